@@ -0,0 +1,532 @@
+"""
+Load test of the MCP server with many concurrent clients.
+
+Starts server.py on a transport, connects N MCP client sessions at once and
+has each replay a weighted mix of tool calls for a while, with the offline
+stand-ins for the Hypernode CLIs on PATH. Reports the throughput, the
+p50/p95/p99 latency and the error and timeout rates per call, and the CPU
+and RSS of the server sampled from /proc over time.
+
+With stdio every client starts its own server, as an agent does; the
+server numbers are then the sum over those processes. With http and sse
+all clients share one server.
+
+Usage:
+    python -m benchmarks.load --transport http --clients 20 --duration 60
+    python -m benchmarks.load --transport stdio --clients 5 --mix mix.json
+
+A mix file is a JSON list of {"name", "tool", "arguments", "weight"}.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER = os.path.join(PACKAGE_ROOT, "server.py")
+
+# URL path the server answers on per network transport
+PATHS = {"http": "/mcp", "sse": "/sse"}
+
+# Seconds to wait for an http or sse server to listen
+STARTUP_TIMEOUT = 60
+
+
+@dataclass
+class Call:
+    """A tool call of the mix, made with probability weight / total weight."""
+    name: str
+    tool: str
+    arguments: Dict[str, Any] = field(default_factory=dict)
+    weight: float = 1
+
+
+# Read-only calls only, so the mix can run for as long as wanted
+DEFAULT_MIX = [
+    Call("list_vhosts", "list_vhosts", {}, 20),
+    Call("analyze_nginx_logs_head", "analyze_nginx_logs", {"limit": 100}, 15),
+    Call("analyze_nginx_logs_unique", "analyze_nginx_logs", {"unique_by_field": "remote_addr", "limit": 20}, 5),
+    Call("analyze_nginx_logs_fields", "analyze_nginx_logs_fields", {}, 5),
+    Call("list_attacks", "list_attacks", {}, 10),
+    Call("list_active_blocks", "list_active_blocks", {}, 10),
+    Call("list_incidents", "list_incidents", {}, 10),
+    Call("execute_shell_command", "execute_shell_command", {"command": "uptime"}, 10),
+    Call("get_server_metrics", "get_server_metrics", {}, 5),
+    Call("hello_world", "hello_world", {}, 10),
+]
+
+
+def load_mix(path: str) -> List[Call]:
+    """
+    Read a mix of calls from a JSON file.
+
+    Raises:
+        ValueError: If the file is not a list of calls with a tool and a positive weight
+    """
+    with open(path) as f:
+        items = json.load(f)
+    if not isinstance(items, list) or not items:
+        raise ValueError(f"{path}: expected a non-empty list of calls")
+    mix = []
+    for item in items:
+        if not isinstance(item, dict) or not item.get("tool"):
+            raise ValueError(f"{path}: every call needs a tool: {item!r}")
+        weight = item.get("weight", 1)
+        if not isinstance(weight, (int, float)) or weight <= 0:
+            raise ValueError(f"{path}: weight of {item['tool']} must be positive")
+        mix.append(Call(item.get("name", item["tool"]), item["tool"], item.get("arguments", {}), weight))
+    return mix
+
+
+def resolve_tool(tool: str, available: List[str]) -> str:
+    """
+    Return the name the server registered a tool under, with or without the tool_ prefix.
+
+    Raises:
+        ValueError: If the server has no such tool
+    """
+    for name in (tool, f"tool_{tool}", tool[5:] if tool.startswith("tool_") else None):
+        if name in available:
+            return name
+    raise ValueError(f"The server has no tool {tool}")
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """The nearest-rank percentile of values, or None without values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+class CallStats:
+    """The outcomes and latencies of one call of the mix."""
+
+    OUTCOMES = ("ok", "failed", "error", "timeout")
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.outcomes = dict.fromkeys(self.OUTCOMES, 0)
+
+    def record(self, seconds: float, outcome: str) -> None:
+        self.outcomes[outcome] += 1
+        # A timed out call has no latency of its own, only the timeout
+        if outcome != "timeout":
+            self.latencies.append(seconds)
+
+    @property
+    def calls(self) -> int:
+        return sum(self.outcomes.values())
+
+    def to_dict(self, elapsed: float) -> Dict[str, Any]:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 1) if value is not None else None
+
+        calls = self.calls
+        return {
+            "calls": calls,
+            **self.outcomes,
+            "calls_per_second": round(calls / elapsed, 2) if elapsed else None,
+            # Tool results with success false are reported apart from protocol errors
+            "failure_rate": round(self.outcomes["failed"] / calls, 4) if calls else 0.0,
+            "error_rate": round(self.outcomes["error"] / calls, 4) if calls else 0.0,
+            "timeout_rate": round(self.outcomes["timeout"] / calls, 4) if calls else 0.0,
+            "p50_ms": ms(percentile(self.latencies, 0.50)),
+            "p95_ms": ms(percentile(self.latencies, 0.95)),
+            "p99_ms": ms(percentile(self.latencies, 0.99)),
+            "max_ms": ms(max(self.latencies, default=None))
+        }
+
+
+class LoadStats:
+    """The outcomes and latencies of every call made during a load test."""
+
+    def __init__(self):
+        self.calls: Dict[str, CallStats] = {}
+
+    def record(self, name: str, seconds: float, outcome: str) -> None:
+        stats = self.calls.get(name)
+        if stats is None:
+            stats = self.calls[name] = CallStats()
+        stats.record(seconds, outcome)
+
+    def to_dict(self, elapsed: float) -> Dict[str, Any]:
+        total = CallStats()
+        for stats in self.calls.values():
+            total.latencies.extend(stats.latencies)
+            for outcome, count in stats.outcomes.items():
+                total.outcomes[outcome] += count
+        return {
+            "total": total.to_dict(elapsed),
+            "calls": {name: self.calls[name].to_dict(elapsed) for name in sorted(self.calls)}
+        }
+
+
+class ProcessSampler:
+    """
+    Samples the CPU and RSS of the server processes from /proc.
+
+    The server processes are the descendants of root_pid with match in
+    their command line, so the servers stdio clients start are found too;
+    the commands a server runs are not counted.
+    """
+
+    def __init__(self, root_pid: int, match: str = "server.py", interval: float = 1.0):
+        self.root_pid = root_pid
+        self.match = match
+        self.interval = interval
+        self.samples: List[Dict[str, Any]] = []
+        self._ticks: Dict[int, int] = {}
+        self._started = time.monotonic()
+        self._last = self._started
+        self._clock_ticks = os.sysconf("SC_CLK_TCK")
+        self._page_kb = os.sysconf("SC_PAGE_SIZE") // 1024
+
+    def processes(self) -> List[int]:
+        """The server processes currently running."""
+        children: Dict[int, List[int]] = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            stat = self._stat(int(entry))
+            if stat is not None:
+                children.setdefault(int(stat[1]), []).append(int(entry))
+        found = []
+        pending = list(children.get(self.root_pid, []))
+        while pending:
+            pid = pending.pop()
+            if self.match in self._cmdline(pid):
+                found.append(pid)
+            else:
+                # Below a server, a forked command has its command line until it execs
+                pending.extend(children.get(pid, []))
+        return sorted(found)
+
+    def sample(self) -> Dict[str, Any]:
+        """Take a sample of the CPU used since the previous one and the current RSS."""
+        now = time.monotonic()
+        ticks = {}
+        rss_kb = 0
+        for pid in self.processes():
+            stat = self._stat(pid)
+            if stat is None:
+                continue
+            # utime and stime, then rss in pages; fields counted from the state
+            ticks[pid] = int(stat[11]) + int(stat[12])
+            rss_kb += int(stat[21]) * self._page_kb
+        used = sum(value - self._ticks.get(pid, 0) for pid, value in ticks.items())
+        seconds = now - self._last
+        sample = {
+            "seconds": round(now - self._started, 2),
+            "processes": len(ticks),
+            "cpu_percent": round(used / self._clock_ticks / seconds * 100, 1) if seconds > 0 else 0.0,
+            "rss_kb": rss_kb
+        }
+        self._ticks, self._last = ticks, now
+        self.samples.append(sample)
+        return sample
+
+    async def run(self) -> None:
+        """Sample every interval until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            self.sample()
+
+    def to_dict(self) -> Dict[str, Any]:
+        # The first sample holds the CPU used to start up
+        measured = self.samples[1:] or self.samples
+        cpu = [sample["cpu_percent"] for sample in measured]
+        return {
+            "processes": max((sample["processes"] for sample in self.samples), default=0),
+            "cpu_percent_mean": round(sum(cpu) / len(cpu), 1) if cpu else None,
+            "cpu_percent_max": max(cpu, default=None),
+            "rss_kb_max": max((sample["rss_kb"] for sample in self.samples), default=None),
+            "samples": self.samples
+        }
+
+    @staticmethod
+    def _stat(pid: int) -> Optional[List[str]]:
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                data = f.read()
+        except OSError:
+            return None
+        # The command name may hold spaces and parentheses; the fields follow the last one
+        return data[data.rfind(")") + 2:].split()
+
+    @staticmethod
+    def _cmdline(pid: int) -> str:
+        try:
+            with open(f"/proc/{pid}/cmdline", 'rb') as f:
+                return f.read().replace(b"\0", b" ").decode('utf-8', errors='ignore')
+        except OSError:
+            return ""
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(transport: str, port: int, env: Dict[str, str], log_path: str) -> subprocess.Popen:
+    """
+    Start an http or sse server and wait until it listens.
+
+    Raises:
+        RuntimeError: If the server exits or does not listen in time
+    """
+    with open(log_path, 'ab') as log:
+        process = subprocess.Popen(
+            [sys.executable, SERVER, "--transport", transport, "--host", "127.0.0.1", "--port", str(port)],
+            cwd=PACKAGE_ROOT, env=env, stdin=subprocess.DEVNULL, stdout=log, stderr=log
+        )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"The server exited with status {process.returncode}; see {log_path}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"The server did not listen on port {port} within {STARTUP_TIMEOUT} seconds; see {log_path}")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def _field(result: Any, name: str, legacy: str) -> Any:
+    """A field of a CallToolResult, named the way the installed MCP SDK names it."""
+    return getattr(result, name) if name in getattr(result, "__dict__", {}) else getattr(result, legacy, None)
+
+
+def _failed(result: Any) -> bool:
+    """Whether a tool answered with success false."""
+    payload = _field(result, "structured_content", "structuredContent")
+    if not isinstance(payload, dict):
+        text = next((item.text for item in result.content if getattr(item, "text", None)), None)
+        try:
+            payload = json.loads(text) if text else None
+        except ValueError:
+            return False
+    if isinstance(payload, dict) and isinstance(payload.get("result"), dict) and "success" not in payload:
+        # Structured output wraps results that are not objects
+        payload = payload["result"]
+    return isinstance(payload, dict) and payload.get("success") is False
+
+
+class LoadTest:
+    """A load test of N clients replaying a mix of calls against the server."""
+
+    def __init__(self, transport: str, clients: int, duration: float, mix: List[Call],
+                 timeout: float = 30, seed: int = 0, sample_interval: float = 1.0):
+        self.transport = transport
+        self.clients = clients
+        self.duration = duration
+        self.mix = mix
+        self.timeout = timeout
+        self.seed = seed
+        self.stats = LoadStats()
+        self.connects = CallStats()
+        self.sampler = ProcessSampler(os.getpid(), interval=sample_interval)
+        self.elapsed = 0.0
+        self.client_errors: List[str] = []
+        self._pending = clients
+        self._connected: Optional[asyncio.Event] = None
+        self._started = time.monotonic()
+        self._deadline = float("inf")
+
+    def client_transport(self, env: Dict[str, str], url: Optional[str], log_path: str) -> Any:
+        from fastmcp.client.transports import SSETransport, StdioTransport, StreamableHttpTransport
+
+        if self.transport == "http":
+            return StreamableHttpTransport(url)
+        if self.transport == "sse":
+            return SSETransport(url)
+        # Through a shell only to keep the server logs out of the report
+        return StdioTransport(
+            command="/bin/sh",
+            args=["-c", 'exec "$0" "$1" --transport stdio 2>>"$2"', sys.executable, SERVER, log_path],
+            env=env,
+            cwd=PACKAGE_ROOT
+        )
+
+    async def run(self, env: Dict[str, str], url: Optional[str], log_path: str) -> None:
+        """
+        Connect every client, then replay the mix until the duration has passed.
+
+        Raises:
+            ValueError: If the server lacks a tool of the mix
+        """
+        self._pending = self.clients
+        self._connected = asyncio.Event()
+        sampler = asyncio.ensure_future(self.sampler.run())
+        try:
+            results = await asyncio.gather(
+                *(self._client(index, env, url, log_path) for index in range(self.clients)),
+                return_exceptions=True
+            )
+            self.elapsed = time.monotonic() - self._started
+        finally:
+            sampler.cancel()
+            await asyncio.gather(sampler, return_exceptions=True)
+        self.sampler.sample()
+        for result in results:
+            if isinstance(result, ValueError):
+                raise result
+        self.client_errors = [repr(result) for result in results if isinstance(result, BaseException)]
+
+    async def _client(self, index: int, env: Dict[str, str], url: Optional[str], log_path: str) -> None:
+        from fastmcp import Client
+
+        rng = random.Random(self.seed * 1000 + index)
+        started = time.perf_counter()
+        connected = False
+        try:
+            async with Client(self.client_transport(env, url, log_path)) as session:
+                available = [tool.name for tool in await session.list_tools()]
+                calls = [(call, resolve_tool(call.tool, available)) for call in self.mix]
+                weights = [call.weight for call, _ in calls]
+                self.connects.record(time.perf_counter() - started, "ok")
+                connected = True
+                self._arrived()
+                # Calls start when every client is connected, at once
+                await self._connected.wait()
+                while time.monotonic() < self._deadline:
+                    call, tool = rng.choices(calls, weights=weights)[0]
+                    await self.call(session, call, tool)
+        finally:
+            if not connected:
+                self.connects.record(time.perf_counter() - started, "error")
+                self._arrived()
+
+    def _arrived(self) -> None:
+        """Count a client as connected or failed, and start the clock once all are."""
+        self._pending -= 1
+        if not self._pending:
+            self._started = time.monotonic()
+            self._deadline = self._started + self.duration
+            self.sampler.sample()
+            self._connected.set()
+
+    async def call(self, session: Any, call: Call, tool: str) -> None:
+        """Make a call and record its outcome."""
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(session.call_tool_mcp(tool, call.arguments), self.timeout)
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+        except Exception:
+            outcome = "error"
+        else:
+            outcome = "error" if _field(result, "is_error", "isError") else "failed" if _failed(result) else "ok"
+        self.stats.record(call.name, time.perf_counter() - started, outcome)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "transport": self.transport,
+            "clients": self.clients,
+            "duration": self.duration,
+            "elapsed": round(self.elapsed, 2),
+            "connect": self.connects.to_dict(0),
+            "client_errors": self.client_errors,
+            **self.stats.to_dict(self.elapsed),
+            "server": self.sampler.to_dict()
+        }
+
+
+def environment(work_dir: str, log_lines: int, latency: Optional[str]) -> Dict[str, str]:
+    """The environment of the servers: the stand-in CLIs on PATH and everything else in work_dir."""
+    from benchmarks.nginx_logs import environment as stand_in_environment, prepare_log
+
+    env = stand_in_environment(prepare_log(log_lines), work_dir)
+    for name, directory in (("HYPERNODE_NGINX_CONFIG_DIR", "nginx"), ("HYPERNODE_INCIDENTS_DIR", "incidents")):
+        env[name] = os.path.join(work_dir, directory)
+        os.makedirs(env[name], exist_ok=True)
+    env["MCP_INCIDENT_INDEX_PATH"] = os.path.join(work_dir, "incident-index.sqlite")
+    if latency:
+        env["FAKE_HYPERNODE_LATENCY"] = latency
+    return env
+
+
+def print_summary(report: Dict[str, Any]) -> None:
+    """Print a table of the calls and the server usage to stderr."""
+    print(f"{'call':<28} {'calls':>7} {'/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'failed':>7} {'errors':>7} {'timeouts':>8}", file=sys.stderr)
+    for name, stats in [*report["calls"].items(), ("total", report["total"])]:
+        print(f"{name:<28} {stats['calls']:>7} {stats['calls_per_second'] or 0:>7} {stats['p50_ms'] or '-':>8} "
+              f"{stats['p95_ms'] or '-':>8} {stats['p99_ms'] or '-':>8} {stats['failed']:>7} "
+              f"{stats['error']:>7} {stats['timeout']:>8}", file=sys.stderr)
+    server = report["server"]
+    print(f"server: {server['processes']} process(es), CPU mean {server['cpu_percent_mean']}% "
+          f"max {server['cpu_percent_max']}%, RSS max {server['rss_kb_max']} KiB", file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the MCP server with concurrent clients.")
+    parser.add_argument("--transport", choices=["stdio", *PATHS], default="http", help="transport (default: http)")
+    parser.add_argument("--clients", type=int, default=20, help="concurrent client sessions (default: 20)")
+    parser.add_argument("--duration", type=float, default=60, help="seconds to replay the mix for (default: 60)")
+    parser.add_argument("--mix", help="JSON file with the calls to replay (default: a read-only mix)")
+    parser.add_argument("--timeout", type=float, default=30, help="seconds before a call counts as timed out (default: 30)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the call choices (default: 0)")
+    parser.add_argument("--port", type=int, default=0, help="port of the http or sse server (default: a free port)")
+    parser.add_argument("--log-lines", type=int, default=100_000,
+                        help="lines of the access log pnl reads (default: 100000)")
+    parser.add_argument("--latency", help="FAKE_HYPERNODE_LATENCY of the stand-in CLIs, e.g. 0.2")
+    parser.add_argument("--sample-interval", type=float, default=1.0,
+                        help="seconds between samples of the server CPU and RSS (default: 1)")
+    parser.add_argument("--output", help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        import fastmcp  # noqa: F401
+    except ImportError:
+        print("The load test needs fastmcp: pip install fastmcp", file=sys.stderr)
+        return 2
+    mix = load_mix(args.mix) if args.mix else DEFAULT_MIX
+    test = LoadTest(args.transport, args.clients, args.duration, mix, args.timeout, args.seed, args.sample_interval)
+
+    with tempfile.TemporaryDirectory(prefix="hypernode-mcp-load-") as work_dir:
+        env = environment(work_dir, args.log_lines, args.latency)
+        log_path = os.path.join(work_dir, "server.log")
+        server = None
+        url = None
+        if args.transport != "stdio":
+            port = args.port or free_port()
+            server = start_server(args.transport, port, env, log_path)
+            url = f"http://127.0.0.1:{port}{PATHS[args.transport]}"
+        try:
+            asyncio.run(test.run(env, url, log_path))
+        finally:
+            if server is not None:
+                stop_server(server)
+
+    report = test.report()
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    print_summary(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
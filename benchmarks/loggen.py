@@ -0,0 +1,242 @@
+"""
+Synthetic nginx access log generator for the benchmarks.
+
+Writes access logs in the Hypernode JSON log format, with every field
+hypernode-parse-nginx-log knows, at millions of lines. Traffic is skewed
+the way real shops see it: a few IPs and user agents make most requests,
+most IPs are seen a handful of times. Attack bursts are mixed in at fixed
+points: login brute force from one network, an aggressive crawler, SQL
+injection probes and requests without a user agent.
+
+The same arguments always give the same bytes, so a log is generated once
+per size and reused across benchmark runs.
+
+Usage: python -m benchmarks.loggen --lines 1000000 --output access.log
+"""
+
+import argparse
+import bisect
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import IO, List, Optional, Sequence, Tuple
+
+DEFAULT_END = "2024-01-15T00:00:00+00:00"
+
+# Lines generated per batch of random choices
+BATCH_SIZE = 65536
+
+BROWSERS = [
+    ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36", 40),
+    ("Mozilla/5.0 (iPhone; CPU iPhone OS 17_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Mobile/15E148 Safari/604.1", 25),
+    ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15", 12),
+    ("Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0", 6),
+    ("Mozilla/5.0 (Linux; Android 14; SM-S918B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36", 10),
+    ("Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)", 4),
+    ("Mozilla/5.0 (compatible; bingbot/2.0; +http://www.bing.com/bingbot.htm)", 2),
+    ("curl/8.5.0", 1),
+]
+COUNTRIES = [("NL", 55), ("BE", 12), ("DE", 12), ("US", 8), ("GB", 5), ("FR", 4), ("CN", 2), ("RU", 2)]
+PATHS = [
+    ("/", 10), ("/catalog/product/view/id/%d", 30), ("/catalog/category/view/id/%d", 12),
+    ("/static/version1705/frontend/Shop/default/nl_NL/js/%d.js", 20), ("/media/catalog/product/%d.jpg", 10),
+    ("/checkout/cart/", 5), ("/customer/section/load/?sections=cart&_=%d", 6), ("/rest/V1/carts/mine", 2),
+    ("/customer/account/login/", 2), ("/search?q=item+%d", 3),
+]
+STATUSES = [("200", 86), ("301", 3), ("302", 3), ("304", 2), ("404", 4), ("403", 1), ("500", 1)]
+HOSTS = [("www.example.com", 60), ("shop.example.nl", 25), ("example.be", 10), ("admin.example.com", 5)]
+
+# Attack bursts: (kind, share of the lines of the log taken by each burst)
+BURST_KINDS = ("login_brute_force", "crawler", "sqli", "empty_user_agent")
+BURST_SHARE = 0.002
+
+
+@dataclass
+class Burst:
+    """An attack mixed into the log from its first line, on every other line."""
+    kind: str
+    first_line: int
+    lines: int
+
+    def to_dict(self):
+        return {"kind": self.kind, "first_line": self.first_line, "lines": self.lines}
+
+
+def _cumulative(weighted: Sequence[Tuple[object, float]]) -> Tuple[List[object], List[float]]:
+    return [value for value, _ in weighted], list(itertools.accumulate(weight for _, weight in weighted))
+
+
+def plan_bursts(lines: int, bursts: int, seed: int = 0) -> List[Burst]:
+    """Spread attack bursts evenly over a log, cycling through the attack kinds."""
+    if bursts <= 0 or lines <= 0:
+        return []
+    rng = random.Random(seed + 1)
+    length = max(int(lines * BURST_SHARE), 10)
+    spacing = lines // bursts
+    plan = []
+    for i in range(bursts):
+        first = i * spacing + rng.randrange(max(spacing - length * 2, 1))
+        plan.append(Burst(BURST_KINDS[i % len(BURST_KINDS)], first, min(length * 2, lines - first)))
+    return plan
+
+
+class LogGenerator:
+    """Generates the lines of a synthetic access log."""
+
+    def __init__(self, lines: int, seed: int = 0, end: str = DEFAULT_END, hours: float = 24,
+                 ips: int = 50000, bursts: int = 8, skew: float = 0.9):
+        self.lines = lines
+        self.seed = seed
+        self.end = datetime.fromisoformat(end)
+        self.hours = hours
+        self.bursts = plan_bursts(lines, bursts, seed)
+        self._rng = random.Random(seed)
+        self._visitors = self._make_visitors(ips, skew)
+
+    def _make_visitors(self, count: int, skew: float) -> Tuple[List[Tuple[str, str, str]], List[float]]:
+        """Make IPs with a fixed country and user agent each, weighted by a Zipf distribution."""
+        rng = self._rng
+        countries, country_weights = _cumulative(COUNTRIES)
+        browsers, browser_weights = _cumulative(BROWSERS)
+        visitors = []
+        seen = set()
+        while len(visitors) < count:
+            ip = f"{rng.choice((31, 77, 81, 84, 145, 185, 212, 213))}.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}"
+            if ip in seen:
+                continue
+            seen.add(ip)
+            country = countries[bisect.bisect_right(country_weights, rng.random() * country_weights[-1])]
+            browser = browsers[bisect.bisect_right(browser_weights, rng.random() * browser_weights[-1])]
+            visitors.append((ip, country, json.dumps(browser)))
+        weights = list(itertools.accumulate(1 / (rank ** skew) for rank in range(1, count + 1)))
+        return visitors, weights
+
+    def _burst_line(self, burst: Burst, index: int, rng: random.Random) -> Tuple[str, str, str, str, str]:
+        """Return (ip, country, user_agent json, request, status) of a line of an attack."""
+        if burst.kind == "login_brute_force":
+            return (f"103.27.{burst.first_line % 200}.{index % 16 + 1}", "CN", json.dumps(BROWSERS[0][0]),
+                    "POST /customer/account/loginPost/ HTTP/1.1", rng.choice(("200", "302")))
+        if burst.kind == "crawler":
+            return (f"54.36.148.{index % 3 + 1}", "FR",
+                    '"Mozilla/5.0 (compatible; AhrefsBot/7.0; +http://ahrefs.com/robot/)"',
+                    f"GET /catalog/product/view/id/{index} HTTP/1.1", "200")
+        if burst.kind == "sqli":
+            return (f"45.148.10.{index % 5 + 1}", "RU", '"python-requests/2.31.0"',
+                    f"GET /search?q=1%27+union+select+{index},2,3-- HTTP/1.1", "403")
+        return (f"193.142.146.{index % 8 + 1}", "NL", '"-"', "GET /wp-login.php HTTP/1.1", "404")
+
+    def write(self, out: IO[str]) -> int:
+        """
+        Write the log.
+
+        Returns:
+            The number of lines written
+        """
+        rng = self._rng
+        visitors, visitor_weights = self._visitors
+        # The parts of a line that only depend on the picked value are rendered once
+        visitor_parts = [(ip, f'","country":"{country}","user_agent":{user_agent},') for ip, country, user_agent in visitors]
+        paths, path_weights = _cumulative([
+            ((path, "%d" in path, "POST" if path.startswith("/rest/") else "GET",
+              '"-"' if path.startswith(("/static/", "/media/")) else '"phpfpm"'), weight)
+            for path, weight in PATHS
+        ])
+        statuses, status_weights = _cumulative(STATUSES)
+        hosts, host_weights = _cumulative([
+            (f'","remote_user":"-","host":"{host}","server_name":"{host}","port":"443","request":"', weight)
+            for host, weight in HOSTS
+        ])
+        tail = '"referer":"-","ssl_protocol":"TLSv1.3","ssl_cipher":"TLS_AES_256_GCM_SHA384","handler":'
+        start = self.end - timedelta(hours=self.hours)
+        step = self.hours * 3600 / max(self.lines, 1)
+        # Line numbers at which the next burst starts or ends
+        events = sorted({line for burst in self.bursts for line in (burst.first_line, burst.first_line + burst.lines)})
+        events.append(self.lines + 1)
+        event = 0
+        burst = None
+
+        next_second, prefix = 0, ""
+        written = 0
+        while written < self.lines:
+            size = min(BATCH_SIZE, self.lines - written)
+            picked = zip(
+                range(written, written + size),
+                rng.choices(visitor_parts, cum_weights=visitor_weights, k=size),
+                rng.choices(paths, cum_weights=path_weights, k=size),
+                rng.choices(statuses, cum_weights=status_weights, k=size),
+                rng.choices(hosts, cum_weights=host_weights, k=size)
+            )
+            chunk = []
+            for line_number, (ip, visitor), (path, numbered, method, handler), status, host in picked:
+                if line_number >= next_second:
+                    second = int(line_number * step)
+                    next_second = math.ceil((second + 1) / step) if step else self.lines
+                    prefix = '{"time":"' + (start + timedelta(seconds=second)).isoformat() + '","remote_addr":"'
+                if line_number >= events[event]:
+                    while line_number >= events[event]:
+                        event += 1
+                    burst = next((b for b in self.bursts if b.first_line <= line_number < b.first_line + b.lines), None)
+                if burst is not None and line_number % 2:
+                    ip, country, user_agent, request, status = self._burst_line(burst, line_number, rng)
+                    visitor = f'","country":"{country}","user_agent":{user_agent},'
+                    handler = '"phpfpm"'
+                else:
+                    request = f"{method} {path % (line_number % 9973) if numbered else path} HTTP/1.1"
+                chunk.append(
+                    f'{prefix}{ip}{host}{request}","status":"{status}","body_bytes_sent":"{(line_number * 7919) % 60000 + 200}",'
+                    f'"request_time":"{(line_number * 31) % 997 / 1000:.3f}{visitor}{tail}{handler}}}\n'
+                )
+            out.write("".join(chunk))
+            written += size
+        return written
+
+
+def generate(path: str, lines: int, seed: int = 0, end: str = DEFAULT_END, hours: float = 24,
+             ips: int = 50000, bursts: int = 8) -> List[Burst]:
+    """
+    Write a synthetic access log, atomically.
+
+    Returns:
+        The attack bursts mixed into the log
+    """
+    generator = LogGenerator(lines, seed=seed, end=end, hours=hours, ips=ips, bursts=bursts)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path + ".tmp", 'w', encoding='utf-8', buffering=1024 * 1024) as f:
+        generator.write(f)
+    os.replace(path + ".tmp", path)
+    return generator.bursts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic nginx access log in the Hypernode JSON format.")
+    parser.add_argument("--lines", type=int, default=1_000_000, help="number of lines (default: 1000000)")
+    parser.add_argument("--output", default="access.log", help="file to write (default: access.log)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random choices (default: 0)")
+    parser.add_argument("--end", default=DEFAULT_END, help=f"time of the last line, ISO 8601 (default: {DEFAULT_END})")
+    parser.add_argument("--hours", type=float, default=24, help="hours the log spans (default: 24)")
+    parser.add_argument("--ips", type=int, default=50000, help="number of distinct visitor IPs (default: 50000)")
+    parser.add_argument("--bursts", type=int, default=8, help="number of attack bursts (default: 8)")
+    args = parser.parse_args(argv)
+
+    started = time.monotonic()
+    bursts = generate(args.output, args.lines, args.seed, args.end, args.hours, args.ips, args.bursts)
+    elapsed = time.monotonic() - started
+    print(json.dumps({
+        "output": args.output,
+        "lines": args.lines,
+        "seconds": round(elapsed, 2),
+        "lines_per_second": round(args.lines / elapsed) if elapsed else None,
+        "bursts": [burst.to_dict() for burst in bursts]
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
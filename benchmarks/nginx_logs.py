@@ -0,0 +1,270 @@
+"""
+Benchmarks of analyze_nginx_logs and the in-process log engine.
+
+Each case runs the tool against a synthetic access log from
+benchmarks.loggen, in a fresh worker process so peak RSS is its own, with
+the offline stand-in for hypernode-parse-nginx-log on PATH. A case reports
+the median latency over its repeats, the log lines scanned per second and
+the peak RSS of the server process and of the pnl it ran.
+
+Results can be saved as a baseline and later runs compared with it: a case
+whose median latency or peak RSS grows by more than the threshold is a
+regression, and the run exits non-zero.
+
+Usage:
+    python -m benchmarks.nginx_logs --lines 1000000 --save-baseline
+    python -m benchmarks.nginx_logs --lines 1000000 --threshold 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from benchmarks.loggen import generate
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_DIR = os.path.join(PACKAGE_ROOT, "benchmarks", "baselines")
+CACHE_DIR = os.environ.get("MCP_BENCH_CACHE", os.path.join(tempfile.gettempdir(), "hypernode-mcp-bench"))
+
+# Hours the generated log spans, up to the next midnight, so --today matches about half of it
+LOG_HOURS = 48
+
+# Cases of analyze_nginx_logs: name -> arguments of the tool.
+# Filters run with limit=0 so pnl always scans the whole log.
+CASES: Dict[str, Dict[str, Any]] = {
+    "head": {"limit": 100},
+    "filter_equals": {"filter": "status=404", "limit": 0},
+    "filter_regex": {"filter": "request~loginPost", "limit": 0},
+    "filter_negated": {"filter": "user_agent!~Mozilla", "limit": 0},
+    "today": {"today": True, "unique_by_field": "status"},
+    "bots": {"query_bots_only": True, "unique_by_field": "user_agent"},
+    "unique_remote_addr": {"unique_by_field": "remote_addr"},
+    "unique_user_agent": {"unique_by_field": "user_agent"},
+    "unique_country": {"unique_by_field": "country"},
+    "unique_request": {"unique_by_field": "request"},
+    "unique_remote_addr_country": {"unique_by_field": "remote_addr,country"},
+}
+
+# Cases of the in-process log engine in utils.nginx_log
+ENGINE_CASES = ("traffic_by_host", "summarize_window")
+
+# Cases that stop reading early, for which lines per second means nothing
+LATENCY_ONLY = {"head"}
+
+
+def log_end(now: Optional[datetime] = None) -> datetime:
+    """The end of the generated log: the next UTC midnight."""
+    now = now or datetime.now(timezone.utc)
+    return datetime(now.year, now.month, now.day, tzinfo=timezone.utc) + timedelta(days=1)
+
+
+def prepare_log(lines: int, seed: int = 0, cache_dir: Optional[str] = None) -> str:
+    """
+    Generate the access log of a run, or reuse the one generated earlier today.
+
+    Returns:
+        The directory holding access.log
+    """
+    end = log_end()
+    directory = os.path.join(cache_dir or CACHE_DIR, f"{lines}-{seed}-{end.date().isoformat()}")
+    path = os.path.join(directory, "access.log")
+    if not os.path.exists(path):
+        generate(path, lines, seed=seed, end=end.isoformat(), hours=LOG_HOURS)
+    return directory
+
+
+def environment(log_directory: str, work_dir: str) -> Dict[str, str]:
+    """The environment of the workers, with the stand-in CLIs on PATH."""
+    from tests.fakes.hypernode_cli import install
+
+    bin_dir = os.path.join(work_dir, "bin")
+    install(bin_dir)
+    return {
+        **os.environ,
+        "PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+        "PYTHONPATH": PACKAGE_ROOT,
+        "FAKE_HYPERNODE_STATE": os.path.join(work_dir, "state"),
+        "HYPERNODE_NGINX_LOG_DIR": log_directory,
+        "MCP_ARTIFACT_DIR": os.path.join(work_dir, "artifacts")
+    }
+
+
+async def _run_once(case: str) -> int:
+    """Run a case once and return the size of its result."""
+    if case in ENGINE_CASES:
+        from utils import nginx_log
+        # The whole log, and the engine has to find where it starts
+        end = log_end().timestamp()
+        result, _ = getattr(nginx_log, case)(end - LOG_HOURS * 3600, end)
+        return len(result) if isinstance(result, dict) else result.requests
+
+    from tools.nginx_logs.analyze import nginx_logs_analyze_tool
+    result = await nginx_logs_analyze_tool.tool_analyze_nginx_logs(**CASES[case])
+    if not result["success"]:
+        raise RuntimeError(f"{case} failed: {result['result']}")
+    return len(result["result"])
+
+
+def peak_rss_kb() -> int:
+    """
+    The peak RSS of this process in KiB.
+
+    ru_maxrss carries over the peak of the parent when a process is started
+    with vfork, as subprocess does, so VmHWM is read where there is one.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_case(case: str, repeat: int) -> Dict[str, Any]:
+    """
+    Run a case in this process.
+
+    Returns:
+        The seconds of each repeat, the result size and the peak RSS in KiB
+        of this process and of the commands it ran
+    """
+    seconds = []
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = asyncio.run(_run_once(case))
+        seconds.append(time.perf_counter() - started)
+    return {
+        "seconds": seconds,
+        "result_size": size,
+        "rss_kb": peak_rss_kb(),
+        "children_rss_kb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    }
+
+
+def run_worker(case: str, repeat: int, env: Dict[str, str], timeout: float = 3600) -> Dict[str, Any]:
+    """Run a case in a fresh worker process."""
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.nginx_logs", "--worker", case, "--repeat", str(repeat)],
+        cwd=PACKAGE_ROOT, env=env, capture_output=True, text=True, timeout=timeout
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Case {case} failed:\n{completed.stderr.strip()}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize(case: str, raw: Dict[str, Any], lines: int) -> Dict[str, Any]:
+    """Reduce the measurements of a case to the numbers compared with a baseline."""
+    median = statistics.median(raw["seconds"])
+    return {
+        "median_seconds": round(median, 4),
+        "min_seconds": round(min(raw["seconds"]), 4),
+        "lines_per_second": round(lines / median) if median and case not in LATENCY_ONLY else None,
+        "peak_rss_kb": raw["rss_kb"],
+        "pnl_peak_rss_kb": raw["children_rss_kb"],
+        "result_size": raw["result_size"]
+    }
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            threshold: float) -> List[str]:
+    """
+    Compare the results of a run with a baseline.
+
+    Returns:
+        A description of each regression: a case whose median latency or
+        peak RSS grew by more than threshold, a fraction of the baseline
+    """
+    regressions = []
+    for case, result in results.items():
+        before = baseline.get(case)
+        if before is None:
+            continue
+        for metric in ("median_seconds", "peak_rss_kb"):
+            old, new = before.get(metric), result.get(metric)
+            if old and new is not None and new > old * (1 + threshold):
+                regressions.append(f"{case}: {metric} {old} -> {new} (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def baseline_path(lines: int) -> str:
+    return os.path.join(BASELINE_DIR, f"nginx_logs-{lines}.json")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark analyze_nginx_logs against a synthetic access log.")
+    parser.add_argument("--lines", type=int, default=1_000_000, help="lines of the log (default: 1000000)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the log (default: 0)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case (default: 3)")
+    parser.add_argument("--case", action="append", choices=sorted([*CASES, *ENGINE_CASES]),
+                        help="case to run, can be given more than once (default: all)")
+    parser.add_argument("--baseline", help="baseline to compare with (default: benchmarks/baselines/nginx_logs-<lines>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="save the results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="growth of latency or peak RSS that fails the run (default: 0.2)")
+    parser.add_argument("--output", help="also write the results to this file")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_case(args.worker, args.repeat)))
+        return 0
+
+    started = time.monotonic()
+    log_directory = prepare_log(args.lines, args.seed)
+    print(f"Log: {log_directory} ({time.monotonic() - started:.1f}s)", file=sys.stderr)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory(prefix="hypernode-mcp-bench-") as work_dir:
+        env = environment(log_directory, work_dir)
+        for case in args.case or [*CASES, *ENGINE_CASES]:
+            results[case] = summarize(case, run_worker(case, args.repeat, env), args.lines)
+            print(f"{case:<28} {json.dumps(results[case])}", file=sys.stderr)
+
+    report = {
+        "lines": args.lines,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "cases": results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    path = args.baseline or baseline_path(args.lines)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline {path}", file=sys.stderr)
+        regressions = []
+    elif os.path.exists(path):
+        with open(path) as f:
+            regressions = compare(results, json.load(f)["cases"], args.threshold)
+    else:
+        print(f"No baseline at {path}; run with --save-baseline to save one", file=sys.stderr)
+        regressions = []
+
+    report["regressions"] = regressions
+    print(json.dumps(report, indent=2))
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
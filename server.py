@@ -2,8 +2,13 @@
 Hypernode MCP Server with HTTP and SSE support using FastMCP 2.0.
 """
 
+import argparse
+import os
+from contextlib import asynccontextmanager
 from fastmcp import FastMCP
 import logging
+from utils.loop_monitor import loop_monitor
+from utils.profiling import ToolTimingMiddleware
 
 # Configure logging
 logging.basicConfig(
@@ -12,13 +17,41 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(server):
+    """Run the event loop monitor for as long as the server runs."""
+    loop_monitor.start()
+    try:
+        yield {}
+    finally:
+        loop_monitor.stop()
+
 # Create FastMCP server instance
-mcp = FastMCP("Hypernode MCP Server")
+mcp = FastMCP("Hypernode MCP Server", lifespan=lifespan)
+mcp.add_middleware(ToolTimingMiddleware())
 
 # Auto-register all tools
 from tools import register_all_tools
 register_all_tools(mcp)
 
+# Host and port environment variables and default port per network transport
+TRANSPORTS = {
+    "http": ("MCP_HTTP", 8000),
+    "sse": ("MCP_SSE", 8001),
+}
+
 if __name__ == "__main__":
-    # TODO: add parameters for other transports
-    mcp.run(transport="stdio")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Hypernode MCP Server")
+    parser.add_argument("--transport", choices=["stdio", *TRANSPORTS], default=os.environ.get("MCP_TRANSPORT", "stdio"),
+                        help="transport to serve on (default: MCP_TRANSPORT or stdio)")
+    parser.add_argument("--host", help="host to listen on for http and sse (default: MCP_HTTP_HOST or MCP_SSE_HOST)")
+    parser.add_argument("--port", type=int, help="port to listen on for http and sse (default: MCP_HTTP_PORT or MCP_SSE_PORT)")
+    args = parser.parse_args()
+    
+    if args.transport == "stdio":
+        mcp.run(transport="stdio")
+    else:
+        prefix, default_port = TRANSPORTS[args.transport]
+        host = args.host or os.environ.get(f"{prefix}_HOST", "0.0.0.0")
+        port = args.port or int(os.environ.get(f"{prefix}_PORT", str(default_port)))
+        mcp.run(transport=args.transport, host=host, port=port)
\ No newline at end of file
@@ -0,0 +1 @@
+# Benchmarks tests package 
@@ -0,0 +1,165 @@
+"""
+Tests for the load test of the MCP server.
+"""
+
+import json
+import os
+import pytest
+import re
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from benchmarks.load import (
+    DEFAULT_MIX, CallStats, LoadStats, ProcessSampler, _failed, environment, load_mix, main, percentile, resolve_tool
+)
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 0.50) == 51
+    assert percentile(values, 0.95) == 96
+    assert percentile(values, 0.99) == 100
+    assert percentile([3.0], 0.99) == 3.0
+    assert percentile([], 0.5) is None
+
+
+def test_call_stats_rates_and_latencies():
+    stats = CallStats()
+    for seconds in (0.1, 0.2, 0.3):
+        stats.record(seconds, "ok")
+    stats.record(0.4, "failed")
+    stats.record(0.5, "error")
+    stats.record(30, "timeout")
+    result = stats.to_dict(elapsed=2)
+    assert result["calls"] == 6
+    assert result["calls_per_second"] == 3
+    assert result["ok"] == 3
+    assert result["failure_rate"] == round(1 / 6, 4)
+    assert result["error_rate"] == round(1 / 6, 4)
+    assert result["timeout_rate"] == round(1 / 6, 4)
+    # Timeouts do not count as latencies
+    assert result["max_ms"] == 500
+    assert result["p50_ms"] == 300
+
+
+def test_load_stats_adds_up_the_calls():
+    stats = LoadStats()
+    stats.record("b", 0.1, "ok")
+    stats.record("a", 0.2, "ok")
+    stats.record("a", 0.3, "timeout")
+    result = stats.to_dict(elapsed=1)
+    assert list(result["calls"]) == ["a", "b"]
+    assert result["calls"]["a"]["calls"] == 2
+    assert result["total"]["calls"] == 3
+    assert result["total"]["timeout"] == 1
+
+
+def test_load_mix(tmp_path):
+    path = tmp_path / "mix.json"
+    path.write_text(json.dumps([
+        {"name": "head", "tool": "analyze_nginx_logs", "arguments": {"limit": 10}, "weight": 3},
+        {"tool": "list_vhosts"}
+    ]))
+    mix = load_mix(str(path))
+    assert [(call.name, call.tool, call.arguments, call.weight) for call in mix] == [
+        ("head", "analyze_nginx_logs", {"limit": 10}, 3),
+        ("list_vhosts", "list_vhosts", {}, 1)
+    ]
+
+
+@pytest.mark.parametrize("items", [[], {"tool": "x"}, [{"arguments": {}}], [{"tool": "x", "weight": 0}]])
+def test_load_mix_rejects_bad_mixes(items, tmp_path):
+    path = tmp_path / "mix.json"
+    path.write_text(json.dumps(items))
+    with pytest.raises(ValueError):
+        load_mix(str(path))
+
+
+def test_default_mix_calls_existing_tools():
+    tools_dir = Path(__file__).parents[2] / "tools"
+    available = [
+        name for path in tools_dir.rglob("*.py") for name in re.findall(r"async def (tool_\w+)\(", path.read_text())
+    ]
+    for call in DEFAULT_MIX:
+        assert resolve_tool(call.tool, available) == f"tool_{call.tool}"
+
+
+def test_resolve_tool():
+    assert resolve_tool("list_vhosts", ["list_vhosts"]) == "list_vhosts"
+    assert resolve_tool("list_vhosts", ["tool_list_vhosts"]) == "tool_list_vhosts"
+    assert resolve_tool("tool_list_vhosts", ["list_vhosts"]) == "list_vhosts"
+    with pytest.raises(ValueError):
+        resolve_tool("nope", ["list_vhosts"])
+
+
+def test_failed_reads_the_tool_result():
+    def result(payload, structured=None):
+        return SimpleNamespace(structuredContent=structured, content=[SimpleNamespace(text=json.dumps(payload))])
+
+    assert _failed(result({"success": False, "error": "x"}))
+    assert not _failed(result({"success": True}))
+    assert not _failed(result({"message": "hi"}))
+    assert _failed(result(None, structured={"success": False}))
+    assert _failed(result(None, structured={"result": {"success": False}}))
+    assert not _failed(SimpleNamespace(structuredContent=None, content=[SimpleNamespace(text="not json")]))
+
+
+def test_process_sampler_finds_the_servers():
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)", "server.py"])
+    other = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        sampler = ProcessSampler(os.getpid())
+        for _ in range(50):
+            if sampler.processes():
+                break
+        assert sampler.processes() == [process.pid]
+        sampler.sample()
+        sample = sampler.sample()
+        assert sample["processes"] == 1
+        assert sample["rss_kb"] > 0
+        assert sample["cpu_percent"] >= 0
+        summary = sampler.to_dict()
+        assert summary["processes"] == 1
+        assert summary["rss_kb_max"] > 0
+        assert len(summary["samples"]) == 2
+    finally:
+        for child in (process, other):
+            child.kill()
+            child.wait()
+
+
+def test_environment_puts_the_stand_ins_on_path(tmp_path, monkeypatch):
+    monkeypatch.setattr("benchmarks.nginx_logs.CACHE_DIR", str(tmp_path / "cache"))
+    env = environment(str(tmp_path / "work"), 500, "0.1")
+    bin_dir = env["PATH"].split(os.pathsep)[0]
+    assert os.access(os.path.join(bin_dir, "hypernode-parse-nginx-log"), os.X_OK)
+    assert os.path.exists(os.path.join(env["HYPERNODE_NGINX_LOG_DIR"], "access.log"))
+    assert os.path.isdir(env["HYPERNODE_NGINX_CONFIG_DIR"])
+    assert os.path.isdir(env["HYPERNODE_INCIDENTS_DIR"])
+    assert env["FAKE_HYPERNODE_LATENCY"] == "0.1"
+
+
+def test_load_test_against_the_server(tmp_path, monkeypatch, capsys):
+    pytest.importorskip("fastmcp")
+    monkeypatch.setattr("benchmarks.nginx_logs.CACHE_DIR", str(tmp_path / "cache"))
+    mix = tmp_path / "mix.json"
+    mix.write_text(json.dumps([
+        {"tool": "hello_world", "weight": 3},
+        {"name": "unknown_field", "tool": "analyze_nginx_logs", "arguments": {"unique_by_field": "nope"}}
+    ]))
+    output = tmp_path / "report.json"
+    assert main([
+        "--transport", "http", "--clients", "2", "--duration", "1", "--log-lines", "100",
+        "--mix", str(mix), "--sample-interval", "0.2", "--output", str(output)
+    ]) == 0
+    report = json.loads(output.read_text())
+    assert report["connect"]["ok"] == 2
+    assert report["client_errors"] == []
+    assert report["calls"]["hello_world"]["ok"] > 0
+    # pnl rejects the field, and the tool answers with success false
+    assert report["calls"]["unknown_field"]["failed"] == report["calls"]["unknown_field"]["calls"]
+    assert report["total"]["p99_ms"] is not None
+    assert report["server"]["processes"] == 1
+    assert report["server"]["rss_kb_max"] > 0
+    capsys.readouterr()
@@ -0,0 +1,89 @@
+"""
+Tests for the synthetic nginx access log generator.
+"""
+
+import io
+import json
+from collections import Counter
+from datetime import datetime
+from benchmarks.loggen import BURST_KINDS, LogGenerator, generate, main, plan_bursts
+from tests.fakes.hypernode_cli import LOG_FIELDS
+from utils.nginx_log import line_time, parse_line
+
+
+def render(lines, **kwargs):
+    out = io.StringIO()
+    written = LogGenerator(lines, **kwargs).write(out)
+    return written, out.getvalue()
+
+
+def test_same_arguments_give_the_same_log():
+    assert render(5000, seed=3)[1] == render(5000, seed=3)[1]
+    assert render(5000, seed=3)[1] != render(5000, seed=4)[1]
+
+
+def test_writes_the_number_of_lines():
+    written, text = render(70000, ips=1000)
+    assert written == 70000
+    assert text.count("\n") == 70000
+
+
+def test_lines_hold_every_pnl_field():
+    _, text = render(2000)
+    for line in text.splitlines():
+        entry = parse_line(line.encode())
+        assert entry is not None
+        assert set(entry) == set(LOG_FIELDS)
+
+
+def test_lines_are_time_ordered_within_the_span():
+    _, text = render(10000, end="2024-01-15T00:00:00+00:00", hours=2)
+    times = [line_time(line.encode()) for line in text.splitlines()]
+    end = datetime.fromisoformat("2024-01-15T00:00:00+00:00").timestamp()
+    assert times == sorted(times)
+    assert end - 2 * 3600 <= times[0] and times[-1] < end
+
+
+def test_traffic_is_skewed():
+    _, text = render(20000, ips=5000)
+    ips = Counter(json.loads(line)["remote_addr"] for line in text.splitlines())
+    top_ip, top_count = ips.most_common(1)[0]
+    # A few IPs make many requests, most make a handful
+    assert top_count > 100
+    assert sum(1 for count in ips.values() if count <= 3) > len(ips) / 2
+
+
+def test_bursts_are_mixed_in():
+    _, text = render(100000, bursts=4)
+    requests = text.splitlines()
+    # One burst per kind, on every other line of 0.4% of the log
+    assert sum('loginPost' in line for line in requests) == 200
+    assert sum('AhrefsBot' in line for line in requests) == 200
+    assert sum('union+select' in line for line in requests) == 200
+    assert sum('"user_agent":"-"' in line for line in requests) == 200
+
+
+def test_plan_bursts_spreads_the_kinds_over_the_log():
+    bursts = plan_bursts(100000, 8)
+    assert [burst.kind for burst in bursts] == list(BURST_KINDS) * 2
+    for i, burst in enumerate(bursts):
+        assert i * 12500 <= burst.first_line
+        assert burst.first_line + burst.lines <= (i + 1) * 12500
+    assert plan_bursts(100000, 0) == []
+
+
+def test_generate_writes_a_file(tmp_path):
+    path = tmp_path / "logs" / "access.log"
+    bursts = generate(str(path), 1000, bursts=2)
+    assert len(path.read_text().splitlines()) == 1000
+    assert len(bursts) == 2
+    assert not (tmp_path / "logs" / "access.log.tmp").exists()
+
+
+def test_main_reports_the_log(tmp_path, capsys):
+    path = tmp_path / "access.log"
+    assert main(["--lines", "500", "--output", str(path)]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["lines"] == 500
+    assert report["output"] == str(path)
+    assert len(report["bursts"]) == 8
@@ -0,0 +1,70 @@
+"""
+Tests for the analyze_nginx_logs benchmarks.
+"""
+
+import inspect
+import os
+import pytest
+from datetime import datetime, timezone
+from benchmarks.nginx_logs import CASES, compare, log_end, prepare_log, run_case, summarize
+from tools.nginx_logs.analyze import NginxLogsAnalyzeTool
+
+
+def test_log_ends_at_the_next_midnight():
+    now = datetime(2024, 1, 15, 13, 30, tzinfo=timezone.utc)
+    assert log_end(now) == datetime(2024, 1, 16, tzinfo=timezone.utc)
+
+
+def test_prepare_log_reuses_the_log(tmp_path):
+    directory = prepare_log(1000, cache_dir=str(tmp_path))
+    path = os.path.join(directory, "access.log")
+    mtime = os.stat(path).st_mtime_ns
+    assert prepare_log(1000, cache_dir=str(tmp_path)) == directory
+    assert os.stat(path).st_mtime_ns == mtime
+    assert prepare_log(1000, seed=1, cache_dir=str(tmp_path)) != directory
+
+
+def test_summarize_takes_the_median():
+    raw = {"seconds": [2.0, 1.0, 4.0], "result_size": 10, "rss_kb": 5000, "children_rss_kb": 3000}
+    summary = summarize("unique_remote_addr", raw, 1000)
+    assert summary["median_seconds"] == 2.0
+    assert summary["min_seconds"] == 1.0
+    assert summary["lines_per_second"] == 500
+    assert summary["peak_rss_kb"] == 5000
+    assert summary["pnl_peak_rss_kb"] == 3000
+    assert summarize("head", raw, 1000)["lines_per_second"] is None
+
+
+def test_compare_reports_growth_beyond_the_threshold():
+    baseline = {
+        "slower": {"median_seconds": 1.0, "peak_rss_kb": 1000},
+        "bigger": {"median_seconds": 1.0, "peak_rss_kb": 1000},
+        "within": {"median_seconds": 1.0, "peak_rss_kb": 1000},
+    }
+    results = {
+        "slower": {"median_seconds": 1.3, "peak_rss_kb": 1000},
+        "bigger": {"median_seconds": 0.5, "peak_rss_kb": 1500},
+        "within": {"median_seconds": 1.19, "peak_rss_kb": 1100},
+        "new": {"median_seconds": 9.0, "peak_rss_kb": 9000},
+    }
+    regressions = compare(results, baseline, 0.2)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("slower: median_seconds 1.0 -> 1.3")
+    assert regressions[1].startswith("bigger: peak_rss_kb 1000 -> 1500")
+    assert compare(results, baseline, 0.6) == []
+
+
+@pytest.mark.parametrize("case", ["head", "filter_regex", "today", "unique_remote_addr", "summarize_window"])
+def test_run_case(case, fake_hypernode, tmp_path, monkeypatch):
+    directory = prepare_log(2000, cache_dir=str(tmp_path / "cache"))
+    monkeypatch.setenv("HYPERNODE_NGINX_LOG_DIR", directory)
+    raw = run_case(case, 2)
+    assert len(raw["seconds"]) == 2
+    assert raw["result_size"] > 0
+    assert raw["rss_kb"] > 0
+
+
+def test_every_case_is_an_analyze_nginx_logs_call():
+    parameters = inspect.signature(NginxLogsAnalyzeTool.tool_analyze_nginx_logs).parameters
+    for arguments in CASES.values():
+        assert set(arguments) <= set(parameters)
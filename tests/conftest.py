@@ -5,12 +5,40 @@ Pytest configuration and shared fixtures for Hypernode MCP Server tests.
 import pytest
 import sys
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 # Add the project root to the Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from utils.command_executor import CommandResult
+from tests.fakes.hypernode_cli import State, install
+
+
+class FakeCommandStream:
+    """Stand-in for utils.command_executor.CommandStream that replays a fixed stdout."""
+
+    def __init__(self, command, stdout):
+        self.command = command
+        self.pid = None
+        self.result = None
+        self.timed_out = False
+        self.stopped = False
+        self._lines = iter(stdout.splitlines())
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._lines)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    def stop(self):
+        self.stopped = True
+
 
 @pytest.fixture(scope="session")
 def project_root_path():
@@ -24,6 +52,51 @@ def test_data_path():
     return project_root / "tests" / "data"
 
 
+@pytest.fixture
+def fake_stream_command():
+    """Build a side effect for patching CommandExecutor.stream_command from a CommandResult."""
+    def factory(result, timed_out=False):
+        @asynccontextmanager
+        async def stream_command(command, timeout=30, cwd=None):
+            stream = FakeCommandStream(command, result.stdout)
+            stream.timed_out = timed_out
+            yield stream
+            stream.result = CommandResult(
+                success=result.success,
+                stdout="",
+                stderr=result.stderr,
+                return_code=result.return_code,
+                command=command
+            )
+        return stream_command
+    return factory
+
+
+@pytest.fixture(scope="session")
+def hypernode_cli(tmp_path_factory):
+    """Install the offline stand-ins for the Hypernode CLIs on PATH for the test session."""
+    root = tmp_path_factory.mktemp("hypernode")
+    install(str(root / "bin"))
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("PATH", f"{root / 'bin'}{os.pathsep}{os.environ.get('PATH', '')}")
+        mp.setenv("FAKE_HYPERNODE_STATE", str(root / "state"))
+        yield State(str(root / "state"))
+
+
+@pytest.fixture
+def fake_hypernode(hypernode_cli, tmp_path, monkeypatch):
+    """
+    The stand-in CLIs, starting from generated vhosts and no blocks.
+    
+    Blocks are installed in a fresh nginx config directory, and the
+    FAKE_HYPERNODE_* variables can be set with monkeypatch per test.
+    """
+    hypernode_cli.reset()
+    monkeypatch.setenv("HYPERNODE_NGINX_CONFIG_DIR", str(tmp_path / "nginx"))
+    yield hypernode_cli
+    hypernode_cli.reset()
+
+
 @pytest.fixture(autouse=True)
 def setup_test_environment():
     """Set up test environment before each test."""
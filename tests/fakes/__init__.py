@@ -0,0 +1,3 @@
+"""
+Offline stand-ins for the Hypernode CLIs used by the tests.
+"""
@@ -0,0 +1,471 @@
+"""
+Offline stand-ins for the Hypernode CLIs.
+
+install() writes hypernode-manage-vhosts, hypernode-systemctl and
+hypernode-parse-nginx-log executables into a directory, so tools can run
+end to end, through real subprocesses, on a machine without a Hypernode.
+Each stand-in replays a recorded output when there is one for its
+arguments and simulates the CLI otherwise, with generated data at any scale.
+
+The stand-ins are configured through the environment:
+
+- FAKE_HYPERNODE_STATE: directory holding their state: the vhosts, the
+  blocked attacks and a log of every call (required)
+- FAKE_HYPERNODE_FIXTURES: directory of recorded outputs, see fixture_path()
+  (default: the fixtures next to this module)
+- FAKE_HYPERNODE_RECORD: directory holding the real CLIs; they are run and
+  their output is recorded as a fixture before it is replayed
+- FAKE_HYPERNODE_LATENCY: seconds to wait before answering, either one value
+  or per CLI, e.g. "hypernode-systemctl=0.5,hypernode-manage-vhosts=0.1"
+- FAKE_HYPERNODE_VHOSTS: number of vhosts to generate when there is no state yet (default: 3)
+- FAKE_HYPERNODE_LOG_LINES: number of log entries to generate when there is
+  no access log in HYPERNODE_NGINX_LOG_DIR (default: 1000)
+- FAKE_HYPERNODE_SEED: seed of the generated data (default: 0)
+
+Usage: python -m tests.fakes.hypernode_cli install <bin_dir>
+"""
+
+import argparse
+import bisect
+import fcntl
+import itertools
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+MANAGE_VHOSTS = "hypernode-manage-vhosts"
+SYSTEMCTL = "hypernode-systemctl"
+PARSE_NGINX_LOG = "hypernode-parse-nginx-log"
+BINARIES = (MANAGE_VHOSTS, SYSTEMCTL, PARSE_NGINX_LOG)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+ATTACKS = {
+    "BlockChinaBruteForce": "Block brute force attacks from China",
+    "BlockRussiaBruteForce": "Block brute force attacks from Russia",
+    "BlockSqliBruteForce": "Block SQL injection attempts",
+    "BlockMagentoAdminBruteForce": "Block brute force attacks on the Magento admin",
+    "BlockWordpressBruteForce": "Block brute force attacks on WordPress logins",
+    "BlockEmptyUserAgent": "Block requests without a user agent",
+    "BlockAhrefsBot": "Block the AhrefsBot crawler",
+    "BlockSemrushBot": "Block the SemrushBot crawler",
+}
+
+LOG_FIELDS = (
+    "remote_user", "ssl_protocol", "referer", "user_agent", "remote_addr", "ssl_cipher",
+    "body_bytes_sent", "country", "status", "time", "request_time", "port", "request",
+    "server_name", "host", "handler"
+)
+
+# Fields pnl prints when none are asked for
+DEFAULT_FIELDS = ("time", "remote_addr", "status", "request", "user_agent")
+
+_BOTS = re.compile(r"bot|crawl|spider|slurp", re.I)
+_FILTER = re.compile(r"^(\w+)(=|~|!~)(.*)$", re.S)
+_UNSAFE = re.compile(r"[^\w.=-]+")
+
+USER_AGENTS = [
+    ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36", 50),
+    ("Mozilla/5.0 (iPhone; CPU iPhone OS 17_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148", 25),
+    ("Mozilla/5.0 (compatible; AhrefsBot/7.0; +http://ahrefs.com/robot/)", 8),
+    ("Mozilla/5.0 (compatible; SemrushBot/7~bl; +http://www.semrush.com/bot.html)", 6),
+    ("Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)", 6),
+    ("python-requests/2.31.0", 3),
+    ("-", 2),
+]
+COUNTRIES = [("NL", 50), ("DE", 15), ("US", 12), ("CN", 10), ("RU", 8), ("BE", 5)]
+PATHS = [
+    ("/", 15), ("/catalog/product/view/id/{n}", 35), ("/checkout/cart/", 10), ("/static/frontend/{n}.js", 20),
+    ("/customer/account/loginPost", 5), ("/admin", 4), ("/wp-login.php", 3), ("/search?q=union+select+{n}", 1),
+    ("/rest/V1/carts/mine", 7),
+]
+STATUSES = [("200", 80), ("301", 5), ("302", 4), ("404", 7), ("403", 2), ("500", 1), ("502", 1)]
+
+
+def _picker(rng: random.Random, weighted: List[Tuple[str, int]]):
+    """Return a function picking a value by weight, fast enough for millions of entries."""
+    values = [value for value, _ in weighted]
+    cumulative = list(itertools.accumulate(weight for _, weight in weighted))
+    total = cumulative[-1]
+    return lambda: values[bisect.bisect_right(cumulative, rng.random() * total)]
+
+
+def generate_log_entries(count: int, end: Optional[datetime] = None, seed: int = 0,
+                         hosts: Tuple[str, ...] = ("example.com", "shop.example.com")) -> Iterator[Dict[str, str]]:
+    """
+    Generate nginx access log entries in the Hypernode JSON log format.
+
+    The entries are spread over the hour before end, oldest first, with a
+    traffic mix of browsers, bots, logins and the odd injection attempt.
+    The same seed always gives the same entries.
+    """
+    rng = random.Random(seed)
+    path, status = _picker(rng, PATHS), _picker(rng, STATUSES)
+    user_agent, country = _picker(rng, USER_AGENTS), _picker(rng, COUNTRIES)
+    end = end or datetime.now(timezone.utc)
+    start = (end - timedelta(hours=1)).replace(microsecond=0)
+    step = 3600.0 / max(count, 1)
+    second, stamp = -1, ""
+    for i in range(count):
+        if int(i * step) != second:
+            second = int(i * step)
+            stamp = (start + timedelta(seconds=second)).isoformat()
+        method = "POST" if rng.random() < 0.08 else "GET"
+        request_path = path().replace("{n}", str(rng.randrange(5000)))
+        host = hosts[int(rng.random() * len(hosts))]
+        yield {
+            "time": stamp,
+            "remote_addr": f"{(10, 81, 185, 212)[int(rng.random() * 4)]}.{int(rng.random() * 256)}.{int(rng.random() * 256)}.{int(rng.random() * 254) + 1}",
+            "remote_user": "-",
+            "host": host,
+            "server_name": host,
+            "port": "443",
+            "request": f"{method} {request_path} HTTP/1.1",
+            "status": status(),
+            "body_bytes_sent": str(int(rng.random() * 60000) + 200),
+            "request_time": f"{rng.expovariate(8):.3f}",
+            "referer": "-",
+            "user_agent": user_agent(),
+            "country": country(),
+            "ssl_protocol": "TLSv1.3",
+            "ssl_cipher": "TLS_AES_256_GCM_SHA384",
+            "handler": "phpfpm" if not request_path.startswith("/static/") else "-",
+        }
+
+
+def generate_vhosts(count: int, seed: int = 0) -> Dict[str, Dict[str, Any]]:
+    """Generate vhosts in the shape hypernode-manage-vhosts --list --format json prints them."""
+    rng = random.Random(seed)
+    vhosts = {}
+    for i in range(count):
+        https = rng.random() < 0.8
+        vhosts[f"shop{i}.example.com" if i else "example.hypernode.io"] = {
+            "default_server": i == 0,
+            "force_https": https and rng.random() < 0.7,
+            "https": https,
+            "ssl_config": "intermediate",
+            "type": rng.choice(("magento2", "magento2", "wordpress", "generic-php")),
+            "varnish": rng.random() < 0.3
+        }
+    return vhosts
+
+
+def fixture_path(binary: str, args: List[str], directory: Optional[str] = None) -> str:
+    """
+    Return the path of the recorded stdout of a call, without extension.
+
+    Fixtures live in <directory>/<binary>/<arguments>.out, with the
+    arguments joined by underscores and unsafe characters replaced, next
+    to an optional .err file with stderr and .rc file with the exit status.
+    """
+    name = _UNSAFE.sub("_", "_".join(args)).strip("_") or "_"
+    return os.path.join(directory or os.environ.get("FAKE_HYPERNODE_FIXTURES") or FIXTURES_DIR, binary, name)
+
+
+class State:
+    """The state the stand-ins share, kept in a directory."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _load(self, name: str, default: Any) -> Any:
+        try:
+            with open(self._path(name), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return default
+
+    def _save(self, name: str, value: Any) -> None:
+        path = self._path(name)
+        with open(path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump(value, f, indent=2, sort_keys=True)
+        os.replace(path + ".tmp", path)
+
+    def vhosts(self) -> Dict[str, Dict[str, Any]]:
+        vhosts = self._load("vhosts.json", None)
+        if vhosts is None:
+            vhosts = generate_vhosts(int(os.environ.get("FAKE_HYPERNODE_VHOSTS", "3")), _seed())
+            self._save("vhosts.json", vhosts)
+        return vhosts
+
+    def set_vhosts(self, vhosts: Dict[str, Dict[str, Any]]) -> None:
+        self._save("vhosts.json", vhosts)
+
+    def blocked(self) -> List[str]:
+        return self._load("blocked.json", [])
+
+    def set_blocked(self, blocked: List[str]) -> None:
+        self._save("blocked.json", sorted(set(blocked)))
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold the state for a read-modify-write, as concurrent calls would lose changes."""
+        with open(self._path(".lock"), 'w') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def record_call(self, binary: str, args: List[str]) -> None:
+        with open(self._path("calls.jsonl"), 'a', encoding='utf-8') as f:
+            f.write(json.dumps({"binary": binary, "args": args, "time": time.time()}) + "\n")
+
+    def calls(self, binary: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return the calls made to the stand-ins, oldest first."""
+        try:
+            with open(self._path("calls.jsonl"), 'r', encoding='utf-8') as f:
+                calls = [json.loads(line) for line in f]
+        except FileNotFoundError:
+            return []
+        return [call for call in calls if binary is None or call["binary"] == binary]
+
+    def reset(self) -> None:
+        """Forget all state, so the next call starts from generated data."""
+        for name in ("vhosts.json", "blocked.json", "calls.jsonl"):
+            try:
+                os.unlink(self._path(name))
+            except FileNotFoundError:
+                pass
+
+
+def _seed() -> int:
+    return int(os.environ.get("FAKE_HYPERNODE_SEED", "0"))
+
+
+def _latency(binary: str) -> float:
+    value = os.environ.get("FAKE_HYPERNODE_LATENCY", "")
+    if "=" not in value:
+        return float(value or 0)
+    for item in value.split(","):
+        name, _, seconds = item.partition("=")
+        if name.strip() == binary:
+            return float(seconds)
+    return 0.0
+
+
+def _replay(binary: str, args: List[str]) -> Optional[int]:
+    """Print a recorded output, recording it first in record mode; None if there is none."""
+    path = fixture_path(binary, args)
+    record_dir = os.environ.get("FAKE_HYPERNODE_RECORD")
+    if record_dir:
+        result = subprocess.run([os.path.join(record_dir, binary), *args], capture_output=True)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".out", 'wb') as f:
+            f.write(result.stdout)
+        with open(path + ".err", 'wb') as f:
+            f.write(result.stderr)
+        with open(path + ".rc", 'w') as f:
+            f.write(str(result.returncode))
+    if not os.path.exists(path + ".out"):
+        return None
+
+    with open(path + ".out", 'rb') as f:
+        sys.stdout.buffer.write(f.read())
+    if os.path.exists(path + ".err"):
+        with open(path + ".err", 'rb') as f:
+            sys.stderr.buffer.write(f.read())
+    if os.path.exists(path + ".rc"):
+        with open(path + ".rc") as f:
+            return int(f.read().strip() or 0)
+    return 0
+
+
+def manage_vhosts(state: State, args: List[str]) -> int:
+    """Simulate hypernode-manage-vhosts: --list [--format json], or <servername>... <flags>."""
+    vhosts = state.vhosts()
+    if "--list" in args:
+        if "--format" in args and args[args.index("--format") + 1:][:1] == ["json"]:
+            print(json.dumps(vhosts, indent=2))
+        else:
+            for name, settings in vhosts.items():
+                print(f"{name}\t{settings.get('type', '')}")
+        return 0
+
+    names = []
+    while args and not args[0].startswith("--"):
+        names.append(args.pop(0))
+    if not names:
+        print(f"usage: {MANAGE_VHOSTS} [--list] SERVERNAME [SERVERNAME ...] [options]", file=sys.stderr)
+        return 2
+
+    changes: Dict[str, Any] = {}
+    while args:
+        flag = args.pop(0)
+        if not flag.startswith("--"):
+            print(f"{MANAGE_VHOSTS}: error: unrecognized argument: {flag}", file=sys.stderr)
+            return 2
+        setting = flag[2:]
+        if setting.startswith("disable-"):
+            changes[setting[len("disable-"):].replace("-", "_")] = False
+        elif args and not args[0].startswith("--"):
+            changes[setting.replace("-", "_")] = args.pop(0)
+        else:
+            changes[setting.replace("-", "_")] = True
+
+    for name in names:
+        vhost = vhosts.setdefault(name, {
+            "default_server": False, "force_https": False, "https": False,
+            "ssl_config": "intermediate", "type": "generic-php", "varnish": False
+        })
+        vhost.update(changes)
+        print(f"Applied {len(changes)} setting(s) to {name}, regenerating nginx config")
+    state.set_vhosts(vhosts)
+    return 0
+
+
+def systemctl(state: State, args: List[str]) -> int:
+    """Simulate hypernode-systemctl block_attack [--help | ATTACK_TYPE]."""
+    if args[:1] != ["block_attack"]:
+        print(f"{SYSTEMCTL}: error: unknown command {' '.join(args[:1])!r}", file=sys.stderr)
+        return 2
+    args = args[1:]
+    if not args or "--help" in args:
+        print(f"usage: {SYSTEMCTL} block_attack [OPTIONS] ATTACK_TYPE\n")
+        print("The possible values are:")
+        for name, description in ATTACKS.items():
+            print(f"{name}\t{description}")
+        print("options:\n  --help  Show this message and exit.")
+        return 0
+
+    attack = args[0]
+    if attack not in ATTACKS:
+        print(f"{SYSTEMCTL} block_attack: error: invalid choice: {attack!r}", file=sys.stderr)
+        return 2
+    state.set_blocked(state.blocked() + [attack])
+    config_dir = os.environ.get("HYPERNODE_NGINX_CONFIG_DIR")
+    if config_dir:
+        # Installed like the real blocks, as a snippet in the custom nginx config
+        os.makedirs(config_dir, exist_ok=True)
+        with open(os.path.join(config_dir, f"server.block_{attack.lower()}.conf"), 'w') as f:
+            f.write(f"# {attack}: {ATTACKS[attack]}\nreturn 403;\n")
+    print(f"Blocked {attack}, nginx config reloaded")
+    return 0
+
+
+def _log_entries() -> Iterator[Dict[str, Any]]:
+    path = os.path.join(os.environ.get("HYPERNODE_NGINX_LOG_DIR", "/var/log/nginx"), "access.log")
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict):
+                    yield entry
+        return
+    count = int(os.environ.get("FAKE_HYPERNODE_LOG_LINES", "1000"))
+    yield from generate_log_entries(count, seed=_seed())
+
+
+def parse_nginx_log(args: List[str]) -> int:
+    """Simulate hypernode-parse-nginx-log (pnl)."""
+    parser = argparse.ArgumentParser(prog=PARSE_NGINX_LOG)
+    parser.add_argument("--list-fields", action="store_true")
+    parser.add_argument("--today", action="store_true")
+    parser.add_argument("--bots", action="store_true")
+    parser.add_argument("--filter", action="append", default=[])
+    parser.add_argument("--fields")
+    options = parser.parse_args(args)
+
+    if options.list_fields:
+        print(f"{PARSE_NGINX_LOG} --list-fields\n")
+        print("Available fields: " + ", ".join(LOG_FIELDS))
+        return 0
+
+    filters = []
+    for item in options.filter:
+        match = _FILTER.match(item)
+        if not match or match.group(1) not in LOG_FIELDS:
+            print(f"{PARSE_NGINX_LOG}: error: invalid filter {item!r}", file=sys.stderr)
+            return 2
+        field, operator, value = match.groups()
+        filters.append((field, operator, value if operator == "=" else re.compile(value)))
+    fields = options.fields.split(",") if options.fields else list(DEFAULT_FIELDS)
+    unknown = [field for field in fields if field not in LOG_FIELDS]
+    if unknown:
+        print(f"{PARSE_NGINX_LOG}: error: unknown fields: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    today = datetime.now(timezone.utc).date().isoformat()
+    out = sys.stdout
+    for entry in _log_entries():
+        if options.today and not str(entry.get("time", "")).startswith(today):
+            continue
+        if options.bots and not _BOTS.search(entry.get("user_agent", "")):
+            continue
+        if not all(_matches(str(entry.get(field, "")), operator, value) for field, operator, value in filters):
+            continue
+        out.write("\t".join(str(entry.get(field, "-")) for field in fields) + "\n")
+    return 0
+
+
+def _matches(actual: str, operator: str, value: Any) -> bool:
+    if operator == "=":
+        return actual == value
+    found = value.search(actual) is not None
+    return found if operator == "~" else not found
+
+
+def main(binary: str, args: List[str]) -> int:
+    """Run a stand-in CLI."""
+    state = State(os.environ["FAKE_HYPERNODE_STATE"])
+    state.record_call(binary, args)
+    latency = _latency(binary)
+    if latency > 0:
+        time.sleep(latency)
+
+    try:
+        replayed = _replay(binary, args)
+        if replayed is not None:
+            return replayed
+        if binary == PARSE_NGINX_LOG:
+            return parse_nginx_log(args)
+        with state.lock():
+            if binary == MANAGE_VHOSTS:
+                return manage_vhosts(state, list(args))
+            return systemctl(state, list(args))
+    except BrokenPipeError:
+        # The reader stopped early, like head -n does; keep the exit quiet
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+
+
+def install(bin_dir: str, python: str = sys.executable) -> List[str]:
+    """
+    Write the stand-in executables into a directory.
+
+    Returns:
+        Paths of the executables
+    """
+    os.makedirs(bin_dir, exist_ok=True)
+    package_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    paths = []
+    for binary in BINARIES:
+        path = os.path.join(bin_dir, binary)
+        with open(path, 'w') as f:
+            f.write(
+                f"#!{python}\n"
+                f"import sys\n"
+                f"sys.path.insert(0, {package_root!r})\n"
+                f"from tests.fakes.hypernode_cli import main\n"
+                f"sys.exit(main({binary!r}, sys.argv[1:]))\n"
+            )
+        os.chmod(path, 0o755)
+        paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] != ["install"] or len(sys.argv) != 3:
+        sys.exit("usage: python -m tests.fakes.hypernode_cli install <bin_dir>")
+    print("\n".join(install(sys.argv[2])))
@@ -0,0 +1,65 @@
+"""
+Tests for the Artifacts Fetch tool.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import patch
+from tools.artifacts.fetch import ArtifactsFetchTool
+from utils.artifacts import ArtifactStore
+
+class TestArtifactsFetchTool:
+    """Test cases for ArtifactsFetchTool."""
+
+    @pytest.fixture
+    def artifacts_fetch_tool(self):
+        """Create an ArtifactsFetchTool instance for testing."""
+        return ArtifactsFetchTool()
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Patch in an artifact store holding numbered lines."""
+        store = ArtifactStore(str(tmp_path), threshold=10)
+        with patch('tools.artifacts.fetch.artifact_store', store):
+            yield store
+
+    def test_fetch_artifact_range(self, artifacts_fetch_tool, store):
+        """Test fetching consecutive byte ranges."""
+        _, artifact = store.spill("".join(f"{i}\n" for i in range(100)), "tool")
+
+        first = asyncio.run(artifacts_fetch_tool.tool_fetch_artifact(artifact.id, length=10))
+        second = asyncio.run(artifacts_fetch_tool.tool_fetch_artifact(artifact.id, offset=first["next_offset"], length=1000))
+
+        assert first["success"] is True
+        assert first["mode"] == "range"
+        assert first["content"] == "0\n1\n2\n3\n4\n"
+        assert first["eof"] is False
+        assert first["artifact"] == artifact.id
+        assert first["lines"] == 100
+        assert first["content"] + second["content"] == "".join(f"{i}\n" for i in range(100))
+        assert second["eof"] is True
+
+    def test_fetch_artifact_lines(self, artifacts_fetch_tool, store):
+        """Test fetching a range of lines."""
+        _, artifact = store.spill("".join(f"{i}\n" for i in range(100)), "tool")
+
+        result = asyncio.run(artifacts_fetch_tool.tool_fetch_artifact(artifact.id, start_line=50, line_count=2))
+
+        assert result["mode"] == "lines"
+        assert result["content"] == "50\n51\n"
+        assert result["first_line"] == 50
+
+    def test_fetch_artifact_tail(self, artifacts_fetch_tool, store):
+        """Test fetching the last lines."""
+        _, artifact = store.spill("".join(f"{i}\n" for i in range(100)), "tool")
+
+        result = asyncio.run(artifacts_fetch_tool.tool_fetch_artifact(artifact.id, tail=1))
+
+        assert result["mode"] == "tail"
+        assert result["content"] == "99\n"
+
+    def test_fetch_unknown_artifact(self, artifacts_fetch_tool, store):
+        """Test fetching an artifact that does not exist."""
+        result = asyncio.run(artifacts_fetch_tool.tool_fetch_artifact("missing"))
+        assert result["success"] is False
+        assert "missing" in result["error"]
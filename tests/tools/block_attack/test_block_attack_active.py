@@ -0,0 +1,47 @@
+"""
+Tests for the Block Attack Active tool.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import patch
+from tools.block_attack.active import BlockAttackActiveTool
+from utils.attack_catalogue import ActiveBlocks, AttackCatalogue
+from tests.utils.test_attack_catalogue import help_result
+
+class TestBlockAttackActiveTool:
+    """Test cases for BlockAttackActiveTool."""
+
+    @pytest.fixture
+    def block_attack_active_tool(self, tmp_path):
+        """Create a BlockAttackActiveTool instance with a config directory holding a block."""
+        (tmp_path / "server.block_china_bruteforce").write_text("deny all;")
+        with patch('tools.block_attack.active.attack_catalogue', AttackCatalogue()), \
+             patch('tools.block_attack.active.active_blocks', ActiveBlocks(str(tmp_path))):
+            yield BlockAttackActiveTool()
+
+    @patch('utils.attack_catalogue.CommandExecutor.execute_command')
+    def test_list_active_blocks(self, mock_execute_command, block_attack_active_tool):
+        """Test listing the active blocks."""
+        mock_execute_command.return_value = help_result()
+
+        result = asyncio.run(block_attack_active_tool.tool_list_active_blocks())
+
+        assert result["success"] is True
+        assert result["count"] == 1
+        assert result["active"] == [
+            {"name": "BlockChinaBruteForce", "files": ["server.block_china_bruteforce"], "blocked_by_server": False}
+        ]
+
+    @patch('utils.attack_catalogue.CommandExecutor.execute_command')
+    def test_list_active_blocks_without_catalogue(self, mock_execute_command, block_attack_active_tool):
+        """Test that blocks made through the server are listed when the attacks can not be listed."""
+        from tools.block_attack import active
+        active.active_blocks.record_block("BlockSqliBruteForce")
+        mock_execute_command.return_value = help_result(success=False)
+
+        result = asyncio.run(block_attack_active_tool.tool_list_active_blocks())
+
+        assert result["success"] is True
+        assert result["attacks_error"] == "failed"
+        assert [block["name"] for block in result["active"]] == ["BlockSqliBruteForce"]
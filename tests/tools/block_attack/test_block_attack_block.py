@@ -6,15 +6,19 @@ import pytest
 import asyncio
 from unittest.mock import patch
 from tools.block_attack.block import BlockAttackTool
+from utils.attack_catalogue import ActiveBlocks, AttackCatalogue
 from utils.command_executor import CommandResult
+from tests.utils.test_attack_catalogue import help_result
 
 class TestBlockAttackTool:
     """Test cases for BlockAttackTool."""
 
     @pytest.fixture
     def block_attack_tool(self):
-        """Create a BlockAttackTool instance for testing."""
-        return BlockAttackTool()
+        """Create a BlockAttackTool instance for testing, with its own caches."""
+        with patch('tools.block_attack.block.attack_catalogue', AttackCatalogue()), \
+             patch('tools.block_attack.block.active_blocks', ActiveBlocks()):
+            yield BlockAttackTool()
 
     def test_block_attack_tool_creation(self, block_attack_tool):
         """Test that BlockAttackTool can be instantiated."""
@@ -153,4 +157,34 @@ class TestBlockAttackTool:
             assert set(result.keys()) == required_keys
             assert isinstance(result["success"], bool)
             assert isinstance(result["result"], str)
-            assert isinstance(result["attack_type"], str) 
\ No newline at end of file
+            assert isinstance(result["attack_type"], str)
+
+    @patch('tools.block_attack.block.CommandExecutor.execute_command')
+    def test_block_attack_invalidates_caches(self, mock_execute_command, block_attack_tool, tmp_path, monkeypatch):
+        """Test that a successful block invalidates the catalogue and records the block."""
+        from tools.block_attack import block
+        # The catalogue is only cached with hypernode-systemctl on PATH
+        binary = tmp_path / "bin" / "hypernode-systemctl"
+        binary.parent.mkdir()
+        binary.write_text("#!/bin/sh\n")
+        binary.chmod(0o755)
+        monkeypatch.setenv("PATH", str(binary.parent))
+        mock_execute_command.return_value = help_result()
+        asyncio.run(block.attack_catalogue.load())
+        assert block.attack_catalogue.stats()["cached"] is True
+
+        mock_execute_command.return_value = CommandResult(
+            success=False, stdout="", stderr="Invalid attack type", return_code=1,
+            command="hypernode-systemctl block_attack Unknown"
+        )
+        asyncio.run(block_attack_tool.tool_block_attack("Unknown"))
+        assert block.attack_catalogue.stats()["cached"] is True
+        assert block.active_blocks.blocked == set()
+
+        mock_execute_command.return_value = CommandResult(
+            success=True, stdout="Blocked", stderr="", return_code=0,
+            command="hypernode-systemctl block_attack BlockChinaBruteForce"
+        )
+        asyncio.run(block_attack_tool.tool_block_attack("BlockChinaBruteForce"))
+        assert block.attack_catalogue.stats()["cached"] is False
+        assert block.active_blocks.blocked == {"BlockChinaBruteForce"}
@@ -6,6 +6,7 @@ import pytest
 import asyncio
 from unittest.mock import patch
 from tools.block_attack.list import BlockAttackListTool
+from utils.attack_catalogue import AttackCatalogue
 from utils.command_executor import CommandResult
 
 class TestBlockAttackListTool:
@@ -13,14 +14,15 @@ class TestBlockAttackListTool:
 
     @pytest.fixture
     def block_attack_list_tool(self):
-        """Create a BlockAttackListTool instance for testing."""
-        return BlockAttackListTool()
+        """Create a BlockAttackListTool instance for testing, with an empty catalogue cache."""
+        with patch('tools.block_attack.list.attack_catalogue', AttackCatalogue()):
+            yield BlockAttackListTool()
 
     def test_block_attack_list_tool_creation(self, block_attack_list_tool):
         """Test that BlockAttackListTool can be instantiated."""
         assert isinstance(block_attack_list_tool, BlockAttackListTool)
 
-    @patch('tools.block_attack.list.CommandExecutor.execute_command')
+    @patch('utils.attack_catalogue.CommandExecutor.execute_command')
     def test_list_attacks_success(self, mock_execute_command, block_attack_list_tool):
         """Test successful attack listing."""
         # Mock successful response with attack data
@@ -60,7 +62,7 @@ class TestBlockAttackListTool:
         
         mock_execute_command.assert_called_once_with("hypernode-systemctl block_attack --help")
 
-    @patch('tools.block_attack.list.CommandExecutor.execute_command')
+    @patch('utils.attack_catalogue.CommandExecutor.execute_command')
     def test_list_attacks_failure(self, mock_execute_command, block_attack_list_tool):
         """Test attack listing failure."""
         # Mock failure response
@@ -79,7 +81,7 @@ class TestBlockAttackListTool:
         assert "error" in result
         assert result["error"] == "Command not found: hypernode-systemctl"
 
-    @patch('tools.block_attack.list.CommandExecutor.execute_command')
+    @patch('utils.attack_catalogue.CommandExecutor.execute_command')
     def test_list_attacks_empty_result(self, mock_execute_command, block_attack_list_tool):
         """Test attack listing with no attacks found."""
         # Mock response with no attack data
@@ -104,7 +106,7 @@ class TestBlockAttackListTool:
         assert result["count"] == 0
         assert "raw_output" in result
 
-    @patch('tools.block_attack.list.CommandExecutor.execute_command')
+    @patch('utils.attack_catalogue.CommandExecutor.execute_command')
     def test_list_attacks_malformed_output(self, mock_execute_command, block_attack_list_tool):
         """Test attack listing with malformed output."""
         # Mock response with malformed data
@@ -139,7 +141,7 @@ class TestBlockAttackListTool:
 
     def test_block_attack_list_tool_return_structure(self, block_attack_list_tool):
         """Test that tool_list_attacks returns the correct data structure."""
-        with patch('tools.block_attack.list.CommandExecutor.execute_command') as mock_execute_command:
+        with patch('utils.attack_catalogue.CommandExecutor.execute_command') as mock_execute_command:
             mock_execute_command.return_value = CommandResult(
                 success=True,
                 stdout="usage: hypernode-systemctl block_attack [OPTIONS] ATTACK_TYPE\n\nThe possible values are:\noptions:\n  --help  Show this message and exit.\n",
@@ -0,0 +1,54 @@
+"""
+Tests for the Block Attack Simulate tool.
+"""
+
+import pytest
+import asyncio
+import time
+from tools.block_attack.simulate import BlockAttackSimulateTool
+from tests.utils.test_attack_rules import entry
+
+class TestBlockAttackSimulateTool:
+    """Test cases for BlockAttackSimulateTool."""
+
+    @pytest.fixture
+    def block_attack_simulate_tool(self):
+        """Create a BlockAttackSimulateTool instance for testing."""
+        return BlockAttackSimulateTool()
+
+    @pytest.fixture
+    def access_log(self, tmp_path, monkeypatch):
+        """Log Chinese logins in the last ten minutes and point the tool at them."""
+        now = int(time.time())
+        with open(tmp_path / "access.log", 'w') as f:
+            for i in range(now - 600, now, 60):
+                f.write(entry(i, "1.2.3.4", country="CN", request="POST /admin HTTP/1.1", status="403", user_agent="curl/8.0"))
+                f.write(entry(i, "5.6.7.8", country="CN", request="POST /admin HTTP/1.1"))
+        monkeypatch.setenv("HYPERNODE_NGINX_LOG_DIR", str(tmp_path))
+
+    def test_simulate_block_attack(self, block_attack_simulate_tool, access_log):
+        """Test simulating a block against recent traffic."""
+        result = asyncio.run(block_attack_simulate_tool.tool_simulate_block_attack("BlockChinaBruteForce", hours=1))
+
+        assert result["success"] is True
+        assert result["attack_type"] == "BlockChinaBruteForce"
+        assert result["criteria"]["countries"] == ["CN"]
+        assert result["requests"] == 20
+        assert result["matched_requests"] == 20
+        assert result["matched_ips"] == 2
+        assert result["legitimate_looking_requests"] == 10
+        assert len(result["samples"]) == 1
+        assert result["samples"][0]["remote_addr"] == "5.6.7.8"
+        assert isinstance(result["samples"][0]["timestamp"], str)
+
+    def test_simulate_unknown_attack(self, block_attack_simulate_tool):
+        """Test that attacks that can not be modelled are reported."""
+        result = asyncio.run(block_attack_simulate_tool.tool_simulate_block_attack("BlockDDoS"))
+
+        assert result["success"] is False
+        assert "BlockDDoS" in result["error"]
+
+    def test_block_attack_simulate_tool_class_attributes(self, block_attack_simulate_tool):
+        """Test that BlockAttackSimulateTool has the expected class structure."""
+        assert hasattr(block_attack_simulate_tool, 'tool_simulate_block_attack')
+        assert callable(block_attack_simulate_tool.tool_simulate_block_attack)
@@ -0,0 +1,84 @@
+"""
+Tests for the Block Attack Suggest tool.
+"""
+
+import pytest
+import asyncio
+import time
+from unittest.mock import patch
+from tools.block_attack.suggest import BlockAttackSuggestTool
+from utils.attack_catalogue import AttackCatalogue
+from utils.attack_detection import AttackDetector, LogFollower
+from utils.command_executor import CommandResult
+from tests.utils.test_attack_rules import entry
+
+HELP_OUTPUT = (
+    "usage: hypernode-systemctl block_attack [OPTIONS] ATTACK_TYPE\n\n"
+    "The possible values are:\n"
+    "BlockChinaBruteForce\tBlock brute force attacks from China\n"
+    "BlockDDoS\tBlock DDoS attacks\n"
+)
+
+class TestBlockAttackSuggestTool:
+    """Test cases for BlockAttackSuggestTool."""
+
+    @pytest.fixture
+    def block_attack_suggest_tool(self):
+        """Create a BlockAttackSuggestTool instance for testing, with an empty catalogue cache."""
+        with patch('tools.block_attack.suggest.attack_catalogue', AttackCatalogue()):
+            yield BlockAttackSuggestTool()
+
+    @pytest.fixture
+    def access_log(self, tmp_path):
+        """Follow an access log with brute forcing from China in the last minute."""
+        path = tmp_path / "access.log"
+        now = int(time.time())
+        with open(path, 'w') as f:
+            for second in range(now - 60, now):
+                f.write(entry(second, "1.2.3.4", country="CN", request="POST /admin HTTP/1.1", status="403"))
+        detector = AttackDetector(window=60)
+        follower = LogFollower(detector, str(path))
+        with patch('tools.block_attack.suggest.attack_detector', detector), \
+             patch('tools.block_attack.suggest.log_follower', follower):
+            yield path
+        follower.close()
+
+    @patch('utils.attack_catalogue.CommandExecutor.execute_command')
+    def test_suggest_attack_blocks(self, mock_execute_command, block_attack_suggest_tool, access_log):
+        """Test suggesting a block for brute forcing."""
+        mock_execute_command.return_value = CommandResult(
+            success=True, stdout=HELP_OUTPUT, stderr="", return_code=0,
+            command="hypernode-systemctl block_attack --help"
+        )
+
+        result = asyncio.run(block_attack_suggest_tool.tool_suggest_attack_blocks())
+
+        assert result["success"] is True
+        assert result["lines_read"] == 60
+        assert [finding["kind"] for finding in result["findings"]] == ["brute_force"]
+        assert [suggestion["attack_type"] for suggestion in result["suggestions"]] == ["BlockChinaBruteForce"]
+        assert result["suggestions"][0]["evidence"][0]["key"] == "1.2.3.4"
+
+    @patch('utils.attack_catalogue.CommandExecutor.execute_command')
+    def test_suggest_without_attack_list(self, mock_execute_command, block_attack_suggest_tool, access_log):
+        """Test that findings are returned when the attacks can not be listed."""
+        mock_execute_command.return_value = CommandResult(
+            success=False, stdout="", stderr="command not found", return_code=127,
+            command="hypernode-systemctl block_attack --help"
+        )
+
+        result = asyncio.run(block_attack_suggest_tool.tool_suggest_attack_blocks())
+
+        assert result["success"] is True
+        assert len(result["findings"]) == 1
+        assert result["suggestions"] == []
+        assert result["attacks_error"] == "command not found"
+
+    def test_suggest_missing_log(self, block_attack_suggest_tool, tmp_path):
+        """Test that a missing access log is reported."""
+        follower = LogFollower(AttackDetector(), str(tmp_path / "access.log"))
+        with patch('tools.block_attack.suggest.log_follower', follower):
+            result = asyncio.run(block_attack_suggest_tool.tool_suggest_attack_blocks())
+
+        assert result["success"] is False
+        assert "access log" in result["error"]
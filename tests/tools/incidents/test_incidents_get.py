@@ -4,9 +4,15 @@ Tests for the Incidents Get tool.
 
 import pytest
 import asyncio
-from unittest.mock import patch, mock_open, MagicMock
+import gzip
+import os
+import tarfile
+import threading
+import time
+from unittest.mock import patch
 from tools.incidents.get import IncidentsGetTool
-from utils.command_executor import CommandResult
+from utils.file_ranges import read_range
+from utils.incident_store import IncidentStore
 
 class TestIncidentsGetTool:
     """Test cases for IncidentsGetTool."""
@@ -16,72 +22,49 @@ class TestIncidentsGetTool:
         """Create an IncidentsGetTool instance for testing."""
         return IncidentsGetTool()
 
-    @patch('tools.incidents.get.os.path.exists')
-    def test_incident_dir_does_not_exist(self, mock_exists, incidents_get_tool):
+    @pytest.fixture
+    def incident_dir(self, tmp_path):
+        """Create an incident directory and point a fresh incident store at its parent."""
+        incident_dir = tmp_path / "incidents" / "2024-01-01"
+        incident_dir.mkdir(parents=True)
+        with patch('tools.incidents.get.incident_store', IncidentStore(str(tmp_path / "incidents"))):
+            yield incident_dir
+
+    def test_incident_dir_does_not_exist(self, incidents_get_tool, incident_dir):
         """Test when the incident directory does not exist."""
-        mock_exists.return_value = False
-        result = asyncio.run(incidents_get_tool.tool_get_incident('2024-01-01'))
+        result = asyncio.run(incidents_get_tool.tool_get_incident('2024-02-02'))
         assert result["success"] is False
         assert "error" in result
         assert "incident_path" in result
 
-    @patch('tools.incidents.get.os.path.exists')
-    @patch('tools.incidents.get.CommandExecutor.execute_command')
-    def test_incident_command_failure(self, mock_execute_command, mock_exists, incidents_get_tool):
-        """Test when the command fails to list files."""
-        mock_exists.return_value = True
-        mock_execute_command.return_value = CommandResult(
-            success=False,
-            stdout="",
-            stderr="ls: cannot access '~/incidents/2024-01-01': No such file or directory",
-            return_code=2,
-            command="ls -la ~/incidents/2024-01-01/*"
-        )
-        result = asyncio.run(incidents_get_tool.tool_get_incident('2024-01-01'))
+    def test_incident_path_traversal(self, incidents_get_tool, incident_dir):
+        """Test that names pointing outside of the incidents directory are rejected."""
+        result = asyncio.run(incidents_get_tool.tool_get_incident('../..'))
+        assert result["success"] is False
+        assert "Invalid incident name" in result["error"]
+
+    def test_incident_listing_failure(self, incidents_get_tool, incident_dir):
+        """Test when the files of the incident can not be listed."""
+        with patch('utils.incident_store.os.scandir', side_effect=PermissionError("Permission denied")):
+            result = asyncio.run(incidents_get_tool.tool_get_incident('2024-01-01'))
         assert result["success"] is False
         assert "error" in result
         assert "incident_path" in result
 
-    @patch('tools.incidents.get.os.path.exists')
-    @patch('tools.incidents.get.CommandExecutor.execute_command')
-    def test_incident_empty_directory(self, mock_execute_command, mock_exists, incidents_get_tool):
-        """Test when the incident directory is empty (only . and ..)."""
-        mock_exists.return_value = True
-        mock_execute_command.return_value = CommandResult(
-            success=True,
-            stdout="total 0\ndrwxr-xr-x 2 user group 4096 Jan 1 00:00 .\ndrwxr-xr-x 3 user group 4096 Jan 1 00:00 ..\n",
-            stderr="",
-            return_code=0,
-            command="ls -la ~/incidents/2024-01-01/*"
-        )
+    def test_incident_empty_directory(self, incidents_get_tool, incident_dir):
+        """Test when the incident directory is empty."""
         result = asyncio.run(incidents_get_tool.tool_get_incident('2024-01-01'))
         assert result["success"] is True
         assert result["files"] == []
         assert result["count"] == 0
         assert result["incident_date"] == '2024-01-01'
 
-    @patch('tools.incidents.get.os.path.exists')
-    @patch('tools.incidents.get.CommandExecutor.execute_command')
-    @patch('builtins.open', new_callable=mock_open, read_data='file content')
-    def test_incident_with_files(self, mock_file, mock_execute_command, mock_exists, incidents_get_tool):
+    def test_incident_with_files(self, incidents_get_tool, incident_dir):
         """Test when the incident directory contains files."""
-        mock_exists.return_value = True
-        mock_execute_command.return_value = CommandResult(
-            success=True,
-            stdout=(
-                "total 8\n"
-                "drwxr-xr-x 2 user group 4096 Jan 1 00:00 .\n"
-                "drwxr-xr-x 3 user group 4096 Jan 1 00:00 ..\n"
-                "-rw-r--r-- 1 user group  123 Jan 2 12:34 test.log\n"
-                "drwxr-xr-x 2 user group 4096 Jan 3 13:45 subdir\n"
-            ),
-            stderr="",
-            return_code=0,
-            command="ls -la ~/incidents/2024-01-01/*"
-        )
-        # Patch os.path.join to return a fake path
-        with patch('tools.incidents.get.os.path.join', side_effect=lambda *args: '/'.join(args)):
-            result = asyncio.run(incidents_get_tool.tool_get_incident('2024-01-01'))
+        (incident_dir / "test.log").write_text("file content")
+        (incident_dir / "subdir").mkdir()
+
+        result = asyncio.run(incidents_get_tool.tool_get_incident('2024-01-01'))
         assert result["success"] is True
         assert result["count"] == 2
         names = [f["name"] for f in result["files"]]
@@ -97,27 +80,114 @@ class TestIncidentsGetTool:
             if not file["is_directory"]:
                 assert "content" in file
                 assert file["content"] == 'file content'
+                assert file["size"] == len('file content')
+                assert file["full_path"] == str(incident_dir / "test.log")
+
+    def test_incident_file_pattern(self, incidents_get_tool, incident_dir):
+        """Test that only files matching the pattern are returned."""
+        (incident_dir / "top.log").write_text("top")
+        (incident_dir / "mysql processlist.txt").write_text("processlist")
+
+        result = asyncio.run(incidents_get_tool.tool_get_incident('2024-01-01', "*.txt"))
+        assert result["success"] is True
+        assert [f["name"] for f in result["files"]] == ["mysql processlist.txt"]
+        assert result["files"][0]["content"] == "processlist"
+
+    def test_incident_hidden_files_are_skipped(self, incidents_get_tool, incident_dir):
+        """Test that hidden files are not returned."""
+        (incident_dir / "test.log").write_text("file content")
+        (incident_dir / ".hidden").mkdir()
+        result = asyncio.run(incidents_get_tool.tool_get_incident('2024-01-01'))
+        assert [file["name"] for file in result["files"]] == ["test.log"]
+
+    def test_incident_compressed_file(self, incidents_get_tool, incident_dir):
+        """Test that compressed files are previewed decompressed."""
+        with gzip.open(incident_dir / "mysql.log.gz", 'wt') as f:
+            f.write("x" * 1000)
+        result = asyncio.run(incidents_get_tool.tool_get_incident('2024-01-01', max_bytes=100))
+        assert result["files"][0]["content"] == "x" * 100
+        assert result["files"][0]["content_truncated"] is True
+
+    def test_archived_incident(self, incidents_get_tool, incident_dir, tmp_path):
+        """Test getting the files of an archived incident."""
+        (incident_dir / "test.log").write_text("file content")
+        (incident_dir / "top.txt").write_text("top - 12:00:01")
+        with tarfile.open(tmp_path / "incidents" / "2023-12-31.tar.gz", 'w:gz') as tar:
+            tar.add(incident_dir, arcname="2023-12-31")
+
+        result = asyncio.run(incidents_get_tool.tool_get_incident('2023-12-31', file_pattern="*.log"))
+        assert result["success"] is True
+        assert result["archive"].endswith("2023-12-31.tar.gz")
+        assert result["count"] == 1
+        assert result["files"][0]["name"] == "test.log"
+        assert result["files"][0]["content"] == "file content"
+        assert result["files"][0]["content_truncated"] is False
+
+    def test_incident_large_file_preview(self, incidents_get_tool, incident_dir):
+        """Test that large files get the start of their content instead of no content."""
+        (incident_dir / "dump.log").write_text("a" * 2 * 1024 * 1024)
+
+        result = asyncio.run(incidents_get_tool.tool_get_incident('2024-01-01', max_bytes=10000))
+        dump = result["files"][0]
+        assert dump["size"] == 2 * 1024 * 1024
+        assert dump["content"] == "a" * 10000
+        assert dump["content_truncated"] is True
+
+    def test_incident_file_grown_since_cached(self, incidents_get_tool, incident_dir):
+        """Test that a file appended to after its listing was cached is returned whole, with its current size."""
+        (incident_dir / "syslog").write_text("a" * 100)
+        age = time.time() - 60
+        os.utime(incident_dir, (age, age))
+        asyncio.run(incidents_get_tool.tool_get_incident('2024-01-01'))
+
+        with open(incident_dir / "syslog", 'a') as f:
+            f.write("b" * 100)
+        result = asyncio.run(incidents_get_tool.tool_get_incident('2024-01-01'))
+        syslog = result["files"][0]
+        assert syslog["size"] == 200
+        assert syslog["content"] == "a" * 100 + "b" * 100
+        assert syslog["content_truncated"] is False
+
+    def test_incident_byte_budget_is_shared_fairly(self, incidents_get_tool, incident_dir):
+        """Test that small files are returned whole and large files split the rest of the budget."""
+        (incident_dir / "small.txt").write_text("s" * 100)
+        (incident_dir / "large1.log").write_text("a" * 50000)
+        (incident_dir / "large2.log").write_text("b" * 50000)
+
+        result = asyncio.run(incidents_get_tool.tool_get_incident('2024-01-01', max_bytes=10100))
+        files = {f["name"]: f for f in result["files"]}
+        assert files["small.txt"]["content"] == "s" * 100
+        assert files["small.txt"]["content_truncated"] is False
+        assert files["large1.log"]["content_length"] == 5000
+        assert files["large2.log"]["content_length"] == 5000
+        assert result["content_bytes"] == 10100
+
+    def test_incident_files_are_read_off_loop(self, incidents_get_tool, incident_dir):
+        """Test that files are read on the incident I/O thread pool."""
+        for i in range(5):
+            (incident_dir / f"snapshot{i}.txt").write_text("x")
+        threads = set()
+
+        def recording_read_range(path, offset, length):
+            threads.add(threading.current_thread().name)
+            return read_range(path, offset, length)
+
+        with patch('tools.incidents.get.read_range', side_effect=recording_read_range):
+            result = asyncio.run(incidents_get_tool.tool_get_incident('2024-01-01'))
+
+        assert result["count"] == 5
+        assert threads and all(name.startswith("incident-io") for name in threads)
 
     def test_incidents_get_tool_class_attributes(self, incidents_get_tool):
         """Test that IncidentsGetTool has the expected class structure."""
         assert hasattr(incidents_get_tool, 'tool_get_incident')
         assert callable(incidents_get_tool.tool_get_incident)
 
-    def test_incidents_get_tool_return_structure(self, incidents_get_tool):
+    def test_incidents_get_tool_return_structure(self, incidents_get_tool, incident_dir):
         """Test that tool_get_incident returns the correct data structure."""
-        with patch('tools.incidents.get.os.path.exists') as mock_exists, \
-             patch('tools.incidents.get.CommandExecutor.execute_command') as mock_execute_command:
-            mock_exists.return_value = True
-            mock_execute_command.return_value = CommandResult(
-                success=True,
-                stdout="total 0\ndrwxr-xr-x 2 user group 4096 Jan 1 00:00 .\ndrwxr-xr-x 3 user group 4096 Jan 1 00:00 ..\n",
-                stderr="",
-                return_code=0,
-                command="ls -la ~/incidents/2024-01-01/*"
-            )
-            result = asyncio.run(incidents_get_tool.tool_get_incident('2024-01-01'))
-            required_keys = {"success", "incident_date", "incident_path", "files", "count", "file_pattern"}
-            assert set(result.keys()).issuperset(required_keys)
-            assert isinstance(result["success"], bool)
-            assert isinstance(result["files"], list)
-            assert isinstance(result["count"], int) 
\ No newline at end of file
+        result = asyncio.run(incidents_get_tool.tool_get_incident('2024-01-01'))
+        required_keys = {"success", "incident_date", "incident_path", "files", "count", "file_pattern"}
+        assert set(result.keys()).issuperset(required_keys)
+        assert isinstance(result["success"], bool)
+        assert isinstance(result["files"], list)
+        assert isinstance(result["count"], int)
@@ -4,9 +4,10 @@ Tests for the Incidents List tool.
 
 import pytest
 import asyncio
-from unittest.mock import patch, MagicMock
+import os
+from unittest.mock import patch
 from tools.incidents.list import IncidentsListTool
-from utils.command_executor import CommandResult
+from utils.incident_store import IncidentStore
 
 class TestIncidentsListTool:
     """Test cases for IncidentsListTool."""
@@ -16,105 +17,111 @@ class TestIncidentsListTool:
         """Create an IncidentsListTool instance for testing."""
         return IncidentsListTool()
 
-    @patch('tools.incidents.list.os.path.exists')
-    def test_incidents_dir_does_not_exist(self, mock_exists, incidents_list_tool):
+    @pytest.fixture
+    def incidents_dir(self, tmp_path):
+        """Create an incidents directory and point a fresh incident store at it."""
+        incidents_dir = tmp_path / "incidents"
+        incidents_dir.mkdir()
+        with patch('tools.incidents.list.incident_store', IncidentStore(str(incidents_dir))):
+            yield incidents_dir
+
+    def test_incidents_dir_does_not_exist(self, incidents_list_tool, tmp_path):
         """Test when the incidents directory does not exist."""
-        mock_exists.return_value = False
-        result = asyncio.run(incidents_list_tool.tool_list_incidents())
+        with patch('tools.incidents.list.incident_store', IncidentStore(str(tmp_path / "missing"))):
+            result = asyncio.run(incidents_list_tool.tool_list_incidents())
         assert result["success"] is True
         assert result["incidents"] == []
         assert result["count"] == 0
         assert "message" in result
         assert result["message"] == "Incidents directory does not exist"
 
-    @patch('tools.incidents.list.os.path.exists')
-    @patch('tools.incidents.list.CommandExecutor.execute_command')
-    def test_incidents_command_failure(self, mock_execute_command, mock_exists, incidents_list_tool):
-        """Test when the command fails to list incidents."""
-        mock_exists.return_value = True
-        mock_execute_command.return_value = CommandResult(
-            success=False,
-            stdout="",
-            stderr="ls: cannot access '~/incidents': No such file or directory",
-            return_code=2,
-            command="ls -la ~/incidents"
-        )
-        result = asyncio.run(incidents_list_tool.tool_list_incidents())
+    def test_incidents_listing_failure(self, incidents_list_tool, incidents_dir):
+        """Test when the incidents directory can not be read."""
+        with patch('utils.incident_store.os.scandir', side_effect=PermissionError("Permission denied")):
+            result = asyncio.run(incidents_list_tool.tool_list_incidents())
         assert result["success"] is False
         assert result["incidents"] == []
-        assert "error" in result
+        assert "Permission denied" in result["error"]
 
-    @patch('tools.incidents.list.os.path.exists')
-    @patch('tools.incidents.list.CommandExecutor.execute_command')
-    def test_incidents_empty_directory(self, mock_execute_command, mock_exists, incidents_list_tool):
-        """Test when the incidents directory is empty (only . and ..)."""
-        mock_exists.return_value = True
-        mock_execute_command.return_value = CommandResult(
-            success=True,
-            stdout="total 0\ndrwxr-xr-x 2 user group 4096 Jan 1 00:00 .\ndrwxr-xr-x 3 user group 4096 Jan 1 00:00 ..\n",
-            stderr="",
-            return_code=0,
-            command="ls -la ~/incidents"
-        )
+    def test_incidents_empty_directory(self, incidents_list_tool, incidents_dir):
+        """Test when the incidents directory is empty."""
         result = asyncio.run(incidents_list_tool.tool_list_incidents())
         assert result["success"] is True
         assert result["incidents"] == []
         assert result["count"] == 0
-        assert "directory" in result
+        assert result["directory"] == str(incidents_dir)
 
-    @patch('tools.incidents.list.os.path.exists')
-    @patch('tools.incidents.list.CommandExecutor.execute_command')
-    def test_incidents_with_files(self, mock_execute_command, mock_exists, incidents_list_tool):
+    def test_incidents_with_files(self, incidents_list_tool, incidents_dir):
         """Test when the incidents directory contains files and directories."""
-        mock_exists.return_value = True
-        mock_execute_command.return_value = CommandResult(
-            success=True,
-            stdout=(
-                "total 8\n"
-                "drwxr-xr-x 2 user group 4096 Jan 1 00:00 .\n"
-                "drwxr-xr-x 3 user group 4096 Jan 1 00:00 ..\n"
-                "-rw-r--r-- 1 user group  123 Jan 2 12:34 2024-01-01.log\n"
-                "drwxr-xr-x 2 user group 4096 Jan 3 13:45 2024-01-02\n"
-                "-rw-r--r-- 1 user group  456 Jan 4 14:56 README.txt\n"
-            ),
-            stderr="",
-            return_code=0,
-            command="ls -la ~/incidents"
-        )
+        (incidents_dir / "2024-01-01.log").write_text("x" * 123)
+        (incidents_dir / "2024-01-02").mkdir()
+        (incidents_dir / "README.txt").write_text("readme")
+        os.utime(incidents_dir / "2024-01-01.log", (1704198840, 1704198840))
+
         result = asyncio.run(incidents_list_tool.tool_list_incidents())
         assert result["success"] is True
         assert result["count"] == 2  # Only 2024-01-01.log and 2024-01-02
         names = [i["name"] for i in result["incidents"]]
-        assert "2024-01-01.log" in names
-        assert "2024-01-02" in names
-        assert "README.txt" not in names
+        assert names == ["2024-01-01.log", "2024-01-02"]
         for incident in result["incidents"]:
             assert "name" in incident
             assert "permissions" in incident
             assert "size" in incident
+            assert "mtime" in incident
             assert "date" in incident
             assert "is_directory" in incident
 
+        log = result["incidents"][0]
+        assert log["size"] == 123
+        assert log["mtime"] == 1704198840
+        assert log["permissions"].startswith("-")
+        assert log["is_directory"] is False
+        assert result["incidents"][1]["is_directory"] is True
+
+    def test_incidents_name_with_spaces(self, incidents_list_tool, incidents_dir):
+        """Test that names with spaces are returned intact."""
+        (incidents_dir / "load spike 2024-01-01").mkdir()
+
+        result = asyncio.run(incidents_list_tool.tool_list_incidents())
+        assert [i["name"] for i in result["incidents"]] == ["load spike 2024-01-01"]
+
+    def test_incidents_sort_and_paginate(self, incidents_list_tool, incidents_dir):
+        """Test sorting by mtime and paging through the incidents."""
+        for day in range(1, 6):
+            path = incidents_dir / f"2024-01-0{day}"
+            path.mkdir()
+            os.utime(path, (1704067200 + day * 86400,) * 2)
+
+        result = asyncio.run(incidents_list_tool.tool_list_incidents(sort_by="mtime", descending=True, limit=2))
+        assert [i["name"] for i in result["incidents"]] == ["2024-01-05", "2024-01-04"]
+        assert result["total"] == 5
+        assert result["next_offset"] == 2
+
+        result = asyncio.run(incidents_list_tool.tool_list_incidents(
+            sort_by="mtime", descending=True, offset=result["next_offset"], limit=2
+        ))
+        assert [i["name"] for i in result["incidents"]] == ["2024-01-03", "2024-01-02"]
+
+        result = asyncio.run(incidents_list_tool.tool_list_incidents(sort_by="mtime", descending=True, offset=4))
+        assert [i["name"] for i in result["incidents"]] == ["2024-01-01"]
+        assert result["next_offset"] is None
+
+    def test_incidents_invalid_sort_key(self, incidents_list_tool, incidents_dir):
+        """Test that an unknown sort key is rejected."""
+        result = asyncio.run(incidents_list_tool.tool_list_incidents(sort_by="owner"))
+        assert result["success"] is False
+        assert "error" in result
+
     def test_incidents_list_tool_class_attributes(self, incidents_list_tool):
         """Test that IncidentsListTool has the expected class structure."""
         assert hasattr(incidents_list_tool, 'tool_list_incidents')
         assert callable(incidents_list_tool.tool_list_incidents)
 
-    def test_incidents_list_tool_return_structure(self, incidents_list_tool):
+    def test_incidents_list_tool_return_structure(self, incidents_list_tool, incidents_dir):
         """Test that tool_list_incidents returns the correct data structure."""
-        with patch('tools.incidents.list.os.path.exists') as mock_exists, \
-             patch('tools.incidents.list.CommandExecutor.execute_command') as mock_execute_command:
-            mock_exists.return_value = True
-            mock_execute_command.return_value = CommandResult(
-                success=True,
-                stdout="total 0\ndrwxr-xr-x 2 user group 4096 Jan 1 00:00 .\ndrwxr-xr-x 3 user group 4096 Jan 1 00:00 ..\n",
-                stderr="",
-                return_code=0,
-                command="ls -la ~/incidents"
-            )
-            result = asyncio.run(incidents_list_tool.tool_list_incidents())
-            required_keys = {"success", "incidents", "count", "directory"}
-            assert set(result.keys()).issuperset(required_keys)
-            assert isinstance(result["success"], bool)
-            assert isinstance(result["incidents"], list)
-            assert isinstance(result["count"], int) 
\ No newline at end of file
+        result = asyncio.run(incidents_list_tool.tool_list_incidents())
+        required_keys = {"success", "incidents", "count", "directory"}
+        assert set(result.keys()).issuperset(required_keys)
+        assert isinstance(result["success"], bool)
+        assert isinstance(result["incidents"], list)
+        assert isinstance(result["count"], int)
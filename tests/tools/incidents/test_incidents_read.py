@@ -0,0 +1,88 @@
+"""
+Tests for the Incidents Read tool.
+"""
+
+import pytest
+import asyncio
+import gzip
+import tarfile
+from unittest.mock import patch
+from tools.incidents.read import IncidentsReadTool
+from utils.incident_store import IncidentStore
+
+class TestIncidentsReadTool:
+    """Test cases for IncidentsReadTool."""
+
+    @pytest.fixture
+    def incidents_read_tool(self):
+        """Create an IncidentsReadTool instance for testing."""
+        return IncidentsReadTool()
+
+    @pytest.fixture
+    def incident_dir(self, tmp_path):
+        """Create an incident with a log file and point a fresh incident store at it."""
+        incident_dir = tmp_path / "incidents" / "2024-01-01"
+        incident_dir.mkdir(parents=True)
+        (incident_dir / "top.log").write_text("".join(f"line {i}\n" for i in range(100)))
+        with patch('tools.incidents.read.incident_store', IncidentStore(str(tmp_path / "incidents"))):
+            yield incident_dir
+
+    def test_read_range(self, incidents_read_tool, incident_dir):
+        """Test reading a byte range."""
+        result = asyncio.run(incidents_read_tool.tool_read_incident_file('2024-01-01', 'top.log', offset=7, length=7))
+        assert result["success"] is True
+        assert result["mode"] == "range"
+        assert result["content"] == "line 1\n"
+        assert result["next_offset"] == 14
+
+    def test_read_tail(self, incidents_read_tool, incident_dir):
+        """Test reading the last lines."""
+        result = asyncio.run(incidents_read_tool.tool_read_incident_file('2024-01-01', 'top.log', tail=2))
+        assert result["success"] is True
+        assert result["mode"] == "tail"
+        assert result["content"] == "line 98\nline 99\n"
+
+    def test_read_lines(self, incidents_read_tool, incident_dir):
+        """Test reading a range of lines."""
+        result = asyncio.run(incidents_read_tool.tool_read_incident_file(
+            '2024-01-01', 'top.log', start_line=50, line_count=2
+        ))
+        assert result["success"] is True
+        assert result["mode"] == "lines"
+        assert result["content"] == "line 50\nline 51\n"
+        assert result["first_line"] == 50
+
+    def test_read_compressed_file(self, incidents_read_tool, incident_dir):
+        """Test reading a compressed file of an incident."""
+        with gzip.open(incident_dir / "mysql.log.gz", 'wt') as f:
+            f.write("".join(f"line {i}\n" for i in range(100)))
+        result = asyncio.run(incidents_read_tool.tool_read_incident_file('2024-01-01', 'mysql.log.gz', start_line=1, line_count=1))
+        assert result["success"] is True
+        assert result["compressed"] is True
+        assert result["content"] == "line 1\n"
+
+    def test_read_archived_incident(self, incidents_read_tool, incident_dir, tmp_path):
+        """Test reading a file of an archived incident."""
+        with tarfile.open(tmp_path / "incidents" / "2023-12-31.tar.gz", 'w:gz') as tar:
+            tar.add(incident_dir, arcname="2023-12-31")
+        result = asyncio.run(incidents_read_tool.tool_read_incident_file('2023-12-31', 'top.log', tail=1))
+        assert result["success"] is True
+        assert result["compressed"] is True
+        assert result["content"] == "line 99\n"
+
+        result = asyncio.run(incidents_read_tool.tool_read_incident_file('2023-12-31', 'missing.log'))
+        assert result["success"] is False
+        assert "does not exist" in result["error"]
+
+    def test_file_does_not_exist(self, incidents_read_tool, incident_dir):
+        """Test reading a file that does not exist."""
+        result = asyncio.run(incidents_read_tool.tool_read_incident_file('2024-01-01', 'missing.log'))
+        assert result["success"] is False
+        assert "error" in result
+
+    @pytest.mark.parametrize("file", ["../../etc/passwd", "/etc/passwd", ""])
+    def test_file_outside_incident(self, incidents_read_tool, incident_dir, file):
+        """Test that files outside of the incident directory can not be read."""
+        result = asyncio.run(incidents_read_tool.tool_read_incident_file('2024-01-01', file))
+        assert result["success"] is False
+        assert "Invalid incident file" in result["error"]
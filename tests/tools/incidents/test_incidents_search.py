@@ -0,0 +1,62 @@
+"""
+Tests for the Incidents Search tool.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import patch
+from tools.incidents.search import IncidentsSearchTool
+from utils.incident_index import IncidentIndex
+from utils.incident_store import IncidentStore
+
+class TestIncidentsSearchTool:
+    """Test cases for IncidentsSearchTool."""
+
+    @pytest.fixture
+    def incidents_search_tool(self):
+        """Create an IncidentsSearchTool instance for testing."""
+        return IncidentsSearchTool()
+
+    @pytest.fixture
+    def incidents_dir(self, tmp_path):
+        """Create an incident and point a fresh store and index at it."""
+        incidents_dir = tmp_path / "incidents"
+        (incidents_dir / "2024-01-01").mkdir(parents=True)
+        (incidents_dir / "2024-01-01" / "dmesg.log").write_text("boot\nOut of memory: Killed process 1234\n")
+        store = IncidentStore(str(incidents_dir))
+        index = IncidentIndex(str(tmp_path / "index.sqlite"), store)
+        with patch('tools.incidents.search.incident_store', store), \
+             patch('tools.incidents.search.incident_index', index):
+            yield incidents_dir
+        index.close()
+
+    def test_search(self, incidents_search_tool, incidents_dir):
+        """Test that hits are returned with their location."""
+        result = asyncio.run(incidents_search_tool.tool_search_incidents('"out of memory"'))
+        assert result["success"] is True
+        assert result["count"] == 1
+        hit = result["hits"][0]
+        assert hit["incident"] == "2024-01-01"
+        assert hit["file"] == "dmesg.log"
+        assert hit["line"] == 1
+        assert hit["offset"] == 5
+        assert result["index_update"]["files_indexed"] == 1
+
+    def test_no_hits(self, incidents_search_tool, incidents_dir):
+        """Test a query without hits."""
+        result = asyncio.run(incidents_search_tool.tool_search_incidents('deadlock'))
+        assert result["success"] is True
+        assert result["hits"] == []
+
+    def test_invalid_query(self, incidents_search_tool, incidents_dir):
+        """Test a query without anything to search for."""
+        result = asyncio.run(incidents_search_tool.tool_search_incidents('""'))
+        assert result["success"] is False
+        assert "error" in result
+
+    def test_incidents_dir_does_not_exist(self, incidents_search_tool, tmp_path):
+        """Test when the incidents directory does not exist."""
+        with patch('tools.incidents.search.incident_store', IncidentStore(str(tmp_path / "missing"))):
+            result = asyncio.run(incidents_search_tool.tool_search_incidents('deadlock'))
+        assert result["success"] is True
+        assert result["hits"] == []
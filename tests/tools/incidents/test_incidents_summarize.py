@@ -0,0 +1,53 @@
+"""
+Tests for the Incidents Summarize tool.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import patch
+from tools.incidents.summarize import IncidentsSummarizeTool
+from utils.incident_store import IncidentStore
+from utils.incident_summaries import IncidentSummaries
+
+class TestIncidentsSummarizeTool:
+    """Test cases for IncidentsSummarizeTool."""
+
+    @pytest.fixture
+    def incidents_summarize_tool(self):
+        """Create an IncidentsSummarizeTool instance for testing."""
+        return IncidentsSummarizeTool()
+
+    @pytest.fixture
+    def incident_dir(self, tmp_path):
+        """Create an incident with snapshots and point a fresh store at it."""
+        incident_dir = tmp_path / "incidents" / "2024-01-01"
+        incident_dir.mkdir(parents=True)
+        (incident_dir / "loadavg").write_text("8.50 4.20 2.10 3/456 7890\n")
+        (incident_dir / "dmesg.log").write_text("kernel: something\n")
+        store = IncidentStore(str(incident_dir.parent))
+        with patch('tools.incidents.summarize.incident_store', store), \
+             patch('tools.incidents.summarize.incident_summaries', IncidentSummaries(store, cache_dir=str(tmp_path / "cache"))):
+            yield incident_dir
+
+    def test_summarize_incident(self, incidents_summarize_tool, incident_dir):
+        """Test that known snapshots are summarized and others are listed."""
+        result = asyncio.run(incidents_summarize_tool.tool_summarize_incident('2024-01-01'))
+        assert result["success"] is True
+        assert result["count"] == 1
+        assert result["summaries"][0]["file"] == "loadavg"
+        assert result["summaries"][0]["parser"] == "load"
+        assert result["summaries"][0]["summary"]["max_1m"] == 8.5
+        assert result["unrecognized"] == ["dmesg.log"]
+
+    def test_cached_summaries_are_not_listed_as_files(self, incidents_summarize_tool, incident_dir):
+        """Test that the summary cache inside the incident is hidden."""
+        asyncio.run(incidents_summarize_tool.tool_summarize_incident('2024-01-01'))
+        result = asyncio.run(incidents_summarize_tool.tool_summarize_incident('2024-01-01'))
+        assert result["summaries"][0]["cached"] is True
+        assert result["unrecognized"] == ["dmesg.log"]
+
+    def test_incident_does_not_exist(self, incidents_summarize_tool, incident_dir):
+        """Test when the incident directory does not exist."""
+        result = asyncio.run(incidents_summarize_tool.tool_summarize_incident('2024-02-02'))
+        assert result["success"] is False
+        assert "error" in result
@@ -0,0 +1,71 @@
+"""
+Tests for the Incidents Traffic tool.
+"""
+
+import os
+import pytest
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import patch
+from tools.incidents.traffic import IncidentsTrafficTool
+from utils.incident_store import IncidentStore
+from tests.utils.test_nginx_log import write_log
+
+BASE = datetime(2024, 1, 15, 12, 0).timestamp()
+
+class TestIncidentsTrafficTool:
+    """Test cases for IncidentsTrafficTool."""
+
+    @pytest.fixture
+    def incidents_traffic_tool(self):
+        """Create an IncidentsTrafficTool instance for testing."""
+        return IncidentsTrafficTool()
+
+    @pytest.fixture
+    def incidents_dir(self, tmp_path, monkeypatch):
+        """Create incidents and an access log, and point the tool at them."""
+        incidents_dir = tmp_path / "incidents"
+        (incidents_dir / "2024-01-15T12:00:00").mkdir(parents=True)
+        snapshot = incidents_dir / "2024-01-15" / "top.txt"
+        snapshot.parent.mkdir()
+        snapshot.write_text("top - 12:30:00")
+        os.utime(snapshot, (BASE + 1800, BASE + 1800))
+
+        log_dir = tmp_path / "nginx"
+        log_dir.mkdir()
+        write_log(log_dir / "access.log", BASE - 3600, BASE + 3600)
+        monkeypatch.setenv("HYPERNODE_NGINX_LOG_DIR", str(log_dir))
+        with patch('tools.incidents.traffic.incident_store', IncidentStore(str(incidents_dir))):
+            yield incidents_dir
+
+    def test_traffic_around_incident_name_time(self, incidents_traffic_tool, incidents_dir):
+        """Test the traffic window around the time in the incident name."""
+        result = asyncio.run(incidents_traffic_tool.tool_get_incident_traffic('2024-01-15T12:00:00', minutes=5))
+        assert result["success"] is True
+        assert result["incident_time_source"] == "name"
+        assert result["incident_time"] == datetime.fromtimestamp(BASE).astimezone().isoformat(timespec='seconds')
+        assert result["requests"] == 60
+        assert result["top_urls"] == [("/checkout", 60)]
+
+    def test_traffic_around_snapshot_time(self, incidents_traffic_tool, incidents_dir):
+        """Test that incidents without a time in their name use their oldest file."""
+        result = asyncio.run(incidents_traffic_tool.tool_get_incident_traffic('2024-01-15', minutes=1))
+        assert result["success"] is True
+        assert result["incident_time_source"] == "files"
+        assert result["requests"] == 12
+
+    def test_explicit_time(self, incidents_traffic_tool, incidents_dir):
+        """Test overriding the incident time."""
+        at = datetime.fromtimestamp(BASE + 3000, timezone.utc).isoformat()
+        result = asyncio.run(incidents_traffic_tool.tool_get_incident_traffic('2024-01-15', minutes=10, at=at))
+        assert result["incident_time_source"] == "argument"
+        assert result["requests"] == 120
+
+        result = asyncio.run(incidents_traffic_tool.tool_get_incident_traffic('2024-01-15', at="yesterday"))
+        assert result["success"] is False
+
+    def test_incident_does_not_exist(self, incidents_traffic_tool, incidents_dir):
+        """Test when the incident does not exist."""
+        result = asyncio.run(incidents_traffic_tool.tool_get_incident_traffic('2024-02-02T10:00:00'))
+        assert result["success"] is False
+        assert "does not exist" in result["error"]
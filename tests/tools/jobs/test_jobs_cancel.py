@@ -0,0 +1,41 @@
+"""
+Tests for the Jobs Cancel tool.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import patch
+from tools.jobs.cancel import JobsCancelTool
+from utils.jobs import JobManager
+
+class TestJobsCancelTool:
+    """Test cases for JobsCancelTool."""
+
+    @pytest.fixture
+    def jobs_cancel_tool(self):
+        """Create a JobsCancelTool instance for testing."""
+        return JobsCancelTool()
+
+    def test_cancel_job(self, jobs_cancel_tool):
+        """Test cancelling a running job."""
+        manager = JobManager()
+
+        async def tool():
+            await asyncio.sleep(60)
+
+        async def run():
+            job = manager.submit("tool", tool, {})
+            await asyncio.sleep(0)
+            return await jobs_cancel_tool.tool_cancel_job(job.id)
+
+        with patch('tools.jobs.cancel.job_manager', manager):
+            result = asyncio.run(run())
+
+        assert result["success"] is True
+        assert result["status"] == "cancelled"
+
+    def test_cancel_unknown_job(self, jobs_cancel_tool):
+        """Test cancelling an unknown job."""
+        with patch('tools.jobs.cancel.job_manager', JobManager()):
+            result = asyncio.run(jobs_cancel_tool.tool_cancel_job("missing"))
+        assert result["success"] is False
@@ -0,0 +1,43 @@
+"""
+Tests for the Jobs List tool.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import patch
+from tools.jobs.list import JobsListTool
+from utils.jobs import JobManager
+
+class TestJobsListTool:
+    """Test cases for JobsListTool."""
+
+    @pytest.fixture
+    def jobs_list_tool(self):
+        """Create a JobsListTool instance for testing."""
+        return JobsListTool()
+
+    def test_list_jobs(self, jobs_list_tool):
+        """Test listing jobs."""
+        manager = JobManager()
+
+        async def tool():
+            return {}
+
+        async def run():
+            jobs = [manager.submit("tool", tool, {}) for _ in range(3)]
+            await asyncio.wait([job.task for job in jobs])
+            return await jobs_list_tool.tool_list_jobs()
+
+        with patch('tools.jobs.list.job_manager', manager):
+            result = asyncio.run(run())
+
+        assert result["success"] is True
+        assert result["count"] == 3
+        assert all(job["status"] == "completed" for job in result["jobs"])
+
+    def test_list_jobs_empty(self, jobs_list_tool):
+        """Test listing when there are no jobs."""
+        with patch('tools.jobs.list.job_manager', JobManager()):
+            result = asyncio.run(jobs_list_tool.tool_list_jobs())
+        assert result["jobs"] == []
+        assert result["count"] == 0
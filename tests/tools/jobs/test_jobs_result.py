@@ -0,0 +1,87 @@
+"""
+Tests for the Jobs Result tool.
+"""
+
+import pytest
+import asyncio
+import json
+from unittest.mock import patch
+from tools.jobs.result import JobsResultTool
+from utils.jobs import JobManager
+
+class TestJobsResultTool:
+    """Test cases for JobsResultTool."""
+
+    @pytest.fixture
+    def jobs_result_tool(self):
+        """Create a JobsResultTool instance for testing."""
+        return JobsResultTool()
+
+    def run_job(self, manager, result):
+        """Run a job returning the given result and return its id."""
+        async def tool():
+            return result
+
+        async def run():
+            job = manager.submit("tool", tool, {})
+            await asyncio.wait([job.task])
+            return job.id
+
+        return asyncio.run(run())
+
+    def test_get_job_result_single_page(self, jobs_result_tool):
+        """Test that small results are returned decoded."""
+        manager = JobManager()
+        job_id = self.run_job(manager, {"success": True, "count": 1})
+
+        with patch('tools.jobs.result.job_manager', manager):
+            result = asyncio.run(jobs_result_tool.tool_get_job_result(job_id))
+
+        assert result["success"] is True
+        assert result["complete"] is True
+        assert result["result"] == {"success": True, "count": 1}
+
+    def test_get_job_result_paginated(self, jobs_result_tool, tmp_path):
+        """Test that large results are fetched in pages."""
+        manager = JobManager(spill_threshold=50, spill_dir=str(tmp_path))
+        job_id = self.run_job(manager, {"lines": ["line %d" % i for i in range(100)]})
+
+        chunks = []
+        offset = 0
+        with patch('tools.jobs.result.job_manager', manager):
+            while True:
+                page = asyncio.run(jobs_result_tool.tool_get_job_result(job_id, offset=offset, length=200))
+                assert page["success"] is True
+                chunks.append(page["chunk"])
+                offset = page["next_offset"]
+                if page["complete"]:
+                    break
+
+        assert len(chunks) > 1
+        assert json.loads("".join(chunks))["lines"][-1] == "line 99"
+
+    def test_get_job_result_not_finished(self, jobs_result_tool):
+        """Test that no result is returned for a running job."""
+        manager = JobManager()
+
+        async def tool():
+            await asyncio.sleep(60)
+
+        async def run():
+            job = manager.submit("tool", tool, {})
+            await asyncio.sleep(0)
+            result = await jobs_result_tool.tool_get_job_result(job.id)
+            job.task.cancel()
+            return result
+
+        with patch('tools.jobs.result.job_manager', manager):
+            result = asyncio.run(run())
+
+        assert result["success"] is False
+        assert result["status"] == "running"
+
+    def test_get_job_result_unknown(self, jobs_result_tool):
+        """Test fetching the result of an unknown job."""
+        with patch('tools.jobs.result.job_manager', JobManager()):
+            result = asyncio.run(jobs_result_tool.tool_get_job_result("missing"))
+        assert result["success"] is False
@@ -0,0 +1,45 @@
+"""
+Tests for the Jobs Status tool.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import patch
+from tools.jobs.status import JobsStatusTool
+from utils.jobs import JobManager
+
+class TestJobsStatusTool:
+    """Test cases for JobsStatusTool."""
+
+    @pytest.fixture
+    def jobs_status_tool(self):
+        """Create a JobsStatusTool instance for testing."""
+        return JobsStatusTool()
+
+    def test_get_job_status(self, jobs_status_tool):
+        """Test the status of a finished job."""
+        manager = JobManager()
+
+        async def tool():
+            return {"success": True}
+
+        async def run():
+            job = manager.submit("hello_world", tool, {})
+            await asyncio.wait([job.task])
+            return await jobs_status_tool.tool_get_job_status(job.id)
+
+        with patch('tools.jobs.status.job_manager', manager):
+            result = asyncio.run(run())
+
+        assert result["success"] is True
+        assert result["status"] == "completed"
+        assert result["tool"] == "hello_world"
+        assert "progress" in result
+        assert result["result_size"] > 0
+
+    def test_get_job_status_unknown(self, jobs_status_tool):
+        """Test the status of an unknown job."""
+        with patch('tools.jobs.status.job_manager', JobManager()):
+            result = asyncio.run(jobs_status_tool.tool_get_job_status("missing"))
+        assert result["success"] is False
+        assert result["job_id"] == "missing"
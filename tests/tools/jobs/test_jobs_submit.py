@@ -0,0 +1,64 @@
+"""
+Tests for the Jobs Submit tool.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import patch
+from tools.jobs.submit import JobsSubmitTool
+from tools.hello_world import HelloWorldTool
+from tools.generic import ToolRegistry
+from utils.jobs import JobManager, JOB_COMPLETED
+
+class TestJobsSubmitTool:
+    """Test cases for JobsSubmitTool."""
+
+    @pytest.fixture
+    def registry(self):
+        """Create a registry with the hello world and job submission tools."""
+        registry = ToolRegistry()
+        registry.register_tool(HelloWorldTool())
+        registry.register_tool(JobsSubmitTool())
+        return registry
+
+    @pytest.fixture
+    def jobs_submit_tool(self):
+        """Create a JobsSubmitTool instance for testing."""
+        return JobsSubmitTool()
+
+    def test_submit_job(self, registry, jobs_submit_tool):
+        """Test that a tool can be submitted and runs to completion."""
+        manager = JobManager()
+
+        async def run():
+            result = await jobs_submit_tool.tool_submit_job("hello_world")
+            await asyncio.wait([manager.jobs[result["job_id"]].task])
+            return result
+
+        with patch('tools.jobs.submit.tool_registry', registry), \
+             patch('tools.jobs.submit.job_manager', manager):
+            result = asyncio.run(run())
+
+        assert result["success"] is True
+        assert result["tool"] == "hello_world"
+        assert manager.jobs[result["job_id"]].status == JOB_COMPLETED
+
+    def test_submit_unknown_tool(self, registry, jobs_submit_tool):
+        """Test that unknown tools are rejected."""
+        with patch('tools.jobs.submit.tool_registry', registry):
+            result = asyncio.run(jobs_submit_tool.tool_submit_job("does_not_exist"))
+        assert result["success"] is False
+        assert "Unknown tool" in result["error"]
+
+    def test_submit_job_tool_is_rejected(self, registry, jobs_submit_tool):
+        """Test that job tools can not be submitted as jobs."""
+        with patch('tools.jobs.submit.tool_registry', registry):
+            result = asyncio.run(jobs_submit_tool.tool_submit_job("submit_job", {"tool": "hello_world"}))
+        assert result["success"] is False
+
+    def test_submit_invalid_arguments(self, registry, jobs_submit_tool):
+        """Test that arguments are validated before the job is queued."""
+        with patch('tools.jobs.submit.tool_registry', registry):
+            result = asyncio.run(jobs_submit_tool.tool_submit_job("hello_world", {"unexpected": 1}))
+        assert result["success"] is False
+        assert "Invalid arguments" in result["error"]
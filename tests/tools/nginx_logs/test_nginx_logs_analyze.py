@@ -4,9 +4,13 @@ Tests for the Nginx Logs Analyze tool.
 
 import pytest
 import asyncio
+import os
+from contextlib import asynccontextmanager
 from unittest.mock import patch, mock_open, MagicMock
 from tools.nginx_logs.analyze import NginxLogsAnalyzeTool
+from utils.artifacts import ArtifactStore
 from utils.command_executor import CommandResult
+from utils.progress import ProgressReporter, use_progress_reporter
 
 class TestNginxLogsAnalyzeTool:
     """Test cases for NginxLogsAnalyzeTool."""
@@ -23,8 +27,8 @@ class TestNginxLogsAnalyzeTool:
     @patch('tools.nginx_logs.analyze.tempfile.NamedTemporaryFile')
     @patch('tools.nginx_logs.analyze.os.chmod')
     @patch('tools.nginx_logs.analyze.os.unlink')
-    @patch('tools.nginx_logs.analyze.CommandExecutor.execute_command')
-    def test_analyze_nginx_logs_basic(self, mock_execute_command, mock_unlink, mock_chmod, mock_tempfile, nginx_logs_analyze_tool):
+    @patch('tools.nginx_logs.analyze.CommandExecutor.stream_command')
+    def test_analyze_nginx_logs_basic(self, mock_stream_command, mock_unlink, mock_chmod, mock_tempfile, nginx_logs_analyze_tool, fake_stream_command):
         """Test basic nginx log analysis without filters."""
         # Mock temporary file
         mock_temp_file = MagicMock()
@@ -32,13 +36,13 @@ class TestNginxLogsAnalyzeTool:
         mock_tempfile.return_value.__enter__.return_value = mock_temp_file
         
         # Mock successful response
-        mock_execute_command.return_value = CommandResult(
+        mock_stream_command.side_effect = fake_stream_command(CommandResult(
             success=True,
             stdout="192.168.1.1 - - [01/Jan/2024:00:00:00 +0000] \"GET / HTTP/1.1\" 200 1234",
             stderr="",
             return_code=0,
             command="bash /tmp/test_script.sh"
-        )
+        ))
         
         result = asyncio.run(nginx_logs_analyze_tool.tool_analyze_nginx_logs())
         
@@ -49,14 +53,14 @@ class TestNginxLogsAnalyzeTool:
         assert result["unique_by_field"] is None
         assert result["query_bots_only"] is False
         mock_chmod.assert_called_once_with("/tmp/test_script.sh", 0o755)
-        mock_execute_command.assert_called_once_with("bash /tmp/test_script.sh", timeout=120)
+        mock_stream_command.assert_called_once_with("bash /tmp/test_script.sh", timeout=120)
         mock_unlink.assert_called_once_with("/tmp/test_script.sh")
 
     @patch('tools.nginx_logs.analyze.tempfile.NamedTemporaryFile')
     @patch('tools.nginx_logs.analyze.os.chmod')
     @patch('tools.nginx_logs.analyze.os.unlink')
-    @patch('tools.nginx_logs.analyze.CommandExecutor.execute_command')
-    def test_analyze_nginx_logs_with_filter(self, mock_execute_command, mock_unlink, mock_chmod, mock_tempfile, nginx_logs_analyze_tool):
+    @patch('tools.nginx_logs.analyze.CommandExecutor.stream_command')
+    def test_analyze_nginx_logs_with_filter(self, mock_stream_command, mock_unlink, mock_chmod, mock_tempfile, nginx_logs_analyze_tool, fake_stream_command):
         """Test nginx log analysis with a filter."""
         # Mock temporary file
         mock_temp_file = MagicMock()
@@ -64,27 +68,27 @@ class TestNginxLogsAnalyzeTool:
         mock_tempfile.return_value.__enter__.return_value = mock_temp_file
         
         # Mock successful response
-        mock_execute_command.return_value = CommandResult(
+        mock_stream_command.side_effect = fake_stream_command(CommandResult(
             success=True,
             stdout="192.168.1.1 - - [01/Jan/2024:00:00:00 +0000] \"GET / HTTP/1.1\" 404 1234",
             stderr="",
             return_code=0,
             command="bash /tmp/test_script.sh"
-        )
+        ))
         
         result = asyncio.run(nginx_logs_analyze_tool.tool_analyze_nginx_logs(filter="status=404"))
         
         assert result["success"] is True
         assert result["filter"] == "status=404"
         mock_chmod.assert_called_once_with("/tmp/test_script.sh", 0o755)
-        mock_execute_command.assert_called_once_with("bash /tmp/test_script.sh", timeout=120)
+        mock_stream_command.assert_called_once_with("bash /tmp/test_script.sh", timeout=120)
         mock_unlink.assert_called_once_with("/tmp/test_script.sh")
 
     @patch('tools.nginx_logs.analyze.tempfile.NamedTemporaryFile')
     @patch('tools.nginx_logs.analyze.os.chmod')
     @patch('tools.nginx_logs.analyze.os.unlink')
-    @patch('tools.nginx_logs.analyze.CommandExecutor.execute_command')
-    def test_analyze_nginx_logs_today_only(self, mock_execute_command, mock_unlink, mock_chmod, mock_tempfile, nginx_logs_analyze_tool):
+    @patch('tools.nginx_logs.analyze.CommandExecutor.stream_command')
+    def test_analyze_nginx_logs_today_only(self, mock_stream_command, mock_unlink, mock_chmod, mock_tempfile, nginx_logs_analyze_tool, fake_stream_command):
         """Test nginx log analysis for today only."""
         # Mock temporary file
         mock_temp_file = MagicMock()
@@ -92,27 +96,27 @@ class TestNginxLogsAnalyzeTool:
         mock_tempfile.return_value.__enter__.return_value = mock_temp_file
         
         # Mock successful response
-        mock_execute_command.return_value = CommandResult(
+        mock_stream_command.side_effect = fake_stream_command(CommandResult(
             success=True,
             stdout="Today's logs: 192.168.1.1 - - [01/Jan/2024:00:00:00 +0000] \"GET / HTTP/1.1\" 200 1234",
             stderr="",
             return_code=0,
             command="bash /tmp/test_script.sh"
-        )
+        ))
         
         result = asyncio.run(nginx_logs_analyze_tool.tool_analyze_nginx_logs(today=True))
         
         assert result["success"] is True
         assert result["today"] is True
         mock_chmod.assert_called_once_with("/tmp/test_script.sh", 0o755)
-        mock_execute_command.assert_called_once_with("bash /tmp/test_script.sh", timeout=120)
+        mock_stream_command.assert_called_once_with("bash /tmp/test_script.sh", timeout=120)
         mock_unlink.assert_called_once_with("/tmp/test_script.sh")
 
     @patch('tools.nginx_logs.analyze.tempfile.NamedTemporaryFile')
     @patch('tools.nginx_logs.analyze.os.chmod')
     @patch('tools.nginx_logs.analyze.os.unlink')
-    @patch('tools.nginx_logs.analyze.CommandExecutor.execute_command')
-    def test_analyze_nginx_logs_bots_only(self, mock_execute_command, mock_unlink, mock_chmod, mock_tempfile, nginx_logs_analyze_tool):
+    @patch('tools.nginx_logs.analyze.CommandExecutor.stream_command')
+    def test_analyze_nginx_logs_bots_only(self, mock_stream_command, mock_unlink, mock_chmod, mock_tempfile, nginx_logs_analyze_tool, fake_stream_command):
         """Test nginx log analysis for bots only."""
         # Mock temporary file
         mock_temp_file = MagicMock()
@@ -120,27 +124,27 @@ class TestNginxLogsAnalyzeTool:
         mock_tempfile.return_value.__enter__.return_value = mock_temp_file
         
         # Mock successful response
-        mock_execute_command.return_value = CommandResult(
+        mock_stream_command.side_effect = fake_stream_command(CommandResult(
             success=True,
             stdout="Bot traffic: Googlebot - - [01/Jan/2024:00:00:00 +0000] \"GET / HTTP/1.1\" 200 1234",
             stderr="",
             return_code=0,
             command="bash /tmp/test_script.sh"
-        )
+        ))
         
         result = asyncio.run(nginx_logs_analyze_tool.tool_analyze_nginx_logs(query_bots_only=True))
         
         assert result["success"] is True
         assert result["query_bots_only"] is True
         mock_chmod.assert_called_once_with("/tmp/test_script.sh", 0o755)
-        mock_execute_command.assert_called_once_with("bash /tmp/test_script.sh", timeout=120)
+        mock_stream_command.assert_called_once_with("bash /tmp/test_script.sh", timeout=120)
         mock_unlink.assert_called_once_with("/tmp/test_script.sh")
 
     @patch('tools.nginx_logs.analyze.tempfile.NamedTemporaryFile')
     @patch('tools.nginx_logs.analyze.os.chmod')
     @patch('tools.nginx_logs.analyze.os.unlink')
-    @patch('tools.nginx_logs.analyze.CommandExecutor.execute_command')
-    def test_analyze_nginx_logs_with_unique_field(self, mock_execute_command, mock_unlink, mock_chmod, mock_tempfile, nginx_logs_analyze_tool):
+    @patch('tools.nginx_logs.analyze.CommandExecutor.stream_command')
+    def test_analyze_nginx_logs_with_unique_field(self, mock_stream_command, mock_unlink, mock_chmod, mock_tempfile, nginx_logs_analyze_tool, fake_stream_command):
         """Test nginx log analysis with unique_by_field."""
         # Mock temporary file
         mock_temp_file = MagicMock()
@@ -148,27 +152,60 @@ class TestNginxLogsAnalyzeTool:
         mock_tempfile.return_value.__enter__.return_value = mock_temp_file
         
         # Mock successful response
-        mock_execute_command.return_value = CommandResult(
+        mock_stream_command.side_effect = fake_stream_command(CommandResult(
             success=True,
-            stdout="      5 192.168.1.1\n      3 192.168.1.2\n      1 192.168.1.3",
+            stdout="\n".join(["192.168.1.2"] * 3 + ["192.168.1.1"] * 5 + ["192.168.1.3"]),
             stderr="",
             return_code=0,
             command="bash /tmp/test_script.sh"
-        )
+        ))
         
         result = asyncio.run(nginx_logs_analyze_tool.tool_analyze_nginx_logs(unique_by_field="remote_addr"))
         
         assert result["success"] is True
         assert result["unique_by_field"] == "remote_addr"
+        assert result["result"] == "      5 192.168.1.1\n      3 192.168.1.2\n      1 192.168.1.3"
         mock_chmod.assert_called_once_with("/tmp/test_script.sh", 0o755)
-        mock_execute_command.assert_called_once_with("bash /tmp/test_script.sh", timeout=120)
+        mock_stream_command.assert_called_once_with("bash /tmp/test_script.sh", timeout=120)
         mock_unlink.assert_called_once_with("/tmp/test_script.sh")
 
+    @patch('tools.nginx_logs.analyze.CommandExecutor.stream_command')
+    def test_analyze_nginx_logs_unique_overflow_sorts_on_disk(self, mock_stream_command, nginx_logs_analyze_tool, fake_stream_command, monkeypatch, tmp_path):
+        """Test that past MAX_UNIQUE_VALUES distinct values the counting moves to sort, with the same result."""
+        values = [f"10.0.{i % 7}.{i % 13}\tNL" for i in range(500)] + ["10.0.0.1\tDE"] * 40
+        mock_stream_command.side_effect = fake_stream_command(CommandResult(
+            success=True,
+            stdout="\n".join(values),
+            stderr="",
+            return_code=0,
+            command="bash /tmp/test_script.sh"
+        ))
+        monkeypatch.setattr("tools.nginx_logs.analyze.SORT_BATCH", 10)
+        monkeypatch.setattr("tools.nginx_logs.analyze.tempfile.tempdir", str(tmp_path))
+        
+        expected = [
+            asyncio.run(nginx_logs_analyze_tool.tool_analyze_nginx_logs(limit=limit, unique_by_field="remote_addr,country"))["result"]
+            for limit in (10, 0)
+        ]
+        monkeypatch.setattr("tools.nginx_logs.analyze.MAX_UNIQUE_VALUES", 20)
+        with patch.object(nginx_logs_analyze_tool, '_format_counts') as mock_format_counts:
+            results = [
+                asyncio.run(nginx_logs_analyze_tool.tool_analyze_nginx_logs(limit=limit, unique_by_field="remote_addr,country"))
+                for limit in (10, 0)
+            ]
+        
+        mock_format_counts.assert_not_called()
+        assert [result["success"] for result in results] == [True, True]
+        assert [result["result"] for result in results] == expected
+        assert expected[0].splitlines()[0] == "     40 10.0.0.1\tDE"
+        assert len(expected[1].splitlines()) == 92
+        assert os.listdir(tmp_path) == []
+
     @patch('tools.nginx_logs.analyze.tempfile.NamedTemporaryFile')
     @patch('tools.nginx_logs.analyze.os.chmod')
     @patch('tools.nginx_logs.analyze.os.unlink')
-    @patch('tools.nginx_logs.analyze.CommandExecutor.execute_command')
-    def test_analyze_nginx_logs_with_limit(self, mock_execute_command, mock_unlink, mock_chmod, mock_tempfile, nginx_logs_analyze_tool):
+    @patch('tools.nginx_logs.analyze.CommandExecutor.stream_command')
+    def test_analyze_nginx_logs_with_limit(self, mock_stream_command, mock_unlink, mock_chmod, mock_tempfile, nginx_logs_analyze_tool, fake_stream_command):
         """Test nginx log analysis with limit."""
         # Mock temporary file
         mock_temp_file = MagicMock()
@@ -176,33 +213,33 @@ class TestNginxLogsAnalyzeTool:
         mock_tempfile.return_value.__enter__.return_value = mock_temp_file
         
         # Mock successful response
-        mock_execute_command.return_value = CommandResult(
+        mock_stream_command.side_effect = fake_stream_command(CommandResult(
             success=True,
             stdout="192.168.1.1 - - [01/Jan/2024:00:00:00 +0000] \"GET / HTTP/1.1\" 200 1234\n192.168.1.2 - - [01/Jan/2024:00:00:01 +0000] \"GET / HTTP/1.1\" 200 1234",
             stderr="",
             return_code=0,
             command="bash /tmp/test_script.sh"
-        )
+        ))
         
         result = asyncio.run(nginx_logs_analyze_tool.tool_analyze_nginx_logs(limit=50))
         
         assert result["success"] is True
         assert result["limit"] == 50
         mock_chmod.assert_called_once_with("/tmp/test_script.sh", 0o755)
-        mock_execute_command.assert_called_once_with("bash /tmp/test_script.sh", timeout=120)
+        mock_stream_command.assert_called_once_with("bash /tmp/test_script.sh", timeout=120)
         mock_unlink.assert_called_once_with("/tmp/test_script.sh")
 
-    @patch('tools.nginx_logs.analyze.CommandExecutor.execute_command')
-    def test_analyze_nginx_logs_failure(self, mock_execute_command, nginx_logs_analyze_tool):
+    @patch('tools.nginx_logs.analyze.CommandExecutor.stream_command')
+    def test_analyze_nginx_logs_failure(self, mock_stream_command, nginx_logs_analyze_tool, fake_stream_command):
         """Test nginx log analysis failure."""
         # Mock failure response
-        mock_execute_command.return_value = CommandResult(
+        mock_stream_command.side_effect = fake_stream_command(CommandResult(
             success=False,
             stdout="",
             stderr="Command not found: hypernode-parse-nginx-log",
             return_code=127,
             command="hypernode-parse-nginx-log"
-        )
+        ))
         
         result = asyncio.run(nginx_logs_analyze_tool.tool_analyze_nginx_logs())
         
@@ -212,8 +249,8 @@ class TestNginxLogsAnalyzeTool:
     @patch('tools.nginx_logs.analyze.tempfile.NamedTemporaryFile')
     @patch('tools.nginx_logs.analyze.os.chmod')
     @patch('tools.nginx_logs.analyze.os.unlink')
-    @patch('tools.nginx_logs.analyze.CommandExecutor.execute_command')
-    def test_analyze_nginx_logs_complex_filter(self, mock_execute_command, mock_unlink, mock_chmod, mock_tempfile, nginx_logs_analyze_tool):
+    @patch('tools.nginx_logs.analyze.CommandExecutor.stream_command')
+    def test_analyze_nginx_logs_complex_filter(self, mock_stream_command, mock_unlink, mock_chmod, mock_tempfile, nginx_logs_analyze_tool, fake_stream_command):
         """Test nginx log analysis with complex filter."""
         # Mock temporary file
         mock_temp_file = MagicMock()
@@ -221,46 +258,132 @@ class TestNginxLogsAnalyzeTool:
         mock_tempfile.return_value.__enter__.return_value = mock_temp_file
         
         # Mock successful response
-        mock_execute_command.return_value = CommandResult(
+        mock_stream_command.side_effect = fake_stream_command(CommandResult(
             success=True,
             stdout="Filtered results for IP range 192.168",
             stderr="",
             return_code=0,
             command="bash /tmp/test_script.sh"
-        )
+        ))
         
         result = asyncio.run(nginx_logs_analyze_tool.tool_analyze_nginx_logs(filter="remote_addr~192.168"))
         
         assert result["success"] is True
         assert result["filter"] == "remote_addr~192.168"
         mock_chmod.assert_called_once_with("/tmp/test_script.sh", 0o755)
-        mock_execute_command.assert_called_once_with("bash /tmp/test_script.sh", timeout=120)
+        mock_stream_command.assert_called_once_with("bash /tmp/test_script.sh", timeout=120)
         mock_unlink.assert_called_once_with("/tmp/test_script.sh")
 
+    @patch('tools.nginx_logs.analyze.CommandExecutor.stream_command')
+    def test_analyze_nginx_logs_reports_partial_top(self, mock_stream_command, nginx_logs_analyze_tool, fake_stream_command):
+        """Test that progress notifications carry lines matched and the partial top-K."""
+        mock_stream_command.side_effect = fake_stream_command(CommandResult(
+            success=True,
+            stdout="\n".join(["10.0.0.1", "10.0.0.2", "10.0.0.1"]),
+            stderr="",
+            return_code=0,
+            command="bash /tmp/test_script.sh"
+        ))
+        notifications = []
+        
+        async def sink(progress, total, message):
+            notifications.append((progress, total, message))
+        
+        async def run():
+            reporter = ProgressReporter(sink=sink, min_interval=0)
+            with use_progress_reporter(reporter):
+                result = await nginx_logs_analyze_tool.tool_analyze_nginx_logs(unique_by_field="remote_addr")
+            await reporter.flush()
+            return result, reporter
+        
+        result, reporter = asyncio.run(run())
+        
+        assert result["success"] is True
+        assert notifications
+        assert reporter.details["lines_matched"] == 3
+        assert reporter.details["top"][0] == ("10.0.0.1", 2)
+
+    @patch('tools.nginx_logs.analyze.CommandExecutor.stream_command')
+    def test_analyze_nginx_logs_timeout_returns_partial(self, mock_stream_command, nginx_logs_analyze_tool, fake_stream_command):
+        """Test that a timeout returns what was counted so far."""
+        mock_stream_command.side_effect = fake_stream_command(CommandResult(
+            success=False,
+            stdout="10.0.0.1\n10.0.0.1\n10.0.0.2",
+            stderr="Command timed out after 120 seconds",
+            return_code=-9,
+            command="bash /tmp/test_script.sh"
+        ), timed_out=True)
+        
+        result = asyncio.run(nginx_logs_analyze_tool.tool_analyze_nginx_logs(unique_by_field="remote_addr"))
+        
+        assert result["success"] is False
+        assert result["partial"] is True
+        assert result["result"] == "      2 10.0.0.1\n      1 10.0.0.2"
+        assert "timed out" in result["error"]
+
+    def test_analyze_nginx_logs_cancel_publishes_partial(self, nginx_logs_analyze_tool):
+        """Test that a cancelled analysis publishes its partial counts."""
+        class SlowStream:
+            pid = None
+            timed_out = False
+            
+            def __init__(self):
+                self.lines = ["10.0.0.1", "10.0.0.2", "10.0.0.1"]
+            
+            def __aiter__(self):
+                return self
+            
+            async def __anext__(self):
+                if self.lines:
+                    return self.lines.pop(0)
+                await asyncio.sleep(60)
+        
+        @asynccontextmanager
+        async def slow_stream_command(command, timeout=30, cwd=None):
+            yield SlowStream()
+        
+        async def run():
+            reporter = ProgressReporter()
+            with use_progress_reporter(reporter):
+                task = asyncio.ensure_future(nginx_logs_analyze_tool.tool_analyze_nginx_logs(unique_by_field="remote_addr"))
+                await asyncio.sleep(0.05)
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+            return reporter
+        
+        with patch('tools.nginx_logs.analyze.CommandExecutor.stream_command', side_effect=slow_stream_command):
+            reporter = asyncio.run(run())
+        
+        assert reporter.partial_result["partial"] is True
+        assert reporter.partial_result["result"] == "      2 10.0.0.1\n      1 10.0.0.2"
+
     def test_nginx_logs_analyze_tool_class_attributes(self, nginx_logs_analyze_tool):
         """Test that NginxLogsAnalyzeTool has the expected class structure."""
         assert hasattr(nginx_logs_analyze_tool, 'tool_analyze_nginx_logs')
         assert callable(nginx_logs_analyze_tool.tool_analyze_nginx_logs)
 
-    def test_nginx_logs_analyze_tool_return_structure(self, nginx_logs_analyze_tool):
+    def test_nginx_logs_analyze_tool_return_structure(self, nginx_logs_analyze_tool, fake_stream_command):
         """Test that tool_analyze_nginx_logs returns the correct data structure."""
         with patch('tools.nginx_logs.analyze.tempfile.NamedTemporaryFile') as mock_tempfile, \
              patch('tools.nginx_logs.analyze.os.chmod') as mock_chmod, \
              patch('tools.nginx_logs.analyze.os.unlink') as mock_unlink, \
-             patch('tools.nginx_logs.analyze.CommandExecutor.execute_command') as mock_execute_command:
+             patch('tools.nginx_logs.analyze.CommandExecutor.stream_command') as mock_stream_command:
             
             # Mock temporary file
             mock_temp_file = MagicMock()
             mock_temp_file.name = "/tmp/test_script.sh"
             mock_tempfile.return_value.__enter__.return_value = mock_temp_file
             
-            mock_execute_command.return_value = CommandResult(
+            mock_stream_command.side_effect = fake_stream_command(CommandResult(
                 success=True,
                 stdout="Test result",
                 stderr="",
                 return_code=0,
                 command="bash /tmp/test_script.sh"
-            )
+            ))
             
             result = asyncio.run(nginx_logs_analyze_tool.tool_analyze_nginx_logs())
             
@@ -270,4 +393,56 @@ class TestNginxLogsAnalyzeTool:
             assert isinstance(result["result"], str)
             assert isinstance(result["limit"], int)
             assert isinstance(result["today"], bool)
-            assert isinstance(result["query_bots_only"], bool) 
\ No newline at end of file
+            assert isinstance(result["query_bots_only"], bool) 
+    @patch('tools.nginx_logs.analyze.CommandExecutor.stream_command')
+    def test_analyze_nginx_logs_spills_large_output(self, mock_stream_command, nginx_logs_analyze_tool, fake_stream_command, tmp_path):
+        """Test that a large result is written to an artifact instead of returned."""
+        lines = [f"10.0.0.{i % 250} - - \"GET /page/{i} HTTP/1.1\" 200" for i in range(500)]
+        mock_stream_command.side_effect = fake_stream_command(CommandResult(
+            success=True,
+            stdout="\n".join(lines),
+            stderr="",
+            return_code=0,
+            command="bash /tmp/test_script.sh"
+        ))
+        store = ArtifactStore(str(tmp_path), threshold=1000)
+        
+        with patch('tools.nginx_logs.analyze.artifact_store', store):
+            result = asyncio.run(nginx_logs_analyze_tool.tool_analyze_nginx_logs(limit=0))
+        
+        assert result["success"] is True
+        assert result["result"].startswith(lines[0] + "\n")
+        assert result["artifact"]["lines"] == 500
+        assert store.read_range(result["artifact"]["artifact"], 0, 10 ** 6).content == "\n".join(lines)
+    
+    def test_analyze_nginx_logs_error_discards_spilled_output(self, nginx_logs_analyze_tool, tmp_path, monkeypatch):
+        """Test that output spilled before reading pnl failed leaves no artifact behind."""
+        class FailingStream:
+            pid = None
+            
+            def __init__(self):
+                self.lines = iter(f"line {i}" for i in range(100))
+            
+            def __aiter__(self):
+                return self
+            
+            async def __anext__(self):
+                line = next(self.lines, None)
+                if line is None:
+                    raise OSError("read failed")
+                return line
+        
+        @asynccontextmanager
+        async def stream_command(command, timeout=30, cwd=None):
+            yield FailingStream()
+        
+        monkeypatch.setattr("utils.artifacts.FLUSH_SIZE", 100)
+        store = ArtifactStore(str(tmp_path / "artifacts"), threshold=100)
+        
+        with patch('tools.nginx_logs.analyze.CommandExecutor.stream_command', side_effect=stream_command), \
+                patch('tools.nginx_logs.analyze.artifact_store', store):
+            with pytest.raises(OSError):
+                asyncio.run(nginx_logs_analyze_tool.tool_analyze_nginx_logs(limit=0))
+        
+        assert os.listdir(tmp_path / "artifacts") == []
+        assert store.list() == []
@@ -0,0 +1,52 @@
+"""
+Tests for the Server Metrics tool.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import patch
+from tools.server.metrics import ServerMetricsTool
+from utils.metrics import MetricsRegistry
+
+class TestServerMetricsTool:
+    """Test cases for ServerMetricsTool."""
+
+    @pytest.fixture
+    def server_metrics_tool(self):
+        """Create a ServerMetricsTool instance for testing."""
+        return ServerMetricsTool()
+
+    def test_get_server_metrics(self, server_metrics_tool):
+        """Test that metrics of all providers are collected."""
+        registry = MetricsRegistry()
+        registry.register("example", lambda: {"value": 1})
+
+        with patch('tools.server.metrics.metrics_registry', registry):
+            result = asyncio.run(server_metrics_tool.tool_get_server_metrics())
+
+        assert result["success"] is True
+        assert result["metrics"] == {"example": {"value": 1}}
+
+    def test_failing_provider_is_reported(self, server_metrics_tool):
+        """Test that a failing provider does not break the tool."""
+        registry = MetricsRegistry()
+
+        def failing():
+            raise RuntimeError("broken")
+
+        registry.register("broken", failing)
+
+        with patch('tools.server.metrics.metrics_registry', registry):
+            result = asyncio.run(server_metrics_tool.tool_get_server_metrics())
+
+        assert result["success"] is True
+        assert result["metrics"]["broken"] == {"error": "broken"}
+
+    def test_event_loop_metrics_registered(self, server_metrics_tool):
+        """Test that the event loop monitor reports through the metrics tool."""
+        import utils.loop_monitor  # noqa: F401 - registers the event loop provider
+
+        result = asyncio.run(server_metrics_tool.tool_get_server_metrics())
+
+        assert "event_loop" in result["metrics"]
+        assert "lag" in result["metrics"]["event_loop"]
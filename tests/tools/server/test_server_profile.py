@@ -0,0 +1,47 @@
+"""
+Tests for the Server Profile tool.
+"""
+
+import pytest
+import asyncio
+import os
+from tools.server.profile import ServerProfileTool
+
+class TestServerProfileTool:
+    """Test cases for ServerProfileTool."""
+
+    @pytest.fixture
+    def server_profile_tool(self):
+        """Create a ServerProfileTool instance for testing."""
+        return ServerProfileTool()
+
+    def test_profile_server(self, server_profile_tool, tmp_path, monkeypatch):
+        """Test that a profile is written as collapsed stacks."""
+        monkeypatch.setenv("MCP_PROFILE_DIR", str(tmp_path))
+
+        result = asyncio.run(server_profile_tool.tool_profile_server(seconds=1, rate=50))
+
+        assert result["success"] is True
+        assert result["format"] == "collapsed"
+        assert result["samples"] > 0
+        assert os.path.dirname(result["flamegraph_file"]) == str(tmp_path)
+        with open(result["flamegraph_file"]) as f:
+            line = f.readline().rstrip("\n")
+        assert ";" in line
+        assert line.rsplit(" ", 1)[1].isdigit()
+        assert "top_functions" in result
+
+    def test_invalid_duration(self, server_profile_tool):
+        """Test that the profiling duration is bounded."""
+        result = asyncio.run(server_profile_tool.tool_profile_server(seconds=0))
+        assert result["success"] is False
+        assert "error" in result
+
+        result = asyncio.run(server_profile_tool.tool_profile_server(seconds=3600))
+        assert result["success"] is False
+
+    def test_invalid_rate(self, server_profile_tool):
+        """Test that the sample rate is bounded."""
+        result = asyncio.run(server_profile_tool.tool_profile_server(seconds=1, rate=0))
+        assert result["success"] is False
+        assert "error" in result
@@ -0,0 +1,40 @@
+"""
+Tests for the Shell Close Session tool.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import patch
+from tools.shell.close_session import ShellCloseSessionTool
+from utils.shell_sessions import ShellSessions
+
+class TestShellCloseSessionTool:
+    """Test cases for ShellCloseSessionTool."""
+
+    @pytest.fixture
+    def shell_close_session_tool(self):
+        """Create a ShellCloseSessionTool instance for testing."""
+        return ShellCloseSessionTool()
+
+    def test_close_shell_session(self, shell_close_session_tool):
+        """Test closing an open session."""
+        sessions = ShellSessions()
+
+        async def run():
+            session = await sessions.open()
+            result = await shell_close_session_tool.tool_close_shell_session(session.id)
+            return session, result
+
+        with patch('tools.shell.close_session.shell_sessions', sessions):
+            session, result = asyncio.run(run())
+
+        assert result == {"success": True, "session": session.id}
+        assert session.closed is True
+        assert sessions.list() == []
+
+    def test_close_unknown_session(self, shell_close_session_tool):
+        """Test closing an unknown session."""
+        with patch('tools.shell.close_session.shell_sessions', ShellSessions()):
+            result = asyncio.run(shell_close_session_tool.tool_close_shell_session("missing"))
+        assert result["success"] is False
+        assert "missing" in result["error"]
@@ -4,9 +4,15 @@ Tests for the Shell Execute tool.
 
 import pytest
 import asyncio
+import json
+import time
 from unittest.mock import patch
 from tools.shell.execute import ShellExecuteTool
 from utils.command_executor import CommandResult
+from utils.progress import ProgressReporter, use_progress_reporter
+from utils.artifacts import ArtifactStore
+from utils.shell_sessions import ShellSessions
+from tests.utils.test_progress import RecordingSink
 
 class TestShellExecuteTool:
     """Test cases for ShellExecuteTool."""
@@ -37,7 +43,19 @@ class TestShellExecuteTool:
         assert result["success"] is True
         assert result["result"] == "file1.txt\nfile2.txt\nfile3.txt"
         assert result["command"] == "ls -la"
-        mock_execute_command.assert_called_once_with("ls -la")
+        mock_execute_command.assert_called_once_with("ls -la", timeout=30)
+
+    @patch('tools.shell.execute.CommandExecutor.execute_command')
+    def test_execute_shell_command_timeout(self, mock_execute_command, shell_execute_tool):
+        """Test that the timeout is passed on to plain execution."""
+        mock_execute_command.return_value = CommandResult(
+            success=True, stdout="", stderr="", return_code=0, command="mysqldump shop"
+        )
+        
+        asyncio.run(shell_execute_tool.tool_execute_shell_command("mysqldump shop", timeout=600))
+        asyncio.run(shell_execute_tool.tool_execute_shell_command("mysqldump shop", timeout=0))
+        
+        assert [call.kwargs["timeout"] for call in mock_execute_command.call_args_list] == [600, 1]
 
     @patch('tools.shell.execute.CommandExecutor.execute_command')
     def test_execute_shell_command_failure(self, mock_execute_command, shell_execute_tool):
@@ -56,7 +74,7 @@ class TestShellExecuteTool:
         assert result["success"] is False
         assert result["result"] == "ls: cannot access 'nonexistent': No such file or directory"
         assert result["command"] == "ls nonexistent"
-        mock_execute_command.assert_called_once_with("ls nonexistent")
+        mock_execute_command.assert_called_once_with("ls nonexistent", timeout=30)
 
     @patch('tools.shell.execute.CommandExecutor.execute_command')
     def test_execute_shell_command_with_output(self, mock_execute_command, shell_execute_tool):
@@ -129,7 +147,7 @@ class TestShellExecuteTool:
         assert result["success"] is True
         assert result["result"] == "Total disk usage: 1.2GB"
         assert result["command"] == "du -sh /var/log"
-        mock_execute_command.assert_called_once_with("du -sh /var/log")
+        mock_execute_command.assert_called_once_with("du -sh /var/log", timeout=30)
 
     @patch('tools.shell.execute.CommandExecutor.execute_command')
     def test_execute_shell_command_with_pipes(self, mock_execute_command, shell_execute_tool):
@@ -148,7 +166,7 @@ class TestShellExecuteTool:
         assert result["success"] is True
         assert result["result"] == "file1.txt\nfile2.txt"
         assert result["command"] == "ls | grep .txt"
-        mock_execute_command.assert_called_once_with("ls | grep .txt")
+        mock_execute_command.assert_called_once_with("ls | grep .txt", timeout=30)
 
     @patch('tools.shell.execute.CommandExecutor.execute_command')
     def test_execute_shell_command_with_quotes(self, mock_execute_command, shell_execute_tool):
@@ -167,7 +185,7 @@ class TestShellExecuteTool:
         assert result["success"] is True
         assert result["result"] == "Found 5 files with 'test' in name"
         assert result["command"] == "find . -name '*test*'"
-        mock_execute_command.assert_called_once_with("find . -name '*test*'")
+        mock_execute_command.assert_called_once_with("find . -name '*test*'", timeout=30)
 
     def test_shell_execute_tool_class_attributes(self, shell_execute_tool):
         """Test that ShellExecuteTool has the expected class structure."""
@@ -209,4 +227,123 @@ class TestShellExecuteTool:
         
         assert result["success"] is True
         assert result["result"] == ""
-        assert result["command"] == "touch empty_file.txt" 
\ No newline at end of file
+        assert result["command"] == "touch empty_file.txt" 
+    def test_execute_shell_command_stream(self, shell_execute_tool):
+        """Test that the output of a streamed command is reported as it arrives."""
+        sink = RecordingSink()
+
+        async def run():
+            with use_progress_reporter(ProgressReporter(sink=sink)):
+                return await shell_execute_tool.tool_execute_shell_command("echo out; echo err >&2", stream=True)
+
+        result = asyncio.run(run())
+
+        assert result["success"] is True
+        assert result["result"] == "out\n"
+        assert result["stdout"] == "out\n"
+        assert result["stderr"] == "err\n"
+        assert result["streamed"] is True
+        assert result["stopped"] is None
+        messages = [json.loads(message) for _, _, message in sink.calls]
+        assert {(message["stream"], message["offset"], message["output"]) for message in messages} == {
+            ("stdout", 0, "out\n"), ("stderr", 0, "err\n")
+        }
+
+    def test_execute_shell_command_stream_stop_pattern(self, shell_execute_tool):
+        """Test that a streamed command is stopped once its output matches."""
+        started = time.monotonic()
+        result = asyncio.run(shell_execute_tool.tool_execute_shell_command(
+            "echo starting; echo READY; sleep 30", stream=True, stop_pattern="READY"
+        ))
+
+        assert time.monotonic() - started < 10
+        assert result["success"] is True
+        assert result["stopped"] == "stop_pattern"
+        assert result["stdout"].startswith("starting\n")
+
+    def test_execute_shell_command_stream_max_output(self, shell_execute_tool):
+        """Test that a streamed command is stopped after max_output_bytes."""
+        result = asyncio.run(shell_execute_tool.tool_execute_shell_command("yes", stream=True, max_output_bytes=1000))
+
+        assert result["success"] is True
+        assert result["stopped"] == "max_output_bytes"
+        assert len(result["stdout"]) >= 1000
+
+    def test_execute_shell_command_stream_timeout(self, shell_execute_tool):
+        """Test that a streamed command is stopped after the timeout."""
+        result = asyncio.run(shell_execute_tool.tool_execute_shell_command("echo first; sleep 30", stream=True, timeout=1))
+
+        assert result["success"] is False
+        assert result["timed_out"] is True
+        assert result["stdout"] == "first\n"
+        assert "timed out" in result["result"]
+
+    def test_execute_shell_command_stream_invalid_pattern(self, shell_execute_tool):
+        """Test that an invalid stop pattern is reported."""
+        result = asyncio.run(shell_execute_tool.tool_execute_shell_command("echo", stream=True, stop_pattern="("))
+
+        assert result["success"] is False
+        assert "stop_pattern" in result["result"]
+
+    def test_execute_shell_command_in_session(self, shell_execute_tool, tmp_path):
+        """Test that commands in a session share its working directory and environment."""
+        sessions = ShellSessions()
+
+        async def run():
+            session = await sessions.open(str(tmp_path))
+            first = await shell_execute_tool.tool_execute_shell_command("cd /; export A=1", session=session.id)
+            second = await shell_execute_tool.tool_execute_shell_command("echo $A; pwd; false", session=session.id)
+            await sessions.close_all()
+            return first, second
+
+        with patch('tools.shell.execute.shell_sessions', sessions):
+            first, second = asyncio.run(run())
+
+        assert first["success"] is True
+        assert first["cwd"] == "/"
+        assert second["success"] is False
+        assert second["return_code"] == 1
+        assert second["stdout"] == "1\n/\n"
+        assert second["truncated"] is False
+
+    def test_execute_shell_command_unknown_session(self, shell_execute_tool):
+        """Test running a command in an unknown session."""
+        with patch('tools.shell.execute.shell_sessions', ShellSessions()):
+            result = asyncio.run(shell_execute_tool.tool_execute_shell_command("echo", session="missing"))
+
+        assert result["success"] is False
+        assert "missing" in result["result"]
+
+    def test_execute_shell_command_session_timeout(self, shell_execute_tool):
+        """Test that a session command running into its timeout closes the session."""
+        sessions = ShellSessions()
+
+        async def run():
+            session = await sessions.open()
+            result = await shell_execute_tool.tool_execute_shell_command("sleep 30", timeout=1, session=session.id)
+            return session, result
+
+        with patch('tools.shell.execute.shell_sessions', sessions):
+            session, result = asyncio.run(run())
+
+        assert result["success"] is False
+        assert "timed out" in result["result"]
+        assert session.closed is True
+
+    def test_execute_shell_command_session_stream(self, shell_execute_tool):
+        """Test that streaming is refused in sessions."""
+        result = asyncio.run(shell_execute_tool.tool_execute_shell_command("echo", stream=True, session="any"))
+        assert result["success"] is False
+        assert "not supported" in result["result"]
+
+    def test_execute_shell_command_spills_large_output(self, shell_execute_tool, tmp_path):
+        """Test that a large result is replaced by a preview and an artifact handle."""
+        store = ArtifactStore(str(tmp_path), threshold=1000)
+
+        with patch('tools.shell.execute.artifact_store', store):
+            result = asyncio.run(shell_execute_tool.tool_execute_shell_command("seq 1 10000"))
+
+        assert result["success"] is True
+        assert result["result"].startswith("1\n2\n3\n")
+        assert result["artifact"]["lines"] == 10000
+        assert store.tail_lines(result["artifact"]["artifact"], 1).content == "10000\n"
@@ -0,0 +1,44 @@
+"""
+Tests for the Shell List Sessions tool.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import patch
+from tools.shell.list_sessions import ShellListSessionsTool
+from utils.shell_sessions import ShellSessions
+
+class TestShellListSessionsTool:
+    """Test cases for ShellListSessionsTool."""
+
+    @pytest.fixture
+    def shell_list_sessions_tool(self):
+        """Create a ShellListSessionsTool instance for testing."""
+        return ShellListSessionsTool()
+
+    def test_list_shell_sessions(self, shell_list_sessions_tool, tmp_path):
+        """Test listing the open sessions."""
+        sessions = ShellSessions(max_sessions=3)
+
+        async def run():
+            session = await sessions.open(str(tmp_path))
+            result = await shell_list_sessions_tool.tool_list_shell_sessions()
+            await sessions.close_all()
+            return session, result
+
+        with patch('tools.shell.list_sessions.shell_sessions', sessions):
+            session, result = asyncio.run(run())
+
+        assert result["success"] is True
+        assert result["count"] == 1
+        assert result["max_sessions"] == 3
+        assert result["sessions"][0]["session"] == session.id
+        assert result["sessions"][0]["cwd"] == str(tmp_path)
+        assert result["sessions"][0]["busy"] is False
+
+    def test_list_no_sessions(self, shell_list_sessions_tool):
+        """Test listing when no session is open."""
+        with patch('tools.shell.list_sessions.shell_sessions', ShellSessions()):
+            result = asyncio.run(shell_list_sessions_tool.tool_list_shell_sessions())
+        assert result["sessions"] == []
+        assert result["count"] == 0
@@ -0,0 +1,59 @@
+"""
+Tests for the Shell Open Session tool.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import patch
+from tools.shell.open_session import ShellOpenSessionTool
+from utils.shell_sessions import ShellSessions
+
+class TestShellOpenSessionTool:
+    """Test cases for ShellOpenSessionTool."""
+
+    @pytest.fixture
+    def shell_open_session_tool(self):
+        """Create a ShellOpenSessionTool instance for testing."""
+        return ShellOpenSessionTool()
+
+    def test_open_shell_session(self, shell_open_session_tool, tmp_path):
+        """Test opening a session in a directory."""
+        sessions = ShellSessions()
+
+        async def run():
+            result = await shell_open_session_tool.tool_open_shell_session(str(tmp_path), {"A": "1"})
+            output, _ = await sessions.get(result["session"]).run("echo $A; pwd")
+            await sessions.close_all()
+            return result, output
+
+        with patch('tools.shell.open_session.shell_sessions', sessions):
+            result, output = asyncio.run(run())
+
+        assert result["success"] is True
+        assert result["cwd"] == str(tmp_path)
+        assert result["idle_timeout"] == sessions.idle_timeout
+        assert output.stdout == f"1\n{tmp_path}\n"
+
+    def test_open_shell_session_limit(self, shell_open_session_tool):
+        """Test that opening more sessions than allowed is refused."""
+        sessions = ShellSessions(max_sessions=1)
+
+        async def run():
+            first = await shell_open_session_tool.tool_open_shell_session()
+            second = await shell_open_session_tool.tool_open_shell_session()
+            await sessions.close_all()
+            return first, second
+
+        with patch('tools.shell.open_session.shell_sessions', sessions):
+            first, second = asyncio.run(run())
+
+        assert first["success"] is True
+        assert second["success"] is False
+        assert "At most 1" in second["error"]
+
+    def test_open_shell_session_invalid_cwd(self, shell_open_session_tool, tmp_path):
+        """Test opening a session in a missing directory."""
+        with patch('tools.shell.open_session.shell_sessions', ShellSessions()):
+            result = asyncio.run(shell_open_session_tool.tool_open_shell_session(str(tmp_path / "missing")))
+        assert result["success"] is False
+        assert "Not a directory" in result["error"]
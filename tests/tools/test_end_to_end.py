@@ -0,0 +1,193 @@
+"""
+End-to-end tests of the tools against the offline stand-ins for the Hypernode CLIs.
+
+Nothing is mocked: the tools run real subprocesses and parse real output.
+"""
+
+import pytest
+import asyncio
+import json
+import time
+from unittest.mock import patch
+from tools.block_attack.active import BlockAttackActiveTool
+from tools.block_attack.block import BlockAttackTool
+from tools.block_attack.list import BlockAttackListTool
+from tools.nginx_logs.analyze import NginxLogsAnalyzeTool
+from tools.nginx_logs.fields import NginxLogsFieldsTool
+from tools.vhosts.batch_modify import VHostsBatchModifyTool
+from tools.vhosts.list import VHostsListTool
+from tools.vhosts.modify import VHostsModifyTool
+from tools.vhosts.reconcile import VHostsReconcileTool
+from tests.fakes.hypernode_cli import LOG_FIELDS, MANAGE_VHOSTS, PARSE_NGINX_LOG, SYSTEMCTL, fixture_path
+from utils.attack_catalogue import ActiveBlocks, AttackCatalogue
+from utils.vhost_state import CliVHostBackend, VHostState
+
+class TestEndToEnd:
+    """Test cases running the tools against the stand-in CLIs."""
+
+    @pytest.fixture
+    def vhost_state(self, fake_hypernode):
+        """Read the vhosts from the stand-in CLI, with a fresh cache."""
+        state = VHostState(CliVHostBackend())
+        with patch('tools.vhosts.list.vhost_state', state), \
+                patch('tools.vhosts.modify.vhost_state', state), \
+                patch('tools.vhosts.batch_modify.vhost_state', state), \
+                patch('tools.vhosts.reconcile.vhost_state', state):
+            yield state
+
+    @pytest.fixture
+    def attack_catalogue(self, fake_hypernode, tmp_path):
+        """Use a fresh attack catalogue and active blocks view."""
+        catalogue = AttackCatalogue()
+        blocks = ActiveBlocks(str(tmp_path / "nginx"))
+        with patch('tools.block_attack.list.attack_catalogue', catalogue), \
+                patch('tools.block_attack.active.attack_catalogue', catalogue), \
+                patch('tools.block_attack.block.attack_catalogue', catalogue), \
+                patch('tools.block_attack.active.active_blocks', blocks), \
+                patch('tools.block_attack.block.active_blocks', blocks):
+            yield catalogue
+
+    def test_list_and_modify_vhosts(self, fake_hypernode, vhost_state):
+        """Test that a modified vhost is listed with its new settings."""
+        listed = asyncio.run(VHostsListTool().tool_list_vhosts())
+        assert listed["success"] is True
+        assert listed["count"] == 3
+
+        modified = asyncio.run(VHostsModifyTool().tool_modify_vhost("example.hypernode.io", "php-version", "8.3"))
+        assert modified["success"] is True
+
+        listed = asyncio.run(VHostsListTool().tool_list_vhosts())
+        assert listed["vhosts"]["example.hypernode.io"]["php_version"] == "8.3"
+
+    def test_reconcile_vhosts(self, fake_hypernode, vhost_state):
+        """Test that reconciling applies the differences in one run and a second pass changes nothing."""
+        desired = {f"new{i}.example.com": {"https": True, "varnish": True} for i in range(5)}
+
+        first = asyncio.run(VHostsReconcileTool().tool_reconcile_vhosts(desired, concurrency=4))
+        second = asyncio.run(VHostsReconcileTool().tool_reconcile_vhosts(desired, refresh=True))
+
+        assert first["success"] is True
+        assert len(first["commands"]) == 1
+        assert second["changes"] == []
+        vhosts = fake_hypernode.vhosts()
+        assert all(vhosts[name]["https"] is True and vhosts[name]["varnish"] is True for name in desired)
+        assert sum(1 for call in fake_hypernode.calls(MANAGE_VHOSTS) if "--list" not in call["args"]) == 1
+
+    def test_reconcile_wildcard_vhost(self, fake_hypernode, vhost_state):
+        """Test that reconciling a wildcard vhost changes that vhost, not a quoted copy of it."""
+        desired = {"*.example.com": {"https": True}}
+
+        first = asyncio.run(VHostsReconcileTool().tool_reconcile_vhosts(desired))
+        second = asyncio.run(VHostsReconcileTool().tool_reconcile_vhosts(desired, refresh=True))
+
+        assert first["success"] is True
+        assert second["changes"] == []
+        vhosts = fake_hypernode.vhosts()
+        assert vhosts["*.example.com"]["https"] is True
+        assert "'*.example.com'" not in vhosts
+
+    def test_batch_modify_vhosts_concurrent_runs(self, fake_hypernode, vhost_state):
+        """Test that concurrent runs of the stand-in do not lose changes."""
+        changes = [{"vhost": f"shop{i}.example.com", "action": "php-version", "value": f"8.{i}"} for i in range(1, 3)]
+
+        result = asyncio.run(VHostsBatchModifyTool().tool_batch_modify_vhosts(changes))
+
+        assert result["success"] is True
+        vhosts = fake_hypernode.vhosts()
+        assert vhosts["shop1.example.com"]["php_version"] == "8.1"
+        assert vhosts["shop2.example.com"]["php_version"] == "8.2"
+
+    def test_batch_modify_wildcard_vhost(self, fake_hypernode, vhost_state):
+        """Test that a wildcard vhost reaches the CLI as typed, without quotes."""
+        changes = [{"vhost": "*.example.com", "action": "https", "value": True}]
+
+        result = asyncio.run(VHostsBatchModifyTool().tool_batch_modify_vhosts(changes))
+
+        assert result["success"] is True
+        assert fake_hypernode.vhosts()["*.example.com"]["https"] is True
+        assert "'*.example.com'" not in fake_hypernode.vhosts()
+        assert fake_hypernode.calls(MANAGE_VHOSTS)[-1]["args"] == ["*.example.com", "--https"]
+
+    def test_attacks_catalogue_and_blocks(self, fake_hypernode, attack_catalogue):
+        """Test listing attacks once, blocking one and seeing it active."""
+        first = asyncio.run(BlockAttackListTool().tool_list_attacks())
+        second = asyncio.run(BlockAttackListTool().tool_list_attacks())
+        assert first["success"] is True
+        assert "BlockChinaBruteForce" in [attack["name"] for attack in first["attacks"]]
+        assert second["attacks"] == first["attacks"]
+        # The catalogue is cached while the binary is unchanged
+        assert len(fake_hypernode.calls(SYSTEMCTL)) == 1
+
+        blocked = asyncio.run(BlockAttackTool().tool_block_attack("BlockChinaBruteForce"))
+        assert blocked["success"] is True
+        assert fake_hypernode.blocked() == ["BlockChinaBruteForce"]
+
+        active = asyncio.run(BlockAttackActiveTool().tool_list_active_blocks())
+        assert [block["name"] for block in active["active"]] == ["BlockChinaBruteForce"]
+        assert active["active"][0]["files"] == ["server.block_blockchinabruteforce.conf"]
+
+    def test_block_unknown_attack(self, fake_hypernode, attack_catalogue):
+        """Test that the stand-in rejects an attack type it does not offer."""
+        result = asyncio.run(BlockAttackTool().tool_block_attack("BlockMars"))
+        assert result["success"] is False
+        assert fake_hypernode.blocked() == []
+
+    def test_analyze_nginx_logs(self, fake_hypernode, monkeypatch, tmp_path):
+        """Test analyzing generated logs through pnl and a filter."""
+        monkeypatch.setenv("HYPERNODE_NGINX_LOG_DIR", str(tmp_path / "nolog"))
+        monkeypatch.setenv("FAKE_HYPERNODE_LOG_LINES", "5000")
+
+        by_country = asyncio.run(NginxLogsAnalyzeTool().tool_analyze_nginx_logs(unique_by_field="country", limit=3))
+        limited = asyncio.run(NginxLogsAnalyzeTool().tool_analyze_nginx_logs(filter="status=404", limit=10))
+
+        assert by_country["success"] is True
+        counts = [line.split() for line in by_country["result"].splitlines()]
+        assert [country for _, country in counts][0] == "NL"
+        assert len(counts) == 3
+        assert limited["success"] is True
+        assert len(limited["result"].splitlines()) == 10
+        assert all("\t404\t" in line for line in limited["result"].splitlines())
+
+    def test_analyze_nginx_logs_reads_access_log(self, fake_hypernode, monkeypatch, tmp_path):
+        """Test that pnl reads the access log in HYPERNODE_NGINX_LOG_DIR when there is one."""
+        (tmp_path / "access.log").write_text("".join(
+            json.dumps({"remote_addr": ip, "status": "200"}) + "\n" for ip in ["10.0.0.1", "10.0.0.2", "10.0.0.1"]
+        ))
+        monkeypatch.setenv("HYPERNODE_NGINX_LOG_DIR", str(tmp_path))
+
+        result = asyncio.run(NginxLogsAnalyzeTool().tool_analyze_nginx_logs(unique_by_field="remote_addr"))
+
+        assert result["result"] == "      2 10.0.0.1\n      1 10.0.0.2"
+
+    def test_fields_replayed_from_fixture(self, fake_hypernode):
+        """Test that the recorded pnl --list-fields output is replayed."""
+        result = asyncio.run(NginxLogsFieldsTool().tool_analyze_nginx_logs_fields())
+        assert result["success"] is True
+        assert result["fields"] == list(LOG_FIELDS)
+
+    def test_recorded_fixture_with_exit_status(self, fake_hypernode, monkeypatch, tmp_path):
+        """Test that a recorded failure is replayed with its stderr and exit status."""
+        path = fixture_path(PARSE_NGINX_LOG, ["--list-fields"], str(tmp_path))
+        (tmp_path / PARSE_NGINX_LOG).mkdir()
+        with open(path + ".out", 'w') as f:
+            f.write("")
+        with open(path + ".err", 'w') as f:
+            f.write("pnl: no access log found")
+        with open(path + ".rc", 'w') as f:
+            f.write("1")
+        monkeypatch.setenv("FAKE_HYPERNODE_FIXTURES", str(tmp_path))
+
+        result = asyncio.run(NginxLogsFieldsTool().tool_analyze_nginx_logs_fields())
+
+        assert result["success"] is False
+        assert result["error"] == "pnl: no access log found"
+
+    def test_latency(self, fake_hypernode, monkeypatch, vhost_state):
+        """Test that the configured latency applies to the named CLI only."""
+        monkeypatch.setenv("FAKE_HYPERNODE_LATENCY", f"{MANAGE_VHOSTS}=0.5,{SYSTEMCTL}=5")
+
+        started = time.monotonic()
+        result = asyncio.run(VHostsListTool().tool_list_vhosts())
+
+        assert result["success"] is True
+        assert 0.5 <= time.monotonic() - started < 5
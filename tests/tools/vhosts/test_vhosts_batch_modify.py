@@ -0,0 +1,73 @@
+"""
+Tests for the VHosts Batch Modify tool.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import patch
+from tools.vhosts.batch_modify import VHostsBatchModifyTool
+from utils.command_executor import CommandResult
+
+
+def command_result(command, success=True):
+    return CommandResult(
+        success=success,
+        stdout="ok" if success else "",
+        stderr="" if success else "failed",
+        return_code=0 if success else 1,
+        command=command
+    )
+
+
+class TestVHostsBatchModifyTool:
+    """Test cases for VHostsBatchModifyTool."""
+
+    @pytest.fixture
+    def vhosts_batch_modify_tool(self):
+        """Create a VHostsBatchModifyTool instance for testing."""
+        return VHostsBatchModifyTool()
+
+    @patch('utils.vhost_changes.CommandExecutor.execute_command')
+    def test_batch_runs_one_command_per_change_set(self, mock_execute_command, vhosts_batch_modify_tool):
+        """Test that 40 identical changes are applied in a single run."""
+        mock_execute_command.side_effect = lambda command, timeout: command_result(command)
+        changes = [{"vhost": f"shop{i}.example.com", "action": "force_https", "value": "true"} for i in range(40)]
+
+        result = asyncio.run(vhosts_batch_modify_tool.tool_batch_modify_vhosts(changes))
+
+        assert result["success"] is True
+        assert result["count"] == 40
+        assert len(result["commands"]) == 1
+        assert mock_execute_command.call_count == 1
+        assert [item["vhost"] for item in result["results"]] == [change["vhost"] for change in changes]
+
+    @patch('utils.vhost_changes.CommandExecutor.execute_command')
+    def test_batch_results_per_item(self, mock_execute_command, vhosts_batch_modify_tool):
+        """Test that a failing run only fails the changes it made."""
+        mock_execute_command.side_effect = lambda command, timeout: command_result(command, "b.example.com" not in command)
+
+        result = asyncio.run(vhosts_batch_modify_tool.tool_batch_modify_vhosts([
+            {"vhost": "a.example.com", "action": "https", "value": "true"},
+            {"vhost": "b.example.com", "action": "php", "value": "8.2"},
+            {"vhost": "a.example.com", "action": "varnish", "value": "false"},
+        ]))
+
+        assert result["success"] is False
+        assert result["failed"] == 1
+        assert [(item["vhost"], item["success"]) for item in result["results"]] == [
+            ("a.example.com", True), ("b.example.com", False), ("a.example.com", True)
+        ]
+        assert result["results"][1]["result"] == "failed"
+        assert mock_execute_command.call_count == 2
+
+    @patch('utils.vhost_changes.CommandExecutor.execute_command')
+    def test_batch_invalid_change_applies_nothing(self, mock_execute_command, vhosts_batch_modify_tool):
+        """Test that nothing is applied when any change is invalid."""
+        result = asyncio.run(vhosts_batch_modify_tool.tool_batch_modify_vhosts([
+            {"vhost": "a.example.com", "action": "https", "value": "true"},
+            {"vhost": "b.example.com", "action": "php", "value": "8.2; reboot"},
+        ]))
+
+        assert result["success"] is False
+        assert result["errors"][0]["index"] == 1
+        mock_execute_command.assert_not_called()
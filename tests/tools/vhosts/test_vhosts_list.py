@@ -4,8 +4,10 @@ Tests for the VHosts List tool.
 
 import pytest
 import asyncio
+import time
 from unittest.mock import AsyncMock, patch
 from tools.vhosts.list import VHostsListTool
+from tests.utils.test_nginx_log import write_log
 
 
 class TestVHostsListTool:
@@ -20,7 +22,7 @@ class TestVHostsListTool:
         """Test that VHostsListTool can be instantiated."""
         assert isinstance(vhosts_list_tool, VHostsListTool)
 
-    @patch('tools.vhosts.list.CommandExecutor.execute_json_command')
+    @patch('utils.vhost_state.CommandExecutor.execute_json_command')
     def test_list_vhosts_success(self, mock_execute_json, vhosts_list_tool):
         """Test successful vhost listing."""
         # Mock successful response
@@ -43,7 +45,7 @@ class TestVHostsListTool:
         assert result["count"] == 1
         mock_execute_json.assert_called_once_with("hypernode-manage-vhosts --list --format json")
 
-    @patch('tools.vhosts.list.CommandExecutor.execute_json_command')
+    @patch('utils.vhost_state.CommandExecutor.execute_json_command')
     def test_list_vhosts_failure(self, mock_execute_json, vhosts_list_tool):
         """Test vhost listing failure."""
         # Mock failure response
@@ -56,7 +58,7 @@ class TestVHostsListTool:
         assert result["vhosts"] == {}
         mock_execute_json.assert_called_once_with("hypernode-manage-vhosts --list --format json")
 
-    @patch('tools.vhosts.list.CommandExecutor.execute_json_command')
+    @patch('utils.vhost_state.CommandExecutor.execute_json_command')
     def test_list_vhosts_empty_result(self, mock_execute_json, vhosts_list_tool):
         """Test vhost listing with empty result."""
         # Mock empty response
@@ -68,7 +70,7 @@ class TestVHostsListTool:
         assert result["vhosts"] == {}
         assert result["count"] == 0
 
-    @patch('tools.vhosts.list.CommandExecutor.execute_json_command')
+    @patch('utils.vhost_state.CommandExecutor.execute_json_command')
     def test_list_vhosts_multiple_vhosts(self, mock_execute_json, vhosts_list_tool):
         """Test vhost listing with multiple vhosts."""
         # Mock multiple vhosts response
@@ -85,7 +87,7 @@ class TestVHostsListTool:
         assert result["vhosts"] == mock_vhosts
         assert result["count"] == 3
 
-    @patch('tools.vhosts.list.CommandExecutor.execute_json_command')
+    @patch('utils.vhost_state.CommandExecutor.execute_json_command')
     def test_list_vhosts_non_dict_result(self, mock_execute_json, vhosts_list_tool):
         """Test vhost listing with non-dict result."""
         # Mock non-dict response
@@ -104,11 +106,49 @@ class TestVHostsListTool:
 
     def test_vhosts_list_tool_return_structure(self, vhosts_list_tool):
         """Test that tool_list_vhosts returns the correct data structure."""
-        with patch('tools.vhosts.list.CommandExecutor.execute_json_command') as mock_execute_json:
+        with patch('utils.vhost_state.CommandExecutor.execute_json_command') as mock_execute_json:
             mock_execute_json.return_value = (True, {})
             result = asyncio.run(vhosts_list_tool.tool_list_vhosts())
             
             required_keys = {"success", "vhosts", "count"}
             assert set(result.keys()) == required_keys
             assert isinstance(result["success"], bool)
-            assert isinstance(result["count"], int) 
\ No newline at end of file
+            assert isinstance(result["count"], int) 
+    @pytest.fixture
+    def access_log(self, tmp_path, monkeypatch):
+        """Log 30 requests for example.com in the last five minutes."""
+        now = int(time.time())
+        write_log(tmp_path / "access.log", now - 300, now)
+        monkeypatch.setenv("HYPERNODE_NGINX_LOG_DIR", str(tmp_path))
+
+    @patch('utils.vhost_state.CommandExecutor.execute_json_command')
+    def test_list_vhosts_with_traffic(self, mock_execute_json, vhosts_list_tool, access_log):
+        """Test joining the vhosts with their recent traffic."""
+        vhosts = {"example.com": {"https": True}, "idle.hypernode.io": {"https": False}}
+        mock_execute_json.return_value = (True, vhosts)
+
+        result = asyncio.run(vhosts_list_tool.tool_list_vhosts(traffic_minutes=10))
+
+        assert result["success"] is True
+        assert result["traffic_minutes"] == 10
+        assert len(result["traffic_logs"]) == 1
+        assert result["other_hosts"] == []
+        traffic = result["vhosts"]["example.com"]["traffic"]
+        assert traffic["requests"] == 30
+        assert traffic["requests_per_minute"] == 3.0
+        assert traffic["bytes_sent"] == 3000
+        assert result["vhosts"]["example.com"]["https"] is True
+        assert result["vhosts"]["idle.hypernode.io"]["traffic"]["requests"] == 0
+        # The cached settings are left as the backend returned them
+        assert "traffic" not in vhosts["example.com"]
+
+    @patch('utils.vhost_state.CommandExecutor.execute_json_command')
+    def test_list_vhosts_traffic_without_vhost(self, mock_execute_json, vhosts_list_tool, access_log):
+        """Test that traffic for hosts without a vhost is reported separately."""
+        mock_execute_json.return_value = (True, {"idle.hypernode.io": {}})
+
+        result = asyncio.run(vhosts_list_tool.tool_list_vhosts(traffic_minutes=10))
+
+        assert result["vhosts"]["idle.hypernode.io"]["traffic"]["requests"] == 0
+        assert [item["host"] for item in result["other_hosts"]] == ["example.com"]
+        assert result["other_hosts"][0]["requests"] == 30
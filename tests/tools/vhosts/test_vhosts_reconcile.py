@@ -0,0 +1,100 @@
+"""
+Tests for the VHosts Reconcile tool.
+"""
+
+import pytest
+import asyncio
+from unittest.mock import patch
+from tools.vhosts.reconcile import VHostsReconcileTool
+from utils.command_executor import CommandResult
+from utils.vhost_state import VHostState
+
+CURRENT = {
+    f"shop{i}.example.com": {"https": True, "force_https": False, "type": "magento2", "varnish": False}
+    for i in range(200)
+}
+
+
+class TestVHostsReconcileTool:
+    """Test cases for VHostsReconcileTool."""
+
+    @pytest.fixture
+    def vhosts_reconcile_tool(self):
+        """Create a VHostsReconcileTool instance for testing."""
+        return VHostsReconcileTool()
+
+    @pytest.fixture
+    def mock_cli(self):
+        """Mock the vhost listing and modification commands."""
+        with patch('utils.vhost_state.CommandExecutor.execute_json_command') as mock_list, \
+             patch('utils.vhost_changes.CommandExecutor.execute_command') as mock_modify, \
+             patch('tools.vhosts.reconcile.vhost_state', VHostState(ttl=60)):
+            mock_list.return_value = (True, CURRENT)
+            mock_modify.side_effect = lambda command, timeout: CommandResult(True, "ok", "", 0, command)
+            yield mock_list, mock_modify
+
+    def test_no_op_costs_a_single_read(self, vhosts_reconcile_tool, mock_cli):
+        """Test that reconciling an up-to-date node changes nothing."""
+        mock_list, mock_modify = mock_cli
+        result = asyncio.run(vhosts_reconcile_tool.tool_reconcile_vhosts(CURRENT))
+
+        assert result["success"] is True
+        assert result["changes"] == []
+        assert len(result["unchanged"]) == 200
+        mock_list.assert_called_once()
+        mock_modify.assert_not_called()
+
+    def test_dry_run(self, vhosts_reconcile_tool, mock_cli):
+        """Test that a dry run only returns the plan."""
+        mock_list, mock_modify = mock_cli
+        desired = {vhost: {**settings, "force_https": True} for vhost, settings in CURRENT.items()}
+        desired["new.example.com"] = {"type": "wordpress"}
+
+        result = asyncio.run(vhosts_reconcile_tool.tool_reconcile_vhosts(desired, dry_run=True))
+
+        assert result["success"] is True
+        assert result["dry_run"] is True
+        assert len(result["changes"]) == 201
+        assert result["created"] == ["new.example.com"]
+        # 200 vhosts getting the same change share runs of at most 50 vhosts
+        assert len(result["commands"]) == 5
+        assert "results" not in result
+        mock_modify.assert_not_called()
+
+    def test_apply_changes(self, vhosts_reconcile_tool, mock_cli):
+        """Test that only the differences are applied and the state is read again afterwards."""
+        mock_list, mock_modify = mock_cli
+        desired = {
+            "shop1.example.com": {"https": True, "varnish": True},
+            "shop2.example.com": {"type": "magento2"},
+        }
+
+        result = asyncio.run(vhosts_reconcile_tool.tool_reconcile_vhosts(desired, concurrency=2))
+
+        assert result["success"] is True
+        assert result["commands"] == ["hypernode-manage-vhosts shop1.example.com --varnish"]
+        assert result["unchanged"] == ["shop2.example.com"]
+        assert len(result["unmanaged"]) == 198
+        assert result["results"][0]["success"] is True
+        mock_modify.assert_called_once()
+
+        asyncio.run(vhosts_reconcile_tool.tool_reconcile_vhosts(desired, dry_run=True))
+        assert mock_list.call_count == 2
+
+    def test_invalid_desired_state(self, vhosts_reconcile_tool, mock_cli):
+        """Test that nothing is applied when the desired state is invalid."""
+        mock_list, mock_modify = mock_cli
+        result = asyncio.run(vhosts_reconcile_tool.tool_reconcile_vhosts({"shop1.example.com": {"php": "8.2 && reboot"}}))
+
+        assert result["success"] is False
+        assert result["errors"][0]["setting"] == "php"
+        mock_modify.assert_not_called()
+
+    def test_listing_failure(self, vhosts_reconcile_tool, mock_cli):
+        """Test when the current vhosts can not be read."""
+        mock_list, _ = mock_cli
+        mock_list.return_value = (False, "Command failed")
+        result = asyncio.run(vhosts_reconcile_tool.tool_reconcile_vhosts({}))
+
+        assert result["success"] is False
+        assert result["error"] == "Command failed"
@@ -0,0 +1,130 @@
+"""
+Tests for the artifact store utilities.
+"""
+
+import asyncio
+import os
+import pytest
+from utils.artifacts import PREVIEW_BYTES, ArtifactStore
+
+
+class TestArtifactStore:
+    """Test cases for ArtifactStore."""
+
+    def test_small_output_not_spilled(self, tmp_path):
+        """Test that output within the threshold is returned as is."""
+        store = ArtifactStore(str(tmp_path), threshold=100)
+        assert store.spill("x" * 100, "tool") == ("x" * 100, None)
+        assert os.listdir(tmp_path) == []
+
+    def test_large_output_spilled(self, tmp_path):
+        """Test that output above the threshold is kept on disk with a preview."""
+        store = ArtifactStore(str(tmp_path), threshold=100)
+        text = "".join(f"line {i}\n" for i in range(2000))
+
+        preview, artifact = store.spill(text, "tool")
+
+        assert preview == text[:PREVIEW_BYTES]
+        assert artifact.size == len(text)
+        assert artifact.lines == 2000
+        assert artifact.truncated is False
+        assert artifact.to_dict()["source"] == "tool"
+        with open(artifact.path) as f:
+            assert f.read() == text
+
+    def test_multibyte_output_measured_in_bytes(self, tmp_path):
+        """Test that the threshold applies to the encoded output."""
+        store = ArtifactStore(str(tmp_path), threshold=100)
+        _, artifact = store.spill("é" * 60, "tool")
+        assert artifact.size == 120
+        assert artifact.lines == 1
+
+    def test_writer_spills_while_writing(self, tmp_path):
+        """Test that a writer moves to disk once past the threshold."""
+        store = ArtifactStore(str(tmp_path), threshold=10)
+        writer = store.writer("tool")
+        writer.write("12345")
+        assert os.listdir(tmp_path) == []
+        writer.write("67890abc")
+        assert len(os.listdir(tmp_path)) == 1
+        writer.write("\nend\n")
+
+        _, artifact = writer.finish()
+        assert store.read_range(artifact.id).content == "1234567890abc\nend\n"
+        assert artifact.lines == 2
+
+    def test_writer_discard(self, tmp_path):
+        """Test that discarded output leaves nothing behind."""
+        store = ArtifactStore(str(tmp_path), threshold=10)
+        writer = store.writer("tool")
+        writer.write("x" * 100)
+        writer.discard()
+        assert os.listdir(tmp_path) == []
+        assert store.list() == []
+
+    def test_writer_async_buffers_writes(self, tmp_path, monkeypatch):
+        """Test that writes from the event loop reach disk in batches, through a thread."""
+        monkeypatch.setattr("utils.artifacts.FLUSH_SIZE", 100)
+        store = ArtifactStore(str(tmp_path), threshold=10)
+        writer = store.writer("tool")
+
+        async def run():
+            await writer.write_async("x" * 60)
+            spilled_early = os.listdir(tmp_path)
+            await writer.write_async("y" * 60)
+            spilled = os.listdir(tmp_path)
+            await writer.write_async("z\n")
+            return spilled_early, spilled, await writer.finish_async()
+
+        spilled_early, spilled, (preview, artifact) = asyncio.run(run())
+        assert spilled_early == []
+        assert len(spilled) == 1
+        assert preview.startswith("x" * 60)
+        assert store.read_range(artifact.id).content == "x" * 60 + "y" * 60 + "z\n"
+
+    def test_writer_discard_async(self, tmp_path, monkeypatch):
+        """Test that discarding from the event loop drops buffered and written output."""
+        monkeypatch.setattr("utils.artifacts.FLUSH_SIZE", 10)
+        store = ArtifactStore(str(tmp_path), threshold=10)
+        writer = store.writer("tool")
+
+        async def run():
+            await writer.write_async("x" * 100)
+            await writer.write_async("y")
+            await writer.discard_async()
+
+        asyncio.run(run())
+        assert os.listdir(tmp_path) == []
+        assert store.list() == []
+
+    def test_output_capped_at_capacity(self, tmp_path):
+        """Test that a single output is cut off at the capacity of the store."""
+        store = ArtifactStore(str(tmp_path), threshold=10, max_bytes=50)
+        _, artifact = store.spill("x" * 80, "tool")
+        assert artifact.size == 50
+        assert artifact.truncated is True
+
+    def test_lru_eviction(self, tmp_path):
+        """Test that the least recently used artifacts are evicted to make room."""
+        store = ArtifactStore(str(tmp_path), threshold=10, max_bytes=100)
+        _, first = store.spill("a" * 40, "tool")
+        _, second = store.spill("b" * 40, "tool")
+        # Using the first artifact makes the second the least recently used
+        store.get(first.id)
+        _, third = store.spill("c" * 40, "tool")
+
+        assert [artifact.id for artifact in store.list()] == [first.id, third.id]
+        assert not os.path.exists(second.path)
+        with pytest.raises(KeyError):
+            store.get(second.id)
+        assert store.stats()["bytes"] == 80
+        assert store.stats()["evicted"] == 1
+
+    def test_read_lines_and_tail(self, tmp_path):
+        """Test reading lines of an artifact."""
+        store = ArtifactStore(str(tmp_path), threshold=10)
+        _, artifact = store.spill("".join(f"{i}\n" for i in range(100)), "tool")
+
+        assert store.read_lines(artifact.id, 10, 3).content == "10\n11\n12\n"
+        assert store.tail_lines(artifact.id, 2).content == "98\n99\n"
+        assert store.read_range(artifact.id, -3, 3).content == "99\n"
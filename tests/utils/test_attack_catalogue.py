@@ -0,0 +1,144 @@
+"""
+Tests for the attack catalogue utilities.
+"""
+
+import asyncio
+import os
+import pytest
+from unittest.mock import patch
+from utils.attack_catalogue import HELP_COMMAND, ActiveBlocks, AttackCatalogue
+from utils.command_executor import CommandResult
+
+HELP_OUTPUT = (
+    "usage: hypernode-systemctl block_attack [OPTIONS] ATTACK_TYPE\n\n"
+    "The possible values are:\n"
+    "BlockChinaBruteForce\tBlock brute force attacks from China\n"
+    "BlockSqliBruteForce\tBlock SQL injection brute forcing\n"
+)
+
+
+def help_result(success=True):
+    return CommandResult(
+        success=success, stdout=HELP_OUTPUT if success else "", stderr="" if success else "failed",
+        return_code=0 if success else 1, command=HELP_COMMAND
+    )
+
+
+@pytest.fixture
+def systemctl(tmp_path, monkeypatch):
+    """Put a hypernode-systemctl binary on PATH."""
+    binary = tmp_path / "bin" / "hypernode-systemctl"
+    binary.parent.mkdir()
+    binary.write_text("#!/bin/sh\n")
+    binary.chmod(0o755)
+    monkeypatch.setenv("PATH", str(binary.parent))
+    return binary
+
+
+class TestAttackCatalogue:
+    """Test cases for AttackCatalogue."""
+
+    @patch('utils.attack_catalogue.CommandExecutor.execute_command')
+    def test_catalogue_is_cached(self, mock_execute_command, systemctl):
+        """Test that the help is parsed once until the binary changes."""
+        mock_execute_command.return_value = help_result()
+        catalogue = AttackCatalogue()
+
+        success, first = asyncio.run(catalogue.load())
+        success, second = asyncio.run(catalogue.load())
+        assert success is True
+        assert second is first
+        assert first.names == ["BlockChinaBruteForce", "BlockSqliBruteForce"]
+        mock_execute_command.assert_called_once_with(HELP_COMMAND)
+
+        os.utime(systemctl, ns=(0, 1))
+        asyncio.run(catalogue.load())
+        catalogue.invalidate()
+        asyncio.run(catalogue.load())
+        assert mock_execute_command.call_count == 3
+        assert catalogue.stats() == {"cached": True, "loads": 3, "hits": 1}
+
+    @patch('utils.attack_catalogue.CommandExecutor.execute_command')
+    def test_catalogue_without_binary(self, mock_execute_command, tmp_path, monkeypatch):
+        """Test that nothing is cached when the binary is not on PATH."""
+        monkeypatch.setenv("PATH", str(tmp_path))
+        mock_execute_command.return_value = help_result()
+        catalogue = AttackCatalogue()
+
+        asyncio.run(catalogue.load())
+        asyncio.run(catalogue.load())
+        assert mock_execute_command.call_count == 2
+
+    @patch('utils.attack_catalogue.CommandExecutor.execute_command')
+    def test_failure_is_not_cached(self, mock_execute_command, systemctl):
+        """Test that a failed help run is reported and not cached."""
+        mock_execute_command.return_value = help_result(success=False)
+        catalogue = AttackCatalogue()
+
+        assert asyncio.run(catalogue.load()) == (False, "failed")
+        assert catalogue.stats()["cached"] is False
+
+
+class TestActiveBlocks:
+    """Test cases for ActiveBlocks."""
+
+    def test_active_blocks(self, tmp_path):
+        """Test finding blocks by snippet name and content."""
+        (tmp_path / "server.block_china_bruteforce").write_text("deny all;")
+        (tmp_path / "server.custom").write_text("set $blocked BlockSqliBruteForce;\nif ($args ~* union) { return 403; }")
+        (tmp_path / "server.rewrites").write_text("rewrite ^/old /new;")
+        blocks = ActiveBlocks(str(tmp_path))
+
+        active = blocks.active(["BlockChinaBruteForce", "BlockSqliBruteForce", "BlockAhrefsBot"])
+        assert active == {
+            "BlockChinaBruteForce": {"files": ["server.block_china_bruteforce"], "blocked_by_server": False},
+            "BlockSqliBruteForce": {"files": ["server.custom"], "blocked_by_server": False}
+        }
+
+    def test_names_match_whole(self, tmp_path):
+        """Test that a name that is the prefix of another, or only mentioned in a comment, is not active."""
+        (tmp_path / "server.block_foo_bruteforce_strict.conf").write_text("deny all;")
+        (tmp_path / "server.custom").write_text("set $blocked BlockBarBruteForceStrict;\n# Replaces BlockChinaBruteForce")
+        blocks = ActiveBlocks(str(tmp_path))
+
+        names = ["BlockFooBruteForce", "BlockFooBruteForceStrict", "BlockBarBruteForce", "BlockChinaBruteForce"]
+        assert blocks.active(names) == {
+            "BlockFooBruteForceStrict": {"files": ["server.block_foo_bruteforce_strict.conf"], "blocked_by_server": False}
+        }
+
+    def test_scan_is_cached(self, tmp_path):
+        """Test that the directory is scanned again only when it changes."""
+        snippet = tmp_path / "server.block"
+        snippet.write_text("# nothing yet")
+        blocks = ActiveBlocks(str(tmp_path))
+
+        assert blocks.active(["BlockChinaBruteForce"]) == {}
+        assert blocks.active(["BlockChinaBruteForce"]) == {}
+        assert (blocks.scans, blocks.hits) == (1, 1)
+
+        snippet.write_text("set $blocked BlockChinaBruteForce;")
+        os.utime(snippet, ns=(0, 1))
+        assert "BlockChinaBruteForce" in blocks.active(["BlockChinaBruteForce"])
+        assert blocks.scans == 2
+
+    def test_record_block(self, tmp_path):
+        """Test that blocks made through the server are reported."""
+        blocks = ActiveBlocks(str(tmp_path / "missing"))
+        blocks.active([])
+        blocks.record_block("BlockChinaBruteForce")
+
+        assert blocks.active([]) == {"BlockChinaBruteForce": {"files": [], "blocked_by_server": True}}
+        assert blocks.scans == 2
+
+    def test_block_removed_by_hand(self, tmp_path):
+        """Test that a block made through the server is no longer reported once its snippet is removed."""
+        blocks = ActiveBlocks(str(tmp_path))
+        blocks.record_block("BlockChinaBruteForce")
+        snippet = tmp_path / "server.block_blockchinabruteforce.conf"
+        snippet.write_text("deny all;")
+        assert blocks.active(["BlockChinaBruteForce"]) == {
+            "BlockChinaBruteForce": {"files": [snippet.name], "blocked_by_server": True}
+        }
+
+        snippet.unlink()
+        assert blocks.active(["BlockChinaBruteForce"]) == {}
@@ -0,0 +1,174 @@
+"""
+Tests for the attack detection utilities.
+"""
+
+import os
+import time
+import pytest
+from utils.attack_detection import (
+    AttackDetector, CountMinSketch, LogFollower, SlidingCounter, network, suggest_attacks
+)
+from utils.nginx_log import line_time, parse_line
+from tests.utils.test_attack_rules import BASE, entry
+
+ATTACKS = [
+    {"name": "BlockChinaBruteForce", "description": "Block brute force attacks from China"},
+    {"name": "BlockAhrefsBot", "description": "Block AhrefsBot"},
+    {"name": "BlockDDoS", "description": "Block DDoS attacks"},
+]
+
+
+def feed(detector, lines):
+    for line in lines:
+        detector.feed(line_time(line.encode()), parse_line(line.encode()))
+
+
+class TestSlidingCounter:
+    """Test cases for the sliding window counters."""
+
+    def test_count_min_sketch(self):
+        """Test that estimates never undercount."""
+        sketch = CountMinSketch(width=64, depth=4)
+        for i in range(500):
+            sketch.add(sketch.indexes(f"key{i % 50}"))
+        assert all(sketch.estimate(sketch.indexes(f"key{i}")) >= 10 for i in range(50))
+
+    def test_window_expires(self):
+        """Test that counts age out of the window."""
+        counter = SlidingCounter(window=60, buckets=6)
+        for second in range(60):
+            counter.add(BASE + second, "10.0.0.1", {})
+        assert counter.estimate("10.0.0.1") == 60
+        assert counter.rate(counter.estimate("10.0.0.1")) == 60.0
+
+        # The window moves a bucket of ten seconds at a time, keeping 40-59
+        counter.add(BASE + 90, "10.0.0.2", {})
+        assert counter.estimate("10.0.0.1") == 20
+        counter.add(BASE + 200, "10.0.0.2", {})
+        assert counter.estimate("10.0.0.1") == 0
+        assert [key for key, _, _ in counter.top()] == ["10.0.0.2"]
+
+    def test_heavy_hitters_are_bounded(self):
+        """Test that the heavy hitter table keeps the heaviest keys in bounded memory."""
+        counter = SlidingCounter(window=60, heavy_hitters=4)
+        for i in range(1000):
+            counter.add(BASE, f"10.0.1.{i % 250}", {})
+            if i % 10 == 0:
+                counter.add(BASE, "10.0.0.1", {"remote_addr": "10.0.0.1"})
+        top = counter.top()
+        assert len(top) == 4
+        assert top[0][:2] == ("10.0.0.1", 100)
+        assert top[0][2] == {"remote_addr": "10.0.0.1"}
+
+    def test_network(self):
+        """Test grouping addresses by network."""
+        assert network("1.2.3.4") == "1.2.3.0/24"
+        assert network("2001:db8::1") == "2001:db8::/64"
+        assert network("unknown") == "unknown"
+
+
+class TestAttackDetector:
+    """Test cases for the attack detector."""
+
+    def test_brute_force_and_crawler(self):
+        """Test spotting brute forcing and crawler bursts, and suggesting blocks for them."""
+        detector = AttackDetector(window=60)
+        lines = []
+        for second in range(60):
+            lines.append(entry(BASE + second, "1.2.3.4", country="CN", request="POST /admin HTTP/1.1", status="403"))
+            for _ in range(2):
+                lines.append(entry(BASE + second, "8.8.4.4", user_agent="Mozilla/5.0 (compatible; AhrefsBot/7.0)"))
+            lines.append(entry(BASE + second, "5.6.7.8"))
+        feed(detector, lines)
+
+        findings = {(finding.kind, finding.key): finding for finding in detector.findings(now=BASE + 59)}
+        assert findings[("brute_force", "1.2.3.4")].requests_per_minute == 60.0
+        assert findings[("crawler_burst", "Mozilla/5.0 (compatible; AhrefsBot/7.0)")].requests_per_minute == 120.0
+        assert ("ip_flood", "5.6.7.8") not in findings
+
+        suggestions = suggest_attacks(detector.findings(now=BASE + 59), ATTACKS)
+        assert [suggestion["attack_type"] for suggestion in suggestions] == ["BlockAhrefsBot", "BlockChinaBruteForce"]
+        evidence = suggestions[1]["evidence"][0]
+        assert evidence["kind"] == "brute_force"
+        assert evidence["last_request"]["country"] == "CN"
+        assert evidence["last_request"]["looks_legitimate"] is False
+
+    def test_quiet_traffic(self):
+        """Test that normal traffic gives no findings."""
+        detector = AttackDetector(window=60)
+        feed(detector, [entry(BASE + second, f"10.0.0.{second}") for second in range(60)])
+        assert detector.findings(now=BASE + 59) == []
+        assert suggest_attacks([], ATTACKS) == []
+
+    def test_findings_expire_when_log_is_quiet(self):
+        """Test that a burst is no longer reported once the window has moved past it without new requests."""
+        detector = AttackDetector(window=60)
+        feed(detector, [entry(BASE + second, "1.2.3.4", request="POST /admin HTTP/1.1") for second in range(60)])
+        assert [finding.kind for finding in detector.findings(now=BASE + 59)] == ["brute_force"]
+        assert detector.findings(now=BASE + 200) == []
+        assert detector.findings() == []
+
+
+class TestLogFollower:
+    """Test cases for the log follower."""
+
+    def test_follow_log(self, tmp_path):
+        """Test backfilling the window, reading appended lines and a rotation."""
+        path = tmp_path / "access.log"
+        now = time.time()
+        with open(path, 'w') as f:
+            f.write(entry(now - 3600, "10.0.0.1"))
+            f.write(entry(now - 10, "10.0.0.2"))
+        follower = LogFollower(AttackDetector(window=60), str(path))
+
+        # Only the window is backfilled
+        assert follower.poll() == 1
+
+        # A line still being written is read once complete
+        with open(path, 'a') as f:
+            line = entry(now, "10.0.0.3")
+            f.write(line[:20])
+        assert follower.poll() == 0
+        with open(path, 'a') as f:
+            f.write(line[20:])
+            f.write(entry(now, "10.0.0.4"))
+        assert follower.poll() == 2
+
+        # The rest of the rotated log is read before the new one
+        with open(path, 'a') as f:
+            f.write(entry(now, "10.0.0.5"))
+        os.rename(path, tmp_path / "access.log.1")
+        with open(path, 'w') as f:
+            f.write(entry(now, "10.0.0.6"))
+        assert follower.poll() == 2
+        assert follower.stats()["rotations"] == 1
+        assert follower.detector.requests == 5
+        follower.close()
+
+    def test_skip_to_window_after_idle(self, tmp_path, monkeypatch):
+        """Test that lines appended while idle for longer than the window are skipped, not parsed."""
+        path = tmp_path / "access.log"
+        now = time.time()
+        with open(path, 'w') as f:
+            f.write(entry(now - 7200, "10.0.0.1"))
+        follower = LogFollower(AttackDetector(window=60), str(path))
+        monkeypatch.setattr(time, "time", lambda: now - 7190)
+        assert follower.poll() == 1
+        read = follower.bytes_read
+
+        backlog = "".join(entry(now - 7000 + second, "10.0.0.2") for second in range(5000))
+        recent = entry(now - 10, "10.0.0.3")
+        with open(path, 'a') as f:
+            f.write(backlog)
+            f.write(recent)
+        monkeypatch.setattr(time, "time", lambda: now)
+        assert follower.poll() == 1
+        assert follower.bytes_read - read == len(recent)
+        assert follower.detector.requests == 2
+        follower.close()
+
+    def test_missing_log(self, tmp_path):
+        """Test that a missing log is reported."""
+        follower = LogFollower(AttackDetector(), str(tmp_path / "access.log"))
+        with pytest.raises(OSError):
+            follower.poll()
@@ -0,0 +1,110 @@
+"""
+Tests for the attack rule utilities.
+"""
+
+import json
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
+from utils.attack_rules import AttackRule, looks_legitimate, rule_for, simulate_block
+from utils.nginx_log import parse_line
+
+BASE = datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc).timestamp()
+
+BROWSER = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Firefox/120.0"
+
+
+def entry(timestamp, remote_addr, country="NL", request="GET / HTTP/1.1", status="200", user_agent=BROWSER, host="example.com"):
+    return json.dumps({
+        "time": datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec='seconds'),
+        "remote_addr": remote_addr,
+        "country": country,
+        "host": host,
+        "request": request,
+        "status": status,
+        "user_agent": user_agent
+    }) + "\n"
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    """An access log with brute forcing from China, a Chinese customer and an AhrefsBot."""
+    with open(tmp_path / "access.log", 'w') as f:
+        for i in range(100):
+            f.write(entry(BASE + i, f"1.2.3.{i % 5}", country="CN", request="POST /admin HTTP/1.1",
+                          status="403", user_agent="python-requests/2.31"))
+            f.write(entry(BASE + i, "5.6.7.8", host="shop.example.com"))
+        f.write(entry(BASE + 50, "9.9.9.9", country="CN", request="POST /customer/account/loginPost HTTP/1.1",
+                      status="302", host="shop.example.com"))
+        f.write(entry(BASE + 60, "8.8.4.4", user_agent="Mozilla/5.0 (compatible; AhrefsBot/7.0)"))
+    return tmp_path
+
+
+class TestAttackRules:
+    """Test cases for the attack rules."""
+
+    def test_rule_from_name(self):
+        """Test deriving rules from the attack name."""
+        china = rule_for("BlockChinaBruteForce")
+        assert china.countries == ("CN",)
+        assert china.matches({"country": "cn", "request": "POST /admin/login HTTP/1.1"})
+        assert not china.matches({"country": "CN", "request": "GET /checkout HTTP/1.1"})
+        assert not china.matches({"country": "NL", "request": "POST /admin HTTP/1.1"})
+
+        bot = rule_for("BlockAhrefsBot")
+        assert bot.matches({"user_agent": "Mozilla/5.0 (compatible; AhrefsBot/7.0)"})
+        assert not bot.matches({"user_agent": BROWSER})
+
+    def test_unknown_rule(self):
+        """Test that attack types that can not be modelled are rejected."""
+        with pytest.raises(ValueError, match="MCP_ATTACK_RULES"):
+            rule_for("BlockDDoS")
+
+    def test_rule_overrides(self, tmp_path, monkeypatch):
+        """Test taking rules from the file in MCP_ATTACK_RULES."""
+        rules = tmp_path / "rules.json"
+        rules.write_text(json.dumps({"BlockDDoS": {"path": "^/search", "methods": ["get"]}}))
+        monkeypatch.setenv("MCP_ATTACK_RULES", str(rules))
+
+        rule = rule_for("BlockDDoS")
+        assert rule.methods == ("GET",)
+        assert rule.matches({"request": "GET /search?q=x HTTP/1.1"})
+        assert not rule.matches({"request": "POST /search HTTP/1.1"})
+
+        rules.write_text(json.dumps({"BlockDDoS": {"path": "("}}))
+        with pytest.raises(ValueError, match="Invalid pattern"):
+            rule_for("BlockDDoS")
+
+    def test_empty_rule_matches_nothing(self):
+        """Test that a rule without criteria matches nothing."""
+        assert not AttackRule(name="BlockNothing").matches({"request": "GET / HTTP/1.1"})
+
+    def test_looks_legitimate(self):
+        """Test telling visitors from automated requests."""
+        assert looks_legitimate({"user_agent": BROWSER, "status": "200"})
+        assert not looks_legitimate({"user_agent": BROWSER, "status": "403"})
+        assert not looks_legitimate({"user_agent": "Mozilla/5.0 (compatible; Googlebot/2.1)", "status": "200"})
+        assert not looks_legitimate({"user_agent": "curl/8.0", "status": "200"})
+
+    def test_simulate_block(self, log_dir):
+        """Test measuring the impact of a block."""
+        impact, logs = simulate_block(rule_for("BlockChinaBruteForce"), BASE, BASE + 3600, str(log_dir))
+        result = impact.to_dict(top=2)
+
+        assert len(logs) == 1
+        assert result["requests"] == 202
+        assert result["matched_requests"] == 101
+        assert result["matched_ips"] == 6
+        assert result["matched_vhosts"] == 2
+        assert result["vhosts"] == [("example.com", 100), ("shop.example.com", 1)]
+        assert len(result["top_ips"]) == 2
+        assert result["legitimate_looking_requests"] == 1
+        assert result["legitimate_looking_ips"] == 1
+        assert [sample["remote_addr"] for sample in result["samples"]] == ["9.9.9.9"]
+
+    def test_prefilter_skips_parsing(self, log_dir):
+        """Test that lines the prefilter rules out are not parsed."""
+        with patch('utils.attack_rules.parse_line', wraps=parse_line) as parse:
+            impact, _ = simulate_block(rule_for("BlockAhrefsBot"), BASE, BASE + 3600, str(log_dir))
+        assert impact.matched == 1
+        assert parse.call_count == 1
@@ -0,0 +1,258 @@
+"""
+Tests for the command executor utilities.
+"""
+
+import asyncio
+import os
+import time
+import pytest
+from utils.command_executor import CommandExecutor, CommandStream, _ProcessStream
+
+
+async def collect(command, timeout=30, stop_after=None):
+    """Stream a command and return its lines and result."""
+    lines = []
+    async with CommandExecutor.stream_command(command, timeout=timeout) as stream:
+        async for line in stream:
+            lines.append(line)
+            if stop_after and len(lines) >= stop_after:
+                break
+    return lines, stream.result
+
+
+class TestStreamCommand:
+    """Test cases for CommandExecutor.stream_command."""
+
+    def test_stream_command_lines(self):
+        """Test that stdout is streamed line by line."""
+        lines, result = asyncio.run(collect("seq 1 5"))
+        assert lines == ["1", "2", "3", "4", "5"]
+        assert result.success is True
+        assert result.return_code == 0
+
+    def test_stream_command_without_trailing_newline(self):
+        """Test that a final line without newline is not lost."""
+        lines, result = asyncio.run(collect("printf a\\nb"))
+        assert lines == ["a", "b"]
+
+    def test_stream_command_failure(self):
+        """Test that the exit status and stderr are reported."""
+        lines, result = asyncio.run(collect("ls /nonexistent-directory"))
+        assert lines == []
+        assert result.success is False
+        assert result.stderr
+
+    def test_stream_command_dangerous(self):
+        """Test that dangerous commands are blocked."""
+        lines, result = asyncio.run(collect("rm -rf /tmp/whatever"))
+        assert lines == []
+        assert result.success is False
+        assert "blocked" in result.stderr
+
+    def test_stream_command_timeout_kills_pipeline(self):
+        """Test that a timeout kills every member of a pipeline and keeps partial output."""
+        started = time.monotonic()
+        lines, result = asyncio.run(collect("echo first; sleep 30 | cat", timeout=1))
+        assert time.monotonic() - started < 10
+        assert lines == ["first"]
+        assert result.success is False
+        assert "timed out" in result.stderr
+
+    def test_stream_command_stop_early(self):
+        """Test that leaving the block early stops the command successfully."""
+        started = time.monotonic()
+        lines, result = asyncio.run(collect("yes", stop_after=3))
+        assert time.monotonic() - started < 10
+        assert lines == ["y", "y", "y"]
+        assert result.success is True
+
+
+async def collect_output(command, timeout=30, consume=None):
+    """Stream the output of a command and return its chunks and result."""
+    chunks = []
+    async with CommandExecutor.stream_output(command, timeout=timeout) as stream:
+        async for name, text in stream:
+            chunks.append((name, text))
+            if consume is not None and await consume(stream, chunks):
+                break
+    return chunks, stream
+
+
+class TestStreamOutput:
+    """Test cases for CommandExecutor.stream_output."""
+
+    def test_stream_output_chunks(self):
+        """Test that stdout and stderr are streamed separately."""
+        chunks, stream = asyncio.run(collect_output("echo out; echo err >&2"))
+        assert "".join(text for name, text in chunks if name == "stdout") == "out\n"
+        assert "".join(text for name, text in chunks if name == "stderr") == "err\n"
+        assert stream.result.success is True
+
+    def test_stream_output_as_produced(self):
+        """Test that output arrives while the command is still running."""
+        async def consume(stream, chunks):
+            return stream.process.returncode is None
+
+        started = time.monotonic()
+        chunks, stream = asyncio.run(collect_output("echo first; sleep 30", consume=consume))
+        assert time.monotonic() - started < 10
+        assert chunks == [("stdout", "first\n")]
+        assert stream.stopped is True
+        assert stream.result.success is True
+
+    def test_stream_output_backpressure(self):
+        """Test that a slow consumer stops the reading instead of buffering the output."""
+        async def consume(stream, chunks):
+            await asyncio.sleep(0.5)
+            return True
+
+        chunks, stream = asyncio.run(collect_output("yes", consume=consume))
+        # Only what fits in the queue was read while the consumer was busy
+        limit = (stream.QUEUE_SIZE + 3) * stream.CHUNK_SIZE
+        assert stream.bytes_read["stdout"] <= limit
+
+    def test_stream_output_timeout(self):
+        """Test that a timeout kills the command and keeps the output."""
+        chunks, stream = asyncio.run(collect_output("echo first; sleep 30 | cat", timeout=1))
+        assert chunks == [("stdout", "first\n")]
+        assert stream.timed_out is True
+        assert stream.result.success is False
+        assert "timed out" in stream.result.stderr
+
+    def test_stream_output_failure(self):
+        """Test that the exit status is reported."""
+        chunks, stream = asyncio.run(collect_output("ls /nonexistent-directory"))
+        assert {name for name, _ in chunks} == {"stderr"}
+        assert stream.result.success is False
+
+    def test_stream_output_dangerous(self):
+        """Test that dangerous commands are blocked."""
+        chunks, stream = asyncio.run(collect_output("rm -rf /tmp/whatever"))
+        assert chunks == []
+        assert "blocked" in stream.result.stderr
+
+    def test_process_stream_requires_overrides(self):
+        """Test that a stream missing a reader hook fails when constructed, not while streaming."""
+        class HalfStream(_ProcessStream):
+            def _start(self, process):
+                pass
+
+        with pytest.raises(TypeError):
+            HalfStream("true", 30)
+        assert isinstance(CommandStream("true", 30), _ProcessStream)
+
+
+def process_group_alive(pgid):
+    """Check whether any process of a process group is still running (zombies do not count)."""
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[2]) == pgid and fields[0] != 'Z':
+            return True
+    return False
+
+
+class TestExecuteCommandCancellation:
+    """Test cases for stopping commands that are no longer wanted."""
+
+    def test_timeout_kills_process_group(self):
+        """Test that a timed out command and its pipeline are killed."""
+        async def run():
+            task = asyncio.ensure_future(CommandExecutor.execute_command("sleep 30 | cat", timeout=1))
+            await asyncio.sleep(0.2)
+            pgids = set(CommandExecutor._process_groups)
+            result = await task
+            return pgids, result
+
+        pgids, result = asyncio.run(run())
+        assert result.success is False
+        assert "timed out" in result.stderr
+        assert pgids
+        time.sleep(0.1)
+        assert not any(process_group_alive(pgid) for pgid in pgids)
+
+    def test_cancel_kills_process_group(self):
+        """Test that cancelling the tool call kills the command right away."""
+        async def run():
+            task = asyncio.ensure_future(CommandExecutor.execute_command("sleep 30 | cat", timeout=60))
+            await asyncio.sleep(0.2)
+            pgids = set(CommandExecutor._process_groups)
+            started = time.monotonic()
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            return pgids, time.monotonic() - started
+
+        pgids, elapsed = asyncio.run(run())
+        assert pgids
+        assert elapsed < 1
+        time.sleep(0.1)
+        assert not any(process_group_alive(pgid) for pgid in pgids)
+        assert not pgids & CommandExecutor._process_groups
+
+    def test_cancel_stream_kills_process_group(self):
+        """Test that cancelling a streaming command kills it."""
+        async def consume():
+            async with CommandExecutor.stream_command("yes | cat", timeout=60) as stream:
+                async for line in stream:
+                    await asyncio.sleep(0)
+
+        async def run():
+            task = asyncio.ensure_future(consume())
+            await asyncio.sleep(0.2)
+            pgids = set(CommandExecutor._process_groups)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            return pgids
+
+        pgids = asyncio.run(run())
+        assert pgids
+        time.sleep(0.1)
+        assert not any(process_group_alive(pgid) for pgid in pgids)
+
+    def test_kill_all(self):
+        """Test that kill_all stops every running command."""
+        async def run():
+            task = asyncio.ensure_future(CommandExecutor.execute_command("sleep 30", timeout=60))
+            await asyncio.sleep(0.2)
+            pgids = set(CommandExecutor._process_groups)
+            CommandExecutor.kill_all()
+            result = await task
+            return pgids, result
+
+        pgids, result = asyncio.run(run())
+        assert pgids
+        assert result.success is False
+
+    def test_cancel_stream_output_kills_process_group(self):
+        """Test that cancelling a command whose output is streamed kills it."""
+        async def consume():
+            async with CommandExecutor.stream_output("yes | cat", timeout=60) as stream:
+                async for _ in stream:
+                    await asyncio.sleep(0)
+
+        async def run():
+            task = asyncio.ensure_future(consume())
+            await asyncio.sleep(0.2)
+            pgids = set(CommandExecutor._process_groups)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            return pgids
+
+        pgids = asyncio.run(run())
+        assert pgids
+        time.sleep(0.1)
+        assert not any(process_group_alive(pgid) for pgid in pgids)
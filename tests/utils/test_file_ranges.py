@@ -0,0 +1,120 @@
+"""
+Tests for the ranged file reading utilities.
+"""
+
+import pytest
+from unittest.mock import patch
+from utils.file_ranges import LineIndexCache, fair_shares, read_lines, read_range, tail_lines
+
+LINES = [f"line {i} " + "x" * (i % 50) for i in range(5000)]
+
+
+@pytest.fixture(params=["read", "mmap"])
+def log_file(request, tmp_path):
+    """Write a log file, read either into memory or memory mapped."""
+    path = tmp_path / "log.txt"
+    path.write_text("\n".join(LINES) + "\n")
+    threshold = 0 if request.param == "mmap" else 1024 * 1024 * 1024
+    with patch('utils.file_ranges.MMAP_THRESHOLD', threshold), \
+         patch('utils.file_ranges.BLOCK_SIZE', 1024), \
+         patch('utils.file_ranges.line_index_cache', LineIndexCache()):
+        yield str(path)
+
+
+class TestReadRange:
+    """Test cases for read_range."""
+
+    def test_read_range(self, log_file):
+        """Test reading a byte range and continuing at next_offset."""
+        first = read_range(log_file, 0, 10)
+        assert first.content == "line 0 \nli"
+        second = read_range(log_file, first.end, 5)
+        assert second.content == "ne 1 "
+        assert second.to_dict()["next_offset"] == 15
+
+    def test_read_from_end(self, log_file):
+        """Test that a negative offset counts from the end."""
+        result = read_range(log_file, -7, 100)
+        assert result.content == LINES[-1][-6:] + "\n"
+        assert result.to_dict()["eof"] is True
+        assert result.to_dict()["next_offset"] is None
+
+
+class TestTailLines:
+    """Test cases for tail_lines."""
+
+    @pytest.mark.parametrize("count", [1, 3, 100, 4999, 5000, 6000])
+    def test_tail(self, log_file, count):
+        """Test returning the last lines across block boundaries."""
+        result = tail_lines(log_file, count)
+        assert result.content == "\n".join(LINES[-count:]) + "\n"
+        assert result.line_count == min(count, len(LINES))
+
+    def test_tail_without_trailing_newline(self, tmp_path):
+        """Test that an unterminated last line counts as a line."""
+        path = tmp_path / "log.txt"
+        path.write_text("a\nb\nc")
+        assert tail_lines(str(path), 2).content == "b\nc"
+
+    def test_tail_reads_only_the_end(self, tmp_path):
+        """Test that a large file is not read in full."""
+        path = tmp_path / "big.txt"
+        path.write_bytes(b"x" * (4 * 1024 * 1024) + b"\nlast line\n")
+        with patch('utils.file_ranges.mmap.mmap') as mock_mmap:
+            mock_mmap.return_value.__enter__.return_value = path.read_bytes()
+            result = tail_lines(str(path), 1)
+        assert result.content == "last line\n"
+        mock_mmap.assert_called_once()
+
+
+class TestReadLines:
+    """Test cases for read_lines."""
+
+    @pytest.mark.parametrize("start,count", [(0, 1), (1, 2), (999, 3), (2500, 100), (4990, 100)])
+    def test_read_lines(self, log_file, start, count):
+        """Test seeking to a line through the line index."""
+        result = read_lines(log_file, start, count)
+        assert result.content == "".join(line + "\n" for line in LINES[start:start + count])
+        assert result.first_line == start
+        assert result.line_count == len(LINES[start:start + count])
+
+    def test_read_lines_from_end(self, log_file):
+        """Test that a negative start line counts from the end."""
+        result = read_lines(log_file, -2, 10)
+        assert result.first_line == 4998
+        assert result.content == LINES[-2] + "\n" + LINES[-1] + "\n"
+
+    def test_index_follows_appends(self, log_file):
+        """Test that lines appended after indexing can be read."""
+        read_lines(log_file, 10, 1)
+        with open(log_file, "a") as f:
+            f.write("appended\n")
+        assert read_lines(log_file, 5000, 1).content == "appended\n"
+
+    def test_long_lines(self, tmp_path):
+        """Test lines longer than a block."""
+        path = tmp_path / "long.txt"
+        lines = ["short", "y" * 5000, "after"]
+        path.write_text("\n".join(lines))
+        with patch('utils.file_ranges.BLOCK_SIZE', 1024), \
+             patch('utils.file_ranges.line_index_cache', LineIndexCache()):
+            assert read_lines(str(path), 2, 1).content == "after"
+            assert read_lines(str(path), 1, 1).content == lines[1] + "\n"
+
+
+class TestFairShares:
+    """Test cases for fair_shares."""
+
+    def test_small_files_are_whole(self):
+        """Test that what small files leave over goes to the large files."""
+        assert fair_shares([10, 1000, 50, 5000], 1000) == [10, 470, 50, 470]
+
+    def test_budget_larger_than_files(self):
+        """Test that files are never given more than their size."""
+        assert fair_shares([5, 5], 100) == [5, 5]
+
+    def test_budget_is_never_exceeded(self):
+        """Test that the shares add up to at most the budget."""
+        shares = fair_shares([1000] * 7, 1000)
+        assert sum(shares) <= 1000
+        assert max(shares) - min(shares) <= 1
@@ -0,0 +1,140 @@
+"""
+Tests for the compressed incident utilities.
+"""
+
+import gzip
+import lzma
+import os
+import tarfile
+import pytest
+from utils.incident_archives import IncidentArchives, is_archive, is_compressed
+
+LINES = b"".join(b"line %d\n" % i for i in range(1000))
+
+
+class TestIncidentArchives:
+    """Test cases for IncidentArchives."""
+
+    @pytest.fixture
+    def archives(self):
+        """Create an IncidentArchives instance and close its streams afterwards."""
+        archives = IncidentArchives()
+        yield archives
+        archives.close()
+
+    @pytest.fixture(params=["gz", "xz"])
+    def compressed(self, request, tmp_path):
+        """Create a compressed log file."""
+        path = tmp_path / f"mysql.log.{request.param}"
+        opener = gzip.open if request.param == "gz" else lzma.open
+        with opener(path, 'wb') as f:
+            f.write(LINES)
+        return str(path)
+
+    @pytest.fixture
+    def archive(self, tmp_path):
+        """Create an archived incident directory."""
+        incident_dir = tmp_path / "2024-01-01"
+        (incident_dir / "mysql").mkdir(parents=True)
+        (incident_dir / "top.txt").write_bytes(LINES)
+        (incident_dir / "mysql" / "processlist.txt").write_text("| Id | User |\n")
+        path = tmp_path / "2024-01-01.tar.gz"
+        with tarfile.open(path, 'w:gz') as tar:
+            tar.add(incident_dir, arcname="2024-01-01")
+        return str(path)
+
+    def test_file_names(self):
+        """Test recognising compressed files and archives."""
+        assert is_compressed("mysql.log.gz") and is_compressed("syslog.xz")
+        assert not is_compressed("2024-01-01.tar.gz") and not is_compressed("top.txt")
+        assert is_archive("2024-01-01.tar.gz") and is_archive("2024-01-01.tar") and is_archive("2024-01-01.txz")
+
+    def test_read_range(self, archives, compressed):
+        """Test reading a range of a compressed file."""
+        result = archives.read_range(compressed, 7, 7)
+        assert result.content == "line 1\n"
+        assert result.size is None
+        assert result.to_dict()["next_offset"] == 14
+        assert result.to_dict()["eof"] is False
+
+    def test_read_range_to_the_end(self, archives, compressed):
+        """Test that the size is known once the end was read."""
+        result = archives.read_range(compressed, len(LINES) - 9, 100)
+        assert result.content == "line 999\n"
+        assert result.size == len(LINES)
+        assert result.to_dict()["eof"] is True
+        assert archives.read_range(compressed, 0, 1).size == len(LINES)
+
+    def test_negative_offset(self, archives, compressed):
+        """Test reading from the end of a compressed file."""
+        assert archives.read_range(compressed, -9, 100).content == "line 999\n"
+
+    def test_paging_reuses_the_stream(self, archives, compressed):
+        """Test that sequential reads continue decompressing where the previous read stopped."""
+        offset, content = 0, ""
+        while offset is not None:
+            result = archives.read_range(compressed, offset, 1000).to_dict()
+            content += result["content"]
+            offset = result["next_offset"]
+        assert content.encode() == LINES
+        assert archives.stats()["streams_opened"] == 1
+        assert archives.stats()["streams_reused"] > 1
+
+    def test_lines(self, archives, compressed):
+        """Test reading lines of a compressed file."""
+        result = archives.read_lines(compressed, 10, 2)
+        assert result.content == "line 10\nline 11\n"
+        assert result.offset == LINES.index(b"line 10\n")
+        assert result.first_line == 10
+        assert result.line_count == 2
+
+        result = archives.read_lines(compressed, -2, 1)
+        assert result.content == "line 998\n"
+        assert result.first_line == 998
+
+    def test_tail(self, archives, compressed):
+        """Test reading the last lines of a compressed file."""
+        result = archives.tail_lines(compressed, 2)
+        assert result.content == "line 998\nline 999\n"
+        assert result.size == len(LINES)
+        assert result.line_count == 2
+
+    def test_corrupt_file(self, archives, tmp_path):
+        """Test that corrupt compressed data is reported as an OSError."""
+        path = tmp_path / "broken.log.xz"
+        path.write_bytes(b"not xz data")
+        with pytest.raises(OSError):
+            archives.read_range(str(path), 0, 10)
+
+    def test_list_members(self, archives, archive):
+        """Test listing the files of an archived incident."""
+        members = archives.list_members(archive)
+        assert sorted(member.name for member in members) == ["mysql/processlist.txt", "top.txt"]
+        assert [member.name for member in archives.list_members(archive, "top*")] == ["top.txt"]
+        assert archives.member(archive, "top.txt").size == len(LINES)
+        assert archives.stats()["cached_archives"] == 1
+        with pytest.raises(FileNotFoundError):
+            archives.member(archive, "missing.txt")
+
+    def test_read_member(self, archives, archive):
+        """Test reading files within an archive."""
+        top = archives.member(archive, "top.txt")
+        processlist = archives.member(archive, "mysql/processlist.txt")
+
+        assert archives.read_range(archive, 7, 7, top).content == "line 1\n"
+        assert archives.read_range(archive, 0, 100, processlist).content == "| Id | User |\n"
+        result = archives.read_range(archive, -9, 100, top)
+        assert result.content == "line 999\n"
+        assert result.to_dict()["eof"] is True
+        assert archives.tail_lines(archive, 1, top).content == "line 999\n"
+        assert archives.read_lines(archive, 0, 5, processlist).line_count == 1
+
+    def test_changed_archive_is_listed_again(self, archives, archive, tmp_path):
+        """Test that the member listing is refreshed when the archive changes."""
+        archives.list_members(archive)
+        new_file = tmp_path / "dmesg.log"
+        new_file.write_text("kernel\n")
+        with tarfile.open(archive, 'w:gz') as tar:
+            tar.add(new_file, arcname="dmesg.log")
+        os.utime(archive, ns=(0, 0))
+        assert [member.name for member in archives.list_members(archive)] == ["dmesg.log"]
@@ -0,0 +1,109 @@
+"""
+Tests for the incident full-text index.
+"""
+
+import os
+import pytest
+from utils.incident_index import IncidentIndex, build_match_query
+from utils.incident_store import IncidentStore
+
+
+class TestBuildMatchQuery:
+    """Test cases for build_match_query."""
+
+    def test_terms_phrases_and_prefixes(self):
+        """Test translating terms, phrases and prefix terms."""
+        assert build_match_query('"Deadlock found" innodb*') == '"Deadlock found" "innodb"*'
+
+    def test_syntax_is_treated_as_text(self):
+        """Test that FTS5 operators and punctuation can not break the query."""
+        assert build_match_query('php-fpm AND NEAR(x') == '"php" "fpm" "AND" "NEAR" "x"'
+
+    def test_empty_query(self):
+        """Test that a query without words is rejected."""
+        with pytest.raises(ValueError):
+            build_match_query('"" - *')
+
+
+class TestIncidentIndex:
+    """Test cases for IncidentIndex."""
+
+    @pytest.fixture
+    def incidents_dir(self, tmp_path):
+        """Create two incidents."""
+        incidents_dir = tmp_path / "incidents"
+        (incidents_dir / "2024-01-01").mkdir(parents=True)
+        (incidents_dir / "2024-02-01" / "mysql").mkdir(parents=True)
+        (incidents_dir / "2024-01-01" / "dmesg.log").write_text(
+            "boot\nOut of memory: Killed process 1234 (php-fpm)\nrecovered\n"
+        )
+        (incidents_dir / "2024-02-01" / "mysql" / "status.txt").write_text(
+            "LATEST DETECTED DEADLOCK\n"
+            "*** (1) TRANSACTION: Deadlock found when trying to get lock\n"
+        )
+        (incidents_dir / "2024-02-01" / "core.gz").write_bytes(b"\x1f\x8b deadlock")
+        return incidents_dir
+
+    @pytest.fixture
+    def index(self, tmp_path, incidents_dir):
+        """Create an index over the incidents."""
+        index = IncidentIndex(str(tmp_path / "index.sqlite"), IncidentStore(str(incidents_dir)))
+        yield index
+        index.close()
+
+    def test_search_with_line_offsets(self, index, incidents_dir):
+        """Test that hits point at the line and byte offset of the match."""
+        index.update()
+        hits = index.search("killed php*")
+        assert len(hits) == 1
+        hit = hits[0]
+        assert hit.incident == "2024-01-01"
+        assert hit.file == "dmesg.log"
+        assert hit.line == 1
+        assert hit.offset == len("boot\n")
+        assert "[Killed]" in hit.snippet
+
+    def test_phrase_search(self, index):
+        """Test that phrases only match words next to each other."""
+        index.update()
+        hits = index.search('"deadlock found"')
+        assert [(hit.file, hit.line) for hit in hits] == [("mysql/status.txt", 1)]
+        assert index.search('"found deadlock"') == []
+
+    def test_compressed_files_are_skipped(self, index):
+        """Test that compressed files are not indexed as text."""
+        index.update()
+        assert all(hit.file != "core.gz" for hit in index.search("deadlock"))
+
+    def test_incident_filter(self, index):
+        """Test restricting the search to incidents by name prefix."""
+        index.update()
+        assert index.search("deadlock", incident="2024-01") == []
+        assert len(index.search("deadlock", incident="2024-02")) == 2
+
+    def test_incremental_update(self, index, incidents_dir):
+        """Test that only new and changed files are reindexed and removed files are dropped."""
+        assert index.update()["files_indexed"] == 2
+        assert index.update()["files_indexed"] == 0
+
+        dmesg = incidents_dir / "2024-01-01" / "dmesg.log"
+        with open(dmesg, "a") as f:
+            f.write("segfault in worker\n")
+        os.utime(dmesg, ns=(0, os.stat(dmesg).st_mtime_ns + 1))
+        result = index.update()
+        assert result["files_indexed"] == 1
+        assert result["files_unchanged"] == 1
+        assert [hit.line for hit in index.search("segfault")] == [3]
+
+        os.unlink(incidents_dir / "2024-02-01" / "mysql" / "status.txt")
+        assert index.update()["files_removed"] == 1
+        assert index.search("deadlock") == []
+
+    def test_index_persists(self, tmp_path, index, incidents_dir):
+        """Test that a new index instance reuses what was indexed before."""
+        index.update()
+        index.close()
+        reopened = IncidentIndex(index.path, IncidentStore(str(incidents_dir)))
+        assert reopened.update()["files_indexed"] == 0
+        assert len(reopened.search("deadlock")) == 2
+        reopened.close()
@@ -0,0 +1,115 @@
+"""
+Tests for the incident store.
+"""
+
+import os
+import time
+import pytest
+from unittest.mock import patch
+from utils.incident_store import IncidentStore, paginate, sort_entries
+
+
+def age(path, seconds=60):
+    """Move the mtime of a path into the past, out of the racy window."""
+    mtime = time.time() - seconds
+    os.utime(path, (mtime, mtime))
+
+
+class TestIncidentStore:
+    """Test cases for IncidentStore."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Create an incident store on an empty directory."""
+        return IncidentStore(str(tmp_path))
+
+    def test_cached_listing_costs_one_stat(self, store, tmp_path):
+        """Test that an unchanged directory is not scanned again."""
+        (tmp_path / "2024-01-01").mkdir()
+        age(tmp_path)
+
+        first = store.list_incidents()
+        with patch('utils.incident_store.os.scandir') as mock_scandir:
+            second = store.list_incidents()
+
+        mock_scandir.assert_not_called()
+        assert second == first
+        assert store.stats() == {"cached_directories": 1, "hits": 1, "misses": 1}
+
+    def test_changed_directory_is_rescanned(self, store, tmp_path):
+        """Test that adding an entry invalidates the cached listing."""
+        (tmp_path / "2024-01-01").mkdir()
+        age(tmp_path, 120)
+        assert [entry.name for entry in store.list_incidents()] == ["2024-01-01"]
+
+        (tmp_path / "2024-01-02").mkdir()
+        age(tmp_path, 60)
+        assert sorted(entry.name for entry in store.list_incidents()) == ["2024-01-01", "2024-01-02"]
+
+    def test_file_modified_in_place_is_restated(self, store, tmp_path):
+        """Test that a cached listing reports the current size and mtime of a file that was appended to."""
+        incident = tmp_path / "2024-01-01"
+        incident.mkdir()
+        (incident / "dmesg.txt").write_text("first\n")
+        age(incident / "dmesg.txt", 120)
+        age(incident)
+        assert [entry.size for entry in store.list_incident_files("2024-01-01")] == [6]
+
+        with open(incident / "dmesg.txt", 'a') as f:
+            f.write("second\n")
+        [entry] = store.list_incident_files("2024-01-01")
+        assert store.stats()["hits"] == 1
+        assert entry.size == 13
+        assert entry.mtime == os.stat(incident / "dmesg.txt").st_mtime
+
+    def test_recently_changed_directory_is_not_cached(self, store, tmp_path):
+        """Test that listings within the mtime resolution of a change are not cached."""
+        (tmp_path / "2024-01-01").mkdir()
+        store.list_incidents()
+        store.list_incidents()
+        assert store.stats()["hits"] == 0
+
+    def test_cache_is_bounded(self, tmp_path):
+        """Test that the least recently listed directories are evicted."""
+        store = IncidentStore(str(tmp_path), max_directories=2)
+        for name in ("a", "b", "c"):
+            (tmp_path / name).mkdir()
+            age(tmp_path / name)
+            store.list_dir(str(tmp_path / name))
+        assert store.stats()["cached_directories"] == 2
+
+    def test_invalid_incident_names(self, store):
+        """Test that incident names can not escape the incidents directory."""
+        for name in ("", ".", "..", "../etc", "a/b"):
+            with pytest.raises(ValueError):
+                store.incident_path(name)
+
+    def test_root_from_environment(self, monkeypatch, tmp_path):
+        """Test that the incidents directory can be configured."""
+        monkeypatch.setenv("HYPERNODE_INCIDENTS_DIR", str(tmp_path))
+        assert IncidentStore().root == str(tmp_path)
+
+
+class TestSortingAndPagination:
+    """Test cases for sort_entries and paginate."""
+
+    def test_sort_by_size_is_stable(self, tmp_path):
+        """Test that entries with equal sort keys are ordered by name."""
+        for name, size in (("b", 1), ("a", 1), ("c", 5)):
+            (tmp_path / name).write_text("x" * size)
+        entries = IncidentStore(str(tmp_path)).list_dir(str(tmp_path))
+
+        assert [entry.name for entry in sort_entries(entries, "size")] == ["a", "b", "c"]
+        assert [entry.name for entry in sort_entries(entries, "size", descending=True)] == ["c", "b", "a"]
+
+    def test_invalid_sort_key(self):
+        """Test that unknown sort keys are rejected."""
+        with pytest.raises(ValueError):
+            sort_entries([], "owner")
+
+    def test_paginate(self):
+        """Test paging through a list."""
+        items = list(range(5))
+        assert paginate(items, 0, 2) == {"items": [0, 1], "total": 5, "offset": 0, "next_offset": 2}
+        assert paginate(items, 4, 2) == {"items": [4], "total": 5, "offset": 4, "next_offset": None}
+        assert paginate(items) == {"items": items, "total": 5, "offset": 0, "next_offset": None}
@@ -0,0 +1,109 @@
+"""
+Tests for the incident summaries cache.
+"""
+
+import os
+import time
+import pytest
+from unittest.mock import patch
+from utils.incident_store import IncidentStore
+from utils.incident_summaries import IncidentSummaries
+from utils.snapshot_parsers import ParserRegistry, SnapshotParser, parser_registry
+
+
+class CountingParser(SnapshotParser):
+    """Parser counting how often it parsed."""
+
+    name = "counting"
+
+    def __init__(self):
+        self.calls = 0
+
+    def matches(self, head):
+        return head.startswith("COUNT")
+
+    def parse(self, text):
+        self.calls += 1
+        return {"lines": len(text.splitlines())}
+
+
+class TestIncidentSummaries:
+    """Test cases for IncidentSummaries."""
+
+    @pytest.fixture
+    def incident_dir(self, tmp_path):
+        """Create an incident with a snapshot file."""
+        incident_dir = tmp_path / "incidents" / "2024-01-01"
+        incident_dir.mkdir(parents=True)
+        (incident_dir / "snapshot.txt").write_text("COUNT\na\nb\n")
+        return incident_dir
+
+    @pytest.fixture
+    def parser(self):
+        """Create a counting parser."""
+        return CountingParser()
+
+    @pytest.fixture
+    def summaries(self, tmp_path, incident_dir, parser):
+        """Create summaries using only the counting parser."""
+        registry = ParserRegistry()
+        registry.register_parser(parser)
+        return IncidentSummaries(IncidentStore(str(incident_dir.parent)), registry, str(tmp_path / "cache"))
+
+    def test_summary_is_cached(self, summaries, parser, incident_dir):
+        """Test that a file is parsed once and then served from the cache."""
+        first = summaries.summarize("2024-01-01", "snapshot.txt")
+        second = summaries.summarize("2024-01-01", "snapshot.txt")
+
+        assert first == {"file": "snapshot.txt", "parser": "counting", "summary": {"lines": 3}, "cached": False}
+        assert second["cached"] is True
+        assert second["summary"] == {"lines": 3}
+        assert parser.calls == 1
+
+    def test_incident_is_left_unchanged(self, summaries, incident_dir, tmp_path):
+        """Test that summarizing writes nothing into the incident, so its mtime and listing stay the same."""
+        store = summaries.store
+        mtime = time.time() - 60
+        os.utime(incident_dir, (mtime, mtime))
+        before = os.stat(incident_dir).st_mtime_ns
+        store.list_incident_files("2024-01-01")
+
+        summaries.summarize("2024-01-01", "snapshot.txt")
+
+        assert os.listdir(incident_dir) == ["snapshot.txt"]
+        assert os.stat(incident_dir).st_mtime_ns == before
+        store.list_incident_files("2024-01-01")
+        assert store.stats()["hits"] == 1
+        assert len(os.listdir(tmp_path / "cache")) == 1
+
+    def test_changed_file_is_parsed_again(self, summaries, parser, incident_dir):
+        """Test that a summary is recomputed when the file changes."""
+        summaries.summarize("2024-01-01", "snapshot.txt")
+        with open(incident_dir / "snapshot.txt", "a") as f:
+            f.write("c\n")
+
+        assert summaries.summarize("2024-01-01", "snapshot.txt")["summary"] == {"lines": 4}
+        assert parser.calls == 2
+
+    def test_new_parser_version_is_parsed_again(self, summaries, parser):
+        """Test that bumping the parser version invalidates cached summaries."""
+        summaries.summarize("2024-01-01", "snapshot.txt")
+        parser.version = 2
+        assert summaries.summarize("2024-01-01", "snapshot.txt")["cached"] is False
+
+    def test_cache_not_writable(self, summaries, parser):
+        """Test that a summary is still returned when it can not be cached."""
+        with patch('utils.incident_summaries.os.makedirs', side_effect=PermissionError("read-only")):
+            first = summaries.summarize("2024-01-01", "snapshot.txt")
+            second = summaries.summarize("2024-01-01", "snapshot.txt")
+
+        assert first["summary"] == second["summary"] == {"lines": 3}
+        assert second["cached"] is False
+        assert parser.calls == 2
+
+    def test_unknown_format(self, incident_dir, tmp_path):
+        """Test that files in no known format have no summary."""
+        (incident_dir / "dmesg.log").write_text("kernel: something\n")
+        summaries = IncidentSummaries(IncidentStore(str(incident_dir.parent)), parser_registry, str(tmp_path / "cache"))
+        assert summaries.summarize("2024-01-01", "dmesg.log")["parser"] is None
+        assert summaries.summarize("2024-01-01", "dmesg.log")["cached"] is True
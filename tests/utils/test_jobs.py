@@ -0,0 +1,183 @@
+"""
+Tests for the background job utilities.
+"""
+
+import asyncio
+import json
+import os
+from utils.jobs import JobManager, JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED, JOB_QUEUED, JOB_RUNNING
+from utils.progress import get_progress_reporter
+
+
+async def wait_finished(job):
+    """Wait until a job's task is done."""
+    await asyncio.wait([job.task])
+
+
+class TestJobManager:
+    """Test cases for JobManager."""
+
+    def test_job_completes_with_result(self):
+        """Test that a job runs and stores its JSON encoded result."""
+        async def tool(value):
+            return {"success": True, "value": value}
+
+        async def run():
+            manager = JobManager()
+            job = manager.submit("tool", tool, {"value": 42})
+            await wait_finished(job)
+            return manager, job, await manager.read_result(job)
+
+        manager, job, page = asyncio.run(run())
+        assert job.status == JOB_COMPLETED
+        assert json.loads(page) == {"success": True, "value": 42}
+        assert job.result_path is None
+
+    def test_job_failure_is_recorded(self):
+        """Test that exceptions mark the job as failed."""
+        async def tool():
+            raise ValueError("boom")
+
+        async def run():
+            manager = JobManager()
+            job = manager.submit("tool", tool, {})
+            await wait_finished(job)
+            return job
+
+        job = asyncio.run(run())
+        assert job.status == JOB_FAILED
+        assert job.error == "boom"
+
+    def test_worker_pool_is_bounded(self):
+        """Test that no more than max_workers jobs run at the same time."""
+        running = []
+        peak = []
+
+        async def tool():
+            running.append(1)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+            return {}
+
+        async def run():
+            manager = JobManager(max_workers=2)
+            jobs = [manager.submit("tool", tool, {}) for _ in range(6)]
+            await asyncio.sleep(0)
+            statuses = [job.status for job in jobs]
+            await asyncio.wait([job.task for job in jobs])
+            return statuses
+
+        statuses = asyncio.run(run())
+        assert max(peak) == 2
+        assert statuses.count(JOB_RUNNING) == 2
+        assert statuses.count(JOB_QUEUED) == 4
+
+    def test_cancel_running_job(self):
+        """Test that a running job can be cancelled."""
+        async def tool():
+            await asyncio.sleep(60)
+
+        async def run():
+            manager = JobManager()
+            job = manager.submit("tool", tool, {})
+            await asyncio.sleep(0)
+            manager.cancel(job.id)
+            await wait_finished(job)
+            return job
+
+        job = asyncio.run(run())
+        assert job.status == JOB_CANCELLED
+        assert job.finished_at is not None
+
+    def test_cancelled_job_keeps_partial_result(self):
+        """Test that a partial result published by a cancelled tool is kept."""
+        async def tool():
+            get_progress_reporter().set_partial_result({"partial": True, "count": 3})
+            await asyncio.sleep(60)
+
+        async def run():
+            manager = JobManager()
+            job = manager.submit("tool", tool, {})
+            await asyncio.sleep(0)
+            manager.cancel(job.id)
+            await wait_finished(job)
+            return job, await manager.read_result(job)
+
+        job, page = asyncio.run(run())
+        assert job.status == JOB_CANCELLED
+        assert job.has_result is True
+        assert json.loads(page) == {"partial": True, "count": 3}
+
+    def test_progress_is_recorded(self):
+        """Test that progress reported by the tool is visible in the job status."""
+        async def tool():
+            get_progress_reporter().update(5, 10, lines=5)
+            return {}
+
+        async def run():
+            manager = JobManager()
+            job = manager.submit("tool", tool, {})
+            await wait_finished(job)
+            return job
+
+        job = asyncio.run(run())
+        progress = job.to_dict()["progress"]
+        assert progress["progress"] == 5
+        assert progress["total"] == 10
+        assert progress["details"] == {"lines": 5}
+
+    def test_large_results_spill_to_disk(self, tmp_path):
+        """Test that large results are written to disk and read back in ranges."""
+        async def tool():
+            return {"data": "x" * 1000}
+
+        async def run():
+            manager = JobManager(spill_threshold=100, spill_dir=str(tmp_path))
+            job = manager.submit("tool", tool, {})
+            await wait_finished(job)
+            pages = []
+            offset = 0
+            while offset < job.result_size:
+                page = await manager.read_result(job, offset, 300)
+                pages.append(page)
+                offset += len(page)
+            return job, pages
+
+        job, pages = asyncio.run(run())
+        assert job.result_data is None
+        assert os.path.exists(job.result_path)
+        assert len(pages) == 4
+        assert json.loads("".join(pages)) == {"data": "x" * 1000}
+
+    def test_expired_jobs_are_purged(self, tmp_path):
+        """Test that finished jobs and their spilled results expire."""
+        async def tool():
+            return {"data": "x" * 1000}
+
+        async def run():
+            manager = JobManager(spill_threshold=100, spill_dir=str(tmp_path), ttl=0)
+            job = manager.submit("tool", tool, {})
+            await wait_finished(job)
+            job.finished_at -= 1
+            return manager, job
+
+        manager, job = asyncio.run(run())
+        path = job.result_path
+        assert manager.get(job.id) is None
+        assert not os.path.exists(path)
+
+    def test_max_jobs(self):
+        """Test that submissions are refused once max_jobs are retained."""
+        async def tool():
+            return {}
+
+        async def run():
+            manager = JobManager(max_jobs=1)
+            manager.submit("tool", tool, {})
+            try:
+                manager.submit("tool", tool, {})
+            except RuntimeError as e:
+                return str(e)
+
+        assert "Too many jobs" in asyncio.run(run())
@@ -0,0 +1,63 @@
+"""
+Tests for the event loop monitor.
+"""
+
+import asyncio
+import time
+from utils.loop_monitor import LoopMonitor
+
+
+def block_the_loop(seconds):
+    """Blocking call standing in for synchronous I/O on the event loop."""
+    time.sleep(seconds)
+
+
+class TestLoopMonitor:
+    """Test cases for LoopMonitor."""
+
+    def test_lag_is_measured(self):
+        """Test that lag samples are collected while the loop is idle."""
+        async def run():
+            monitor = LoopMonitor(interval=0.01, slow_threshold=0.5)
+            monitor.start()
+            await asyncio.sleep(0.2)
+            monitor.stop()
+            return monitor.stats()
+
+        stats = asyncio.run(run())
+        assert stats["lag"]["samples"] > 5
+        assert stats["lag"]["p50"] < 0.5
+        assert stats["stall_count"] == 0
+
+    def test_blocking_callback_is_captured(self):
+        """Test that a blocking callback is detected with its stack."""
+        async def run():
+            monitor = LoopMonitor(interval=0.01, slow_threshold=0.05)
+            monitor.start()
+            await asyncio.sleep(0.05)
+            block_the_loop(0.3)
+            await asyncio.sleep(0.05)
+            monitor.stop()
+            return monitor.stats()
+
+        stats = asyncio.run(run())
+        assert stats["stall_count"] >= 1
+        assert stats["lag"]["max"] >= 0.2
+        stall = stats["slow_callbacks"][0]
+        assert "block_the_loop" in stall["location"]
+        assert any("time.sleep" in line for line in stall["stack"])
+        assert stats["blockers"][0]["location"] == stall["location"]
+        assert stats["blockers"][0]["max_duration"] >= 0.2
+
+    def test_start_is_idempotent(self):
+        """Test that starting twice keeps a single heartbeat."""
+        async def run():
+            monitor = LoopMonitor(interval=0.01)
+            monitor.start()
+            task = monitor._heartbeat_task
+            monitor.start()
+            same = monitor._heartbeat_task is task
+            monitor.stop()
+            return same
+
+        assert asyncio.run(run()) is True
@@ -0,0 +1,146 @@
+"""
+Tests for the nginx access log utilities.
+"""
+
+import gzip
+import json
+import pytest
+from datetime import datetime, timezone
+from utils.file_ranges import open_buffer
+from utils.nginx_log import (
+    access_logs, entry_host, line_time, logs_in_window, parse_line, request_path, seek_time,
+    summarize_window, traffic_by_host
+)
+
+BASE = datetime(2024, 1, 15, 12, 0, tzinfo=timezone.utc).timestamp()
+
+
+def log_line(timestamp, remote_addr="10.0.0.1", request="GET /checkout?step=1 HTTP/1.1", status="200"):
+    return json.dumps({
+        "time": datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec='seconds'),
+        "remote_addr": remote_addr,
+        "host": "example.com",
+        "request": request,
+        "status": status,
+        "body_bytes_sent": "100",
+        "user_agent": "Mozilla/5.0"
+    }) + "\n"
+
+
+def write_log(path, start, end, step=10, opener=open):
+    with opener(path, 'wt') as f:
+        for timestamp in range(int(start), int(end), step):
+            f.write(log_line(timestamp, remote_addr=f"10.0.0.{timestamp % 3}"))
+
+
+class TestNginxLog:
+    """Test cases for the nginx access log utilities."""
+
+    def test_parse_json_line(self):
+        """Test parsing a JSON log line."""
+        entry = parse_line(log_line(BASE).encode())
+        assert entry["remote_addr"] == "10.0.0.1"
+        assert entry["status"] == "200"
+        assert request_path(entry) == "/checkout"
+        assert line_time(log_line(BASE).encode()) == BASE
+
+    def test_parse_combined_line(self):
+        """Test parsing a line in the combined log format."""
+        line = b'10.0.0.2 - - [15/Jan/2024:12:00:00 +0000] "GET /robots.txt HTTP/1.1" 404 12 "-" "curl/8.0"'
+        entry = parse_line(line)
+        assert entry["remote_addr"] == "10.0.0.2"
+        assert entry["status"] == "404"
+        assert entry["user_agent"] == "curl/8.0"
+        assert line_time(line) == BASE
+
+    def test_unknown_line(self):
+        """Test that lines in no known format are skipped."""
+        assert parse_line(b"garbage") is None
+        assert line_time(b"garbage") is None
+
+    def test_seek_time(self, tmp_path):
+        """Test finding the first line at or after a time."""
+        path = tmp_path / "access.log"
+        write_log(path, BASE, BASE + 3600)
+        with open_buffer(str(path)) as (buffer, size):
+            offset = seek_time(buffer, size, BASE + 1805)
+            assert line_time(buffer[offset:buffer.find(b"\n", offset)]) == BASE + 1810
+            assert seek_time(buffer, size, BASE - 100) == 0
+            assert seek_time(buffer, size, BASE + 7200) == size
+
+    def test_access_logs_newest_first(self, tmp_path):
+        """Test listing the access log and its rotations."""
+        for name in ("access.log.2.gz", "access.log", "access.log.10.gz", "access.log.1", "error.log"):
+            (tmp_path / name).write_text("")
+        assert [path.rsplit("/", 1)[1] for path in access_logs(str(tmp_path))] == [
+            "access.log", "access.log.1", "access.log.2.gz", "access.log.10.gz"
+        ]
+
+    def test_logs_in_window(self, tmp_path):
+        """Test that only the logs covering the window are read."""
+        write_log(tmp_path / "access.log.2.gz", BASE - 7200, BASE - 3600, opener=gzip.open)
+        write_log(tmp_path / "access.log.1", BASE - 3600, BASE)
+        write_log(tmp_path / "access.log", BASE, BASE + 3600)
+
+        def names(start, end):
+            return [path.rsplit("/", 1)[1] for path in logs_in_window(start, end, str(tmp_path))]
+
+        assert names(BASE + 600, BASE + 1200) == ["access.log"]
+        assert names(BASE - 600, BASE + 600) == ["access.log.1", "access.log"]
+        assert names(BASE - 5400, BASE - 4800) == ["access.log.2.gz"]
+
+    def test_summarize_window(self, tmp_path):
+        """Test aggregating the traffic in a window spanning a rotation."""
+        write_log(tmp_path / "access.log.1.gz", BASE - 3600, BASE, opener=gzip.open)
+        write_log(tmp_path / "access.log", BASE, BASE + 3600)
+
+        summary, logs = summarize_window(BASE - 600, BASE + 600, str(tmp_path))
+        result = summary.to_dict(top=2)
+
+        assert len(logs) == 2
+        assert result["requests"] == 120
+        assert result["bytes_sent"] == 12000
+        assert result["top_urls"] == [("/checkout", 120)]
+        assert result["status_codes"] == {"200": 120}
+        assert len(result["top_ips"]) == 2
+        assert len(result["requests_per_minute"]) == 20
+        assert all(count == 6 for _, count in result["requests_per_minute"])
+
+    @pytest.mark.parametrize("directory", ["missing"])
+    def test_no_logs(self, tmp_path, directory):
+        """Test a missing log directory."""
+        summary, logs = summarize_window(BASE, BASE + 60, str(tmp_path / directory))
+        assert logs == []
+        assert summary.requests == 0
+
+    def test_entry_host(self):
+        """Test that the server_name is preferred and ports are stripped."""
+        assert entry_host({"server_name": "Shop.example.com", "host": "www.shop.example.com"}) == "shop.example.com"
+        assert entry_host({"host": "example.com:8080"}) == "example.com"
+        assert entry_host({}) == ""
+
+    def test_traffic_by_host(self, tmp_path):
+        """Test aggregating the traffic per host in one pass."""
+        with open(tmp_path / "access.log", 'w') as f:
+            for i in range(100):
+                f.write(json.dumps({
+                    "time": datetime.fromtimestamp(BASE + i, timezone.utc).isoformat(timespec='seconds'),
+                    "server_name": "shop.example.com" if i % 4 else "blog.example.com",
+                    "status": "502" if i % 10 == 1 else "200",
+                    "body_bytes_sent": "1000",
+                    "request_time": f"{(i % 20) / 100:.3f}"
+                }) + "\n")
+
+        hosts, logs = traffic_by_host(BASE, BASE + 100, str(tmp_path))
+        shop = hosts["shop.example.com"].to_dict(minutes=2)
+
+        assert len(logs) == 1
+        assert set(hosts) == {"shop.example.com", "blog.example.com"}
+        assert shop["requests"] == 75
+        assert shop["requests_per_minute"] == 37.5
+        assert shop["server_errors"] == 10
+        assert shop["server_error_rate"] == round(10 / 75, 4)
+        assert shop["p95_request_time"] == 0.19
+        assert shop["bytes_sent"] == 75000
+        assert shop["bytes_per_minute"] == 37500
+        assert hosts["blog.example.com"].to_dict(minutes=2)["server_errors"] == 0
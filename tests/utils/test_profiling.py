@@ -0,0 +1,142 @@
+"""
+Tests for the profiling utilities.
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from tools.generic import BaseTool
+from utils.command_executor import CommandExecutor
+from utils.profiling import (
+    CallTiming, SamplingProfiler, ToolTimingMiddleware, ToolTimings, span, use_call_timing,
+    SPAN_EXECUTE, SPAN_PARSE, SPAN_QUEUED, SPAN_SERIALIZE, SPAN_SUBPROCESS, SPAN_TOTAL
+)
+
+
+class ExampleTool(BaseTool):
+    """Tool used to exercise the timing wrapper."""
+
+    async def tool_example(self) -> dict:
+        result = await CommandExecutor.execute_command("true")
+        with span(SPAN_PARSE):
+            time.sleep(0.01)
+        return {"success": result.success}
+
+
+class TestCallTiming:
+    """Test cases for CallTiming and span."""
+
+    def test_spans(self):
+        """Test that queued, execute, serialize and total are derived from the marks."""
+        timing = CallTiming("tool_example", received_at=time.perf_counter() - 0.05)
+        timing.start()
+        timing.finish()
+        timing.complete()
+
+        assert timing.spans[SPAN_QUEUED] >= 0.05
+        assert timing.spans[SPAN_TOTAL] >= timing.spans[SPAN_QUEUED] + timing.spans[SPAN_EXECUTE]
+        assert timing.spans[SPAN_SERIALIZE] >= 0
+
+    def test_span_accumulates(self):
+        """Test that a span entered twice accumulates its time."""
+        timing = CallTiming("tool_example")
+        with use_call_timing(timing):
+            with span(SPAN_PARSE):
+                time.sleep(0.01)
+            with span(SPAN_PARSE):
+                time.sleep(0.01)
+
+        assert timing.spans[SPAN_PARSE] >= 0.02
+
+    def test_span_outside_of_call(self):
+        """Test that span is a no-op outside of a tool call."""
+        with span(SPAN_PARSE):
+            pass
+
+
+class TestToolTimings:
+    """Test cases for ToolTimings."""
+
+    def test_stats(self):
+        """Test that span durations are aggregated per tool."""
+        timings = ToolTimings()
+        for seconds in (0.1, 0.2, 0.3):
+            timing = CallTiming("tool_example")
+            timing.add(SPAN_SUBPROCESS, seconds)
+            timings.record(timing)
+
+        stats = timings.stats()["tool_example"]
+        assert stats["calls"] == 3
+        assert stats["spans"][SPAN_SUBPROCESS]["count"] == 3
+        assert stats["spans"][SPAN_SUBPROCESS]["p50"] == 0.2
+        assert stats["spans"][SPAN_SUBPROCESS]["max"] == 0.3
+        assert stats["spans"][SPAN_SUBPROCESS]["mean"] == pytest.approx(0.2)
+
+    def test_wrapped_tool_records_spans(self):
+        """Test that the registration wrapper times tool calls."""
+        timings = ToolTimings()
+        tool = ExampleTool()
+
+        with patch('tools.generic.tool_timings', timings):
+            result = asyncio.run(tool.wrap_tool(tool.tool_example)())
+
+        assert result["success"] is True
+        spans = timings.stats()["tool_example"]["spans"]
+        assert {SPAN_QUEUED, SPAN_SUBPROCESS, SPAN_PARSE, SPAN_EXECUTE, SPAN_TOTAL} <= set(spans)
+        assert spans[SPAN_PARSE]["max"] >= 0.01
+        assert spans[SPAN_EXECUTE]["max"] >= spans[SPAN_SUBPROCESS]["max"] + spans[SPAN_PARSE]["max"]
+
+    def test_middleware_records_serialization(self):
+        """Test that the middleware owns the timing and records the time after the tool as serialization."""
+        timings = ToolTimings()
+        tool = ExampleTool()
+        wrapped = tool.wrap_tool(tool.tool_example)
+
+        async def call_next(context):
+            result = await wrapped()
+            time.sleep(0.01)  # converting the result
+            return result
+
+        context = SimpleNamespace(message=SimpleNamespace(name="tool_example"))
+        with patch('tools.generic.tool_timings', timings), \
+             patch('utils.profiling.tool_timings', timings):
+            asyncio.run(ToolTimingMiddleware().on_call_tool(context, call_next))
+
+        stats = timings.stats()["tool_example"]
+        assert stats["calls"] == 1
+        assert stats["spans"][SPAN_SERIALIZE]["max"] >= 0.01
+
+
+class TestSamplingProfiler:
+    """Test cases for SamplingProfiler."""
+
+    def test_profile_busy_thread(self, tmp_path):
+        """Test that a busy thread shows up in the collapsed stacks."""
+        stop = threading.Event()
+
+        def busy_loop():
+            while not stop.is_set():
+                sum(range(1000))
+
+        thread = threading.Thread(target=busy_loop, name="busy")
+        thread.start()
+        try:
+            profiler = SamplingProfiler(rate=200)
+            profiler.run(0.2)
+        finally:
+            stop.set()
+            thread.join()
+
+        assert profiler.sample_count > 0
+        path = profiler.write(str(tmp_path))
+        with open(path) as f:
+            lines = f.read().splitlines()
+        busy = [line for line in lines if line.startswith("busy;")]
+        assert busy
+        stack, count = busy[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert "busy_loop (tests/utils/test_profiling.py:" in stack
+        assert profiler.top_functions(3)
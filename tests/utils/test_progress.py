@@ -0,0 +1,154 @@
+"""
+Tests for the progress reporting utilities.
+"""
+
+import asyncio
+import subprocess
+from tools.hello_world import HelloWorldTool
+from utils.progress import ProgressReporter, get_progress_reporter, use_progress_reporter, sample_read_progress
+
+
+class RecordingSink:
+    """Progress sink that records every notification."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, progress, total, message):
+        self.calls.append((progress, total, message))
+
+
+class TestProgressReporter:
+    """Test cases for ProgressReporter."""
+
+    def test_disabled_reporter_outside_tool_call(self):
+        """Test that a disabled reporter is returned outside of a tool call."""
+        reporter = get_progress_reporter()
+        assert reporter.enabled is False
+        assert reporter.due() is False
+        reporter.update(1, 2)  # Must not need a running event loop
+
+    def test_updates_are_throttled(self):
+        """Test that rapid updates result in a single notification."""
+        sink = RecordingSink()
+
+        async def run():
+            reporter = ProgressReporter(sink=sink, min_interval=60)
+            for i in range(1000):
+                reporter.update(i, 1000, lines=i)
+            await asyncio.sleep(0)
+            return reporter
+
+        reporter = asyncio.run(run())
+        assert len(sink.calls) == 1
+        assert sink.calls[0][:2] == (0, 1000)
+        assert reporter.details == {"lines": 999}
+
+    def test_flush_sends_latest_state(self):
+        """Test that flush bypasses the throttle."""
+        sink = RecordingSink()
+
+        async def run():
+            reporter = ProgressReporter(sink=sink, min_interval=60)
+            reporter.update(1, 10)
+            reporter.update(5, 10, message="halfway")
+            await reporter.flush()
+
+        asyncio.run(run())
+        assert sink.calls[-1] == (5, 10, "halfway")
+
+    def test_report_is_not_dropped(self):
+        """Test that reported updates are all sent, in order, despite the throttle."""
+        sink = RecordingSink()
+
+        async def run():
+            reporter = ProgressReporter(sink=sink, min_interval=60)
+            for i in range(5):
+                await reporter.report(i, output=str(i))
+
+        asyncio.run(run())
+        assert [call[0] for call in sink.calls] == [0, 1, 2, 3, 4]
+        assert sink.calls[-1][2] == '{"output":"4"}'
+
+    def test_progress_never_goes_backwards(self):
+        """Test that progress is monotonic as required by MCP."""
+        reporter = ProgressReporter()
+        reporter.update(10)
+        reporter.update(3)
+        assert reporter.progress == 10
+
+    def test_failing_sink_does_not_raise(self):
+        """Test that a failing sink does not break the tool."""
+        async def failing_sink(progress, total, message):
+            raise RuntimeError("client went away")
+
+        async def run():
+            reporter = ProgressReporter(sink=failing_sink)
+            reporter.update(1, 2)
+            await reporter.flush()
+
+        asyncio.run(run())
+
+    def test_use_progress_reporter_sets_current(self):
+        """Test that the current reporter is scoped to the block."""
+        reporter = ProgressReporter()
+        with use_progress_reporter(reporter):
+            assert get_progress_reporter() is reporter
+        assert get_progress_reporter() is not reporter
+
+
+class TestWrapTool:
+    """Test cases for BaseTool.wrap_tool."""
+
+    def test_wrapped_tool_reports_to_context(self):
+        """Test that progress reported by a tool reaches the request context."""
+        tool = HelloWorldTool()
+        sink = RecordingSink()
+
+        class FakeContext:
+            report_progress = sink
+
+        async def run():
+            async def method():
+                tool.progress.update(1, 1, message="done")
+                return {"success": True}
+            wrapped = tool.wrap_tool(method)
+            return await wrapped(ctx=FakeContext())
+
+        result = asyncio.run(run())
+        assert result == {"success": True}
+        assert sink.calls == [(1, 1, "done")]
+
+    def test_wrapped_tool_without_context(self):
+        """Test that wrapped tools still work when no context is injected."""
+        tool = HelloWorldTool()
+        result = asyncio.run(tool.wrap_tool(tool.tool_hello_world)())
+        assert result["status"] == "success"
+
+
+class TestSampleReadProgress:
+    """Test cases for sample_read_progress."""
+
+    def test_sample_read_progress_of_reading_process(self, tmp_path):
+        """Test that the read offset of a child process is sampled."""
+        data = tmp_path / "access.log"
+        data.write_bytes(b"x" * 4096)
+        # Read one block and then wait, keeping the file open
+        process = subprocess.Popen(
+            ["bash", "-c", f"exec 3<{data}; read -N 1024 -u 3 line; sleep 5"],
+        )
+        try:
+            for _ in range(100):
+                scanned, total = sample_read_progress(process.pid)
+                if scanned:
+                    break
+                asyncio.run(asyncio.sleep(0.02))
+            assert total >= 4096
+            assert scanned >= 1024
+        finally:
+            process.kill()
+            process.wait()
+
+    def test_sample_read_progress_unknown_pid(self):
+        """Test that a missing process reports no progress."""
+        assert sample_read_progress(2 ** 22 + 1) == (0, 0)
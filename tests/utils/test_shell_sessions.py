@@ -0,0 +1,197 @@
+"""
+Tests for the shell session utilities.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+from utils.command_executor import CommandExecutor
+from utils.shell_sessions import SessionClosed, ShellSession, ShellSessions
+
+
+async def in_session(commands, cwd=None, env=None, **kwargs):
+    """Run commands in a new session and return their results."""
+    sessions = ShellSessions(**kwargs)
+    session = await sessions.open(cwd, env)
+    try:
+        return [await session.run(command) for command in commands]
+    finally:
+        await sessions.close_all()
+
+
+class TestShellSession:
+    """Test cases for ShellSession."""
+
+    def test_state_carries_over(self, tmp_path):
+        """Test that the working directory and variables carry over between commands."""
+        (tmp_path / "sub").mkdir()
+        results = asyncio.run(in_session(
+            ["cd sub; export A=1; B=2", "pwd; echo $A $B $C"],
+            cwd=str(tmp_path), env={"C": "3"}
+        ))
+
+        result, truncated = results[1]
+        assert result.success is True
+        assert result.stdout == f"{tmp_path / 'sub'}\n1 2 3\n"
+        assert truncated is False
+
+    def test_return_code_and_stderr(self):
+        """Test that the exit status and stderr of each command are kept apart."""
+        results = asyncio.run(in_session(["echo out; echo err >&2; exit_code() { return 3; }; exit_code", "echo next"]))
+
+        failed, _ = results[0]
+        assert failed.success is False
+        assert failed.return_code == 3
+        assert failed.stdout == "out\n"
+        assert failed.stderr == "err\n"
+        assert results[1][0].stdout == "next\n"
+        assert results[1][0].stderr == ""
+
+    def test_output_without_newline(self):
+        """Test that output not ending in a newline is kept as is."""
+        results = asyncio.run(in_session(["printf abc", "printf def"]))
+        assert [result.stdout for result, _ in results] == ["abc", "def"]
+
+    def test_stdin_is_not_the_session(self):
+        """Test that a command reading stdin can not read the commands that follow."""
+        results = asyncio.run(in_session(["cat", "echo after"]))
+        assert results[0][0].stdout == ""
+        assert results[1][0].stdout == "after\n"
+
+    def test_status_line_split_over_reads(self):
+        """Test that output is returned once when a read ends inside the status line."""
+        async def run():
+            pipe = asyncio.StreamReader()
+            pipe.feed_data(b"hello world\n\n__mcp_abc__ 0 /da")
+            session = ShellSession("split", None, idle_timeout=0)
+            read = asyncio.ensure_future(session._read_until("stdout", pipe, "__mcp_abc__"))
+            await asyncio.sleep(0)
+            pipe.feed_data(b"ta/web\nnext")
+            return await read, session._buffers["stdout"]
+
+        (output, truncated, status), rest = asyncio.run(run())
+        assert output == "hello world\n"
+        assert truncated is False
+        assert status == "0 /data/web"
+        assert rest == b"next"
+
+    def test_dangerous_command_blocked(self):
+        """Test that dangerous commands are blocked in sessions too."""
+        result, _ = asyncio.run(in_session(["rm -rf /tmp/nothing"]))[0]
+        assert result.success is False
+        assert "blocked" in result.stderr
+
+    def test_output_truncated(self):
+        """Test that output beyond the limit is dropped and flagged."""
+        with patch('utils.shell_sessions.MAX_OUTPUT_BYTES', 1000):
+            results = asyncio.run(in_session(["head -c 100000 /dev/zero | tr '\\0' x", "echo ok"]))
+        result, truncated = results[0]
+        assert len(result.stdout) == 1000
+        assert truncated is True
+        assert results[1][0].stdout == "ok\n"
+
+    def test_timeout_closes_session(self):
+        """Test that a command running into its timeout kills the session."""
+        async def run():
+            sessions = ShellSessions()
+            session = await sessions.open()
+            pid = session.process.pid
+            with pytest.raises(SessionClosed, match="timed out"):
+                await session.run("sleep 30", timeout=1)
+            return sessions, session, pid
+
+        sessions, session, pid = asyncio.run(run())
+        assert session.closed is True
+        assert pid not in CommandExecutor._process_groups
+        assert sessions.list() == []
+
+    def test_exit_closes_session(self):
+        """Test that a session whose shell exits is closed."""
+        async def run():
+            sessions = ShellSessions()
+            session = await sessions.open()
+            with pytest.raises(SessionClosed):
+                await session.run("exit 0")
+            return session
+
+        assert asyncio.run(run()).closed is True
+
+    def test_commands_run_one_at_a_time(self):
+        """Test that concurrent commands in a session do not mix their output."""
+        async def run():
+            sessions = ShellSessions()
+            session = await sessions.open()
+            results = await asyncio.gather(
+                session.run("sleep 0.2; echo first"),
+                session.run("echo second")
+            )
+            await sessions.close_all()
+            return results
+
+        first, second = asyncio.run(run())
+        assert first[0].stdout == "first\n"
+        assert second[0].stdout == "second\n"
+
+
+class TestShellSessions:
+    """Test cases for ShellSessions."""
+
+    def test_max_sessions(self):
+        """Test that no more than max_sessions can be open."""
+        async def run():
+            sessions = ShellSessions(max_sessions=1)
+            session = await sessions.open()
+            with pytest.raises(ValueError, match="At most 1"):
+                await sessions.open()
+            await sessions.close(session.id)
+            other = await sessions.open()
+            await sessions.close_all()
+            return sessions, other
+
+        sessions, other = asyncio.run(run())
+        assert sessions.stats() == {"open": 0, "max_sessions": 1, "opened": 2}
+        assert other.closed is True
+
+    def test_invalid_cwd(self, tmp_path):
+        """Test that a session can not start in a missing directory."""
+        with pytest.raises(ValueError, match="Not a directory"):
+            asyncio.run(ShellSessions().open(str(tmp_path / "missing")))
+
+    def test_idle_timeout(self):
+        """Test that an idle session closes itself."""
+        async def run():
+            sessions = ShellSessions(idle_timeout=0.3)
+            session = await sessions.open()
+            await session.run("true")
+            await asyncio.sleep(0.2)
+            # Using the session postpones the timeout
+            await session.run("true")
+            await asyncio.sleep(0.2)
+            open_after_use = not session.closed
+            await asyncio.sleep(0.3)
+            return sessions, session, open_after_use
+
+        sessions, session, open_after_use = asyncio.run(run())
+        assert open_after_use is True
+        assert session.closed is True
+        assert sessions.list() == []
+
+    def test_get_unknown(self):
+        """Test that an unknown session is reported."""
+        with pytest.raises(KeyError):
+            ShellSessions().get("missing")
+
+    def test_list(self, tmp_path):
+        """Test that open sessions are listed with their working directory."""
+        async def run():
+            sessions = ShellSessions()
+            session = await sessions.open(str(tmp_path))
+            await session.run("cd /")
+            listed = sessions.list()
+            await sessions.close_all()
+            return session, listed
+
+        session, listed = asyncio.run(run())
+        assert [item["session"] for item in listed] == [session.id]
+        assert listed[0]["cwd"] == "/"
+        assert listed[0]["commands"] == 1
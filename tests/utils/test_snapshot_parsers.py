@@ -0,0 +1,146 @@
+"""
+Tests for the snapshot parsers.
+"""
+
+from utils.snapshot_parsers import parser_registry
+
+TOP = """top - 12:00:01 up 10 days,  3:02,  1 user,  load average: 8.50, 4.20, 2.10
+Tasks: 212 total,   3 running, 209 sleeping,   0 stopped,   0 zombie
+%Cpu(s): 90.0 us,  5.0 sy,  0.0 ni,  5.0 id,  0.0 wa,  0.0 hi,  0.0 si,  0.0 st
+MiB Mem :  15886.5 total,   1234.2 free,   8000.1 used,   6652.2 buff/cache
+MiB Swap:      0.0 total,      0.0 free,      0.0 used.   7000.0 avail Mem
+
+    PID USER      PR  NI    VIRT    RES    SHR S  %CPU  %MEM     TIME+ COMMAND
+   1234 app       20   0  500000 100000  20000 R  98.0   0.6   1:02.03 php-fpm: pool www
+   2345 mysql     20   0 2000000 900000  30000 S  45.5   5.6  10:00.00 mysqld
+   3456 app       20   0  500000 100000  20000 S   1.0   0.6   0:01.00 php-fpm: pool www
+
+top - 12:00:06 up 10 days,  3:02,  1 user,  load average: 9.00, 4.50, 2.20
+Tasks: 213 total,   2 running, 211 sleeping,   0 stopped,   0 zombie
+    PID USER      PR  NI    VIRT    RES    SHR S  %CPU  %MEM     TIME+ COMMAND
+   2345 mysql     20   0 2000000 900000  30000 S  75.0   5.6  10:05.00 mysqld
+"""
+
+PS = """USER         PID %CPU %MEM    VSZ   RSS TTY      STAT START   TIME COMMAND
+root           1  0.0  0.1 169000 13000 ?        Ss   Jan01   0:10 /sbin/init
+app         1234 98.0  0.6 500000 100000 ?       R    12:00   1:02 php-fpm: pool www
+app         1235 12.0  0.6 500000 100000 ?       S    12:00   0:12 php-fpm: pool www
+app         1300  0.5  0.3 400000 50000 ?        S    12:00   0:01 php-fpm: pool cron
+mysql       2345 45.5  5.6 2000000 900000 ?      Dsl  Jan01  10:00 /usr/sbin/mysqld --basedir=/usr
+"""
+
+FREE = """               total        used        free      shared  buff/cache   available
+Mem:           15886        8000        1234         100        6652        7000
+Swap:              0           0           0
+"""
+
+PROCESSLIST = """+-----+------+-----------+------+---------+------+--------------+-----------------------------+
+| Id  | User | Host      | db   | Command | Time | State        | Info                        |
++-----+------+-----------+------+---------+------+--------------+-----------------------------+
+| 10  | app  | localhost | shop | Query   | 120  | Sending data | SELECT * FROM sales_order   |
+| 11  | app  | localhost | shop | Sleep   | 300  |              | NULL                        |
+| 12  | app  | localhost | shop | Query   | 5    | Locked       | UPDATE cataloginventory ... |
+| 13  | root | localhost | NULL | Query   | 0    | starting     | SHOW FULL PROCESSLIST       |
++-----+------+-----------+------+---------+------+--------------+-----------------------------+
+"""
+
+PROCESSLIST_VERTICAL = """*************************** 1. row ***************************
+     Id: 10
+   User: app
+   Host: localhost
+     db: shop
+Command: Query
+   Time: 120
+  State: Sending data
+   Info: SELECT * FROM sales_order
+*************************** 2. row ***************************
+     Id: 11
+   User: app
+   Host: localhost
+     db: shop
+Command: Sleep
+   Time: 300
+  State:
+   Info: NULL
+"""
+
+
+def parse(text):
+    parser = parser_registry.find_parser(text[:4096])
+    assert parser is not None
+    return parser.name, parser.parse(text)
+
+
+class TestSnapshotParsers:
+    """Test cases for the built-in snapshot parsers."""
+
+    def test_top(self):
+        """Test parsing several top snapshots."""
+        name, summary = parse(TOP)
+        assert name == "top"
+        assert summary["snapshot_count"] == 2
+        first = summary["snapshots"][0]
+        assert first["time"] == "12:00:01"
+        assert first["load"] == {"1m": 8.5, "5m": 4.2, "15m": 2.1}
+        assert first["tasks"]["running"] == 3
+        assert first["memory"]["unit"] == "MiB"
+        assert first["memory"]["total"] == 15886.5
+        assert first["memory"]["buff/cache"] == 6652.2
+        assert first["top_cpu"][0]["pid"] == 1234
+        assert first["top_cpu"][0]["command"] == "php-fpm: pool www"
+        assert first["php_fpm_workers"] == 2
+        assert summary["snapshots"][1]["top_cpu"][0]["cpu"] == 75.0
+
+    def test_ps(self):
+        """Test parsing ps aux output."""
+        name, summary = parse(PS)
+        assert name == "ps"
+        assert summary["process_count"] == 5
+        assert summary["top_cpu"][0]["pid"] == 1234
+        assert summary["top_memory"][0]["command"] == "/usr/sbin/mysqld --basedir=/usr"
+        assert summary["php_fpm_workers"] == {"total": 3, "pools": {"www": 2, "cron": 1}}
+        assert summary["running"] == 1
+        assert summary["uninterruptible"] == 1
+
+    def test_free(self):
+        """Test parsing free output."""
+        name, summary = parse(FREE)
+        assert name == "free"
+        assert summary["mem"]["total"] == 15886
+        assert summary["mem"]["available"] == 7000
+        assert summary["swap"]["used"] == 0
+
+    def test_load(self):
+        """Test parsing /proc/loadavg samples and uptime output."""
+        name, summary = parse("1.50 1.20 0.90 3/456 7890\n4.00 2.00 1.00 5/460 7900\n")
+        assert name == "load"
+        assert summary["max_1m"] == 4.0
+        assert summary["samples"][0]["processes"] == 456
+
+        name, summary = parse(" 12:00:01 up 10 days,  3:02,  1 user,  load average: 8.50, 4.20, 2.10\n")
+        assert name == "load"
+        assert summary["samples"] == [{"1m": 8.5, "5m": 4.2, "15m": 2.1}]
+
+    def test_mysql_processlist_table(self):
+        """Test parsing a processlist table."""
+        name, summary = parse(PROCESSLIST)
+        assert name == "mysql_processlist"
+        assert summary["connection_count"] == 4
+        assert summary["sleeping_count"] == 1
+        assert summary["active_count"] == 3
+        assert summary["longest_running"][0]["id"] == "10"
+        assert summary["longest_running"][0]["time"] == 120
+        assert summary["longest_running"][0]["info"] == "SELECT * FROM sales_order"
+        assert summary["by_state"]["Locked"] == 1
+
+    def test_mysql_processlist_vertical(self):
+        """Test parsing a processlist in vertical format."""
+        name, summary = parse(PROCESSLIST_VERTICAL)
+        assert name == "mysql_processlist"
+        assert summary["connection_count"] == 2
+        assert summary["longest_running"][0]["state"] == "Sending data"
+        assert summary["by_command"] == {"Query": 1, "Sleep": 1}
+
+    def test_unknown_format(self):
+        """Test that files in no known format are not claimed by any parser."""
+        assert parser_registry.find_parser("Jan 01 12:00:00 kernel: something happened\n") is None
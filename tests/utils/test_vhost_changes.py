@@ -0,0 +1,101 @@
+"""
+Tests for the vhost change utilities.
+"""
+
+import pytest
+from utils.vhost_changes import MAX_VHOSTS_PER_COMMAND, VHostChange, diff_vhosts, plan_commands, validate_changes
+
+
+class TestVHostChanges:
+    """Test cases for the vhost change utilities."""
+
+    @pytest.mark.parametrize("item, arguments", [
+        ({"vhost": "example.com", "action": "https", "value": "true"}, ["--https"]),
+        ({"vhost": "example.com", "action": "force_https", "value": False}, ["--disable-force-https"]),
+        ({"vhost": "example.com", "action": "php", "value": "8.1"}, ["--php", "8.1"]),
+        ({"vhost": "example.com", "action": "type", "value": "magento2"}, ["--type", "magento2"]),
+    ])
+    def test_arguments(self, item, arguments):
+        """Test the CLI arguments of a change."""
+        assert VHostChange.from_dict(item).arguments() == arguments
+
+    @pytest.mark.parametrize("item", [
+        {"vhost": "localhost", "action": "https", "value": "true"},
+        {"vhost": "example.com; rm -rf /", "action": "https", "value": "true"},
+        {"vhost": "example.com", "action": "https --yes", "value": "true"},
+        {"vhost": "example.com", "action": "disable-https", "value": "true"},
+        {"vhost": "example.com", "action": "php", "value": "8.1 && reboot"},
+        {"vhost": "example.com", "action": "php"},
+        "example.com",
+    ])
+    def test_invalid_change(self, item):
+        """Test that invalid changes are rejected."""
+        with pytest.raises(ValueError):
+            VHostChange.from_dict(item)
+
+    def test_validate_changes(self):
+        """Test that duplicates are merged and conflicts reported by index."""
+        changes, errors = validate_changes([
+            {"vhost": "a.example.com", "action": "https", "value": "true"},
+            {"vhost": "a.example.com", "action": "https", "value": True},
+            {"vhost": "a.example.com", "action": "php", "value": "8.1"},
+            {"vhost": "a.example.com", "action": "php", "value": "8.2"},
+            {"vhost": "bad", "action": "https", "value": "true"},
+        ])
+        assert [change.action for change in changes] == ["https", "php"]
+        assert [error["index"] for error in errors] == [3, 4]
+        assert "Conflicting" in errors[0]["error"]
+
+    def test_plan_groups_per_vhost(self):
+        """Test that all changes of a vhost go into one command."""
+        changes, _ = validate_changes([
+            {"vhost": "a.example.com", "action": "https", "value": "true"},
+            {"vhost": "b.example.com", "action": "php", "value": "8.2"},
+            {"vhost": "a.example.com", "action": "force_https", "value": "true"},
+        ])
+        commands = plan_commands(changes)
+        assert [command.command for command in commands] == [
+            "hypernode-manage-vhosts a.example.com --https --force-https",
+            "hypernode-manage-vhosts b.example.com --php 8.2",
+        ]
+        assert len(commands[0].changes) == 2
+
+    def test_plan_shares_identical_changes(self):
+        """Test that vhosts getting identical changes share a command."""
+        items = [
+            {"vhost": f"shop{i}.example.com", "action": "force_https", "value": "true"}
+            for i in range(MAX_VHOSTS_PER_COMMAND + 10)
+        ]
+        commands = plan_commands(validate_changes(items)[0])
+        assert len(commands) == 2
+        assert commands[0].command.startswith("hypernode-manage-vhosts shop0.example.com shop1.example.com")
+        assert commands[0].command.endswith("--force-https")
+        assert sum(len(command.changes) for command in commands) == len(items)
+
+    def test_diff_vhosts(self):
+        """Test that only differing desired settings become changes."""
+        current = {
+            "a.example.com": {"https": True, "force_https": False, "type": "magento2", "varnish": False},
+            "b.example.com": {"https": True, "force_https": True, "type": "wordpress"},
+            "c.example.com": {"https": False},
+        }
+        desired = {
+            "a.example.com": {"https": True, "force_https": True, "type": "magento2"},
+            "b.example.com": {"https": True, "force_https": True},
+            "new.example.com": {"type": "magento2", "https": True},
+        }
+
+        changes, errors = diff_vhosts(current, desired)
+
+        assert errors == []
+        assert [change.to_dict() for change in changes] == [
+            {"vhost": "a.example.com", "action": "force-https", "value": "true"},
+            {"vhost": "new.example.com", "action": "type", "value": "magento2"},
+            {"vhost": "new.example.com", "action": "https", "value": "true"},
+        ]
+
+    def test_diff_vhosts_invalid_settings(self):
+        """Test that invalid desired settings are reported."""
+        changes, errors = diff_vhosts({}, {"a.example.com": {"php": "8.2; reboot"}, "b.example.com": "magento2"})
+        assert changes == []
+        assert [error["vhost"] for error in errors] == ["a.example.com", "b.example.com"]
@@ -0,0 +1,131 @@
+"""
+Tests for the vhost state cache.
+"""
+
+import asyncio
+import json
+import os
+from unittest.mock import patch
+from utils.vhost_state import (
+    LIST_COMMAND, CliVHostBackend, ConfigVHostBackend, VHostState, select_backend
+)
+
+VHOSTS = {"example.hypernode.io": {"https": True, "type": "magento2"}}
+
+
+class TestVHostState:
+    """Test cases for VHostState."""
+
+    @patch('utils.vhost_state.CommandExecutor.execute_json_command')
+    def test_state_is_cached(self, mock_execute_json):
+        """Test that the vhosts are read once within the ttl."""
+        mock_execute_json.return_value = (True, VHOSTS)
+        state = VHostState(CliVHostBackend(), ttl=60)
+
+        assert asyncio.run(state.load()) == (True, VHOSTS)
+        assert asyncio.run(state.load()) == (True, VHOSTS)
+        mock_execute_json.assert_called_once_with(LIST_COMMAND)
+        assert state.stats() == {"backend": "cli", "cached": True, "reads": 1, "hits": 1}
+
+    @patch('utils.vhost_state.CommandExecutor.execute_json_command')
+    def test_refresh_and_invalidate(self, mock_execute_json):
+        """Test that refreshing or invalidating reads the vhosts again."""
+        mock_execute_json.return_value = (True, VHOSTS)
+        state = VHostState(CliVHostBackend(), ttl=60)
+
+        asyncio.run(state.load())
+        asyncio.run(state.load(refresh=True))
+        state.invalidate()
+        asyncio.run(state.load())
+        assert mock_execute_json.call_count == 3
+
+    @patch('utils.vhost_state.CommandExecutor.execute_json_command')
+    def test_expired_state(self, mock_execute_json):
+        """Test that the vhosts are read again after the ttl."""
+        mock_execute_json.return_value = (True, VHOSTS)
+        state = VHostState(CliVHostBackend(), ttl=0)
+
+        asyncio.run(state.load())
+        asyncio.run(state.load())
+        assert mock_execute_json.call_count == 2
+
+    @patch('utils.vhost_state.CommandExecutor.execute_json_command')
+    def test_failure_is_not_cached(self, mock_execute_json):
+        """Test that a failed read is reported and not cached."""
+        mock_execute_json.return_value = (False, "Command failed")
+        state = VHostState(CliVHostBackend(), ttl=60)
+
+        assert asyncio.run(state.load()) == (False, "Command failed")
+        assert state.stats()["cached"] is False
+
+
+class TestConfigVHostBackend:
+    """Test cases for ConfigVHostBackend."""
+
+    def test_file_matches_cli(self, tmp_path):
+        """Test that a configuration file reads as the CLI lists it."""
+        path = tmp_path / "vhosts.json"
+        path.write_text(json.dumps(VHOSTS))
+
+        with patch('utils.vhost_state.CommandExecutor.execute_json_command', return_value=(True, VHOSTS)):
+            cli = asyncio.run(CliVHostBackend().read())
+        assert asyncio.run(ConfigVHostBackend(str(path)).read()) == cli
+
+    def test_file_is_reread_when_changed(self, tmp_path):
+        """Test that the file is parsed once until it changes."""
+        path = tmp_path / "vhosts.json"
+        path.write_text(json.dumps(VHOSTS))
+        backend = ConfigVHostBackend(str(path))
+
+        backend.read_sync()
+        backend.read_sync()
+        assert backend.loads == 1
+
+        path.write_text(json.dumps({**VHOSTS, "shop.hypernode.io": {"https": False}}))
+        os.utime(path, ns=(0, 1))
+        assert set(backend.read_sync()) == {"example.hypernode.io", "shop.hypernode.io"}
+        assert backend.loads == 2
+
+    def test_directory(self, tmp_path):
+        """Test a directory with a settings file per vhost."""
+        (tmp_path / "example.hypernode.io.json").write_text(json.dumps(VHOSTS["example.hypernode.io"]))
+        (tmp_path / "README").write_text("not a vhost")
+        backend = ConfigVHostBackend(str(tmp_path))
+
+        assert asyncio.run(backend.read()) == (True, VHOSTS)
+
+        settings = tmp_path / "example.hypernode.io.json"
+        settings.write_text(json.dumps({"https": False}))
+        os.utime(settings, ns=(0, 1))
+        assert backend.read_sync() == {"example.hypernode.io": {"https": False}}
+        assert backend.loads == 2
+
+    def test_invalid_configuration(self, tmp_path):
+        """Test that an invalid configuration is reported."""
+        path = tmp_path / "vhosts.json"
+        path.write_text("[1, 2]")
+
+        success, error = asyncio.run(ConfigVHostBackend(str(path)).read())
+        assert success is False
+        assert "Failed to read vhost configuration" in error
+
+    def test_state_skips_ttl(self, tmp_path):
+        """Test that a watching backend is asked on every load."""
+        path = tmp_path / "vhosts.json"
+        path.write_text(json.dumps(VHOSTS))
+        backend = ConfigVHostBackend(str(path))
+        state = VHostState(backend, ttl=60)
+
+        asyncio.run(state.load())
+        asyncio.run(state.load())
+        assert state.stats() == {"backend": "config", "cached": True, "reads": 2, "hits": 0}
+        assert backend.loads == 1
+
+    def test_select_backend(self, tmp_path):
+        """Test that the configuration is used when it exists."""
+        path = tmp_path / "vhosts.json"
+        assert select_backend(str(path)).name == "cli"
+        path.write_text("{}")
+        assert select_backend(str(path)).name == "config"
+        with patch.dict(os.environ, {"HYPERNODE_VHOSTS_CONFIG": str(path)}):
+            assert select_backend().name == "config"
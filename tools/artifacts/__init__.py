@@ -0,0 +1,3 @@
+"""
+Artifact tools package.
+"""
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""
+Artifact fetching tool for Hypernode MCP Server.
+"""
+
+import asyncio
+import functools
+from typing import Dict, Any, Optional
+from ..generic import BaseTool, tool_registry
+from utils.artifacts import artifact_store
+
+MAX_FETCH_LENGTH = 1024 * 1024
+MAX_FETCH_LINES = 10000
+
+class ArtifactsFetchTool(BaseTool):
+    """Artifact fetching tool implementation."""
+    
+    async def tool_fetch_artifact(
+        self,
+        artifact: str,
+        offset: int = 0,
+        length: int = 65536,
+        tail: Optional[int] = None,
+        start_line: Optional[int] = None,
+        line_count: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Fetch part of a tool output that was too large to return at once.
+        
+        Tools return an artifact handle instead of their full output when it
+        is larger than the artifact threshold. Reads a byte range by default.
+        With tail, returns the last lines of the output; with start_line,
+        returns line_count lines starting at that line. Artifacts are evicted,
+        least recently used first, when the store is full.
+        
+        Args:
+            artifact: The artifact id from the artifact handle of a tool response
+            offset: Byte offset to start reading at; negative counts from the end
+            length: Number of bytes to read, at most 1 MB
+            tail: Number of lines to return from the end of the output
+            start_line: First line to return (0-based); negative counts from the end
+            line_count: Number of lines to return with start_line, at most 10000
+        
+        Returns:
+            Dict containing the content, its offset and length, and next_offset to continue reading
+        """
+        try:
+            handle = artifact_store.get(artifact)
+        except KeyError as e:
+            return {
+                "success": False,
+                "error": e.args[0],
+                "artifact": artifact
+            }
+        
+        if tail is not None:
+            mode = "tail"
+            read = functools.partial(artifact_store.tail_lines, artifact, min(tail, MAX_FETCH_LINES))
+        elif start_line is not None:
+            mode = "lines"
+            read = functools.partial(artifact_store.read_lines, artifact, start_line, min(line_count, MAX_FETCH_LINES))
+        else:
+            mode = "range"
+            read = functools.partial(artifact_store.read_range, artifact, offset, min(length, MAX_FETCH_LENGTH))
+        
+        try:
+            file_range = await asyncio.to_thread(read)
+        except (KeyError, OSError) as e:
+            # Evicted between the lookup and the read
+            return {
+                "success": False,
+                "error": f"Failed to read artifact: {e}",
+                "artifact": artifact
+            }
+        
+        return {
+            "success": True,
+            **handle.to_dict(),
+            "mode": mode,
+            **file_range.to_dict()
+        }
+
+# Create and register the tool instance automatically
+artifacts_fetch_tool = ArtifactsFetchTool()
+tool_registry.register_tool(artifacts_fetch_tool)
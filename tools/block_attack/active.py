@@ -0,0 +1,46 @@
+"""
+Active attack block listing tool for Hypernode MCP Server.
+"""
+
+import asyncio
+from typing import Dict, Any
+from ..generic import BaseTool, tool_registry
+from utils.attack_catalogue import active_blocks, attack_catalogue
+
+class BlockAttackActiveTool(BaseTool):
+    """Active attack block listing tool implementation."""
+    
+    async def tool_list_active_blocks(self) -> Dict[str, Any]:
+        """
+        List the attack blocks currently enabled on the Hypernode.
+        
+        A block is active when an nginx config snippet in the custom nginx
+        config directory names its attack type. The scan is cached until the
+        directory changes or an attack is blocked, so checking costs a stat
+        per snippet.
+        
+        Returns:
+            Dict containing the active attack types and the snippets installing them
+        """
+        success, catalogue = await attack_catalogue.load()
+        if not success:
+            # Blocks made through the server are still known
+            names, error = [], catalogue
+        else:
+            names, error = catalogue.names, None
+        
+        active = await asyncio.to_thread(active_blocks.active, names)
+        
+        response = {
+            "success": True,
+            "active": [{"name": name, **block} for name, block in active.items()],
+            "count": len(active),
+            "config_dir": active_blocks.directory
+        }
+        if error is not None:
+            response["attacks_error"] = error
+        return response
+
+# Create and register the tool instance automatically
+block_attack_active_tool = BlockAttackActiveTool()
+tool_registry.register_tool(block_attack_active_tool)
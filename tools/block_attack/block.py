@@ -4,6 +4,7 @@ Attack blocking tool for Hypernode MCP Server.
 
 from typing import Dict, Any
 from ..generic import BaseTool, tool_registry
+from utils.attack_catalogue import active_blocks, attack_catalogue
 from utils.command_executor import CommandExecutor
 
 class BlockAttackTool(BaseTool):
@@ -27,6 +28,10 @@ class BlockAttackTool(BaseTool):
         
         result = await CommandExecutor.execute_command(command)
         
+        if result.success:
+            attack_catalogue.invalidate()
+            active_blocks.record_block(attack_type)
+        
         return {
             "success": result.success,
             "result": result.stdout if result.success else result.stderr,
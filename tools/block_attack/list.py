@@ -4,7 +4,7 @@ Attack listing tool for Hypernode MCP Server.
 
 from typing import Dict, Any
 from ..generic import BaseTool, tool_registry
-from utils.command_executor import CommandExecutor
+from utils.attack_catalogue import attack_catalogue
 
 class BlockAttackListTool(BaseTool):
     """Attack listing tool implementation."""
@@ -13,45 +13,26 @@ class BlockAttackListTool(BaseTool):
         """
         List all available but not necessarily enabled known attack-blocking options on the Hypernode.
         
+        The help of hypernode-systemctl block_attack is parsed once and cached
+        until the CLI changes or an attack is blocked.
+        
         Returns:
             Dict containing the list of available attack types
         """
-        command = "hypernode-systemctl block_attack --help"
-        
-        result = await CommandExecutor.execute_command(command)
+        success, catalogue = await attack_catalogue.load()
         
-        if not result.success:
+        if not success:
             return {
                 "success": False,
-                "error": result.stderr,
+                "error": catalogue,
                 "attacks": []
             }
         
-        # Parse the help output to extract attack names and descriptions
-        lines = result.stdout.strip().split('\n')
-        attacks = []
-        
-        for line in lines:
-            line = line.strip()
-            if line and not line.startswith('usage:') and not line.startswith('The possible values are:') and not line.startswith('options:'):
-                # Look for lines that contain attack names and descriptions
-                if 'Block' in line and '\t' in line:
-                    # Extract attack name and description
-                    parts = line.split('\t')
-                    if len(parts) >= 2:
-                        attack_name = parts[0].strip()
-                        description = parts[1].strip()
-                        
-                        attacks.append({
-                            "name": attack_name,
-                            "description": description
-                        })
-        
         return {
             "success": True,
-            "attacks": attacks,
-            "count": len(attacks),
-            "raw_output": result.stdout
+            "attacks": catalogue.attacks,
+            "count": len(catalogue.attacks),
+            "raw_output": catalogue.raw_output
         }
 
 # Create and register the tool instance automatically
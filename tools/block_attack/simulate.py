@@ -0,0 +1,70 @@
+"""
+Attack block simulation tool for Hypernode MCP Server.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, Any
+from ..generic import BaseTool, tool_registry
+from utils.attack_rules import rule_for, simulate_block
+
+MAX_HOURS = 24
+
+class BlockAttackSimulateTool(BaseTool):
+    """Attack block simulation tool implementation."""
+    
+    async def tool_simulate_block_attack(self, attack_type: str, hours: float = 1, samples: int = 10, top: int = 10) -> Dict[str, Any]:
+        """
+        Measure what blocking an attack type would have blocked in recent traffic, without blocking anything.
+        
+        The criteria of the attack (countries, user agent, paths and methods)
+        are evaluated in-process against the access log of the last hours.
+        Lines are prefiltered on their raw bytes and only possible matches
+        are parsed, so a simulation is cheap enough to run before every block.
+        
+        Args:
+            attack_type: The type of attack to simulate, as listed by list_attacks (e.g., "BlockChinaBruteForce")
+            hours: Hours of recent traffic to evaluate the block against (default: 1)
+            samples: Number of legitimate-looking matched requests to return, one per IP
+            top: Number of top IPs and vhosts to return
+        
+        Returns:
+            Dict containing the requests, IPs and vhosts the block would affect
+        """
+        try:
+            rule = rule_for(attack_type)
+        except ValueError as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "attack_type": attack_type
+            }
+        
+        hours = max(min(hours, MAX_HOURS), 0)
+        end = time.time()
+        start = end - hours * 3600
+        impact, logs = await asyncio.to_thread(simulate_block, rule, start, end, None, max(samples, 0))
+        
+        result = impact.to_dict(top)
+        for sample in result["samples"]:
+            sample["timestamp"] = self._isoformat(sample["timestamp"])
+        
+        return {
+            "success": True,
+            "attack_type": attack_type,
+            "criteria": rule.to_dict(),
+            "hours": hours,
+            "window_start": self._isoformat(start),
+            "window_end": self._isoformat(end),
+            "logs": logs,
+            **result
+        }
+    
+    @staticmethod
+    def _isoformat(timestamp: float) -> str:
+        return datetime.fromtimestamp(timestamp).astimezone().isoformat(timespec='seconds')
+
+# Create and register the tool instance automatically
+block_attack_simulate_tool = BlockAttackSimulateTool()
+tool_registry.register_tool(block_attack_simulate_tool)
@@ -0,0 +1,59 @@
+"""
+Attack block suggestion tool for Hypernode MCP Server.
+"""
+
+import asyncio
+from typing import Dict, Any
+from ..generic import BaseTool, tool_registry
+from utils.attack_catalogue import attack_catalogue
+from utils.attack_detection import attack_detector, log_follower, suggest_attacks
+
+class BlockAttackSuggestTool(BaseTool):
+    """Attack block suggestion tool implementation."""
+    
+    async def tool_suggest_attack_blocks(self, top: int = 10) -> Dict[str, Any]:
+        """
+        Detect attacks in the live access log and suggest the block_attack types that block them.
+        
+        The access log is followed, and per-IP, per-network, login and crawler
+        request rates are kept over a sliding window in bounded memory. Brute
+        forcing of login and admin paths, crawler bursts and floods are
+        reported as findings, and the attack types from list_attacks whose
+        criteria match the requests of a finding are suggested with the
+        findings as evidence. Run simulate_block_attack before blocking.
+        
+        Args:
+            top: Number of heaviest keys of each kind to check
+        
+        Returns:
+            Dict containing the findings and the suggested attack types with their evidence
+        """
+        try:
+            lines = await asyncio.to_thread(log_follower.poll)
+        except OSError as e:
+            return {
+                "success": False,
+                "error": f"Failed to read the access log: {e}"
+            }
+        
+        findings = attack_detector.findings(top)
+        response = {
+            "success": True,
+            "window_seconds": attack_detector.window,
+            "lines_read": lines,
+            "findings": [finding.to_dict() for finding in findings],
+            "suggestions": []
+        }
+        if not findings:
+            return response
+        
+        success, catalogue = await attack_catalogue.load()
+        if not success:
+            response["attacks_error"] = catalogue
+            return response
+        response["suggestions"] = suggest_attacks(findings, catalogue.attacks)
+        return response
+
+# Create and register the tool instance automatically
+block_attack_suggest_tool = BlockAttackSuggestTool()
+tool_registry.register_tool(block_attack_suggest_tool)
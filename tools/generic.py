@@ -3,11 +3,21 @@ Generic tool base class for Hypernode MCP Server tools.
 Provides common functionality that other tools can inherit from.
 """
 
+import functools
+import inspect
 import logging
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List, Callable
 from dataclasses import dataclass
 from utils.command_executor import CommandExecutor, CommandResult
+from utils.profiling import CallTiming, current_call_timing, tool_timings, use_call_timing
+from utils.progress import ProgressReporter, get_progress_reporter, use_progress_reporter
+
+try:
+    from fastmcp import Context
+except ImportError:
+    # fastmcp is only needed to serve the tools, not to call them directly
+    Context = None
 
 class BaseTool(ABC):
     """
@@ -19,6 +29,48 @@ class BaseTool(ABC):
         self.mcp = mcp
         self.logger = logging.getLogger(self.__class__.__name__)
     
+    @property
+    def progress(self) -> ProgressReporter:
+        """Progress reporter of the tool call currently being handled."""
+        return get_progress_reporter()
+    
+    def wrap_tool(self, method: Callable) -> Callable:
+        """
+        Wrap a tool method so every call gets its own progress reporter and timing.
+        
+        The wrapper asks fastmcp for the request Context and forwards progress
+        reported through self.progress as MCP progress notifications, which
+        works the same on every transport.
+        
+        The call timing is started by ToolTimingMiddleware when the server
+        received the call; without the middleware the wrapper starts and
+        records it itself, missing only the serialization span.
+        """
+        @functools.wraps(method)
+        async def wrapper(*args, ctx=None, **kwargs):
+            sink = ctx.report_progress if ctx is not None else None
+            timing = current_call_timing()
+            owns_timing = timing is None
+            if owns_timing:
+                timing = CallTiming(method.__name__)
+            timing.start()
+            try:
+                with use_call_timing(timing), use_progress_reporter(ProgressReporter(sink=sink)):
+                    return await method(*args, **kwargs)
+            finally:
+                timing.finish()
+                if owns_timing:
+                    timing.complete()
+                    tool_timings.record(timing)
+        
+        if Context is not None:
+            # Expose the method's own parameters plus the Context fastmcp injects
+            signature = inspect.signature(method)
+            ctx_param = inspect.Parameter('ctx', inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Context)
+            wrapper.__signature__ = signature.replace(parameters=[*signature.parameters.values(), ctx_param])
+            wrapper.__annotations__ = {**method.__annotations__, 'ctx': Context}
+        return wrapper
+    
     def register(self, mcp):
         """Register this tool with the MCP instance."""
         self.mcp = mcp
@@ -28,7 +80,7 @@ class BaseTool(ABC):
             if callable(attr) and attr_name.startswith('tool_'):
                 # Register the method as an MCP tool
                 tool_name = attr_name[5:]  # Remove 'tool_' prefix
-                self.mcp.tool(attr)
+                self.mcp.tool(self.wrap_tool(attr))
                 self.logger.info(f"Registered tool: {tool_name}")
 
 
@@ -44,6 +96,23 @@ class ToolRegistry:
         """Register a tool instance."""
         self.tools.append(tool)
     
+    def get_tool_method(self, name: str) -> Optional[Callable]:
+        """
+        Find a registered tool method by its name.
+        
+        Args:
+            name: Tool name, with or without the 'tool_' prefix
+        
+        Returns:
+            The bound tool method, or None if no registered tool provides it
+        """
+        attr_name = name if name.startswith('tool_') else f"tool_{name}"
+        for tool in self.tools:
+            method = getattr(tool, attr_name, None)
+            if callable(method):
+                return method
+        return None
+    
     def register_all_tools(self, mcp):
         """Register all tools with the MCP instance."""
         for tool in self.tools:
@@ -2,30 +2,53 @@
 Incident retrieval tool for Hypernode MCP Server.
 """
 
+import asyncio
+import functools
 import os
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Optional
 from ..generic import BaseTool, tool_registry
-from utils.command_executor import CommandExecutor
+from utils.file_ranges import FileRange, fair_shares, read_range
+from utils.incident_archives import incident_archives, is_compressed
+from utils.incident_store import FileEntry, incident_store, sort_entries
+
+DEFAULT_MAX_BYTES = 256 * 1024
+MAX_BYTES_LIMIT = 16 * 1024 * 1024
 
 class IncidentsGetTool(BaseTool):
     """Incident retrieval tool implementation."""
     
-    async def tool_get_incident(self, date: str, file_pattern: str = "*") -> Dict[str, Any]:
+    async def tool_get_incident(self, date: str, file_pattern: str = "*", max_bytes: int = DEFAULT_MAX_BYTES) -> Dict[str, Any]:
         """
         Get files from a specific incident directory.
         
+        Files are read concurrently. The content returned is limited to max_bytes
+        in total, divided fairly over the files: small files are returned whole
+        and the rest of the budget is split evenly over the larger files.
+        Compressed files (.gz, .xz, .bz2) and archived incidents (e.g.
+        2024-01-01.tar.gz) are decompressed on the fly, only as far as needed.
+        
         Args:
             date: The incident date/directory name
             file_pattern: Optional file pattern to filter files (e.g., "*.log")
+            max_bytes: Total number of content bytes to return over all files
         
         Returns:
             Dict containing the incident files and their contents
         """
-        incidents_dir = os.path.expanduser("~/incidents")
-        incident_path = os.path.join(incidents_dir, date)
+        try:
+            incident_path = incident_store.incident_path(date)
+        except ValueError as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "incident_path": os.path.join(incident_store.root, date)
+            }
         
-        # Check if incident directory exists
-        if not os.path.exists(incident_path):
+        # Check if incident directory exists, or was archived
+        if not os.path.isdir(incident_path):
+            archive = incident_store.incident_archive(date)
+            if archive is not None:
+                return await self._get_archived_incident(date, archive, file_pattern, max_bytes)
             return {
                 "success": False,
                 "error": f"Incident directory does not exist: {incident_path}",
@@ -33,63 +56,102 @@ class IncidentsGetTool(BaseTool):
             }
         
         # List files in the incident directory
-        list_command = f"ls -la {incident_path}/{file_pattern}"
-        result = await CommandExecutor.execute_command(list_command)
-        
-        if not result.success:
+        try:
+            entries = await incident_store.run(incident_store.list_incident_files, date, file_pattern)
+        except OSError as e:
             return {
                 "success": False,
-                "error": f"Failed to list files: {result.stderr}",
+                "error": f"Failed to list files: {e}",
                 "incident_path": incident_path
             }
         
-        # Parse the ls output to get file details
-        lines = result.stdout.strip().split('\n')
-        files = []
-        
-        for line in lines[1:]:  # Skip the total line
-            if line.strip():
-                parts = line.split()
-                if len(parts) >= 9:
-                    permissions = parts[0]
-                    size = parts[4]
-                    date_str = f"{parts[5]} {parts[6]} {parts[7]}"
-                    name = parts[8]
-                    
-                    # Skip . and .. directories
-                    if name in ['.', '..']:
-                        continue
-                    
-                    file_info = {
-                        "name": name,
-                        "permissions": permissions,
-                        "size": size,
-                        "date": date_str,
-                        "is_directory": permissions.startswith('d'),
-                        "full_path": os.path.join(incident_path, name)
-                    }
-                    
-                    # Get file content if it's a regular file and not too large
-                    if not file_info["is_directory"] and int(size) < 1024 * 1024:  # Less than 1MB
-                        try:
-                            with open(file_info["full_path"], 'r', encoding='utf-8', errors='ignore') as f:
-                                content = f.read()
-                                file_info["content"] = content[:10000]  # Limit to first 10KB
-                                file_info["content_truncated"] = len(content) > 10000
-                        except Exception as e:
-                            file_info["content_error"] = str(e)
-                    
-                    files.append(file_info)
+        entries = sort_entries(entries)
+        regular = [entry for entry in entries if not entry.is_directory]
+        budget = min(max_bytes, MAX_BYTES_LIMIT)
+        # The listing stats every entry again, even when cached, so the shares are of the current sizes.
+        # The decompressed size of a compressed file is unknown, so it counts as a large file
+        budgets = dict(zip(
+            (entry.path for entry in regular),
+            fair_shares([budget if is_compressed(entry.name) else entry.size for entry in regular], budget)
+        ))
+        files = await asyncio.gather(*(
+            self._load_file(entry.to_dict(), entry.path, self._preview(entry, budgets.get(entry.path)))
+            for entry in entries
+        ))
         
         return {
             "success": True,
             "incident_date": date,
             "incident_path": incident_path,
-            "files": files,
+            "files": list(files),
+            "count": len(files),
+            "file_pattern": file_pattern,
+            "max_bytes": max_bytes,
+            "content_bytes": sum(file.get("content_length", 0) for file in files)
+        }
+    
+    async def _get_archived_incident(self, date: str, archive: str, file_pattern: str, max_bytes: int) -> Dict[str, Any]:
+        """Get files from an archived incident, streaming them from the archive."""
+        try:
+            members = await incident_store.run(incident_archives.list_members, archive, file_pattern)
+        except OSError as e:
+            return {
+                "success": False,
+                "error": f"Failed to list files: {e}",
+                "incident_path": archive
+            }
+        
+        members = sorted(members, key=lambda member: member.name)
+        budgets = fair_shares([member.size for member in members], min(max_bytes, MAX_BYTES_LIMIT))
+        files = await asyncio.gather(*(
+            self._load_file(
+                member.to_dict(),
+                os.path.join(archive, member.name),
+                functools.partial(incident_archives.read_range, archive, 0, budget, member)
+            )
+            for member, budget in zip(members, budgets)
+        ))
+        
+        return {
+            "success": True,
+            "incident_date": date,
+            "incident_path": archive,
+            "archive": archive,
+            "files": list(files),
             "count": len(files),
-            "file_pattern": file_pattern
+            "file_pattern": file_pattern,
+            "max_bytes": max_bytes,
+            "content_bytes": sum(file.get("content_length", 0) for file in files)
         }
+    
+    @staticmethod
+    def _preview(entry: FileEntry, budget: Optional[int]) -> Optional[Callable[[], FileRange]]:
+        """Return the read of the start of a file within its share of the budget."""
+        if budget is None:
+            return None
+        if is_compressed(entry.name):
+            return functools.partial(incident_archives.read_range, entry.path, 0, budget)
+        return functools.partial(read_range, entry.path, 0, budget)
+    
+    @staticmethod
+    async def _load_file(file_info: Dict[str, Any], full_path: str, preview: Optional[Callable[[], FileRange]]) -> Dict[str, Any]:
+        file_info["full_path"] = full_path
+        
+        # Return the start of regular files within their share of the budget; read_incident_file reads the rest
+        if preview is not None:
+            try:
+                content = await incident_store.run(preview)
+                if content.size is not None and not is_compressed(file_info["name"]):
+                    # The size when opened, in case the file changed since it was listed
+                    file_info["size"] = content.size
+                file_info["content"] = content.content
+                file_info["content_length"] = content.length
+                file_info["content_truncated"] = not content.eof
+            except Exception as e:
+                file_info["content_error"] = str(e)
+        
+        return file_info
 
 # Create and register the tool instance automatically
 incidents_get_tool = IncidentsGetTool()
-tool_registry.register_tool(incidents_get_tool) 
\ No newline at end of file
+tool_registry.register_tool(incidents_get_tool)
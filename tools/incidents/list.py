@@ -3,21 +3,34 @@ Incident listing tool for Hypernode MCP Server.
 """
 
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from ..generic import BaseTool, tool_registry
-from utils.command_executor import CommandExecutor
+from utils.incident_store import incident_store, paginate, sort_entries
+from utils.profiling import SPAN_PARSE, span
 
 class IncidentsListTool(BaseTool):
     """Incident listing tool implementation."""
     
-    async def tool_list_incidents(self) -> Dict[str, Any]:
+    async def tool_list_incidents(
+        self,
+        sort_by: str = "name",
+        descending: bool = False,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         List all incidents in the ~/incidents directory.
         
+        Args:
+            sort_by: Sort by "name", "mtime" or "size"
+            descending: Sort in descending order, e.g. newest first with sort_by="mtime"
+            offset: Number of incidents to skip
+            limit: Maximum number of incidents to return (all if not set)
+        
         Returns:
-            Dict containing the list of incidents
+            Dict containing the list of incidents with exact sizes and epoch mtimes
         """
-        incidents_dir = os.path.expanduser("~/incidents")
+        incidents_dir = incident_store.root
         
         # Check if incidents directory exists
         if not os.path.exists(incidents_dir):
@@ -28,48 +41,36 @@ class IncidentsListTool(BaseTool):
                 "message": "Incidents directory does not exist"
             }
         
-        command = f"ls -la {incidents_dir}"
-        result = await CommandExecutor.execute_command(command)
-        
-        if not result.success:
+        try:
+            entries = await incident_store.run(incident_store.list_incidents)
+        except OSError as e:
             return {
                 "success": False,
-                "error": result.stderr,
+                "error": str(e),
                 "incidents": []
             }
         
-        # Parse the ls output to get file details
-        lines = result.stdout.strip().split('\n')
-        incidents = []
-        
-        for line in lines[1:]:  # Skip the total line
-            if line.strip():
-                parts = line.split()
-                if len(parts) >= 9:
-                    permissions = parts[0]
-                    size = parts[4]
-                    date = f"{parts[5]} {parts[6]} {parts[7]}"
-                    name = parts[8]
-                    
-                    # Skip . and .. directories and README.txt
-                    if name in ['.', '..', 'README.txt']:
-                        continue
-                    
-                    incidents.append({
-                        "name": name,
-                        "permissions": permissions,
-                        "size": size,
-                        "date": date,
-                        "is_directory": permissions.startswith('d')
-                    })
+        try:
+            with span(SPAN_PARSE):
+                page = paginate(sort_entries(entries, sort_by, descending), offset, limit)
+                incidents = [entry.to_dict() for entry in page["items"]]
+        except ValueError as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "incidents": []
+            }
         
         return {
             "success": True,
             "incidents": incidents,
             "count": len(incidents),
+            "total": page["total"],
+            "offset": page["offset"],
+            "next_offset": page["next_offset"],
             "directory": incidents_dir
         }
 
 # Create and register the tool instance automatically
 incidents_list_tool = IncidentsListTool()
-tool_registry.register_tool(incidents_list_tool) 
\ No newline at end of file
+tool_registry.register_tool(incidents_list_tool)
@@ -0,0 +1,127 @@
+"""
+Incident file reading tool for Hypernode MCP Server.
+"""
+
+import functools
+import os
+from typing import Dict, Any, Optional
+from ..generic import BaseTool, tool_registry
+from utils.file_ranges import read_lines, read_range, tail_lines
+from utils.incident_archives import incident_archives, is_compressed
+from utils.incident_store import incident_store
+
+MAX_READ_LENGTH = 1024 * 1024
+MAX_READ_LINES = 10000
+
+class IncidentsReadTool(BaseTool):
+    """Incident file reading tool implementation."""
+    
+    async def tool_read_incident_file(
+        self,
+        date: str,
+        file: str,
+        offset: int = 0,
+        length: int = 65536,
+        tail: Optional[int] = None,
+        start_line: Optional[int] = None,
+        line_count: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Read part of a file of an incident without reading the whole file.
+        
+        Reads a byte range by default. With tail, returns the last lines of the
+        file; with start_line, returns line_count lines starting at that line.
+        Large files are memory mapped, so only the requested part is read.
+        Compressed files (.gz, .xz, .bz2) and files of archived incidents (e.g.
+        2024-01-01.tar.gz) are decompressed on the fly, no further than the
+        requested part; size is None until the end of a compressed file was read.
+        
+        Args:
+            date: The incident date/directory name
+            file: Name of the file within the incident directory
+            offset: Byte offset to start reading at; negative counts from the end
+            length: Number of bytes to read, at most 1 MB
+            tail: Number of lines to return from the end of the file
+            start_line: First line to return (0-based); negative counts from the end
+            line_count: Number of lines to return with start_line, at most 10000
+        
+        Returns:
+            Dict containing the content, its offset and length, and next_offset to continue reading
+        """
+        try:
+            path = incident_store.incident_file_path(date, file)
+        except ValueError as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        
+        archive = None
+        if not os.path.isfile(path):
+            if not os.path.isdir(incident_store.incident_path(date)):
+                archive = incident_store.incident_archive(date)
+            if archive is None:
+                return {
+                    "success": False,
+                    "error": f"Incident file does not exist: {path}",
+                    "path": path
+                }
+            path = os.path.join(archive, file)
+        
+        if archive is not None or is_compressed(path):
+            # Stream compressed data through the decompressor
+            source = archive or path
+            member = None
+            if archive is not None:
+                try:
+                    member = await incident_store.run(incident_archives.member, archive, file)
+                except FileNotFoundError:
+                    return {
+                        "success": False,
+                        "error": f"Incident file does not exist: {path}",
+                        "path": path
+                    }
+                except OSError as e:
+                    return {
+                        "success": False,
+                        "error": f"Failed to read archive: {e}",
+                        "path": path
+                    }
+            tail_reader = functools.partial(incident_archives.tail_lines, source, member=member)
+            lines_reader = functools.partial(incident_archives.read_lines, source, member=member)
+            range_reader = functools.partial(incident_archives.read_range, source, member=member)
+        else:
+            tail_reader = functools.partial(tail_lines, path)
+            lines_reader = functools.partial(read_lines, path)
+            range_reader = functools.partial(read_range, path)
+        
+        if tail is not None:
+            mode = "tail"
+            read = functools.partial(tail_reader, min(tail, MAX_READ_LINES))
+        elif start_line is not None:
+            mode = "lines"
+            read = functools.partial(lines_reader, start_line, min(line_count, MAX_READ_LINES))
+        else:
+            mode = "range"
+            read = functools.partial(range_reader, offset, min(length, MAX_READ_LENGTH))
+        
+        try:
+            file_range = await incident_store.run(read)
+        except OSError as e:
+            return {
+                "success": False,
+                "error": f"Failed to read file: {e}",
+                "path": path
+            }
+        
+        return {
+            "success": True,
+            "path": path,
+            "compressed": archive is not None or is_compressed(path),
+            "mode": mode,
+            **file_range.to_dict()
+        }
+
+# Create and register the tool instance automatically
+incidents_read_tool = IncidentsReadTool()
+tool_registry.register_tool(incidents_read_tool)
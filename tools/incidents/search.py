@@ -0,0 +1,80 @@
+"""
+Incident search tool for Hypernode MCP Server.
+"""
+
+import os
+import time
+from typing import Dict, Any, Optional
+from ..generic import BaseTool, tool_registry
+from utils.incident_index import incident_index
+from utils.incident_store import incident_store
+
+MAX_SEARCH_RESULTS = 500
+
+class IncidentsSearchTool(BaseTool):
+    """Incident search tool implementation."""
+    
+    async def tool_search_incidents(
+        self,
+        query: str,
+        limit: int = 20,
+        incident: Optional[str] = None,
+        update_index: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Full-text search through the files of all incidents in ~/incidents.
+        
+        Finds the lines that contain all terms of the query, e.g. to find when a
+        MySQL deadlock or an OOM kill was seen before. Quote words to search for
+        a phrase and end a term with * to search for a prefix:
+        '"Deadlock found" innodb*'. The index is updated incrementally before
+        searching; only new and changed files are (re)indexed.
+        
+        Args:
+            query: Terms, "quoted phrases" and prefix* terms that all have to match
+            limit: Maximum number of hits, at most 500
+            incident: Only search incidents whose name starts with this, e.g. "2024-01"
+            update_index: Index new and changed files before searching
+        
+        Returns:
+            Dict containing the hits, most relevant first, with the incident, file,
+            line (0-based), byte offset and a snippet with the matches in [brackets]
+        """
+        if not os.path.exists(incident_store.root):
+            return {
+                "success": True,
+                "hits": [],
+                "count": 0,
+                "message": "Incidents directory does not exist"
+            }
+        
+        started = time.perf_counter()
+        try:
+            index_update = await incident_store.run(incident_index.update) if update_index else None
+            hits = await incident_store.run(incident_index.search, query, min(limit, MAX_SEARCH_RESULTS), incident)
+        except ValueError as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "hits": []
+            }
+        except Exception as e:
+            self.logger.error(f"Incident search failed: {e}")
+            return {
+                "success": False,
+                "error": f"Incident search failed: {e}",
+                "hits": []
+            }
+        
+        return {
+            "success": True,
+            "query": query,
+            "hits": [hit.to_dict() for hit in hits],
+            "count": len(hits),
+            "index_update": index_update,
+            "took_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+
+# Create and register the tool instance automatically
+incidents_search_tool = IncidentsSearchTool()
+tool_registry.register_tool(incidents_search_tool)
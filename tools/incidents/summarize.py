@@ -0,0 +1,85 @@
+"""
+Incident summary tool for Hypernode MCP Server.
+"""
+
+import asyncio
+import os
+from typing import Dict, Any
+from ..generic import BaseTool, tool_registry
+from utils.incident_store import incident_store, sort_entries
+from utils.incident_summaries import incident_summaries
+
+class IncidentsSummarizeTool(BaseTool):
+    """Incident summary tool implementation."""
+    
+    async def tool_summarize_incident(self, date: str, file_pattern: str = "*", refresh: bool = False) -> Dict[str, Any]:
+        """
+        Get structured summaries of the snapshot files of an incident.
+        
+        Recognises top, ps, free, load average and MySQL processlist snapshots by
+        their content and returns compact records instead of raw text, e.g. the
+        top CPU processes, PHP-FPM worker counts per pool and the longest running
+        queries. Summaries are computed once and cached next to the incident.
+        
+        Args:
+            date: The incident date/directory name
+            file_pattern: Optional file pattern to filter files (e.g., "*.txt")
+            refresh: Parse the files again even if cached summaries are valid
+        
+        Returns:
+            Dict containing the summaries per file and the files in no known format
+        """
+        try:
+            incident_path = incident_store.incident_path(date)
+        except ValueError as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        
+        if not os.path.exists(incident_path):
+            return {
+                "success": False,
+                "error": f"Incident directory does not exist: {incident_path}",
+                "incident_path": incident_path
+            }
+        
+        try:
+            entries = await incident_store.run(incident_store.list_incident_files, date, file_pattern)
+        except OSError as e:
+            return {
+                "success": False,
+                "error": f"Failed to list files: {e}",
+                "incident_path": incident_path
+            }
+        
+        files = [entry.name for entry in sort_entries(entries) if not entry.is_directory]
+        results = await asyncio.gather(
+            *(incident_store.run(incident_summaries.summarize, date, file, refresh) for file in files),
+            return_exceptions=True
+        )
+        
+        summaries = []
+        unrecognized = []
+        errors = []
+        for file, result in zip(files, results):
+            if isinstance(result, Exception):
+                errors.append({"file": file, "error": str(result)})
+            elif result["parser"] is None:
+                unrecognized.append(file)
+            else:
+                summaries.append(result)
+        
+        return {
+            "success": True,
+            "incident_date": date,
+            "incident_path": incident_path,
+            "summaries": summaries,
+            "count": len(summaries),
+            "unrecognized": unrecognized,
+            "errors": errors
+        }
+
+# Create and register the tool instance automatically
+incidents_summarize_tool = IncidentsSummarizeTool()
+tool_registry.register_tool(incidents_summarize_tool)
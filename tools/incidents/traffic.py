@@ -0,0 +1,105 @@
+"""
+Incident traffic correlation tool for Hypernode MCP Server.
+"""
+
+import asyncio
+import os
+import re
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+from ..generic import BaseTool, tool_registry
+from utils.incident_archives import incident_archives
+from utils.incident_store import incident_store
+from utils.nginx_log import parse_time, summarize_window
+
+MAX_WINDOW_MINUTES = 24 * 60
+
+# Incident names holding a time, e.g. 2024-01-15T12:34:56, 2024-01-15_12-34 or 20240115-123456
+_NAME_TIME = re.compile(r"(\d{4})-?(\d{2})-?(\d{2})[T_ -]?(\d{2})[:.-]?(\d{2})(?:[:.-]?(\d{2}))?")
+
+class IncidentsTrafficTool(BaseTool):
+    """Incident traffic correlation tool implementation."""
+    
+    async def tool_get_incident_traffic(self, date: str, minutes: int = 10, top: int = 10, at: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get the nginx traffic around the time of an incident.
+        
+        The access logs are seeked to the window by binary search on the
+        timestamps of their time-ordered lines, so only the lines within the
+        window are read. The incident time is taken from the incident name when
+        it holds a time, and otherwise from the oldest file of the incident.
+        
+        Args:
+            date: The incident date/directory name, as returned by list_incidents
+            minutes: Minutes of traffic to aggregate before and after the incident
+            top: Number of top IPs, URLs, hosts and user agents to return
+            at: Time of the incident (ISO 8601) to use instead of the detected time
+        
+        Returns:
+            Dict containing the incident time, the window and its top IPs, URLs, status codes and requests per minute
+        """
+        try:
+            if at is not None:
+                incident_time, source = parse_time(at), "argument"
+                if incident_time is None:
+                    raise ValueError(f"Invalid time: {at!r}, expected ISO 8601")
+            else:
+                incident_time, source = await incident_store.run(self._incident_time, date)
+        except (ValueError, OSError) as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        
+        minutes = max(min(minutes, MAX_WINDOW_MINUTES), 0)
+        start = incident_time - minutes * 60
+        end = incident_time + minutes * 60
+        summary, logs = await asyncio.to_thread(summarize_window, start, end)
+        
+        return {
+            "success": True,
+            "incident": date,
+            "incident_time": self._isoformat(incident_time),
+            "incident_time_source": source,
+            "window_start": self._isoformat(start),
+            "window_end": self._isoformat(end),
+            "logs": logs,
+            **summary.to_dict(top)
+        }
+    
+    @staticmethod
+    def _incident_time(date: str) -> Tuple[float, str]:
+        """
+        Return the time of an incident and where it was taken from.
+        
+        Raises:
+            ValueError: If the incident name is invalid
+            FileNotFoundError: If the incident does not exist
+        """
+        incident_path = incident_store.incident_path(date)
+        archive = None if os.path.isdir(incident_path) else incident_store.incident_archive(date)
+        if archive is None and not os.path.isdir(incident_path):
+            raise FileNotFoundError(f"Incident does not exist: {incident_path}")
+        
+        match = _NAME_TIME.search(date)
+        if match:
+            year, month, day, hour, minute, second = (int(value or 0) for value in match.groups())
+            try:
+                return datetime(year, month, day, hour, minute, second).timestamp(), "name"
+            except ValueError:
+                pass
+        
+        # Snapshots are written when the incident happens; the directory itself changes later on
+        if archive is not None:
+            mtimes = [member.mtime for member in incident_archives.list_members(archive)]
+            return (min(mtimes) if mtimes else os.stat(archive).st_mtime), "files"
+        mtimes = [entry.mtime for entry in incident_store.list_incident_files(date) if not entry.is_directory]
+        return (min(mtimes) if mtimes else os.stat(incident_path).st_mtime), "files"
+    
+    @staticmethod
+    def _isoformat(timestamp: float) -> str:
+        return datetime.fromtimestamp(timestamp).astimezone().isoformat(timespec='seconds')
+
+# Create and register the tool instance automatically
+incidents_traffic_tool = IncidentsTrafficTool()
+tool_registry.register_tool(incidents_traffic_tool)
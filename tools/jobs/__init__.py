@@ -0,0 +1,3 @@
+"""
+Background job tools package.
+"""
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""
+Job cancellation tool for Hypernode MCP Server.
+"""
+
+import asyncio
+from typing import Dict, Any
+from ..generic import BaseTool, tool_registry
+from utils.jobs import job_manager
+
+class JobsCancelTool(BaseTool):
+    """Job cancellation tool implementation."""
+    
+    async def tool_cancel_job(self, job_id: str) -> Dict[str, Any]:
+        """
+        Cancel a queued or running background job.
+        
+        Args:
+            job_id: The job id returned by submit_job
+        
+        Returns:
+            Dict containing the job status after cancelling
+        """
+        job = job_manager.cancel(job_id)
+        
+        if job is None:
+            return {
+                "success": False,
+                "error": f"Job does not exist or has expired: {job_id}",
+                "job_id": job_id
+            }
+        
+        # Let the job handle the cancellation before reporting its status
+        if job.task is not None and not job.task.done():
+            await asyncio.wait([job.task], timeout=5)
+        
+        return {
+            "success": True,
+            "job_id": job_id,
+            "status": job.status
+        }
+
+# Create and register the tool instance automatically
+jobs_cancel_tool = JobsCancelTool()
+tool_registry.register_tool(jobs_cancel_tool)
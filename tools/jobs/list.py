@@ -0,0 +1,29 @@
+"""
+Job listing tool for Hypernode MCP Server.
+"""
+
+from typing import Dict, Any
+from ..generic import BaseTool, tool_registry
+from utils.jobs import job_manager
+
+class JobsListTool(BaseTool):
+    """Job listing tool implementation."""
+    
+    async def tool_list_jobs(self) -> Dict[str, Any]:
+        """
+        List all background jobs that are still retained, oldest first.
+        
+        Returns:
+            Dict containing the jobs and their status
+        """
+        jobs = [job.to_dict() for job in job_manager.list()]
+        
+        return {
+            "success": True,
+            "jobs": jobs,
+            "count": len(jobs)
+        }
+
+# Create and register the tool instance automatically
+jobs_list_tool = JobsListTool()
+tool_registry.register_tool(jobs_list_tool)
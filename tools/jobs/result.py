@@ -0,0 +1,76 @@
+"""
+Job result tool for Hypernode MCP Server.
+"""
+
+import json
+from typing import Dict, Any
+from ..generic import BaseTool, tool_registry
+from utils.jobs import job_manager
+
+class JobsResultTool(BaseTool):
+    """Job result tool implementation."""
+    
+    async def tool_get_job_result(self, job_id: str, offset: int = 0, length: int = 65536) -> Dict[str, Any]:
+        """
+        Fetch the result of a completed background job, page by page.
+        
+        Cancelled jobs return the partial result of tools that support it.
+        
+        Results that fit in a single page are returned as-is. Larger results are
+        returned as consecutive slices of their JSON encoding; request the next
+        page with offset=next_offset until complete is true.
+        
+        Args:
+            job_id: The job id returned by submit_job
+            offset: Offset into the JSON encoded result (default: 0)
+            length: Maximum size of the page (default: 65536)
+        
+        Returns:
+            Dict containing the result or a page of it
+        """
+        job = job_manager.get(job_id)
+        
+        if job is None:
+            return {
+                "success": False,
+                "error": f"Job does not exist or has expired: {job_id}",
+                "job_id": job_id
+            }
+        
+        if not job.has_result:
+            return {
+                "success": False,
+                "error": f"Job is {job.status}, no result available",
+                "job_id": job_id,
+                "status": job.status
+            }
+        
+        offset = max(offset, 0)
+        length = max(length, 1)
+        page = await job_manager.read_result(job, offset, length)
+        next_offset = offset + len(page)
+        complete = next_offset >= job.result_size
+        
+        if offset == 0 and complete:
+            return {
+                "success": True,
+                "job_id": job_id,
+                "status": job.status,
+                "complete": True,
+                "result": json.loads(page)
+            }
+        
+        return {
+            "success": True,
+            "job_id": job_id,
+            "status": job.status,
+            "complete": complete,
+            "chunk": page,
+            "offset": offset,
+            "next_offset": next_offset,
+            "result_size": job.result_size
+        }
+
+# Create and register the tool instance automatically
+jobs_result_tool = JobsResultTool()
+tool_registry.register_tool(jobs_result_tool)
@@ -0,0 +1,38 @@
+"""
+Job status tool for Hypernode MCP Server.
+"""
+
+from typing import Dict, Any
+from ..generic import BaseTool, tool_registry
+from utils.jobs import job_manager
+
+class JobsStatusTool(BaseTool):
+    """Job status tool implementation."""
+    
+    async def tool_get_job_status(self, job_id: str) -> Dict[str, Any]:
+        """
+        Get the status and latest progress of a background job.
+        
+        Args:
+            job_id: The job id returned by submit_job
+        
+        Returns:
+            Dict containing the job status, progress and result size once finished
+        """
+        job = job_manager.get(job_id)
+        
+        if job is None:
+            return {
+                "success": False,
+                "error": f"Job does not exist or has expired: {job_id}",
+                "job_id": job_id
+            }
+        
+        return {
+            "success": True,
+            **job.to_dict()
+        }
+
+# Create and register the tool instance automatically
+jobs_status_tool = JobsStatusTool()
+tool_registry.register_tool(jobs_status_tool)
@@ -0,0 +1,65 @@
+"""
+Job submission tool for Hypernode MCP Server.
+"""
+
+import inspect
+from typing import Dict, Any, Optional
+from ..generic import BaseTool, tool_registry
+from utils.jobs import job_manager
+
+class JobsSubmitTool(BaseTool):
+    """Job submission tool implementation."""
+    
+    async def tool_submit_job(self, tool: str, arguments: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Run any other tool as a background job and return immediately with a job id.
+        
+        Use this for analyses that may take longer than a request should stay open,
+        then poll get_job_status and collect the output with get_job_result.
+        
+        Args:
+            tool: Name of the tool to run (e.g., "analyze_nginx_logs")
+            arguments: Arguments for the tool (optional)
+        
+        Returns:
+            Dict containing the job id and its initial status
+        """
+        arguments = arguments or {}
+        method = tool_registry.get_tool_method(tool)
+        
+        # Job tools operate on jobs themselves and are never run as a job
+        if method is None or method.__module__.startswith(__package__):
+            return {
+                "success": False,
+                "error": f"Unknown tool or tool can not run as a job: {tool}",
+                "tool": tool
+            }
+        
+        try:
+            inspect.signature(method).bind(**arguments)
+        except TypeError as e:
+            return {
+                "success": False,
+                "error": f"Invalid arguments for {tool}: {e}",
+                "tool": tool
+            }
+        
+        try:
+            job = job_manager.submit(tool, method, arguments)
+        except RuntimeError as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "tool": tool
+            }
+        
+        return {
+            "success": True,
+            "job_id": job.id,
+            "status": job.status,
+            "tool": tool
+        }
+
+# Create and register the tool instance automatically
+jobs_submit_tool = JobsSubmitTool()
+tool_registry.register_tool(jobs_submit_tool)
@@ -2,15 +2,31 @@
 Nginx log analysis tool for Hypernode MCP Server.
 """
 
+import asyncio
+import heapq
+import itertools
 import tempfile
 import os
-from typing import Dict, Any, Optional
+from collections import Counter
+from typing import Dict, Any, List, Optional, Tuple
 from ..generic import BaseTool, tool_registry
-from utils.command_executor import CommandExecutor
+from utils.artifacts import Artifact, ArtifactWriter, artifact_store
+from utils.command_executor import CommandExecutor, CommandStream
+from utils.profiling import SPAN_PARSE, span
+from utils.progress import sample_read_progress
+
+# Distinct values of unique_by_field counted in memory; past this many they are counted by sort on disk
+MAX_UNIQUE_VALUES = 500_000
+
+# Values written to the sort input at a time
+SORT_BATCH = 10_000
 
 class NginxLogsAnalyzeTool(BaseTool):
     """Nginx log analysis tool implementation."""
     
+    # Number of entries in the partial top-K sent with progress notifications
+    PROGRESS_TOP_K = 5
+    
     async def tool_analyze_nginx_logs(self, filter: Optional[str] = None, limit: int = 100, today: bool = False, unique_by_field: Optional[str] = None, query_bots_only: bool = False) -> Dict[str, Any]:
         """
         Analyze nginx logs with optional filters.
@@ -22,6 +38,10 @@ class NginxLogsAnalyzeTool(BaseTool):
             unique_by_field: Field to count and group unique occurrences by (e.g., "remote_addr", "user_agent")
             query_bots_only: Whether to analyze only bot traffic (default: False)
         
+        A result larger than the artifact threshold is written to disk while
+        pnl runs instead of being collected in memory: the response holds its
+        start and an artifact handle for fetch_artifact.
+        
         Returns:
             Dict containing the log analysis results
         """
@@ -37,47 +57,218 @@ class NginxLogsAnalyzeTool(BaseTool):
         if filter:
             command += f" --filter \"{filter}\""
         
-        # If we need to pipe commands, use a temporary script file
-        if unique_by_field or limit > 0:
-            if unique_by_field:
-                command += f" --fields {unique_by_field}"
-
-            # Create a temporary script to handle the piping
-            script_content = f"#!/bin/bash\n{command}"
-            
-            if unique_by_field:
-                script_content += f" | sort | uniq -c | sort -nr"
+        if unique_by_field:
+            command += f" --fields {unique_by_field}"
+        elif limit > 0:
+            command += f" | head -n {limit}"
+        
+        # Run the command from a temporary script so quoted filters reach pnl intact
+        script_content = f"#!/bin/bash\n{command}"
+        
+        temp_script = await asyncio.to_thread(self._write_script, script_content)
+        
+        counts: Counter = Counter()
+        # Once counts holds too many values: the file the values are written to for sort
+        sort_input: List[str] = []
+        lines = artifact_store.writer("analyze_nginx_logs")
+        
+        async def output() -> Tuple[str, Optional[Artifact]]:
+            if sort_input:
+                await self._sort_counts(sort_input[0], limit, lines)
+            if not unique_by_field or sort_input:
+                return await lines.finish_async()
+            with span(SPAN_PARSE):
+                text = self._format_counts(counts, limit)
+            return await asyncio.to_thread(artifact_store.spill, text, "analyze_nginx_logs")
+        
+        def response(success: bool, result: Tuple[str, Optional[Artifact]], **extra: Any) -> Dict[str, Any]:
+            text, artifact = result
+            if artifact is not None:
+                extra["artifact"] = artifact.to_dict()
+            return {
+                "success": success,
+                "result": text,
+                "filter": filter,
+                "limit": limit,
+                "today": today,
+                "unique_by_field": unique_by_field,
+                "query_bots_only": query_bots_only,
+                **extra
+            }
+        
+        # Whether the output was completed; otherwise its artifact file is dropped
+        finished = False
+        try:
+            try:
+                async with CommandExecutor.stream_command(f"bash {temp_script}", timeout=120) as stream:
+                    if unique_by_field:
+                        await self._count_unique(stream, counts, sort_input)
+                    else:
+                        await self._collect_lines(stream, lines)
+            except asyncio.CancelledError:
+                # pnl has been killed already; keep what was counted for whoever cancelled us
+                partial = await output()
+                finished = True
+                self.progress.set_partial_result(response(False, partial, partial=True, error="Analysis was cancelled"))
+                raise
             
-            if limit > 0:
-                script_content += f" | head -n {limit}"
+            result = stream.result
             
-            # Write script to temporary file and execute
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.sh', delete=False) as f:
-                f.write(script_content)
-                temp_script = f.name
+            if stream.timed_out:
+                # Return what was found before the timeout rather than nothing
+                partial = await output()
+                finished = True
+                return response(False, partial, partial=True, error=result.stderr)
             
+            if not result.success:
+                return response(False, (result.stderr, None))
+            complete = await output()
+            finished = True
+            return response(True, complete)
+        finally:
+            # Clean up temporary file
             try:
-                # Make script executable and run it
-                os.chmod(temp_script, 0o755)
-                result = await CommandExecutor.execute_command(f"bash {temp_script}", timeout=120)
-            finally:
-                # Clean up temporary file
-                try:
-                    os.unlink(temp_script)
-                except:
-                    pass
+                os.unlink(temp_script)
+            except:
+                pass
+            if not finished:
+                await lines.discard_async()
+            if sort_input:
+                await asyncio.to_thread(os.unlink, sort_input[0])
+    
+    @staticmethod
+    def _write_script(script_content: str) -> str:
+        """Write an executable temporary script; runs in a thread to keep file I/O off the event loop."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.sh', delete=False) as f:
+            f.write(script_content)
+            temp_script = f.name
+        
+        try:
+            os.chmod(temp_script, 0o755)
+        except OSError:
+            os.unlink(temp_script)
+            raise
+        return temp_script
+    
+    async def _count_unique(self, stream: CommandStream, counts: Counter, sort_input: List[str]) -> None:
+        """
+        Count unique output lines.
+        
+        Counting in-process replaces two full sorts of the pnl output with a
+        single hash pass and makes partial results available while scanning.
+        Past MAX_UNIQUE_VALUES distinct values the memory this takes is no
+        longer bounded, so the counts so far and the rest of the output are
+        written to a file for `sort | uniq -c` instead, whose path is added to
+        sort_input.
+        """
+        matched = 0
+        batch: List[str] = []
+        
+        try:
+            async for line in stream:
+                matched += 1
+                if sort_input:
+                    batch.append(line)
+                    if len(batch) >= SORT_BATCH:
+                        await asyncio.to_thread(self._append_values, sort_input[0], batch)
+                        batch = []
+                else:
+                    counts[line] += 1
+                    if len(counts) > MAX_UNIQUE_VALUES:
+                        sort_input.append(await asyncio.to_thread(self._write_values, counts))
+                        counts.clear()
+                if self.progress.due():
+                    self._report_progress(stream, matched, None if sort_input else counts)
+        finally:
+            # Also on cancellation or timeout, so the partial result counts every line read
+            if batch:
+                await asyncio.to_thread(self._append_values, sort_input[0], batch)
+    
+    @staticmethod
+    def _write_values(counts: Counter) -> str:
+        """Write the counted values to a new sort input file, each as many times as it was counted."""
+        fd, path = tempfile.mkstemp(prefix="analyze_nginx_logs-", suffix=".values")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                for value, count in counts.items():
+                    f.writelines(itertools.repeat(value + "\n", count))
+        except BaseException:
+            os.unlink(path)
+            raise
+        return path
+    
+    @staticmethod
+    def _append_values(path: str, values: List[str]) -> None:
+        with open(path, 'a') as f:
+            f.writelines(value + "\n" for value in values)
+    
+    async def _sort_counts(self, path: str, limit: int, lines: ArtifactWriter) -> None:
+        """Count the values of a sort input file like `sort | uniq -c | sort -nr | head -n <limit>`, into lines."""
+        counted = path + ".counts"
+        # The C locale orders ties like _format_counts
+        command = f"LC_ALL=C sort {path} | LC_ALL=C uniq -c | LC_ALL=C sort -nr"
+        if limit > 0:
+            command += f" | head -n {limit}"
+        try:
+            result = await CommandExecutor.execute_command(f"{command} > {counted}", timeout=120)
+            if not result.success:
+                raise OSError(f"Failed to count the values: {result.stderr}")
+            await asyncio.to_thread(self._copy_counts, counted, lines)
+        finally:
+            try:
+                await asyncio.to_thread(os.unlink, counted)
+            except OSError:
+                pass
+    
+    @staticmethod
+    def _copy_counts(path: str, lines: ArtifactWriter) -> None:
+        """Copy the output of sort to lines, without its final newline like _format_counts."""
+        with open(path) as f:
+            previous = ""
+            for block in iter(lambda: f.read(1024 * 1024), ""):
+                lines.write(previous)
+                previous = block
+            lines.write(previous[:-1] if previous.endswith("\n") else previous)
+    
+    async def _collect_lines(self, stream: CommandStream, lines: ArtifactWriter) -> None:
+        """Collect the output lines, newline separated, while reporting progress."""
+        matched = 0
+        
+        async for line in stream:
+            await lines.write_async(f"\n{line}" if matched else line)
+            matched += 1
+            if self.progress.due():
+                self._report_progress(stream, matched)
+    
+    @staticmethod
+    def _format_counts(counts: Counter, limit: int) -> str:
+        """Format counts like `sort | uniq -c | sort -nr | head -n <limit>`."""
+        # Ties are ordered like `sort -nr`, which falls back to comparing the whole line in reverse
+        def sort_key(item):
+            return item[1], item[0]
+        
+        if limit > 0:
+            top = heapq.nlargest(limit, counts.items(), key=sort_key)
         else:
-            result = await CommandExecutor.execute_command(command, timeout=120)
-        
-        return {
-            "success": result.success,
-            "result": result.stdout if result.success else result.stderr,
-            "filter": filter,
-            "limit": limit,
-            "today": today,
-            "unique_by_field": unique_by_field,
-            "query_bots_only": query_bots_only
+            top = sorted(counts.items(), key=sort_key, reverse=True)
+        
+        return "\n".join(f"{count:>7} {value}" for value, count in top)
+    
+    def _report_progress(self, stream: CommandStream, matched: int, counts: Optional[Counter] = None) -> None:
+        """Report bytes scanned by pnl, lines matched and the partial top-K."""
+        scanned, total = sample_read_progress(stream.pid) if stream.pid else (0, 0)
+        details: Dict[str, Any] = {
+            "bytes_scanned": scanned,
+            "bytes_total": total,
+            "lines_matched": matched
         }
+        if counts is not None:
+            details["top"] = counts.most_common(self.PROGRESS_TOP_K)
+        
+        if total:
+            self.progress.update(scanned, total, **details)
+        else:
+            self.progress.update(matched, **details)
 
 # Create and register the tool instance automatically
 nginx_logs_analyze_tool = NginxLogsAnalyzeTool()
@@ -5,6 +5,7 @@ Nginx log fields tool for Hypernode MCP Server.
 from typing import Dict, Any
 from ..generic import BaseTool, tool_registry
 from utils.command_executor import CommandExecutor
+from utils.profiling import SPAN_PARSE, span
 
 class NginxLogsFieldsTool(BaseTool):
     """Nginx log fields tool implementation."""
@@ -28,13 +29,14 @@ class NginxLogsFieldsTool(BaseTool):
             }
         
         # Parse the output to extract field names
-        output = result.stdout.strip()
-        fields = []
+        with span(SPAN_PARSE):
+            output = result.stdout.strip()
+            fields = []
         
-        if "Available fields:" in output:
-            # Extract fields after "Available fields:"
-            fields_part = output.split("Available fields:")[1].strip()
-            fields = [field.strip() for field in fields_part.split(", ")]
+            if "Available fields:" in output:
+                # Extract fields after "Available fields:"
+                fields_part = output.split("Available fields:")[1].strip()
+                fields = [field.strip() for field in fields_part.split(", ")]
         
         return {
             "success": True,
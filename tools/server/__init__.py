@@ -0,0 +1,3 @@
+"""
+Server introspection tools package.
+"""
\ No newline at end of file
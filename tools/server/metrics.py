@@ -0,0 +1,30 @@
+"""
+Server metrics tool for Hypernode MCP Server.
+"""
+
+from typing import Dict, Any
+from ..generic import BaseTool, tool_registry
+from utils.metrics import metrics_registry
+
+class ServerMetricsTool(BaseTool):
+    """Server metrics tool implementation."""
+    
+    async def tool_get_server_metrics(self) -> Dict[str, Any]:
+        """
+        Get health metrics of the MCP server itself.
+        
+        Includes event loop scheduling lag percentiles and the code locations that
+        blocked the event loop for longer than the slow callback threshold, with
+        the stack captured while they were blocking.
+        
+        Returns:
+            Dict containing the metrics per component
+        """
+        return {
+            "success": True,
+            "metrics": metrics_registry.collect()
+        }
+
+# Create and register the tool instance automatically
+server_metrics_tool = ServerMetricsTool()
+tool_registry.register_tool(server_metrics_tool)
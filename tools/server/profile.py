@@ -0,0 +1,70 @@
+"""
+Server profiling tool for Hypernode MCP Server.
+"""
+
+import asyncio
+import os
+from typing import Dict, Any
+from ..generic import BaseTool, tool_registry
+from utils.profiling import SamplingProfiler
+
+MAX_PROFILE_SECONDS = 300
+
+class ServerProfileTool(BaseTool):
+    """Server profiling tool implementation."""
+    
+    def __init__(self, mcp=None):
+        super().__init__(mcp)
+        self._lock = asyncio.Lock()
+    
+    async def tool_profile_server(self, seconds: int = 10, rate: int = 100, top: int = 10) -> Dict[str, Any]:
+        """
+        Run a sampling profiler on the running MCP server for a number of seconds.
+        
+        Samples the stacks of all server threads while the server keeps handling
+        requests, and writes them as collapsed stacks, ready for flamegraph.pl
+        or speedscope. Only one profile can run at a time.
+        
+        Args:
+            seconds: How long to profile, at most 300 seconds
+            rate: Samples per second
+            top: Number of functions with the most samples to include in the result
+        
+        Returns:
+            Dict containing the path of the collapsed stack file and the hottest functions
+        """
+        if not 0 < seconds <= MAX_PROFILE_SECONDS:
+            return {
+                "success": False,
+                "error": f"seconds must be between 1 and {MAX_PROFILE_SECONDS}"
+            }
+        if not 0 < rate <= 1000:
+            return {
+                "success": False,
+                "error": "rate must be between 1 and 1000"
+            }
+        if self._lock.locked():
+            return {
+                "success": False,
+                "error": "A profile is already running"
+            }
+        
+        async with self._lock:
+            profiler = SamplingProfiler(rate=rate)
+            await asyncio.to_thread(profiler.run, seconds)
+            path = await asyncio.to_thread(profiler.write, os.environ.get("MCP_PROFILE_DIR"))
+        
+        return {
+            "success": True,
+            "flamegraph_file": path,
+            "format": "collapsed",
+            "seconds": seconds,
+            "rate": rate,
+            "samples": profiler.sample_count,
+            "unique_stacks": len(profiler.stacks),
+            "top_functions": profiler.top_functions(top)
+        }
+
+# Create and register the tool instance automatically
+server_profile_tool = ServerProfileTool()
+tool_registry.register_tool(server_profile_tool)
@@ -0,0 +1,38 @@
+"""
+Shell session closing tool for Hypernode MCP Server.
+"""
+
+from typing import Dict, Any
+from ..generic import BaseTool, tool_registry
+from utils.shell_sessions import shell_sessions
+
+class ShellCloseSessionTool(BaseTool):
+    """Shell session closing tool implementation."""
+    
+    async def tool_close_shell_session(self, session: str) -> Dict[str, Any]:
+        """
+        Close a shell session, stopping anything still running in it.
+        
+        Args:
+            session: The session id returned by open_shell_session
+        
+        Returns:
+            Dict containing whether the session was closed
+        """
+        try:
+            await shell_sessions.close(session)
+        except KeyError:
+            return {
+                "success": False,
+                "error": f"Shell session does not exist or has expired: {session}",
+                "session": session
+            }
+        
+        return {
+            "success": True,
+            "session": session
+        }
+
+# Create and register the tool instance automatically
+shell_close_session_tool = ShellCloseSessionTool()
+tool_registry.register_tool(shell_close_session_tool)
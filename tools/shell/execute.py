@@ -2,31 +2,185 @@
 Shell command execution tool for Hypernode MCP Server.
 """
 
-from typing import Dict, Any
+import asyncio
+import re
+from typing import Dict, Any, List, Optional
 from ..generic import BaseTool, tool_registry
+from utils.artifacts import artifact_store
 from utils.command_executor import CommandExecutor
+from utils.shell_sessions import SessionClosed, shell_sessions
+
+# Streaming commands such as tail -f run until they are stopped
+MAX_STREAM_TIMEOUT = 3600
+
+DEFAULT_MAX_OUTPUT_BYTES = 1024 * 1024
+
+# Bytes of the previous output of a stream searched together with a new chunk,
+# so a stop pattern split over two chunks is still found
+PATTERN_OVERLAP = 4096
 
 class ShellExecuteTool(BaseTool):
     """Shell command execution tool implementation."""
     
-    async def tool_execute_shell_command(self, command: str) -> Dict[str, Any]:
+    async def tool_execute_shell_command(
+        self,
+        command: str,
+        stream: bool = False,
+        timeout: int = 30,
+        max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+        stop_pattern: Optional[str] = None,
+        session: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Execute a shell command safely (dangerous commands are blocked).
         
+        With stream, stdout and stderr are sent as progress notifications as
+        they arrive, for commands that run for a while (tail -f, mysqldump,
+        find over the docroot). Each notification is sent before more output
+        is read, so a slow client slows the command down rather than output
+        piling up. Cancelling the call, reaching max_output_bytes or output
+        matching stop_pattern stops the command and everything it started.
+        
+        With session, the command runs in a shell opened by
+        open_shell_session, in the working directory and environment the
+        previous commands of the session left behind.
+        
+        A result larger than the artifact threshold is kept on disk: the
+        response holds its start and an artifact handle for fetch_artifact.
+        
         Args:
             command: Shell command to execute
+            stream: Stream the output while the command runs (default: False)
+            timeout: Seconds after which the command is stopped, or a session command gives up waiting (default: 30)
+            max_output_bytes: Stop a streamed command after this much output (streaming only)
+            stop_pattern: Regex; stop a streamed command once its output matches (streaming only)
+            session: Id of a shell session to run the command in (not with stream)
         
         Returns:
             Dict containing the command execution result
         """
-        result = await CommandExecutor.execute_command(command)
+        if session is not None:
+            if stream:
+                return {
+                    "success": False,
+                    "result": "Streaming is not supported in shell sessions",
+                    "command": command
+                }
+            return await self._run_in_session(session, command, max(timeout, 1))
+        
+        if stream:
+            return await self._stream(command, min(max(timeout, 1), MAX_STREAM_TIMEOUT), max_output_bytes, stop_pattern)
         
-        return {
+        result = await CommandExecutor.execute_command(command, timeout=max(timeout, 1))
+        
+        return await self._spilled({
             "success": result.success,
             "result": result.stdout if result.success else result.stderr,
             "command": command
+        })
+    
+    @staticmethod
+    async def _spilled(response: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace a large result by its preview and the handle of the artifact holding it."""
+        preview, artifact = await asyncio.to_thread(artifact_store.spill, response["result"], "execute_shell_command")
+        if artifact is not None:
+            response["result"] = preview
+            response["artifact"] = artifact.to_dict()
+        return response
+    
+    async def _run_in_session(self, session_id: str, command: str, timeout: int) -> Dict[str, Any]:
+        """Run a command in a shell session."""
+        try:
+            session = shell_sessions.get(session_id)
+            result, truncated = await session.run(command, timeout=timeout)
+        except (KeyError, SessionClosed) as e:
+            return {
+                "success": False,
+                "result": e.args[0] if e.args else str(e),
+                "command": command,
+                "session": session_id
+            }
+        
+        stdout, stdout_artifact = await asyncio.to_thread(artifact_store.spill, result.stdout, "execute_shell_command")
+        stderr, stderr_artifact = await asyncio.to_thread(artifact_store.spill, result.stderr, "execute_shell_command")
+        response = {
+            "success": result.success,
+            "result": stdout if result.success or not result.stderr else stderr,
+            "command": command,
+            "session": session_id,
+            "stdout": stdout,
+            "stderr": stderr,
+            "return_code": result.return_code,
+            "cwd": session.cwd,
+            "truncated": truncated
         }
+        artifact = stdout_artifact if result.success or not result.stderr else stderr_artifact
+        if artifact is not None:
+            response["artifact"] = artifact.to_dict()
+        if stdout_artifact is not None:
+            response["stdout_artifact"] = stdout_artifact.id
+        if stderr_artifact is not None:
+            response["stderr_artifact"] = stderr_artifact.id
+        return response
+    
+    async def _stream(self, command: str, timeout: int, max_output_bytes: int, stop_pattern: Optional[str]) -> Dict[str, Any]:
+        """Run a command, reporting its output chunks as they arrive."""
+        try:
+            pattern = re.compile(stop_pattern) if stop_pattern else None
+        except re.error as e:
+            return {
+                "success": False,
+                "result": f"Invalid stop_pattern: {e}",
+                "command": command
+            }
+        
+        output: Dict[str, List[str]] = {"stdout": [], "stderr": []}
+        sizes = {"stdout": 0, "stderr": 0}
+        tails = {"stdout": "", "stderr": ""}
+        stopped: Optional[str] = None
+        
+        def response(success: bool, result: str, **extra: Any) -> Dict[str, Any]:
+            return {
+                "success": success,
+                "result": result,
+                "command": command,
+                "stdout": "".join(output["stdout"]),
+                "stderr": "".join(output["stderr"]),
+                "streamed": True,
+                "stopped": stopped,
+                **extra
+            }
+        
+        try:
+            async with CommandExecutor.stream_output(command, timeout=timeout) as chunks:
+                async for name, text in chunks:
+                    offset = sizes[name]
+                    sizes[name] += len(text.encode('utf-8'))
+                    output[name].append(text)
+                    await self.progress.report(sum(sizes.values()), stream=name, offset=offset, output=text)
+                    
+                    searched = tails[name] + text
+                    tails[name] = searched[-PATTERN_OVERLAP:]
+                    if pattern is not None and pattern.search(searched):
+                        stopped = "stop_pattern"
+                    elif sum(sizes.values()) >= max_output_bytes:
+                        stopped = "max_output_bytes"
+                    if stopped:
+                        chunks.stop()
+                        break
+        except asyncio.CancelledError:
+            # The command has been killed; keep what it printed for whoever cancelled us
+            stopped = "cancelled"
+            self.progress.set_partial_result(response(False, "Command was cancelled", partial=True))
+            raise
+        
+        result = chunks.result
+        stdout = "".join(output["stdout"])
+        if result.success:
+            return response(True, stdout, return_code=result.return_code)
+        return response(False, "".join(output["stderr"]) or result.stderr, return_code=result.return_code,
+                        timed_out=chunks.timed_out)
 
 # Create and register the tool instance automatically
 shell_execute_tool = ShellExecuteTool()
-tool_registry.register_tool(shell_execute_tool) 
\ No newline at end of file
+tool_registry.register_tool(shell_execute_tool)
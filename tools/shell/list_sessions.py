@@ -0,0 +1,30 @@
+"""
+Shell session listing tool for Hypernode MCP Server.
+"""
+
+from typing import Dict, Any
+from ..generic import BaseTool, tool_registry
+from utils.shell_sessions import shell_sessions
+
+class ShellListSessionsTool(BaseTool):
+    """Shell session listing tool implementation."""
+    
+    async def tool_list_shell_sessions(self) -> Dict[str, Any]:
+        """
+        List the open shell sessions with their working directory and use.
+        
+        Returns:
+            Dict containing the open sessions
+        """
+        sessions = shell_sessions.list()
+        
+        return {
+            "success": True,
+            "sessions": sessions,
+            "count": len(sessions),
+            "max_sessions": shell_sessions.max_sessions
+        }
+
+# Create and register the tool instance automatically
+shell_list_sessions_tool = ShellListSessionsTool()
+tool_registry.register_tool(shell_list_sessions_tool)
@@ -0,0 +1,49 @@
+"""
+Shell session opening tool for Hypernode MCP Server.
+"""
+
+from typing import Dict, Any, Optional
+from ..generic import BaseTool, tool_registry
+from utils.shell_sessions import shell_sessions
+
+class ShellOpenSessionTool(BaseTool):
+    """Shell session opening tool implementation."""
+    
+    async def tool_open_shell_session(
+        self,
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Open a persistent shell session for execute_shell_command.
+        
+        Commands run in a session share a long-lived shell, so the working
+        directory, exported variables and shell variables carry over between
+        them, and a follow-up command skips starting a new shell. Sessions
+        close after being idle for a while, and only a few can be open at
+        once; close them with close_shell_session when done.
+        
+        Args:
+            cwd: Working directory to start in (default: the server's)
+            env: Environment variables to set in the session
+        
+        Returns:
+            Dict containing the session id to pass to execute_shell_command
+        """
+        try:
+            session = await shell_sessions.open(cwd, {str(k): str(v) for k, v in (env or {}).items()})
+        except (ValueError, OSError) as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        
+        return {
+            "success": True,
+            **session.to_dict(),
+            "idle_timeout": shell_sessions.idle_timeout
+        }
+
+# Create and register the tool instance automatically
+shell_open_session_tool = ShellOpenSessionTool()
+tool_registry.register_tool(shell_open_session_tool)
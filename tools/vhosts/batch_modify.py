@@ -0,0 +1,65 @@
+"""
+VHost batch modification tool for Hypernode MCP Server.
+"""
+
+from typing import Dict, Any, List
+from ..generic import BaseTool, tool_registry
+from utils.vhost_changes import apply_commands, plan_commands, validate_changes
+from utils.vhost_state import vhost_state
+
+MAX_CHANGES = 1000
+
+class VHostsBatchModifyTool(BaseTool):
+    """VHost batch modification tool implementation."""
+    
+    async def tool_batch_modify_vhosts(self, changes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Modify settings of several vhosts in one call.
+        
+        All changes are validated before anything is applied; if any change is
+        invalid, nothing is applied. The changes of a vhost are applied in a
+        single hypernode-manage-vhosts run, and vhosts getting identical
+        changes share a run, so the nginx config is regenerated once per
+        run instead of once per change.
+        
+        Args:
+            changes: List of {"vhost": ..., "action": ..., "value": ...} objects, as for modify_vhost
+        
+        Returns:
+            Dict containing the result per change, in the order given, and the commands that were run
+        """
+        if len(changes) > MAX_CHANGES:
+            return {
+                "success": False,
+                "error": f"Too many changes: {len(changes)}, at most {MAX_CHANGES} per batch",
+                "results": []
+            }
+        
+        valid, errors = validate_changes(changes)
+        if errors:
+            return {
+                "success": False,
+                "error": "Invalid changes, nothing was applied",
+                "errors": errors,
+                "results": []
+            }
+        
+        commands = plan_commands(valid)
+        try:
+            applied = {(result["vhost"], result["action"]): result for result in await apply_commands(commands)}
+        finally:
+            vhost_state.invalidate()
+        results = [applied[(change.vhost, change.action)] for change in valid]
+        failed = sum(1 for result in results if not result["success"])
+        
+        return {
+            "success": failed == 0,
+            "results": results,
+            "count": len(results),
+            "failed": failed,
+            "commands": [command.command for command in commands]
+        }
+
+# Create and register the tool instance automatically
+vhosts_batch_modify_tool = VHostsBatchModifyTool()
+tool_registry.register_tool(vhosts_batch_modify_tool)
@@ -2,23 +2,41 @@
 VHost listing tool for Hypernode MCP Server.
 """
 
+import asyncio
+import time
 from typing import Dict, Any
 from ..generic import BaseTool, tool_registry
-from utils.command_executor import CommandExecutor
+from utils.nginx_log import HostTraffic, traffic_by_host
+from utils.vhost_state import vhost_state
+
+MAX_TRAFFIC_MINUTES = 24 * 60
+
+# Number of hosts without a vhost to report traffic for
+MAX_OTHER_HOSTS = 10
 
 class VHostsListTool(BaseTool):
     """VHost listing tool implementation."""
     
-    async def tool_list_vhosts(self) -> Dict[str, Any]:
+    async def tool_list_vhosts(self, traffic_minutes: int = 0) -> Dict[str, Any]:
         """
         List all vhosts configured on the Hypernode with their settings.
         
+        The vhosts are read straight from the vhost configuration when it is
+        available, which is an in-memory read while it does not change, and
+        from hypernode-manage-vhosts otherwise.
+        
+        With traffic_minutes, each vhost gets the traffic it served in the
+        last minutes from the nginx access log: requests per minute, 5xx rate,
+        p95 request_time and bandwidth. All vhosts are aggregated in a single
+        pass over the lines in the window, by server_name.
+        
+        Args:
+            traffic_minutes: Minutes of recent traffic to add per vhost (default: 0, no traffic)
+        
         Returns:
             Dict containing the list of vhosts and their configurations
         """
-        command = "hypernode-manage-vhosts --list --format json"
-        
-        success, result = await CommandExecutor.execute_json_command(command)
+        success, result = await vhost_state.load(refresh=True)
         
         if not success:
             return {
@@ -27,12 +45,41 @@ class VHostsListTool(BaseTool):
                 "vhosts": {}
             }
         
-        return {
+        response = {
             "success": True,
             "vhosts": result,
             "count": len(result) if isinstance(result, dict) else 0
         }
+        if traffic_minutes > 0 and isinstance(result, dict):
+            response.update(await self._with_traffic(result, min(traffic_minutes, MAX_TRAFFIC_MINUTES)))
+        return response
+    
+    @staticmethod
+    async def _with_traffic(vhosts: Dict[str, Any], minutes: int) -> Dict[str, Any]:
+        """Join the vhosts with their traffic in the last minutes."""
+        end = time.time()
+        hosts, logs = await asyncio.to_thread(traffic_by_host, end - minutes * 60, end)
+        
+        # The vhost settings are shared with the state cache, so copy them
+        names = {name.lower(): name for name in vhosts}
+        idle = HostTraffic().to_dict(minutes)
+        enriched = {name: {**settings, "traffic": idle} for name, settings in vhosts.items()}
+        other = []
+        for host, traffic in hosts.items():
+            name = names.get(host)
+            if name is None:
+                other.append({"host": host, **traffic.to_dict(minutes)})
+            else:
+                enriched[name]["traffic"] = traffic.to_dict(minutes)
+        other.sort(key=lambda item: item["requests"], reverse=True)
+        
+        return {
+            "vhosts": enriched,
+            "traffic_minutes": minutes,
+            "traffic_logs": logs,
+            "other_hosts": other[:MAX_OTHER_HOSTS]
+        }
 
 # Create and register the tool instance automatically
 vhosts_list_tool = VHostsListTool()
-tool_registry.register_tool(vhosts_list_tool) 
\ No newline at end of file
+tool_registry.register_tool(vhosts_list_tool)
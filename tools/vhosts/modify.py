@@ -5,6 +5,7 @@ VHost modification tool for Hypernode MCP Server.
 from typing import Dict, Any
 from ..generic import BaseTool, tool_registry
 from utils.command_executor import CommandExecutor
+from utils.vhost_state import vhost_state
 
 class VHostsModifyTool(BaseTool):
     """VHost modification tool implementation."""
@@ -31,6 +32,7 @@ class VHostsModifyTool(BaseTool):
             command = f"hypernode-manage-vhosts {vhost} --{action} {value}"
         
         result = await CommandExecutor.execute_command(command)
+        vhost_state.invalidate()
         
         return {
             "success": result.success,
@@ -0,0 +1,88 @@
+"""
+VHost reconciliation tool for Hypernode MCP Server.
+"""
+
+from typing import Dict, Any
+from ..generic import BaseTool, tool_registry
+from utils.vhost_changes import apply_commands, diff_vhosts, plan_commands
+from utils.vhost_state import vhost_state
+
+MAX_CONCURRENCY = 8
+
+class VHostsReconcileTool(BaseTool):
+    """VHost reconciliation tool implementation."""
+    
+    async def tool_reconcile_vhosts(
+        self,
+        desired: Dict[str, Dict[str, Any]],
+        dry_run: bool = False,
+        concurrency: int = 4,
+        refresh: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Bring vhosts to a desired state.
+        
+        Compares the desired settings with the current (cached) vhost settings
+        and applies only the differences, grouped into as few hypernode-manage-vhosts
+        runs as possible. Only the settings given are compared; vhosts that are
+        not in desired are left alone and reported as unmanaged. A run without
+        differences reads the current state once and changes nothing.
+        
+        Args:
+            desired: Map of vhost name to settings, in the shape list_vhosts returns
+            dry_run: Only return the changes and commands that would be run
+            concurrency: Number of hypernode-manage-vhosts runs at a time (at most 8)
+            refresh: Read the current vhosts even if the cached state is still fresh
+        
+        Returns:
+            Dict containing the planned changes and commands, and the result per change unless dry_run
+        """
+        success, current = await vhost_state.load(refresh)
+        if success and not isinstance(current, dict):
+            success, current = False, f"Unexpected vhost list: {str(current)[:200]}"
+        if not success:
+            return {
+                "success": False,
+                "error": current,
+                "changes": []
+            }
+        
+        changes, errors = diff_vhosts(current, desired)
+        if errors:
+            return {
+                "success": False,
+                "error": "Invalid desired state, nothing was applied",
+                "errors": errors,
+                "changes": []
+            }
+        
+        commands = plan_commands(changes)
+        changed = {change.vhost for change in changes}
+        plan = {
+            "dry_run": dry_run,
+            "changes": [change.to_dict() for change in changes],
+            "commands": [command.command for command in commands],
+            "created": sorted(vhost for vhost in changed if vhost not in current),
+            "unchanged": sorted(vhost for vhost in desired if vhost not in changed),
+            "unmanaged": sorted(vhost for vhost in current if vhost not in desired)
+        }
+        
+        if dry_run or not commands:
+            return {"success": True, **plan}
+        
+        try:
+            results = await apply_commands(commands, concurrency=max(min(concurrency, MAX_CONCURRENCY), 1))
+        finally:
+            vhost_state.invalidate()
+        failed = sum(1 for result in results if not result["success"])
+        
+        return {
+            "success": failed == 0,
+            **plan,
+            "results": results,
+            "failed": failed
+        }
+
+# Create and register the tool instance automatically
+vhosts_reconcile_tool = VHostsReconcileTool()
+tool_registry.register_tool(vhosts_reconcile_tool)
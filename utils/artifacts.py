@@ -0,0 +1,282 @@
+"""
+Artifact store utilities for the Hypernode MCP Server.
+Writes tool output above a threshold to a size-capped disk area instead of
+returning or truncating it, so a tool can answer with a handle and a
+preview, and the output can be fetched piece by piece afterwards.
+"""
+
+import asyncio
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.file_ranges import FileRange, read_lines, read_range, tail_lines
+from utils.metrics import metrics_registry
+
+# Bytes of the start of a spilled output returned in place of it
+PREVIEW_BYTES = 4096
+
+# Characters of output written from the event loop that are buffered before
+# they are handed to a thread
+FLUSH_SIZE = 256 * 1024
+
+
+@dataclass
+class Artifact:
+    """A tool output kept on disk."""
+    id: str
+    path: str
+    source: str
+    size: int
+    lines: int
+    # Whether output beyond the capacity of the store was dropped
+    truncated: bool
+    created_at: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the handle of the artifact as a dict."""
+        return {
+            "artifact": self.id,
+            "source": self.source,
+            "size": self.size,
+            "lines": self.lines,
+            "truncated": self.truncated,
+            "created_at": self.created_at
+        }
+
+
+class ArtifactWriter:
+    """
+    Collects the output of a tool, in memory up to the threshold of the store
+    and on disk beyond it, so large output never has to be held in memory.
+
+    write, finish and discard may do file I/O; from the event loop use
+    write_async, finish_async and discard_async, which buffer the output
+    and do the I/O in a thread.
+    """
+
+    def __init__(self, store: "ArtifactStore", source: str):
+        self.store = store
+        self.source = source
+        self.size = 0
+        self.lines = 0
+        self.truncated = False
+        self._chunks: List[bytes] = []
+        self._preview = b""
+        self._file = None
+        self._path: Optional[str] = None
+        self._pending: List[str] = []
+        self._pending_size = 0
+
+    def write(self, text: str) -> None:
+        """Add output. Output beyond the capacity of the store is dropped."""
+        data = text.encode('utf-8')
+        room = self.store.max_bytes - self.size
+        if len(data) > room:
+            data = data[:max(room, 0)]
+            self.truncated = True
+        if not data:
+            return
+        self.size += len(data)
+        self.lines += data.count(b"\n")
+        if self._file is None:
+            self._chunks.append(data)
+            if self.size <= self.store.threshold:
+                return
+            self._path = self.store._new_path()
+            self._file = open(self._path, 'wb')
+            buffered = b"".join(self._chunks)
+            self._chunks = []
+            self._preview = buffered[:PREVIEW_BYTES]
+            self._file.write(buffered)
+        else:
+            self._file.write(data)
+
+    def finish(self) -> Tuple[str, Optional[Artifact]]:
+        """
+        Complete the output.
+
+        Returns:
+            Tuple of (the output, or its preview once spilled, the artifact if spilled)
+        """
+        if self._file is None:
+            return b"".join(self._chunks).decode('utf-8', errors='ignore'), None
+        self._file.close()
+        # A last line without a newline is a line too
+        lines = self.lines + (1 if self._last_byte() != b"\n" else 0)
+        artifact = Artifact(
+            id=os.path.basename(self._path),
+            path=self._path,
+            source=self.source,
+            size=self.size,
+            lines=lines,
+            truncated=self.truncated,
+            created_at=time.time()
+        )
+        self.store._add(artifact)
+        return self._preview.decode('utf-8', errors='ignore'), artifact
+
+    def discard(self) -> None:
+        """Drop the output, e.g. when the tool failed."""
+        self._chunks = []
+        if self._file is not None:
+            self._file.close()
+            try:
+                os.unlink(self._path)
+            except OSError:
+                pass
+            self._file = None
+
+    async def write_async(self, text: str) -> None:
+        """Add output from the event loop."""
+        self._pending.append(text)
+        self._pending_size += len(text)
+        if self._pending_size >= FLUSH_SIZE:
+            await self._flush()
+
+    async def finish_async(self) -> Tuple[str, Optional[Artifact]]:
+        """Complete the output from the event loop; see finish."""
+        await self._flush()
+        return await asyncio.to_thread(self.finish)
+
+    async def discard_async(self) -> None:
+        """Drop the output from the event loop; see discard."""
+        self._pending = []
+        self._pending_size = 0
+        await asyncio.to_thread(self.discard)
+
+    async def _flush(self) -> None:
+        if self._pending:
+            text = "".join(self._pending)
+            self._pending = []
+            self._pending_size = 0
+            await asyncio.to_thread(self.write, text)
+
+    def _last_byte(self) -> bytes:
+        with open(self._path, 'rb') as f:
+            f.seek(max(self.size - 1, 0))
+            return f.read(1)
+
+
+class ArtifactStore:
+    """
+    Tool outputs larger than threshold bytes, kept on disk.
+
+    The store holds at most max_bytes; the least recently used artifacts are
+    deleted to make room for new ones, and a single output is cut off at
+    max_bytes. Artifacts live as long as the server, in a temporary
+    directory unless a directory is given.
+    """
+
+    def __init__(self, directory: Optional[str] = None, threshold: int = 64 * 1024,
+                 max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.threshold = threshold
+        self.max_bytes = max_bytes
+        self.spilled = 0
+        self.evicted = 0
+        self._artifacts: "OrderedDict[str, Artifact]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def writer(self, source: str) -> ArtifactWriter:
+        """Return a writer collecting the output of a tool."""
+        return ArtifactWriter(self, source)
+
+    def spill(self, text: str, source: str) -> Tuple[str, Optional[Artifact]]:
+        """
+        Keep an output on disk if it is larger than the threshold.
+
+        Returns:
+            Tuple of (the output, or its preview once spilled, the artifact if spilled)
+        """
+        # Text this short is within the threshold whatever its encoding
+        if len(text) <= self.threshold // 4:
+            return text, None
+        writer = self.writer(source)
+        writer.write(text)
+        return writer.finish()
+
+    def get(self, artifact_id: str) -> Artifact:
+        """
+        Return an artifact, marking it as recently used.
+
+        Raises:
+            KeyError: If the artifact does not exist or was evicted
+        """
+        with self._lock:
+            artifact = self._artifacts.get(artifact_id)
+            if artifact is None:
+                raise KeyError(f"Artifact does not exist or was evicted: {artifact_id}")
+            self._artifacts.move_to_end(artifact_id)
+            return artifact
+
+    def read_range(self, artifact_id: str, offset: int = 0, length: int = 65536) -> FileRange:
+        """Read a byte range of an artifact; a negative offset counts from the end."""
+        return read_range(self.get(artifact_id).path, offset, length)
+
+    def read_lines(self, artifact_id: str, start_line: int = 0, count: int = 100) -> FileRange:
+        """Read a range of lines of an artifact; a negative start_line counts from the end."""
+        return read_lines(self.get(artifact_id).path, start_line, count)
+
+    def tail_lines(self, artifact_id: str, count: int = 100) -> FileRange:
+        """Read the last lines of an artifact."""
+        return tail_lines(self.get(artifact_id).path, count)
+
+    def list(self) -> List[Artifact]:
+        """Return the artifacts, least recently used first."""
+        with self._lock:
+            return list(self._artifacts.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """Return store statistics."""
+        with self._lock:
+            return {
+                "artifacts": len(self._artifacts),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "threshold": self.threshold,
+                "spilled": self.spilled,
+                "evicted": self.evicted
+            }
+
+    def _new_path(self) -> str:
+        with self._lock:
+            if self.directory is None:
+                self.directory = tempfile.mkdtemp(prefix="hypernode-mcp-artifacts-")
+                atexit.register(shutil.rmtree, self.directory, True)
+            os.makedirs(self.directory, exist_ok=True)
+        return os.path.join(self.directory, uuid.uuid4().hex[:16])
+
+    def _add(self, artifact: Artifact) -> None:
+        with self._lock:
+            self._artifacts[artifact.id] = artifact
+            self._size += artifact.size
+            self.spilled += 1
+            evicted = []
+            while self._size > self.max_bytes and len(self._artifacts) > 1:
+                _, oldest = self._artifacts.popitem(last=False)
+                self._size -= oldest.size
+                self.evicted += 1
+                evicted.append(oldest)
+        for oldest in evicted:
+            try:
+                os.unlink(oldest.path)
+            except OSError:
+                pass
+
+
+# Global artifact store instance
+artifact_store = ArtifactStore(
+    directory=os.environ.get("MCP_ARTIFACT_DIR"),
+    threshold=int(os.environ.get("MCP_ARTIFACT_THRESHOLD", str(64 * 1024))),
+    max_bytes=int(os.environ.get("MCP_ARTIFACT_MAX_BYTES", str(256 * 1024 * 1024)))
+)
+metrics_registry.register("artifact_store", artifact_store.stats)
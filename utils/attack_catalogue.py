@@ -0,0 +1,236 @@
+"""
+Attack catalogue utilities for the Hypernode MCP Server.
+Caches the attack types hypernode-systemctl block_attack offers until the
+CLI changes, and tells which blocks are active from the nginx config
+snippets the blocks install.
+"""
+
+import os
+import re
+import shutil
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from utils.attack_rules import parse_attack_list
+from utils.command_executor import CommandExecutor
+from utils.metrics import metrics_registry
+from utils.profiling import SPAN_PARSE, span
+
+SYSTEMCTL = "hypernode-systemctl"
+HELP_COMMAND = f"{SYSTEMCTL} block_attack --help"
+
+# Only the start of a snippet is searched for the attack types it blocks
+MAX_SNIPPET_BYTES = 64 * 1024
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]")
+# Names in snippets: words with their underscores and dashes, so a name only matches as a whole
+_TOKEN = re.compile(r"[\w-]+")
+_COMMENT = re.compile(r"#[^\n]*")
+# The snippets block_attack installs are named server.block_<attack type, lowercased>.conf
+_SNIPPET_NAME = re.compile(r"block_([\w-]+)", re.I)
+
+
+def nginx_config_dir() -> str:
+    """The directory holding the custom nginx config snippets, where blocks are installed."""
+    return os.path.expanduser(os.environ.get("HYPERNODE_NGINX_CONFIG_DIR", "/data/web/nginx"))
+
+
+def _normalize(name: str) -> str:
+    return _NON_ALNUM.sub("", name.lower())
+
+
+def _tokens(text: str) -> Set[str]:
+    return {_normalize(token) for token in _TOKEN.findall(text)}
+
+
+@dataclass(frozen=True)
+class Catalogue:
+    """The attack types block_attack offers, as parsed from its help."""
+    attacks: List[Dict[str, str]]
+    raw_output: str
+
+    @property
+    def names(self) -> List[str]:
+        return [attack["name"] for attack in self.attacks]
+
+
+class AttackCatalogue:
+    """
+    The attack types offered by hypernode-systemctl block_attack.
+
+    The help is run and parsed once and cached until the CLI binary
+    changes, as told by its path and modification time, or until the cache
+    is invalidated after a block. Failures are not cached.
+    """
+
+    def __init__(self):
+        self.loads = 0
+        self.hits = 0
+        self._key: Optional[Tuple[Any, ...]] = None
+        self._catalogue: Optional[Catalogue] = None
+
+    async def load(self) -> Tuple[bool, Any]:
+        """
+        Return the attack types.
+
+        Returns:
+            Tuple of (success, catalogue_or_error_message)
+        """
+        key = self._binary_key()
+        if key is not None and self._catalogue is not None and key == self._key:
+            self.hits += 1
+            return True, self._catalogue
+
+        result = await CommandExecutor.execute_command(HELP_COMMAND)
+        if not result.success:
+            return False, result.stderr
+        with span(SPAN_PARSE):
+            catalogue = Catalogue(attacks=parse_attack_list(result.stdout), raw_output=result.stdout)
+        self.loads += 1
+        # Without the binary on PATH there is nothing to tell a change by
+        if key is not None:
+            self._key, self._catalogue = key, catalogue
+        return True, catalogue
+
+    def invalidate(self) -> None:
+        """Forget the cached attack types."""
+        self._catalogue = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics."""
+        return {
+            "cached": self._catalogue is not None,
+            "loads": self.loads,
+            "hits": self.hits
+        }
+
+    @staticmethod
+    def _binary_key() -> Optional[Tuple[Any, ...]]:
+        path = shutil.which(SYSTEMCTL)
+        if path is None:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (os.path.realpath(path), st.st_mtime_ns, st.st_size)
+
+
+class ActiveBlocks:
+    """
+    The attack blocks currently enabled on the Hypernode.
+
+    block_attack installs an nginx config snippet per block in the custom
+    nginx config directory, so a block is active when a snippet names the
+    attack type as a whole word, in its file name (server.block_<name>.conf)
+    or outside the comments of its content. The scan is cached until a stat
+    shows the directory changed, or until invalidated after a block. Blocks
+    made through the server are reported until their snippet shows up;
+    from then on the snippet tells, so a block removed by hand is not.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self._directory = directory
+        self.scans = 0
+        self.hits = 0
+        self.blocked: Set[str] = set()
+        # Blocks made through the server whose snippet has not been seen yet
+        self._pending: Set[str] = set()
+        self._key: Optional[Tuple[Any, ...]] = None
+        self._active: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> str:
+        return self._directory or nginx_config_dir()
+
+    def active(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the active blocks among the given attack types.
+
+        Returns:
+            Dict mapping the active attack types to the snippets installing
+            them and whether they were blocked through the server
+        """
+        with self._lock:
+            names = sorted(set(names) | self._pending)
+            key = (self._stat(), tuple(names))
+            if key != self._key:
+                self._active = self._scan(names)
+                self._key = key
+                self.scans += 1
+                self._pending -= self._active.keys()
+            else:
+                self.hits += 1
+            found = self._active
+            pending = set(self._pending)
+
+        return {
+            name: {"files": found.get(name, []), "blocked_by_server": name in self.blocked}
+            for name in names
+            if name in found or name in pending
+        }
+
+    def record_block(self, name: str) -> None:
+        """Remember a block made through the server and rescan on the next lookup."""
+        with self._lock:
+            self.blocked.add(name)
+            self._pending.add(name)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Forget the cached scan."""
+        with self._lock:
+            self._key = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics."""
+        return {
+            "scans": self.scans,
+            "hits": self.hits,
+            "blocked_by_server": sorted(self.blocked)
+        }
+
+    def _stat(self) -> Optional[Tuple[Any, ...]]:
+        try:
+            st = os.stat(self.directory)
+        except OSError:
+            return None
+        # Snippets edited in place do not change the directory, so stat every file
+        files = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file():
+                    file_st = entry.stat()
+                    files.append((entry.name, file_st.st_size, file_st.st_mtime_ns))
+        return (st.st_ino, st.st_mtime_ns, tuple(sorted(files)))
+
+    def _scan(self, names: List[str]) -> Dict[str, List[str]]:
+        normalized = {name: _normalize(name) for name in names}
+        found: Dict[str, List[str]] = {}
+        try:
+            entries = sorted(os.scandir(self.directory), key=lambda entry: entry.name)
+        except OSError:
+            return found
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            try:
+                with open(entry.path, 'rb') as f:
+                    content = f.read(MAX_SNIPPET_BYTES).decode('utf-8', errors='ignore')
+            except OSError:
+                continue
+            tokens = _tokens(entry.name) | _tokens(_COMMENT.sub("", content))
+            tokens.update(_normalize(name) for name in _SNIPPET_NAME.findall(entry.name))
+            for name, needle in normalized.items():
+                if needle and needle in tokens:
+                    found.setdefault(name, []).append(entry.name)
+        return found
+
+
+# Global attack catalogue instances
+attack_catalogue = AttackCatalogue()
+active_blocks = ActiveBlocks()
+metrics_registry.register("attack_catalogue", attack_catalogue.stats)
+metrics_registry.register("active_blocks", active_blocks.stats)
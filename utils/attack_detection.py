@@ -0,0 +1,402 @@
+"""
+Attack detection utilities for the Hypernode MCP Server.
+Follows the nginx access log and keeps per-IP, per-network, login and
+crawler request rates over a sliding window in bounded memory, so attacks
+can be spotted and matched to block_attack types without a log scan.
+"""
+
+import ipaddress
+import os
+import re
+import threading
+import time
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Deque, Dict, List, Optional, Tuple
+
+from utils.attack_rules import LOGIN_PATHS, entry_country, looks_legitimate, rule_for
+from utils.file_ranges import open_buffer
+from utils.metrics import metrics_registry
+from utils.nginx_log import TIME_SKEW, entry_host, line_time, log_dir, parse_line, request_path, seek_time
+
+# Sliding window the rates are computed over, in seconds
+WINDOW = 300
+
+# Requests per minute above which a finding is reported
+LOGIN_RATE = 10.0
+CRAWLER_RATE = 60.0
+IP_RATE = 300.0
+NETWORK_RATE = 600.0
+
+READ_SIZE = 1024 * 1024
+
+_LOGIN = re.compile(LOGIN_PATHS, re.I)
+_CRAWLER = re.compile(r"bot|crawl|spider|slurp|scrapy|headless", re.I)
+
+
+class CountMinSketch:
+    """
+    Approximate counts per key in fixed memory.
+
+    Estimates never undercount; they overcount by at most a small fraction
+    of the total count, with high probability.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.rows = [array('L', [0]) * width for _ in range(depth)]
+
+    def indexes(self, key: str) -> List[int]:
+        """Return the column of a key in each row; compute once to add to or estimate from several sketches."""
+        # Double hashing: two hashes give independent enough columns for every row
+        first, second = hash(key), hash((key, 1))
+        return [(first + row * second) % self.width for row in range(self.depth)]
+
+    def add(self, indexes: List[int], count: int = 1) -> None:
+        for row, index in zip(self.rows, indexes):
+            row[index] += count
+
+    def estimate(self, indexes: List[int]) -> int:
+        return min(row[index] for row, index in zip(self.rows, indexes))
+
+    def subtract(self, other: "CountMinSketch") -> None:
+        """Subtract the counts of a sketch of the same shape."""
+        for index, (row, other_row) in enumerate(zip(self.rows, other.rows)):
+            self.rows[index] = array('L', map(int.__sub__, row, other_row))
+
+
+class SlidingCounter:
+    """
+    Request counts per key over the last window seconds, in bounded memory.
+
+    The window is split into buckets with a count-min sketch each, which
+    are subtracted from a sketch of the whole window as they age out, so a
+    count costs a single sketch update and lookup. A small table tracks the keys with the highest counts
+    exactly by key, with their estimated count and the last entry seen, so
+    the heavy hitters can be listed without storing every key.
+    """
+
+    def __init__(self, window: float = WINDOW, buckets: int = 10, width: int = 2048, depth: int = 4,
+                 heavy_hitters: int = 32):
+        self.window = window
+        self.bucket_seconds = window / buckets
+        self.width = width
+        self.depth = depth
+        self.heavy_hitters = heavy_hitters
+        self._buckets: Deque[Tuple[int, CountMinSketch]] = deque()
+        self._total = CountMinSketch(width, depth)
+        # key -> [estimated count, last entry]
+        self._heavy: Dict[str, List[Any]] = {}
+        self._floor = 0
+
+    def add(self, timestamp: float, key: str, entry: Dict[str, Any]) -> int:
+        """
+        Count a request for a key.
+
+        Returns:
+            The estimated count of the key in the window
+        """
+        self.advance(timestamp)
+        indexes = self._total.indexes(key)
+        self._buckets[-1][1].add(indexes)
+        self._total.add(indexes)
+        count = self._total.estimate(indexes)
+
+        heavy = self._heavy.get(key)
+        if heavy is not None:
+            heavy[0] = count
+            heavy[1] = entry
+        elif len(self._heavy) < self.heavy_hitters:
+            self._heavy[key] = [count, entry]
+            self._floor = min(self._floor, count) if len(self._heavy) > 1 else count
+        elif count > self._floor:
+            # Replace the key with the lowest count; counts in the table lag behind, never ahead
+            lowest = min(self._heavy, key=lambda heavy_key: self._heavy[heavy_key][0])
+            del self._heavy[lowest]
+            self._heavy[key] = [count, entry]
+            self._floor = min(heavy[0] for heavy in self._heavy.values())
+        return count
+
+    def estimate(self, key: str) -> int:
+        """Return the estimated count of a key in the window."""
+        return self._total.estimate(self._total.indexes(key))
+
+    def top(self, count: int = 10) -> List[Tuple[str, int, Dict[str, Any]]]:
+        """Return the keys with the highest counts, with their count and last entry."""
+        ranked = sorted(self._heavy.items(), key=lambda item: item[1][0], reverse=True)
+        return [(key, heavy[0], heavy[1]) for key, heavy in ranked[:count]]
+
+    def rate(self, count: int) -> float:
+        """Return a count in the window as requests per minute."""
+        return round(count * 60 / self.window, 2)
+
+    def advance(self, timestamp: float) -> None:
+        """Move the window to end at a point in time, aging out the buckets before it."""
+        bucket = int(timestamp // self.bucket_seconds)
+        if self._buckets and bucket <= self._buckets[-1][0]:
+            # Lines within the clock skew of the workers are counted in the current bucket
+            return
+        self._buckets.append((bucket, CountMinSketch(self.width, self.depth)))
+        oldest = bucket - int(self.window // self.bucket_seconds) + 1
+        expired = False
+        while self._buckets[0][0] < oldest:
+            self._total.subtract(self._buckets.popleft()[1])
+            expired = True
+        if expired:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        """Recount the heavy hitters after buckets aged out, dropping keys that went quiet."""
+        for key in list(self._heavy):
+            count = self.estimate(key)
+            if count:
+                self._heavy[key][0] = count
+            else:
+                del self._heavy[key]
+        self._floor = min((heavy[0] for heavy in self._heavy.values()), default=0)
+
+
+@dataclass(frozen=True)
+class Finding:
+    """A key whose request rate points to an attack, with the last request seen for it."""
+    kind: str
+    key: str
+    requests_per_minute: float
+    entry: Dict[str, Any]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the finding as a dict."""
+        return {
+            "kind": self.kind,
+            "key": self.key,
+            "requests_per_minute": self.requests_per_minute,
+            "last_request": {
+                "remote_addr": self.entry.get("remote_addr", ""),
+                "country": entry_country(self.entry),
+                "host": entry_host(self.entry),
+                "request": self.entry.get("request", ""),
+                "status": self.entry.get("status", ""),
+                "user_agent": self.entry.get("user_agent", ""),
+                "looks_legitimate": looks_legitimate(self.entry)
+            }
+        }
+
+
+def network(ip: str) -> str:
+    """Return the /24 of an IPv4 address or the /64 of an IPv6 address."""
+    if ip.count(".") == 3 and ":" not in ip:
+        return ip.rsplit(".", 1)[0] + ".0/24"
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return ip
+    prefix = 24 if address.version == 4 else 64
+    return str(ipaddress.ip_network(f"{ip}/{prefix}", strict=False))
+
+
+class AttackDetector:
+    """
+    Sliding-window request rates of the access log, and the attacks they show.
+
+    Tracks the rates of all requests per IP and per network, of login and
+    admin requests per IP (brute forcing) and of self-declared crawlers per
+    user agent (crawler bursts).
+    """
+
+    def __init__(self, window: float = WINDOW):
+        self.window = window
+        self.ips = SlidingCounter(window)
+        self.networks = SlidingCounter(window)
+        self.logins = SlidingCounter(window)
+        self.crawlers = SlidingCounter(window)
+        self.requests = 0
+        self.last: Optional[float] = None
+
+    def feed(self, timestamp: float, entry: Dict[str, Any]) -> None:
+        """Count a request."""
+        self.requests += 1
+        self.last = timestamp if self.last is None else max(self.last, timestamp)
+        ip = entry.get("remote_addr", "")
+        self.ips.add(timestamp, ip, entry)
+        self.networks.add(timestamp, network(ip), entry)
+        if _LOGIN.search(request_path(entry)):
+            self.logins.add(timestamp, ip, entry)
+        user_agent = entry.get("user_agent", "")
+        if _CRAWLER.search(user_agent):
+            self.crawlers.add(timestamp, user_agent, entry)
+
+    def findings(self, top: int = 10, now: Optional[float] = None) -> List["Finding"]:
+        """
+        Return the keys whose request rate exceeds the threshold of their kind, highest rate first per kind.
+
+        The window ends at now, the current time by default, so a burst that
+        ended longer than a window ago is not reported when the log went quiet.
+        """
+        now = time.time() if now is None else now
+        findings = []
+        for kind, counter, threshold in (
+            ("brute_force", self.logins, LOGIN_RATE),
+            ("crawler_burst", self.crawlers, CRAWLER_RATE),
+            ("ip_flood", self.ips, IP_RATE),
+            ("network_flood", self.networks, NETWORK_RATE),
+        ):
+            counter.advance(now)
+            for key, count, entry in counter.top(top):
+                rate = counter.rate(count)
+                if rate >= threshold:
+                    findings.append(Finding(kind=kind, key=key, requests_per_minute=rate, entry=entry))
+        return findings
+
+    def stats(self) -> Dict[str, Any]:
+        """Return detector statistics."""
+        return {"requests": self.requests, "last": self.last, "window": self.window}
+
+
+def suggest_attacks(findings: List[Finding], attacks: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """
+    Match findings to the attack types whose rules block their requests.
+
+    Attack types whose criteria can not be modelled are skipped.
+
+    Returns:
+        Suggestions with the attack type, its description and the findings as evidence, most requests first
+    """
+    suggestions = []
+    for attack in attacks:
+        try:
+            rule = rule_for(attack["name"])
+        except ValueError:
+            continue
+        evidence = [finding for finding in findings if rule.matches(finding.entry)]
+        if evidence:
+            suggestions.append({
+                "attack_type": attack["name"],
+                "description": attack.get("description", ""),
+                "requests_per_minute": round(sum(finding.requests_per_minute for finding in evidence), 2),
+                "evidence": [finding.to_dict() for finding in evidence]
+            })
+    suggestions.sort(key=lambda suggestion: suggestion["requests_per_minute"], reverse=True)
+    return suggestions
+
+
+class LogFollower:
+    """
+    Follows the access log, feeding new requests to the detector.
+
+    Each poll reads what was appended since the previous one. The first
+    poll starts a window before now, found by binary search, so the rates
+    are complete right away. A rotated log is read to its end before the
+    new log is opened.
+    """
+
+    def __init__(self, detector: AttackDetector, path: Optional[str] = None):
+        self.detector = detector
+        self._path = path
+        self._file: Optional[BinaryIO] = None
+        self._partial = b""
+        self._lock = threading.Lock()
+        self.bytes_read = 0
+        self.rotations = 0
+
+    @property
+    def path(self) -> str:
+        return self._path or os.path.join(log_dir(), "access.log")
+
+    def poll(self) -> int:
+        """
+        Feed the requests logged since the previous poll.
+
+        Returns:
+            Number of lines read
+
+        Raises:
+            OSError: If the log can not be read
+        """
+        with self._lock:
+            if self._file is None:
+                self._open(backfill=True)
+            elif self._stale():
+                # Idle for longer than the window: what was appended since is mostly too old to count
+                self._seek_window()
+            lines = self._drain()
+            # After a rotation the log is a new file; the rest of the old one was read above
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                return lines
+            if st.st_ino != os.fstat(self._file.fileno()).st_ino:
+                self._file.close()
+                self._open(backfill=self._stale())
+                self.rotations += 1
+                lines += self._drain()
+            elif st.st_size < self._file.tell():
+                # Truncated in place
+                self._file.seek(0)
+                self._partial = b""
+                lines += self._drain()
+            return lines
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self._partial = b""
+
+    def _open(self, backfill: bool) -> None:
+        self._file = open(self.path, 'rb')
+        self._partial = b""
+        if backfill:
+            self._seek_window()
+
+    def _stale(self) -> bool:
+        """Whether the last request fed is older than the window."""
+        last = self.detector.last
+        return last is None or last < time.time() - self.detector.window - TIME_SKEW
+
+    def _seek_window(self) -> None:
+        """Skip ahead to the first line of the window, found by binary search."""
+        # Through the descriptor, so it is the file being followed even when rotated away
+        with open_buffer(f"/dev/fd/{self._file.fileno()}") as (buffer, size):
+            offset = seek_time(buffer, size, time.time() - self.detector.window - TIME_SKEW)
+        if offset > self._file.tell():
+            self._file.seek(offset)
+            self._partial = b""
+
+    def _drain(self) -> int:
+        lines = 0
+        while True:
+            data = self._file.read(READ_SIZE)
+            if not data:
+                return lines
+            self.bytes_read += len(data)
+            chunk = self._partial + data
+            end = chunk.rfind(b"\n")
+            if end < 0:
+                self._partial = chunk
+                continue
+            # A line still being written stays behind until the next poll
+            self._partial = chunk[end + 1:]
+            for line in chunk[:end].split(b"\n"):
+                timestamp = line_time(line)
+                entry = parse_line(line) if timestamp is not None else None
+                if entry is not None:
+                    self.detector.feed(timestamp, entry)
+                    lines += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return follower and detector statistics."""
+        return {
+            **self.detector.stats(),
+            "following": self._file is not None,
+            "bytes_read": self.bytes_read,
+            "rotations": self.rotations
+        }
+
+
+# Global attack detection instances
+attack_detector = AttackDetector()
+log_follower = LogFollower(attack_detector)
+metrics_registry.register("attack_detection", log_follower.stats)
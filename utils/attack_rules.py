@@ -0,0 +1,290 @@
+"""
+Attack rule utilities for the Hypernode MCP Server.
+Models what the hypernode-systemctl block_attack options block, so the
+impact of a block can be measured against recent traffic before it is
+enabled.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Pattern, Tuple
+
+from utils.nginx_log import entry_host, logs_in_window, parse_line, request_path, window_lines
+
+# Paths brute force attacks go for: the Magento and WordPress logins and admin
+LOGIN_PATHS = (
+    r"^/(index\.php/)?(admin|backend)(/|$)"
+    r"|^/(index\.php/)?customer/account/loginPost"
+    r"|^/rest/(\w+/)?V1/integration/(admin|customer)/token"
+    r"|^/wp-login\.php|^/xmlrpc\.php|^/downloader(/|$)"
+)
+
+COUNTRIES = {
+    "China": "CN",
+    "Russia": "RU",
+    "Ukraine": "UA",
+    "Vietnam": "VN",
+    "India": "IN",
+    "Brazil": "BR",
+    "Iran": "IR",
+    "NorthKorea": "KP",
+    "Turkey": "TR",
+    "Indonesia": "ID",
+}
+
+# User agents that announce themselves as automated
+_AUTOMATED = re.compile(r"bot|crawl|spider|slurp|curl|wget|python|java/|go-http|libwww|scrapy|headless", re.I)
+
+_COUNTRY_BRUTE_FORCE = re.compile(r"^Block(\w+?)BruteForce$")
+_BOT = re.compile(r"^Block(\w+Bot)$")
+_LITERAL = re.compile(r"^[\w-]+$")
+
+
+@dataclass(frozen=True)
+class AttackRule:
+    """
+    The requests an attack block matches.
+
+    All given criteria must match; a rule without criteria matches nothing.
+    """
+    name: str
+    countries: Tuple[str, ...] = ()
+    user_agent: Optional[str] = None
+    path: Optional[str] = None
+    methods: Tuple[str, ...] = ()
+    _user_agent: Optional[Pattern] = field(init=False, default=None, compare=False, repr=False)
+    _path: Optional[Pattern] = field(init=False, default=None, compare=False, repr=False)
+
+    def __post_init__(self):
+        # The rule is frozen, so the compiled patterns are set around it
+        if self.user_agent is not None:
+            object.__setattr__(self, "_user_agent", re.compile(self.user_agent, re.I))
+        if self.path is not None:
+            object.__setattr__(self, "_path", re.compile(self.path, re.I))
+
+    @classmethod
+    def from_dict(cls, name: str, item: Dict[str, Any]) -> "AttackRule":
+        """
+        Create a rule from a dict with countries, user_agent, path and methods.
+
+        Raises:
+            ValueError: If a criterion is invalid
+        """
+        if not isinstance(item, dict):
+            raise ValueError(f"Expected the criteria of {name} as an object")
+        try:
+            return cls(
+                name=name,
+                countries=tuple(str(country).upper() for country in item.get("countries", ())),
+                user_agent=item.get("user_agent"),
+                path=item.get("path"),
+                methods=tuple(str(method).upper() for method in item.get("methods", ()))
+            )
+        except re.error as e:
+            raise ValueError(f"Invalid pattern for {name}: {e}") from e
+
+    @property
+    def empty(self) -> bool:
+        return not (self.countries or self.user_agent or self.path or self.methods)
+
+    def prefilter(self) -> Optional[Pattern]:
+        """
+        Return a pattern every raw line the rule matches contains.
+
+        Lines without it are skipped without parsing them, which is what
+        makes a simulation over hours of traffic fast. Only literal criteria
+        can be looked for in the raw, possibly escaped, line.
+        """
+        if self.countries:
+            return re.compile(b"|".join(b'"' + re.escape(country.encode()) + b'"' for country in self.countries))
+        if self.user_agent is not None and _LITERAL.match(self.user_agent):
+            return re.compile(self.user_agent.encode(), re.I)
+        return None
+
+    def matches(self, entry: Dict[str, Any]) -> bool:
+        """Whether the rule blocks a parsed log entry."""
+        if self.empty:
+            return False
+        if self.countries and entry_country(entry) not in self.countries:
+            return False
+        if self.methods and entry.get("request", "").split(" ", 1)[0].upper() not in self.methods:
+            return False
+        if self.user_agent is not None and not self._user_agent.search(entry.get("user_agent", "")):
+            return False
+        if self.path is not None and not self._path.search(request_path(entry)):
+            return False
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the criteria as a dict."""
+        return {
+            "countries": list(self.countries),
+            "user_agent": self.user_agent,
+            "path": self.path,
+            "methods": list(self.methods)
+        }
+
+
+# Rules for the block_attack options whose criteria do not follow from their name
+KNOWN_RULES: Dict[str, Dict[str, Any]] = {
+    "BlockSqliBruteForce": {
+        "path": r"(union(\s|%20|\+)+select|select(\s|%20|\+)+.*from|sleep\(|benchmark\(|information_schema)"
+    },
+    "BlockMagentoAdminBruteForce": {"path": LOGIN_PATHS, "methods": ["POST"]},
+    "BlockWordpressBruteForce": {"path": r"^/wp-login\.php|^/xmlrpc\.php", "methods": ["POST"]},
+    "BlockEmptyUserAgent": {"user_agent": r"^-?$"},
+}
+
+
+def parse_attack_list(output: str) -> List[Dict[str, str]]:
+    """
+    Parse the attack types from the output of hypernode-systemctl block_attack --help.
+
+    Returns:
+        List of dicts with the name and description of each attack type
+    """
+    attacks = []
+    for line in output.strip().split('\n'):
+        line = line.strip()
+        if line and not line.startswith('usage:') and not line.startswith('The possible values are:') and not line.startswith('options:'):
+            # Attack types are listed as name<TAB>description
+            if 'Block' in line and '\t' in line:
+                parts = line.split('\t')
+                if len(parts) >= 2:
+                    attacks.append({
+                        "name": parts[0].strip(),
+                        "description": parts[1].strip()
+                    })
+    return attacks
+
+
+def entry_country(entry: Dict[str, Any]) -> str:
+    """Return the GeoIP country code of a log entry."""
+    return (entry.get("country") or entry.get("geoip_country_code") or "").upper()
+
+
+def looks_legitimate(entry: Dict[str, Any]) -> bool:
+    """Whether a request looks like a real visitor: a browser user agent, served successfully."""
+    user_agent = entry.get("user_agent", "")
+    status = entry.get("status", "")
+    return user_agent.startswith("Mozilla/") and not _AUTOMATED.search(user_agent) and status[:1] in ("2", "3")
+
+
+def rule_for(attack_type: str) -> AttackRule:
+    """
+    Return the rule modelling an attack type.
+
+    Rules are taken from the JSON file in MCP_ATTACK_RULES, mapping attack
+    types to their criteria, then from the known rules, and otherwise
+    derived from the name: Block<Country>BruteForce blocks logins from a
+    country and Block<Name>Bot blocks a bot by its user agent.
+
+    Raises:
+        ValueError: If the attack type can not be modelled
+    """
+    overrides_path = os.environ.get("MCP_ATTACK_RULES")
+    if overrides_path:
+        try:
+            with open(os.path.expanduser(overrides_path), 'r', encoding='utf-8') as f:
+                overrides = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Failed to read attack rules {overrides_path}: {e}") from e
+        if isinstance(overrides, dict) and attack_type in overrides:
+            return AttackRule.from_dict(attack_type, overrides[attack_type])
+
+    if attack_type in KNOWN_RULES:
+        return AttackRule.from_dict(attack_type, KNOWN_RULES[attack_type])
+
+    match = _COUNTRY_BRUTE_FORCE.match(attack_type)
+    if match and match.group(1) in COUNTRIES:
+        return AttackRule(name=attack_type, countries=(COUNTRIES[match.group(1)],), path=LOGIN_PATHS)
+    match = _BOT.match(attack_type)
+    if match:
+        return AttackRule(name=attack_type, user_agent=re.escape(match.group(1)))
+    raise ValueError(
+        f"Can not model the criteria of {attack_type}; add them to the file in MCP_ATTACK_RULES"
+    )
+
+
+class BlockImpact:
+    """The requests of a log window a rule would have blocked."""
+
+    def __init__(self, max_samples: int = 10):
+        self.max_samples = max_samples
+        self.requests = 0
+        self.matched = 0
+        self.legitimate = 0
+        self.ips: Dict[str, int] = {}
+        self.hosts: Dict[str, int] = {}
+        self.legitimate_ips: Dict[str, int] = {}
+        self.samples: List[Dict[str, Any]] = []
+
+    def add(self, timestamp: float, entry: Dict[str, Any]) -> None:
+        """Count a request the rule matches."""
+        self.matched += 1
+        ip = entry.get("remote_addr", "")
+        host = entry_host(entry)
+        self.ips[ip] = self.ips.get(ip, 0) + 1
+        self.hosts[host] = self.hosts.get(host, 0) + 1
+        if not looks_legitimate(entry):
+            return
+        self.legitimate += 1
+        # One sample per visitor, so a single busy visitor does not fill them all
+        if ip not in self.legitimate_ips and len(self.samples) < self.max_samples:
+            self.samples.append({
+                "timestamp": timestamp,
+                "remote_addr": ip,
+                "country": entry_country(entry),
+                "host": host,
+                "request": entry.get("request", ""),
+                "status": entry.get("status", ""),
+                "user_agent": entry.get("user_agent", "")
+            })
+        self.legitimate_ips[ip] = self.legitimate_ips.get(ip, 0) + 1
+
+    def to_dict(self, top: int = 10) -> Dict[str, Any]:
+        """Return the impact, with the top IPs and vhosts."""
+        def most(counts: Dict[str, int]) -> List[Tuple[str, int]]:
+            return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:top]
+
+        return {
+            "requests": self.requests,
+            "matched_requests": self.matched,
+            "matched_fraction": round(self.matched / self.requests, 4) if self.requests else 0.0,
+            "matched_ips": len(self.ips),
+            "matched_vhosts": len(self.hosts),
+            "top_ips": most(self.ips),
+            "vhosts": most(self.hosts),
+            "legitimate_looking_requests": self.legitimate,
+            "legitimate_looking_ips": len(self.legitimate_ips),
+            "samples": self.samples
+        }
+
+
+def _matching(rule: AttackRule, lines: Iterator[Tuple[float, bytes]], impact: BlockImpact) -> Iterator[Tuple[float, Dict[str, Any]]]:
+    prefilter = rule.prefilter()
+    for timestamp, line in lines:
+        impact.requests += 1
+        if prefilter is not None and not prefilter.search(line):
+            continue
+        entry = parse_line(line)
+        if entry is not None and rule.matches(entry):
+            yield timestamp, entry
+
+
+def simulate_block(rule: AttackRule, start: float, end: float, directory: Optional[str] = None,
+                   max_samples: int = 10) -> Tuple[BlockImpact, List[str]]:
+    """
+    Measure which requests logged within [start, end) a rule would have blocked.
+
+    Returns:
+        Tuple of (impact, paths of the logs read)
+    """
+    impact = BlockImpact(max_samples)
+    logs = logs_in_window(start, end, directory)
+    for path in logs:
+        for timestamp, entry in _matching(rule, window_lines(path, start, end), impact):
+            impact.add(timestamp, entry)
+    return impact, logs
@@ -4,11 +4,20 @@ Provides safe command execution with proper error handling and validation.
 """
 
 import asyncio
+import atexit
+import codecs
 import json
 import logging
+import os
+import signal
 import subprocess
-from typing import Dict, List, Optional, Tuple, Any
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, List, Optional, Set, Tuple, Any
 from dataclasses import dataclass
+from utils.profiling import SPAN_PARSE, SPAN_SUBPROCESS, add_span, span
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +30,257 @@ class CommandResult:
     return_code: int
     command: str
 
+class _ProcessStream(ABC):
+    """
+    Lifecycle of a running command whose output is read while it runs.
+
+    Kills the process group when the timeout expires, when the caller stops
+    early or when the stream is closed before all output was read, and
+    builds the final CommandResult on close. Subclasses start their readers
+    in _start, tell in _reading whether output is left, and hand over the
+    rest of the pipes in _drain.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        command: str,
+        timeout: int,
+        process: Optional[asyncio.subprocess.Process] = None,
+        result: Optional[CommandResult] = None
+    ):
+        self.command = command
+        self.timeout = timeout
+        self.process = process
+        self.result = result
+        self.timed_out = False
+        self.stopped = False
+        self.wait_time = 0.0
+        self._timeout_handle = None
+
+        if process is not None:
+            self._start(process)
+            self._timeout_handle = asyncio.get_running_loop().call_later(timeout, self._on_timeout)
+
+    @property
+    def pid(self) -> Optional[int]:
+        """PID of the running command, if it was started."""
+        return self.process.pid if self.process is not None else None
+
+    @abstractmethod
+    def _start(self, process: asyncio.subprocess.Process) -> None:
+        """Start reading the output of the command."""
+
+    @property
+    @abstractmethod
+    def _reading(self) -> bool:
+        """Whether the caller has output left to read."""
+
+    @abstractmethod
+    async def _drain(self) -> str:
+        """Stop the readers and empty the pipes; return the stderr to report."""
+
+    def stop(self) -> None:
+        """Stop the command early, e.g. once enough output has been read."""
+        self.stopped = True
+        self._terminate()
+
+    def _on_timeout(self) -> None:
+        logger.error(f"Command timed out: {self.command}")
+        self.timed_out = True
+        self._terminate()
+
+    def _terminate(self) -> None:
+        if self.process is not None:
+            CommandExecutor.kill_process_group(self.process)
+
+    async def close(self) -> CommandResult:
+        """Make sure the command has exited and build its result."""
+        if self.process is None:
+            return self.result
+
+        if self._reading:
+            # The caller stopped reading before EOF or was cancelled, the command has no reason to keep running
+            self.stopped = True
+            self._terminate()
+        started = time.perf_counter()
+        try:
+            stderr = await self._drain()
+            # A command that closed its pipes may still be running; the timeout still applies
+            await self.process.wait()
+        finally:
+            self._timeout_handle.cancel()
+            CommandExecutor.forget_process_group(self.process)
+            self.wait_time += time.perf_counter() - started
+            add_span(SPAN_SUBPROCESS, self.wait_time)
+
+        if self.timed_out:
+            stderr = f"Command timed out after {self.timeout} seconds"
+        success = not self.timed_out and (self.stopped or self.process.returncode == 0)
+        self.result = CommandResult(
+            success=success,
+            stdout="",
+            stderr=stderr,
+            return_code=self.process.returncode,
+            command=self.command
+        )
+        if success:
+            logger.info(f"Command executed successfully: {self.command}")
+        else:
+            logger.warning(f"Command failed: {self.command}, return code: {self.process.returncode}")
+        return self.result
+
+
+class CommandStream(_ProcessStream):
+    """
+    Line-by-line view of the stdout of a running command.
+
+    Created by CommandExecutor.stream_command; iterate over it to receive
+    stdout lines as they are produced. When the timeout expires the process
+    is killed and iteration simply stops, so callers keep whatever they have
+    processed so far. The final CommandResult is available as `result` once
+    the stream is closed.
+
+    Only the time spent waiting for output counts towards the subprocess
+    span, so the caller's processing of the lines is not attributed to it.
+    """
+
+    def __init__(
+        self,
+        command: str,
+        timeout: int,
+        process: Optional[asyncio.subprocess.Process] = None,
+        result: Optional[CommandResult] = None
+    ):
+        self.lines_read = 0
+        self.bytes_read = 0
+        self._lines: Deque[bytes] = deque()
+        self._partial = b""
+        self._eof = process is None
+        self._stderr_task = None
+        super().__init__(command, timeout, process, result)
+
+    def _start(self, process: asyncio.subprocess.Process) -> None:
+        # Drain stderr concurrently so a chatty command can not fill the pipe and stall
+        self._stderr_task = asyncio.ensure_future(process.stderr.read())
+
+    @property
+    def _reading(self) -> bool:
+        return not self._eof
+
+    def __aiter__(self) -> "CommandStream":
+        return self
+
+    async def __anext__(self) -> str:
+        while not self._lines:
+            if self._eof:
+                raise StopAsyncIteration
+            started = time.perf_counter()
+            chunk = await self.process.stdout.read(self.CHUNK_SIZE)
+            self.wait_time += time.perf_counter() - started
+            if not chunk:
+                self._eof = True
+                if self._partial:
+                    self._lines.append(self._partial)
+                    self._partial = b""
+                continue
+            self.bytes_read += len(chunk)
+            lines = (self._partial + chunk).split(b"\n")
+            self._partial = lines.pop()
+            self._lines.extend(lines)
+
+        self.lines_read += 1
+        return self._lines.popleft().decode('utf-8', errors='ignore')
+
+    async def _drain(self) -> str:
+        # Drain what is left in the pipe, reading may have been paused on a full buffer
+        while await self.process.stdout.read(self.CHUNK_SIZE):
+            pass
+        return (await self._stderr_task).decode('utf-8', errors='ignore')
+
+
+class OutputStream(_ProcessStream):
+    """
+    Chunks of the stdout and stderr of a running command, as they are produced.
+
+    Created by CommandExecutor.stream_output; iterate over it to receive
+    (stream, text) tuples, stream being "stdout" or "stderr". Both pipes are
+    read into a small bounded queue: a consumer that falls behind stops the
+    reading, and the command then blocks on its full pipe instead of its
+    output piling up in memory. The process is killed when the timeout
+    expires or the block is left early, and the final CommandResult is
+    available as `result` once the stream is closed.
+    """
+
+    QUEUE_SIZE = 8
+
+    def __init__(
+        self,
+        command: str,
+        timeout: int,
+        process: Optional[asyncio.subprocess.Process] = None,
+        result: Optional[CommandResult] = None
+    ):
+        self.bytes_read = {"stdout": 0, "stderr": 0}
+        self._queue: asyncio.Queue = asyncio.Queue(self.QUEUE_SIZE)
+        self._open_pipes = 0
+        self._readers: List[asyncio.Future] = []
+        super().__init__(command, timeout, process, result)
+
+    def _start(self, process: asyncio.subprocess.Process) -> None:
+        self._open_pipes = 2
+        self._readers = [
+            asyncio.ensure_future(self._read("stdout", process.stdout)),
+            asyncio.ensure_future(self._read("stderr", process.stderr))
+        ]
+
+    @property
+    def _reading(self) -> bool:
+        return bool(self._open_pipes)
+
+    def __aiter__(self) -> "OutputStream":
+        return self
+
+    async def __anext__(self) -> Tuple[str, str]:
+        while self._open_pipes:
+            started = time.perf_counter()
+            name, text = await self._queue.get()
+            self.wait_time += time.perf_counter() - started
+            if text is None:
+                self._open_pipes -= 1
+                continue
+            return name, text
+        raise StopAsyncIteration
+
+    async def _read(self, name: str, pipe: asyncio.StreamReader) -> None:
+        # Multi-byte characters may be split over reads
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        while True:
+            chunk = await pipe.read(self.CHUNK_SIZE)
+            if not chunk:
+                break
+            self.bytes_read[name] += len(chunk)
+            text = decoder.decode(chunk)
+            if text:
+                await self._queue.put((name, text))
+        text = decoder.decode(b"", final=True)
+        if text:
+            await self._queue.put((name, text))
+        await self._queue.put((name, None))
+
+    async def _drain(self) -> str:
+        for reader in self._readers:
+            reader.cancel()
+        await asyncio.gather(*self._readers, return_exceptions=True)
+        # Drain what is left in the pipes, reading may have been paused on a full queue
+        for pipe in (self.process.stdout, self.process.stderr):
+            while await pipe.read(self.CHUNK_SIZE):
+                pass
+        # The caller has received stderr already
+        return ""
+
+
 class CommandExecutor:
     """Safe command executor with validation and error handling."""
     
@@ -40,6 +300,83 @@ class CommandExecutor:
         base_cmd = cmd_parts[0].lower()
         return base_cmd in cls.DANGEROUS_COMMANDS
     
+    # Process groups of commands that are still running
+    _process_groups: Set[int] = set()
+    
+    @classmethod
+    async def _spawn(
+        cls,
+        command: str,
+        cwd: Optional[str] = None
+    ) -> asyncio.subprocess.Process:
+        """
+        Start a command with piped stdout and stderr.
+        
+        Every command gets its own process group, so the command and everything
+        it starts (e.g. all members of a pipeline) can be killed at once.
+        """
+        # Check if command contains shell features that require shell=True
+        shell_features = ['|', '&&', '||', ';', '>', '<', '>>', '<<', '&', '(', ')', '$', '`']
+        use_shell = any(feature in command for feature in shell_features)
+        
+        if use_shell:
+            # Use shell=True for commands with pipes, redirects, etc.
+            process = await asyncio.create_subprocess_shell(
+                command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd,
+                start_new_session=True
+            )
+        else:
+            # Use subprocess_exec for simple commands (more secure)
+            process = await asyncio.create_subprocess_exec(
+                *command.split(),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=cwd,
+                start_new_session=True
+            )
+        
+        cls.track_process_group(process)
+        return process
+    
+    @classmethod
+    def kill_process_group(cls, process: asyncio.subprocess.Process) -> None:
+        """Kill a command and everything it started right away."""
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+    
+    @classmethod
+    async def reap(cls, process: asyncio.subprocess.Process) -> None:
+        """Collect a killed command, draining its pipes so the wait can complete."""
+        try:
+            await asyncio.wait_for(process.communicate(), timeout=5)
+        except (asyncio.TimeoutError, asyncio.CancelledError, OSError):
+            pass
+    
+    @classmethod
+    def track_process_group(cls, process: asyncio.subprocess.Process) -> None:
+        """Track the process group of a command started in its own session, so kill_all kills it."""
+        cls._process_groups.add(process.pid)
+    
+    @classmethod
+    def forget_process_group(cls, process: asyncio.subprocess.Process) -> None:
+        """Stop tracking the process group of a command that has finished."""
+        cls._process_groups.discard(process.pid)
+    
+    @classmethod
+    def kill_all(cls) -> None:
+        """Kill every command that is still running, e.g. when the server exits."""
+        for pgid in list(cls._process_groups):
+            try:
+                os.killpg(pgid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+        cls._process_groups.clear()
+    
     @classmethod
     async def execute_command(
         cls, 
@@ -70,31 +407,22 @@ class CommandExecutor:
             )
         
         try:
-            # Check if command contains shell features that require shell=True
-            shell_features = ['|', '&&', '||', ';', '>', '<', '>>', '<<', '&', '(', ')', '$', '`']
-            use_shell = any(feature in command for feature in shell_features)
-            
-            if use_shell:
-                # Use shell=True for commands with pipes, redirects, etc.
-                process = await asyncio.create_subprocess_shell(
-                    command,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                    cwd=cwd
-                )
-            else:
-                # Use subprocess_exec for simple commands (more secure)
-                process = await asyncio.create_subprocess_exec(
-                    *command.split(),
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                    cwd=cwd
-                )
-            
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=timeout
-            )
+            with span(SPAN_SUBPROCESS):
+                process = await cls._spawn(command, cwd)
+                
+                try:
+                    stdout, stderr = await asyncio.wait_for(
+                        process.communicate(),
+                        timeout=timeout
+                    )
+                except BaseException:
+                    # Timed out, or the tool call was cancelled because the client cancelled
+                    # the request or went away: stop the command and everything it started
+                    cls.kill_process_group(process)
+                    await cls.reap(process)
+                    raise
+                finally:
+                    cls.forget_process_group(process)
             
             result = CommandResult(
                 success=process.returncode == 0,
@@ -130,6 +458,110 @@ class CommandExecutor:
                 command=command
             )
     
+    @classmethod
+    @asynccontextmanager
+    async def stream_command(
+        cls,
+        command: str,
+        timeout: int = 30,
+        cwd: Optional[str] = None
+    ) -> AsyncIterator[CommandStream]:
+        """
+        Execute a command and stream its stdout line by line.
+
+        Use as an async context manager; the command is stopped when the block
+        is left before it finished, and `stream.result` holds the CommandResult
+        afterwards (its stdout is empty as the output has been streamed).
+
+        Args:
+            command: The command to execute
+            timeout: Timeout in seconds for the whole command
+            cwd: Working directory for the command
+
+        Yields:
+            CommandStream to iterate over
+        """
+        logger.info(f"Streaming command: {command}")
+
+        if cls.is_dangerous_command(command):
+            stream = CommandStream(command, timeout, result=CommandResult(
+                success=False,
+                stdout="",
+                stderr=f"Command '{command}' is blocked for security reasons",
+                return_code=1,
+                command=command
+            ))
+        else:
+            try:
+                process = await cls._spawn(command, cwd)
+                stream = CommandStream(command, timeout, process=process)
+            except Exception as e:
+                logger.error(f"Error executing command '{command}': {str(e)}")
+                stream = CommandStream(command, timeout, result=CommandResult(
+                    success=False,
+                    stdout="",
+                    stderr=f"Error executing command: {str(e)}",
+                    return_code=-1,
+                    command=command
+                ))
+
+        try:
+            yield stream
+        finally:
+            await stream.close()
+
+    @classmethod
+    @asynccontextmanager
+    async def stream_output(
+        cls,
+        command: str,
+        timeout: int = 30,
+        cwd: Optional[str] = None
+    ) -> AsyncIterator[OutputStream]:
+        """
+        Execute a command and stream its stdout and stderr in chunks as they arrive.
+
+        Use as an async context manager like stream_command; the command is
+        stopped when the block is left before it finished, and `stream.result`
+        holds the CommandResult afterwards (without the streamed output).
+
+        Args:
+            command: The command to execute
+            timeout: Timeout in seconds for the whole command
+            cwd: Working directory for the command
+
+        Yields:
+            OutputStream to iterate over
+        """
+        logger.info(f"Streaming command output: {command}")
+
+        if cls.is_dangerous_command(command):
+            stream = OutputStream(command, timeout, result=CommandResult(
+                success=False,
+                stdout="",
+                stderr=f"Command '{command}' is blocked for security reasons",
+                return_code=1,
+                command=command
+            ))
+        else:
+            try:
+                process = await cls._spawn(command, cwd)
+                stream = OutputStream(command, timeout, process=process)
+            except Exception as e:
+                logger.error(f"Error executing command '{command}': {str(e)}")
+                stream = OutputStream(command, timeout, result=CommandResult(
+                    success=False,
+                    stdout="",
+                    stderr=f"Error executing command: {str(e)}",
+                    return_code=-1,
+                    command=command
+                ))
+
+        try:
+            yield stream
+        finally:
+            await stream.close()
+
     @classmethod
     async def execute_json_command(
         cls, 
@@ -152,7 +584,8 @@ class CommandExecutor:
             return False, result.stderr
         
         try:
-            parsed_json = json.loads(result.stdout)
+            with span(SPAN_PARSE):
+                parsed_json = json.loads(result.stdout)
             return True, parsed_json
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON from command output: {e}")
@@ -170,4 +603,7 @@ class CommandExecutor:
         """Validate an attack name format."""
         if not attack_name or not attack_name.startswith('Block'):
             return False
-        return True 
\ No newline at end of file
+        return True 
+
+# Never leave commands running after the server exits, e.g. when a stdio client went away
+atexit.register(CommandExecutor.kill_all)
@@ -0,0 +1,273 @@
+"""
+Ranged file reading utilities for the Hypernode MCP Server.
+Reads byte ranges, the last lines or a range of lines of a file without
+reading the whole file, so large incident dumps can be inspected cheaply.
+"""
+
+import bisect
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+# Files at least this large are memory mapped, so only the pages that are
+# actually looked at are read from disk
+MMAP_THRESHOLD = 1024 * 1024
+
+BLOCK_SIZE = 64 * 1024
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+@dataclass
+class FileRange:
+    """A piece of a file."""
+    content: str
+    offset: int
+    length: int
+    # None while the size of a compressed file is not known yet
+    size: Optional[int]
+    first_line: Optional[int] = None
+    line_count: Optional[int] = None
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.length
+
+    @property
+    def eof(self) -> bool:
+        return self.size is not None and self.end >= self.size
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the range as a dict."""
+        result = {
+            "content": self.content,
+            "offset": self.offset,
+            "length": self.length,
+            "size": self.size,
+            "next_offset": None if self.eof else self.end,
+            "eof": self.eof
+        }
+        if self.first_line is not None:
+            result["first_line"] = self.first_line
+            result["line_count"] = self.line_count
+        return result
+
+
+@contextmanager
+def open_buffer(path: str) -> Iterator[Tuple[Buffer, int]]:
+    """
+    Open a file as a sliceable buffer.
+
+    Large files are memory mapped; small files are simply read, which is
+    cheaper than setting up a mapping.
+
+    Yields:
+        Tuple of (buffer, size)
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            yield f.read(), size
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm, size
+
+
+def _decode(data: bytes) -> str:
+    return data.decode('utf-8', errors='ignore')
+
+
+def read_range(path: str, offset: int = 0, length: int = BLOCK_SIZE) -> FileRange:
+    """
+    Read a byte range of a file.
+
+    A negative offset counts from the end of the file.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if offset < 0:
+            offset = max(size + offset, 0)
+        offset = min(offset, size)
+        f.seek(offset)
+        data = f.read(max(length, 0))
+    return FileRange(content=_decode(data), offset=offset, length=len(data), size=size)
+
+
+def fair_shares(sizes: List[int], budget: int) -> List[int]:
+    """
+    Divide a byte budget over files of the given sizes (max-min fairness).
+
+    Every file gets an equal share, and what small files do not need is
+    divided over the larger ones, so small files are returned whole and no
+    single large file can take the whole budget.
+
+    Returns:
+        Number of bytes to read per file, in the order of sizes
+    """
+    shares = [0] * len(sizes)
+    remaining = max(budget, 0)
+    order = sorted(range(len(sizes)), key=lambda i: sizes[i])
+    for position, i in enumerate(order):
+        share = min(sizes[i], remaining // (len(order) - position))
+        shares[i] = share
+        remaining -= share
+    return shares
+
+
+def tail_lines(path: str, count: int = 100) -> FileRange:
+    """
+    Read the last lines of a file by reading blocks backwards from the end.
+
+    Only the blocks holding the requested lines are read, however large the file is.
+    """
+    with open_buffer(path) as (buffer, size):
+        end = size
+        # A trailing newline ends the last line, it does not start a new one
+        if end > 0 and buffer[end - 1:end] == b"\n":
+            end -= 1
+
+        start = end
+        newlines = 0
+        while start > 0 and newlines < count:
+            block_start = max(start - BLOCK_SIZE, 0)
+            block = buffer[block_start:start]
+            position = len(block)
+            while newlines < count:
+                position = block.rfind(b"\n", 0, position)
+                if position < 0:
+                    break
+                newlines += 1
+            start = block_start + position + 1 if newlines >= count else block_start
+
+        data = buffer[start:size] if count > 0 else b""
+    lines = data.count(b"\n") + (1 if data and not data.endswith(b"\n") else 0)
+    return FileRange(content=_decode(data), offset=start, length=len(data), size=size, line_count=lines)
+
+
+def _advance(buffer: Buffer, size: int, position: int, lines: int) -> int:
+    """Return the offset lines lines after position, or size if the file ends first."""
+    for _ in range(lines):
+        newline = buffer.find(b"\n", position, size)
+        if newline < 0:
+            return size
+        position = newline + 1
+    return position
+
+
+class LineIndex:
+    """
+    Sparse index of line start offsets of a file.
+
+    Remembers the line number and offset of the first line starting after
+    every block of the file, so building the index costs a count and a
+    search per block and seeking to a line scans at most one block. When
+    the file grows the index is extended from where it left off.
+    """
+
+    def __init__(self, block_size: int = BLOCK_SIZE):
+        self.block_size = block_size
+        self.line_numbers: List[int] = [0]
+        self.offsets: List[int] = [0]
+        self._lock = threading.Lock()
+
+    @property
+    def indexed_size(self) -> int:
+        return self.offsets[-1]
+
+    @property
+    def indexed_lines(self) -> int:
+        return self.line_numbers[-1]
+
+    def locate(self, buffer: Buffer, size: int, start_line: int, count: int) -> Tuple[int, int, int]:
+        """
+        Find the byte range of count lines starting at a (0-based) line.
+
+        Returns:
+            Tuple of (start_line, start_offset, end_offset); a negative
+            start_line is resolved relative to the number of lines
+        """
+        with self._lock:
+            self._extend(buffer, size)
+            if start_line < 0:
+                total_lines = self.indexed_lines + (1 if self.indexed_size < size else 0)
+                start_line = max(total_lines + start_line, 0)
+            start = self._seek(buffer, size, start_line)
+            end = self._seek(buffer, size, start_line + max(count, 0))
+        return start_line, start, end
+
+    def _extend(self, buffer: Buffer, size: int) -> None:
+        position = self.indexed_size
+        lines = self.indexed_lines
+        while position < size:
+            end = min(position + self.block_size, size)
+            block = buffer[position:end]
+            last = block.rfind(b"\n")
+            if last >= 0:
+                lines += block.count(b"\n")
+                position += last + 1
+            else:
+                # No line ends in this block: a line longer than a block, or the incomplete last line
+                newline = buffer.find(b"\n", end, size)
+                if newline < 0:
+                    break
+                lines += 1
+                position = newline + 1
+            self.line_numbers.append(lines)
+            self.offsets.append(position)
+
+    def _seek(self, buffer: Buffer, size: int, line: int) -> int:
+        checkpoint = bisect.bisect_right(self.line_numbers, line) - 1
+        return _advance(buffer, size, self.offsets[checkpoint], line - self.line_numbers[checkpoint])
+
+
+class LineIndexCache:
+    """Line indexes of recently read files, keyed by path and validated by inode and size."""
+
+    def __init__(self, max_files: int = 64):
+        self.max_files = max_files
+        self._indexes: "OrderedDict[str, Tuple[Tuple[int, int], LineIndex]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str, st: os.stat_result) -> LineIndex:
+        """Return the index of a file, reusing it if the file was only appended to."""
+        identity = (st.st_dev, st.st_ino)
+        with self._lock:
+            cached = self._indexes.get(path)
+            if cached is not None and cached[0] == identity and cached[1].indexed_size <= st.st_size:
+                self._indexes.move_to_end(path)
+                return cached[1]
+            index = LineIndex()
+            self._indexes[path] = (identity, index)
+            while len(self._indexes) > self.max_files:
+                self._indexes.popitem(last=False)
+            return index
+
+
+line_index_cache = LineIndexCache()
+
+
+def read_lines(path: str, start_line: int = 0, count: int = 100) -> FileRange:
+    """
+    Read a range of lines of a file.
+
+    The first read of a file builds a sparse line index, later reads seek
+    straight to the nearest indexed line. A negative start_line counts from
+    the end of the file.
+    """
+    index = line_index_cache.get(path, os.stat(path))
+    with open_buffer(path) as (buffer, size):
+        start_line, start, end = index.locate(buffer, size, start_line, count)
+        data = buffer[start:end]
+    lines = data.count(b"\n") + (1 if data and not data.endswith(b"\n") else 0)
+    return FileRange(
+        content=_decode(data),
+        offset=start,
+        length=len(data),
+        size=size,
+        first_line=start_line,
+        line_count=lines
+    )
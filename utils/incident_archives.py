@@ -0,0 +1,385 @@
+"""
+Compressed incident utilities for the Hypernode MCP Server.
+Reads gzip, xz and bzip2 compressed incident files and the members of
+archived (tarred) incidents by streaming them through the decompressor,
+without unpacking anything to disk.
+"""
+
+import bz2
+import fnmatch
+import gzip
+import lzma
+import os
+import stat
+import tarfile
+import threading
+import zlib
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, BinaryIO, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from utils.file_ranges import BLOCK_SIZE, FileRange
+
+ARCHIVE_SUFFIXES = (".tar.gz", ".tgz", ".tar.xz", ".txz", ".tar.bz2", ".tbz2", ".tar")
+COMPRESSED_SUFFIXES = (".gz", ".xz", ".bz2")
+
+_OPENERS: Tuple[Tuple[Tuple[str, ...], Callable[..., BinaryIO]], ...] = (
+    ((".gz", ".tgz"), gzip.open),
+    ((".xz", ".txz"), lzma.open),
+    ((".bz2", ".tbz2"), bz2.open),
+)
+
+# Errors the decompressors and tarfile raise for corrupt or truncated data
+_DATA_ERRORS = (tarfile.TarError, EOFError, lzma.LZMAError, zlib.error)
+
+
+def is_archive(name: str) -> bool:
+    """Whether a file name is that of a tar archive, compressed or not."""
+    return name.endswith(ARCHIVE_SUFFIXES)
+
+
+def is_compressed(name: str) -> bool:
+    """Whether a file name is that of a single compressed file."""
+    return name.endswith(COMPRESSED_SUFFIXES) and not is_archive(name)
+
+
+def open_decompressed(path: str) -> BinaryIO:
+    for suffixes, opener in _OPENERS:
+        if path.endswith(suffixes):
+            return opener(path, 'rb')
+    return open(path, 'rb')
+
+
+def _key(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def _decode(data: bytes) -> str:
+    return data.decode('utf-8', errors='ignore')
+
+
+@contextmanager
+def _data_errors(path: str) -> Iterator[None]:
+    """Report corrupt compressed data as an OSError, like any other unreadable file."""
+    try:
+        yield
+    except _DATA_ERRORS as e:
+        raise OSError(f"Can not decompress {path}: {e}") from e
+
+
+@dataclass(frozen=True)
+class ArchiveMember:
+    """A regular file within an archive."""
+    name: str
+    size: int
+    mtime: float
+    mode: int
+    # Offset of the file's data in the decompressed archive
+    offset: int
+
+    is_directory = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the member as a dict, like FileEntry.to_dict()."""
+        return {
+            "name": self.name,
+            "permissions": stat.filemode(self.mode),
+            "size": self.size,
+            "mtime": self.mtime,
+            "date": datetime.fromtimestamp(self.mtime).astimezone().isoformat(timespec='seconds'),
+            "is_directory": False
+        }
+
+
+class IncidentArchives:
+    """
+    Streaming reads of compressed incident files and archived incidents.
+
+    Nothing is unpacked: reads seek the decompressed stream to the requested
+    offset and decompress no further than the requested bytes. Compressed
+    streams can only seek by decompressing, so streams are kept open after
+    a read and reused by a read starting at or after where they stopped;
+    paging through a file with next_offset decompresses it only once.
+
+    Archive member listings are read from the tar headers once and cached
+    until the archive changes. The decompressed size of a compressed file
+    is not stored in the file, so it is reported once a read reached the
+    end of the file and None until then.
+    """
+
+    def __init__(self, max_archives: int = 64, max_streams: int = 8):
+        self.max_archives = max_archives
+        self.max_streams = max_streams
+        self.streams_opened = 0
+        self.streams_reused = 0
+        self._members: "OrderedDict[str, Tuple[Tuple[int, int], List[ArchiveMember]]]" = OrderedDict()
+        self._sizes: "OrderedDict[str, Tuple[Tuple[int, int], int]]" = OrderedDict()
+        self._streams: Deque[Tuple[str, Tuple[int, int], BinaryIO]] = deque()
+        self._lock = threading.Lock()
+
+    def list_members(self, path: str, pattern: str = "*") -> List[ArchiveMember]:
+        """
+        List the regular files in an archive whose names match a glob pattern.
+
+        When all files are in a single top-level directory, as when the
+        incident directory itself was archived, names are relative to it.
+
+        Raises:
+            OSError: If the archive can not be read
+        """
+        key = _key(path)
+        with self._lock:
+            cached = self._members.get(path)
+        if cached is None or cached[0] != key:
+            with _data_errors(path), self._stream(path, 0) as stream:
+                members = self._scan(stream)
+            with self._lock:
+                self._members[path] = (key, members)
+                self._members.move_to_end(path)
+                while len(self._members) > self.max_archives:
+                    self._members.popitem(last=False)
+        else:
+            members = cached[1]
+        return [member for member in members if fnmatch.fnmatchcase(member.name, pattern)]
+
+    def member(self, path: str, name: str) -> ArchiveMember:
+        """
+        Return a file within an archive.
+
+        Raises:
+            FileNotFoundError: If the archive holds no such file
+        """
+        name = os.path.normpath(name).lstrip("/")
+        for member in self.list_members(path):
+            if member.name == name:
+                return member
+        raise FileNotFoundError(f"No such file in {path}: {name}")
+
+    def read_range(self, path: str, offset: int = 0, length: int = BLOCK_SIZE,
+                   member: Optional[ArchiveMember] = None) -> FileRange:
+        """
+        Read a byte range of a compressed file or an archive member.
+
+        A negative offset counts from the end, which for a compressed file of
+        unknown size means decompressing it to the end once.
+        """
+        start, size = self._bounds(path, member)
+        length = max(length, 0)
+        if offset < 0:
+            if size is None:
+                size = self.decompressed_size(path)
+            offset = max(size + offset, 0)
+        if size is not None:
+            offset = min(offset, size)
+            length = min(length, size - offset)
+
+        with _data_errors(path), self._stream(path, start + offset) as stream:
+            # Compressed streams stop seeking at their end
+            offset = stream.tell() - start
+            data = stream.read(length)
+            # Peeking tells whether the end of a file of unknown size was reached, without moving past the range
+            if size is None and not stream.peek(1):
+                size = offset + len(data)
+                self._remember_size(path, size)
+        return FileRange(content=_decode(data), offset=offset, length=len(data), size=size)
+
+    def read_lines(self, path: str, start_line: int = 0, count: int = 100,
+                   member: Optional[ArchiveMember] = None) -> FileRange:
+        """
+        Read a range of lines of a compressed file or an archive member.
+
+        The file is decompressed up to the last requested line. A negative
+        start_line counts from the end, which means decompressing the whole file.
+        """
+        if start_line < 0:
+            return self._last_lines(path, -start_line, count, member)
+
+        start, size = self._bounds(path, member)
+        offset = 0
+        chunks: List[bytes] = []
+        with _data_errors(path), self._stream(path, start) as stream:
+            if count > 0:
+                for line_number, line in enumerate(self._lines(stream, size)):
+                    if line_number < start_line:
+                        offset += len(line)
+                        continue
+                    chunks.append(line)
+                    if len(chunks) >= count:
+                        break
+            if size is None and not stream.peek(1):
+                size = stream.tell()
+                self._remember_size(path, size)
+        if not chunks and size is not None:
+            offset = min(offset, size)
+
+        data = b"".join(chunks)
+        return FileRange(
+            content=_decode(data),
+            offset=offset,
+            length=len(data),
+            size=size,
+            first_line=start_line,
+            line_count=len(chunks)
+        )
+
+    def tail_lines(self, path: str, count: int = 100, member: Optional[ArchiveMember] = None) -> FileRange:
+        """
+        Read the last lines of a compressed file or an archive member.
+
+        Compressed data can not be read backwards, so the file is decompressed
+        to the end, keeping only the last lines in memory.
+        """
+        return self._last_lines(path, count, count, member)
+
+    def decompressed_size(self, path: str) -> int:
+        """Return the decompressed size of a compressed file, decompressing it if it is not known yet."""
+        key = _key(path)
+        with self._lock:
+            cached = self._sizes.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        with _data_errors(path), self._stream(path, 0) as stream:
+            while stream.read(BLOCK_SIZE * 16):
+                pass
+            size = stream.tell()
+        self._remember_size(path, size)
+        return size
+
+    def close(self) -> None:
+        """Close the streams kept open for reuse."""
+        with self._lock:
+            streams = list(self._streams)
+            self._streams.clear()
+        for _, _, stream in streams:
+            stream.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics."""
+        with self._lock:
+            return {
+                "cached_archives": len(self._members),
+                "open_streams": len(self._streams),
+                "streams_opened": self.streams_opened,
+                "streams_reused": self.streams_reused
+            }
+
+    def _last_lines(self, path: str, from_end: int, count: int, member: Optional[ArchiveMember]) -> FileRange:
+        start, size = self._bounds(path, member)
+        last: Deque[Tuple[int, bytes]] = deque(maxlen=max(from_end, 0))
+        position = line_number = 0
+        with _data_errors(path), self._stream(path, start) as stream:
+            for line_number, line in enumerate(self._lines(stream, size), 1):
+                if last.maxlen:
+                    last.append((position, line))
+                position += len(line)
+        if size is None:
+            size = position
+            self._remember_size(path, size)
+
+        selected = list(last)[:max(count, 0)]
+        data = b"".join(line for _, line in selected)
+        return FileRange(
+            content=_decode(data),
+            offset=selected[0][0] if selected else size,
+            length=len(data),
+            size=size,
+            first_line=line_number - len(last),
+            line_count=len(selected)
+        )
+
+    def _bounds(self, path: str, member: Optional[ArchiveMember]) -> Tuple[int, Optional[int]]:
+        """Return where the data starts in the decompressed stream and its size, if known."""
+        if member is not None:
+            return member.offset, member.size
+        with self._lock:
+            cached = self._sizes.get(path)
+        return 0, cached[1] if cached is not None and cached[0] == _key(path) else None
+
+    def _remember_size(self, path: str, size: int) -> None:
+        key = _key(path)
+        with self._lock:
+            self._sizes[path] = (key, size)
+            self._sizes.move_to_end(path)
+            while len(self._sizes) > self.max_archives:
+                self._sizes.popitem(last=False)
+
+    @staticmethod
+    def _lines(stream: BinaryIO, limit: Optional[int]) -> Iterator[bytes]:
+        """Yield the lines of a stream, stopping after limit bytes."""
+        remaining = limit
+        for line in stream:
+            if remaining is not None:
+                if remaining <= 0:
+                    return
+                line = line[:remaining]
+                remaining -= len(line)
+            yield line
+
+    @staticmethod
+    def _scan(stream: BinaryIO) -> List[ArchiveMember]:
+        members = []
+        with tarfile.open(fileobj=stream, mode='r:') as tar:
+            for info in tar:
+                if info.isfile():
+                    name = os.path.normpath(info.name).lstrip("/")
+                    members.append(ArchiveMember(
+                        name=name,
+                        size=info.size,
+                        mtime=float(info.mtime),
+                        mode=stat.S_IFREG | info.mode,
+                        offset=info.offset_data
+                    ))
+        # Archives of an incident directory hold everything in that directory
+        tops = {member.name.split("/", 1)[0] for member in members}
+        if len(tops) == 1 and all("/" in member.name for member in members):
+            prefix = len(tops.pop()) + 1
+            members = [
+                ArchiveMember(member.name[prefix:], member.size, member.mtime, member.mode, member.offset)
+                for member in members
+            ]
+        return members
+
+    @contextmanager
+    def _stream(self, path: str, position: int) -> Iterator[BinaryIO]:
+        """
+        Yield the decompressed stream of a file positioned at an offset.
+
+        Reuses a kept open stream of the same file that stopped at or before
+        the offset, so seeking only decompresses the bytes in between.
+        """
+        key = _key(path)
+        stream = None
+        with self._lock:
+            candidates = [
+                entry for entry in self._streams
+                if entry[0] == path and entry[1] == key and entry[2].tell() <= position
+            ]
+            if candidates:
+                entry = max(candidates, key=lambda entry: entry[2].tell())
+                self._streams.remove(entry)
+                stream = entry[2]
+                self.streams_reused += 1
+            else:
+                self.streams_opened += 1
+        if stream is None:
+            stream = open_decompressed(path)
+
+        try:
+            stream.seek(position)
+            yield stream
+        except BaseException:
+            stream.close()
+            raise
+
+        with self._lock:
+            self._streams.append((path, key, stream))
+            evicted = self._streams.popleft() if len(self._streams) > self.max_streams else None
+        if evicted is not None:
+            evicted[2].close()
+
+
+# Global incident archives instance
+incident_archives = IncidentArchives()
@@ -0,0 +1,304 @@
+"""
+Full-text index of the incident files for the Hypernode MCP Server.
+Keeps an on-disk SQLite FTS5 index of every line of every incident file,
+updated incrementally, so the whole incident history can be searched
+without grepping through it.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from utils.incident_store import FileEntry, IncidentStore, incident_store
+
+logger = logging.getLogger(__name__)
+
+# Files larger than this are not indexed
+MAX_INDEX_FILE_SIZE = 256 * 1024 * 1024
+
+# Compressed and binary files can not be indexed as text
+SKIP_EXTENSIONS = (".gz", ".xz", ".bz2", ".zst", ".zip", ".tar", ".tgz", ".sqlite", ".db")
+
+# Rows are identified by (file id << LINE_BITS | line number), so the rows of
+# a file form a single rowid range that can be deleted without a table scan
+LINE_BITS = 32
+
+INSERT_BATCH = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    incident TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS lines USING fts5(
+    text,
+    offset UNINDEXED,
+    tokenize = "unicode61 tokenchars '_'",
+    prefix = '2 3 4'
+);
+"""
+
+_TOKEN = re.compile(r'"([^"]*)"|(\S+)')
+_WORD = re.compile(r"[\w]+", re.UNICODE)
+
+
+@dataclass
+class SearchHit:
+    """A line matching a search query."""
+    incident: str
+    file: str
+    path: str
+    line: int
+    offset: int
+    snippet: str
+    score: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the hit as a dict."""
+        return {
+            "incident": self.incident,
+            "file": self.file,
+            "path": self.path,
+            "line": self.line,
+            "offset": self.offset,
+            "snippet": self.snippet,
+            "score": self.score
+        }
+
+
+def build_match_query(query: str) -> str:
+    """
+    Translate a search query into an FTS5 MATCH expression.
+
+    Supports "quoted phrases" and prefix terms ending in *; all terms and
+    phrases have to match. Anything else FTS5 would interpret as syntax is
+    treated as text.
+
+    Raises:
+        ValueError: If the query contains nothing to search for
+    """
+    parts = []
+    for phrase, term in _TOKEN.findall(query):
+        if phrase:
+            words = _WORD.findall(phrase)
+            if words:
+                parts.append('"' + " ".join(words) + '"')
+            continue
+        words = _WORD.findall(term)
+        parts.extend(f'"{word}"' for word in words)
+        if words and term.endswith("*"):
+            parts[-1] += "*"
+    if not parts:
+        raise ValueError(f"Nothing to search for in query: {query!r}")
+    return " ".join(parts)
+
+
+class IncidentIndex:
+    """
+    Inverted index of the lines of all incident files.
+
+    update() walks the incident directories through the incident store's
+    cached listings and only reindexes files whose size or mtime changed;
+    files that disappeared are dropped from the index.
+    """
+
+    def __init__(self, path: Optional[str] = None, store: Optional[IncidentStore] = None):
+        self._path = path
+        self.store = store or incident_store
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> str:
+        """Location of the index database."""
+        return os.path.expanduser(self._path or os.environ.get(
+            "MCP_INCIDENT_INDEX_PATH", "~/.cache/hypernode-mcp/incident-index.sqlite"
+        ))
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def close(self) -> None:
+        """Close the index database."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def update(self) -> Dict[str, Any]:
+        """
+        Bring the index up to date with the incident files.
+
+        Returns:
+            Dict with the number of files indexed, removed and unchanged
+        """
+        started = time.perf_counter()
+        with self._lock:
+            connection = self._connect()
+            known = {
+                path: (file_id, size, mtime_ns)
+                for file_id, path, size, mtime_ns in connection.execute("SELECT id, path, size, mtime_ns FROM files")
+            }
+            indexed = unchanged = 0
+            seen = set()
+
+            for incident, path, size, mtime_ns in self._walk():
+                seen.add(path)
+                current = known.get(path)
+                if current is not None and current[1:] == (size, mtime_ns):
+                    unchanged += 1
+                    continue
+                with connection:
+                    if current is not None:
+                        self._delete(connection, current[0])
+                    self._index_file(connection, incident, path, size, mtime_ns)
+                indexed += 1
+
+            removed = [file_id for path, (file_id, _, _) in known.items() if path not in seen]
+            with connection:
+                for file_id in removed:
+                    self._delete(connection, file_id)
+
+        return {
+            "files_indexed": indexed,
+            "files_removed": len(removed),
+            "files_unchanged": unchanged,
+            "seconds": time.perf_counter() - started
+        }
+
+    def search(self, query: str, limit: int = 20, incident: Optional[str] = None) -> List[SearchHit]:
+        """
+        Search the index.
+
+        Args:
+            query: Terms, "quoted phrases" and prefix* terms that all have to match
+            limit: Maximum number of hits
+            incident: Only search the incidents whose name starts with this
+
+        Returns:
+            Hits ordered by relevance (BM25), most relevant first
+
+        Raises:
+            ValueError: If the query contains nothing to search for
+        """
+        match = build_match_query(query)
+        sql = (
+            "SELECT files.incident, files.name, files.path, lines.rowid, lines.offset, "
+            "snippet(lines, 0, '[', ']', '...', 16), bm25(lines) "
+            "FROM lines JOIN files ON files.id = (lines.rowid >> ?) "
+            "WHERE lines MATCH ?"
+        )
+        params: List[Any] = [LINE_BITS, match]
+        if incident:
+            sql += " AND files.incident LIKE ? ESCAPE '\\'"
+            params.append(incident.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        sql += " ORDER BY bm25(lines) LIMIT ?"
+        params.append(max(limit, 0))
+
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+        return [
+            SearchHit(
+                incident=incident_name,
+                file=name,
+                path=path,
+                line=rowid & ((1 << LINE_BITS) - 1),
+                offset=offset,
+                snippet=snippet,
+                # bm25() is more negative for better matches
+                score=-score
+            )
+            for incident_name, name, path, rowid, offset, snippet, score in rows
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the size of the index."""
+        with self._lock:
+            connection = self._connect()
+            files, = connection.execute("SELECT COUNT(*) FROM files").fetchone()
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return {"path": self.path, "files": files, "size": size}
+
+    def _walk(self) -> Iterator[Tuple[str, str, int, int]]:
+        """Yield (incident, path, size, mtime_ns) for every indexable file."""
+        try:
+            incidents = self.store.list_incidents()
+        except FileNotFoundError:
+            return
+        pending: List[Tuple[str, FileEntry]] = [(entry.name, entry) for entry in incidents]
+        while pending:
+            incident, entry = pending.pop()
+            if entry.name.startswith("."):
+                continue
+            if entry.is_directory:
+                try:
+                    pending.extend((incident, child) for child in self.store.list_dir(entry.path))
+                except OSError as e:
+                    logger.warning(f"Can not index {entry.path}: {e}")
+                continue
+            if entry.name.endswith(SKIP_EXTENSIONS):
+                continue
+            # Listings are cached per directory, so stat the file itself to notice files that were appended to
+            try:
+                st = os.stat(entry.path)
+            except FileNotFoundError:
+                continue
+            if st.st_size <= MAX_INDEX_FILE_SIZE:
+                yield incident, entry.path, st.st_size, st.st_mtime_ns
+
+    def _index_file(self, connection: sqlite3.Connection, incident: str, path: str, size: int, mtime_ns: int) -> None:
+        incident_path = os.path.join(self.store.root, incident)
+        # Name relative to the incident, as read_incident_file expects it
+        name = os.path.basename(path) if path == incident_path else os.path.relpath(path, incident_path)
+        cursor = connection.execute(
+            "INSERT INTO files (path, incident, name, size, mtime_ns) VALUES (?, ?, ?, ?, ?)",
+            (path, incident, name, size, mtime_ns)
+        )
+        base = cursor.lastrowid << LINE_BITS
+        try:
+            with open(path, 'rb') as f:
+                if b"\0" in f.read(8192):
+                    # Binary file
+                    return
+                f.seek(0)
+                batch = []
+                offset = 0
+                for line_number, line in enumerate(f):
+                    text = line.decode('utf-8', errors='ignore').strip()
+                    if text:
+                        batch.append((base | line_number, text, offset))
+                    offset += len(line)
+                    if len(batch) >= INSERT_BATCH:
+                        connection.executemany("INSERT INTO lines (rowid, text, offset) VALUES (?, ?, ?)", batch)
+                        batch = []
+                connection.executemany("INSERT INTO lines (rowid, text, offset) VALUES (?, ?, ?)", batch)
+        except OSError as e:
+            logger.warning(f"Can not index {path}: {e}")
+
+    @staticmethod
+    def _delete(connection: sqlite3.Connection, file_id: int) -> None:
+        connection.execute(
+            "DELETE FROM lines WHERE rowid BETWEEN ? AND ?",
+            (file_id << LINE_BITS, ((file_id + 1) << LINE_BITS) - 1)
+        )
+        connection.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+
+# Global incident index instance
+incident_index = IncidentIndex()
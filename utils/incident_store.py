@@ -0,0 +1,269 @@
+"""
+Incident storage utilities for the Hypernode MCP Server.
+Lists the incident directories under ~/incidents in-process, without
+spawning ls, and caches directory metadata between calls.
+"""
+
+import asyncio
+import fnmatch
+import functools
+import logging
+import os
+import stat
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from utils.incident_archives import ARCHIVE_SUFFIXES
+from utils.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+SORT_KEYS = ("name", "mtime", "size")
+
+# Directory mtimes have a limited resolution; a listing taken less than this many
+# seconds after the directory changed could miss a change within the same tick
+RACY_WINDOW = 2.0
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    """Metadata of a single directory entry."""
+    name: str
+    path: str
+    size: int
+    mtime: float
+    mode: int
+
+    @property
+    def is_directory(self) -> bool:
+        return stat.S_ISDIR(self.mode)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the entry as a dict."""
+        return {
+            "name": self.name,
+            "permissions": stat.filemode(self.mode),
+            "size": self.size,
+            "mtime": self.mtime,
+            "date": datetime.fromtimestamp(self.mtime).astimezone().isoformat(timespec='seconds'),
+            "is_directory": self.is_directory
+        }
+
+
+class IncidentStore:
+    """
+    In-process access to the incident directories.
+
+    Directory listings are cached keyed by the directory's own mtime, which
+    changes whenever an entry is added, removed or renamed, so a repeated
+    listing of an unchanged directory does not read the directory again.
+    The entries are stat'ed again on every listing, as an entry modified in
+    place (e.g. a file that is appended to) leaves the directory unchanged.
+
+    Blocking file system work runs through run(), on a thread pool of its
+    own, so incident I/O neither blocks the event loop nor takes over the
+    default executor other tools use.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_directories: int = 256, io_workers: int = 8):
+        self._root = root
+        self.max_directories = max_directories
+        self.io_workers = io_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[str, Tuple[Tuple[int, int, int], List[FileEntry]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def root(self) -> str:
+        """The directory holding the incidents."""
+        return os.path.expanduser(self._root or os.environ.get("HYPERNODE_INCIDENTS_DIR", "~/incidents"))
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run blocking file system work on the incident I/O thread pool."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="incident-io")
+        return await asyncio.get_running_loop().run_in_executor(self._pool, functools.partial(func, *args))
+
+    def incident_path(self, name: str) -> str:
+        """
+        Return the path of an incident directory.
+
+        Raises:
+            ValueError: If the name would point outside of the incidents directory
+        """
+        if not name or name in (".", "..") or "/" in name or "\0" in name:
+            raise ValueError(f"Invalid incident name: {name!r}")
+        return os.path.join(self.root, name)
+
+    def incident_file_path(self, name: str, file: str) -> str:
+        """
+        Return the path of a file within an incident directory.
+
+        Raises:
+            ValueError: If the file would be outside of the incident directory
+        """
+        incident_path = self.incident_path(name)
+        path = os.path.normpath(os.path.join(incident_path, file))
+        if not file or os.path.isabs(file) or not path.startswith(incident_path + os.sep):
+            raise ValueError(f"Invalid incident file: {file!r}")
+        return path
+
+    def incident_archive(self, name: str) -> Optional[str]:
+        """
+        Return the path of an archived incident, e.g. 2024-01-01.tar.gz for 2024-01-01.
+
+        Returns:
+            The path of the archive, or None if the incident is not archived
+
+        Raises:
+            ValueError: If the name would point outside of the incidents directory
+        """
+        names = [name] if name.endswith(ARCHIVE_SUFFIXES) else [name + suffix for suffix in ARCHIVE_SUFFIXES]
+        for candidate in names:
+            path = self.incident_path(candidate)
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def list_dir(self, path: str) -> List[FileEntry]:
+        """
+        List a directory, using the cached listing if the directory did not change.
+
+        Args:
+            path: Directory to list
+
+        Returns:
+            Entries of the directory in no particular order
+
+        Raises:
+            OSError: If the directory can not be read
+        """
+        st = os.stat(path)
+        key = (st.st_dev, st.st_ino, st.st_mtime_ns)
+
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached is not None and cached[0] == key:
+                self._cache.move_to_end(path)
+                self.hits += 1
+                return self._refresh(cached[1])
+            self.misses += 1
+
+        entries = self._scan(path)
+
+        if time.time() - st.st_mtime >= RACY_WINDOW:
+            with self._lock:
+                self._cache[path] = (key, entries)
+                self._cache.move_to_end(path)
+                while len(self._cache) > self.max_directories:
+                    self._cache.popitem(last=False)
+        return entries
+
+    def list_incidents(self) -> List[FileEntry]:
+        """List the incidents, skipping the README the incidents directory ships with."""
+        return [entry for entry in self.list_dir(self.root) if entry.name != "README.txt"]
+
+    def list_incident_files(self, name: str, file_pattern: str = "*") -> List[FileEntry]:
+        """
+        List the files of an incident whose names match a glob pattern.
+
+        Like a shell glob, hidden files only match patterns starting with a dot.
+        """
+        return [
+            entry for entry in self.list_dir(self.incident_path(name))
+            if fnmatch.fnmatchcase(entry.name, file_pattern)
+            and (not entry.name.startswith(".") or file_pattern.startswith("."))
+        ]
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Forget the cached listing of a directory, or of all directories."""
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(path, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics."""
+        with self._lock:
+            return {
+                "cached_directories": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+    @staticmethod
+    def _refresh(entries: List[FileEntry]) -> List[FileEntry]:
+        """Return cached entries with the size and mtime they have now."""
+        refreshed = []
+        for entry in entries:
+            try:
+                st = os.stat(entry.path)
+            except FileNotFoundError:
+                continue
+            if st.st_size == entry.size and st.st_mtime == entry.mtime and st.st_mode == entry.mode:
+                refreshed.append(entry)
+            else:
+                refreshed.append(FileEntry(name=entry.name, path=entry.path, size=st.st_size,
+                                           mtime=st.st_mtime, mode=st.st_mode))
+        return refreshed
+
+    @staticmethod
+    def _scan(path: str) -> List[FileEntry]:
+        entries = []
+        with os.scandir(path) as it:
+            for dir_entry in it:
+                try:
+                    st = dir_entry.stat()
+                except FileNotFoundError:
+                    # Removed between reading the directory and the stat
+                    continue
+                entries.append(FileEntry(
+                    name=dir_entry.name,
+                    path=dir_entry.path,
+                    size=st.st_size,
+                    mtime=st.st_mtime,
+                    mode=st.st_mode
+                ))
+        return entries
+
+
+def sort_entries(entries: List[FileEntry], sort_by: str = "name", descending: bool = False) -> List[FileEntry]:
+    """
+    Sort directory entries.
+
+    Raises:
+        ValueError: If sort_by is not one of SORT_KEYS
+    """
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"Invalid sort key: {sort_by}, expected one of {', '.join(SORT_KEYS)}")
+    # Name as secondary key keeps the order stable for equal sizes and mtimes
+    return sorted(entries, key=lambda entry: (getattr(entry, sort_by), entry.name), reverse=descending)
+
+
+def paginate(items: List[Any], offset: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+    """Return a page of items together with the pagination details."""
+    offset = max(offset, 0)
+    end = len(items) if limit is None else offset + max(limit, 0)
+    page = items[offset:end]
+    return {
+        "items": page,
+        "total": len(items),
+        "offset": offset,
+        "next_offset": end if end < len(items) else None
+    }
+
+
+# Global incident store instance
+incident_store = IncidentStore(io_workers=int(os.environ.get("MCP_INCIDENT_IO_WORKERS", "8")))
+metrics_registry.register("incident_cache", incident_store.stats)
@@ -0,0 +1,140 @@
+"""
+Incident snapshot summaries for the Hypernode MCP Server.
+Parses snapshot files once with the snapshot parsers and caches the
+resulting summaries per incident file, so they can be served again
+without reparsing.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from utils.incident_store import IncidentStore, incident_store
+from utils.snapshot_parsers import ParserRegistry, parser_registry
+
+logger = logging.getLogger(__name__)
+
+# Only this much of a file is used to recognise its format
+HEAD_SIZE = 4096
+
+# Larger files are not parsed; they are not snapshots
+MAX_SNAPSHOT_SIZE = 32 * 1024 * 1024
+
+
+class IncidentSummaries:
+    """
+    Structured summaries of incident snapshot files.
+
+    Summaries are stored as JSON in a cache directory, keyed by the path of
+    the incident file. They are kept out of the incident itself, as writing
+    there would change the mtime incidents are listed by. A summary records
+    the size and mtime of the file it was made from and the parser version,
+    and is recomputed when any of them changed.
+    """
+
+    def __init__(
+        self,
+        store: Optional[IncidentStore] = None,
+        registry: Optional[ParserRegistry] = None,
+        cache_dir: Optional[str] = None
+    ):
+        self.store = store or incident_store
+        self.registry = registry or parser_registry
+        self._cache_dir = cache_dir
+
+    @property
+    def cache_dir(self) -> str:
+        """Where summaries are cached."""
+        return os.path.expanduser(self._cache_dir or os.environ.get(
+            "MCP_INCIDENT_SUMMARY_DIR", "~/.cache/hypernode-mcp/summaries"
+        ))
+
+    def summarize(self, incident: str, file: str, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Return the summary of a snapshot file, parsing it only if needed.
+
+        Args:
+            incident: The incident date/directory name
+            file: Name of the file within the incident directory
+            refresh: Parse the file even if a valid summary is cached
+
+        Returns:
+            Dict with the parser name, the summary and whether it came from the
+            cache; parser is None for files in no known format
+
+        Raises:
+            ValueError: If the file is outside of the incident directory
+            OSError: If the file can not be read
+        """
+        path = self.store.incident_file_path(incident, file)
+        st = os.stat(path)
+        key = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+        cache_path = self._cache_path(path)
+        if not refresh:
+            cached = self._read_cache(cache_path)
+            if cached is not None and cached["source"] == key and self._current(cached):
+                return {"file": file, "parser": cached["parser"], "summary": cached["summary"], "cached": True}
+
+        if st.st_size > MAX_SNAPSHOT_SIZE:
+            return {"file": file, "parser": None, "summary": None, "cached": False}
+
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            head = f.read(HEAD_SIZE)
+            parser = self.registry.find_parser(head)
+            if parser is None:
+                record = {"source": key, "parser": None, "version": None, "summary": None}
+            else:
+                summary = parser.parse(head + f.read())
+                record = {"source": key, "parser": parser.name, "version": parser.version, "summary": summary}
+
+        self._write_cache(cache_path, record)
+        return {"file": file, "parser": record["parser"], "summary": record["summary"], "cached": False}
+
+    def _current(self, cached: Dict[str, Any]) -> bool:
+        """Whether a cached record was made by the current version of its parser."""
+        if cached["parser"] is None:
+            # Files in no known format are checked again when a parser is added
+            return cached.get("parsers") == self._parser_versions()
+        return any(
+            parser.name == cached["parser"] and parser.version == cached["version"]
+            for parser in self.registry.parsers
+        )
+
+    def _parser_versions(self) -> List[List[Any]]:
+        return [[parser.name, parser.version] for parser in self.registry.parsers]
+
+    def _cache_path(self, path: str) -> str:
+        digest = hashlib.sha1(os.path.realpath(path).encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    @staticmethod
+    def _read_cache(cache_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_cache(self, cache_path: str, record: Dict[str, Any]) -> None:
+        if record["parser"] is None:
+            record = {**record, "parsers": self._parser_versions()}
+        temp_path = None
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            # Write to a temporary file first, so readers never see a partial summary
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(record, f, separators=(',', ':'))
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            logger.debug(f"Can not cache summary in {cache_path}: {e}")
+            if temp_path is not None and os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+
+# Global incident summaries instance
+incident_summaries = IncidentSummaries()
@@ -0,0 +1,243 @@
+"""
+Background job utilities for the Hypernode MCP server.
+Runs tool methods outside of the MCP request that started them, so long
+analyses can be polled, fetched in pages and cancelled later on.
+"""
+
+import asyncio
+import atexit
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from utils.profiling import CallTiming, tool_timings, use_call_timing
+from utils.progress import ProgressReporter, use_progress_reporter
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+FINISHED_STATES = {JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED}
+
+
+async def _discard_progress(progress: float, total: Optional[float], message: Optional[str]) -> None:
+    """Progress sink for jobs; the reporter itself keeps the latest state for polling."""
+
+
+@dataclass
+class Job:
+    """A tool call running in the background."""
+    id: str
+    tool: str
+    arguments: Dict[str, Any]
+    status: str = JOB_QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    result_size: int = 0
+    result_data: Optional[str] = None
+    result_path: Optional[str] = None
+    reporter: ProgressReporter = field(default_factory=lambda: ProgressReporter(sink=_discard_progress, min_interval=1.0))
+    timing: Optional[CallTiming] = None
+    task: Optional[asyncio.Task] = None
+
+    @property
+    def has_result(self) -> bool:
+        """Whether a (possibly partial) result is available."""
+        return self.result_data is not None or self.result_path is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the job status as a dict."""
+        return {
+            "job_id": self.id,
+            "tool": self.tool,
+            "arguments": self.arguments,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": self.reporter.snapshot(),
+            "error": self.error,
+            "result_size": self.result_size,
+            "result_available": self.has_result,
+            "result_spilled": self.result_path is not None
+        }
+
+
+class JobManager:
+    """
+    Runs tool calls as background jobs on a bounded pool of worker slots.
+
+    Results are serialized to JSON once the job finishes; results larger than
+    spill_threshold bytes are written to disk instead of being kept in memory.
+    Finished jobs are forgotten ttl seconds after they finished.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_jobs: int = 100,
+        ttl: int = 3600,
+        spill_threshold: int = 1024 * 1024,
+        spill_dir: Optional[str] = None
+    ):
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self.ttl = ttl
+        self.spill_threshold = spill_threshold
+        self.spill_dir = spill_dir
+        self.jobs: Dict[str, Job] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def submit(self, tool: str, func: Callable[..., Awaitable[Dict[str, Any]]], arguments: Dict[str, Any]) -> Job:
+        """
+        Submit a tool call to run in the background.
+
+        Args:
+            tool: Name of the tool, for reporting
+            func: Tool method to call
+            arguments: Keyword arguments for the tool method
+
+        Returns:
+            The queued Job
+
+        Raises:
+            RuntimeError: If too many jobs are retained already
+        """
+        self.purge_expired()
+        if len(self.jobs) >= self.max_jobs:
+            raise RuntimeError(f"Too many jobs ({self.max_jobs}), wait for jobs to finish or expire")
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+
+        job = Job(id=uuid.uuid4().hex, tool=tool, arguments=arguments, timing=CallTiming(getattr(func, "__name__", tool)))
+        self.jobs[job.id] = job
+        job.task = asyncio.ensure_future(self._run(job, func))
+        logger.info(f"Submitted job {job.id}: {tool}")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job by id, or None if it does not exist (anymore)."""
+        self.purge_expired()
+        return self.jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        """Return all retained jobs, oldest first."""
+        self.purge_expired()
+        return sorted(self.jobs.values(), key=lambda job: job.created_at)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued or running job; finished jobs are left alone."""
+        job = self.get(job_id)
+        if job is not None and job.status not in FINISHED_STATES and job.task is not None:
+            job.task.cancel()
+        return job
+
+    async def read_result(self, job: Job, offset: int = 0, length: int = 65536) -> str:
+        """
+        Read a page of the serialized result of a finished job.
+
+        Args:
+            job: The job to read from
+            offset: Offset to start at
+            length: Maximum number of characters to return
+
+        Returns:
+            The requested slice of the JSON encoded result
+        """
+        if job.result_path is None:
+            return (job.result_data or "")[offset:offset + length]
+        return await asyncio.to_thread(self._read_spilled, job.result_path, offset, length)
+
+    def purge_expired(self) -> None:
+        """Forget finished jobs whose retention period has passed."""
+        now = time.time()
+        for job in list(self.jobs.values()):
+            if job.finished_at is not None and now - job.finished_at > self.ttl:
+                self._discard_result(job)
+                del self.jobs[job.id]
+
+    async def _run(self, job: Job, func: Callable[..., Awaitable[Dict[str, Any]]]) -> None:
+        # Waiting for a worker slot counts as queued, storing the result as serialization
+        timing = job.timing or CallTiming(job.tool)
+        try:
+            async with self._slots:
+                job.status = JOB_RUNNING
+                job.started_at = time.time()
+                timing.start()
+                try:
+                    with use_call_timing(timing), use_progress_reporter(job.reporter):
+                        result = await func(**job.arguments)
+                finally:
+                    timing.finish()
+            await self._store_result(job, result)
+            job.status = JOB_COMPLETED
+        except asyncio.CancelledError:
+            job.status = JOB_CANCELLED
+            logger.info(f"Job {job.id} cancelled")
+            if job.reporter.partial_result is not None:
+                # The tool left what it found before it was cancelled
+                await self._store_result(job, job.reporter.partial_result)
+        except Exception as e:
+            job.status = JOB_FAILED
+            job.error = str(e)
+            logger.error(f"Job {job.id} failed: {e}")
+        finally:
+            job.finished_at = time.time()
+            if timing.started_at is not None:
+                timing.complete()
+                tool_timings.record(timing)
+
+    async def _store_result(self, job: Job, result: Any) -> None:
+        data = json.dumps(result, default=str)
+        job.result_size = len(data)
+        if job.result_size <= self.spill_threshold:
+            job.result_data = data
+            return
+        job.result_path = await asyncio.to_thread(self._spill, job.id, data)
+
+    def _spill(self, job_id: str, data: str) -> str:
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix="hypernode-mcp-jobs-")
+            atexit.register(shutil.rmtree, self.spill_dir, True)
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = os.path.join(self.spill_dir, f"{job_id}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        return path
+
+    @staticmethod
+    def _read_spilled(path: str, offset: int, length: int) -> str:
+        # json.dumps escapes non-ASCII characters, so byte offsets equal character offsets
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            return f.read(length).decode('ascii')
+
+    def _discard_result(self, job: Job) -> None:
+        job.result_data = None
+        if job.result_path is not None:
+            try:
+                os.unlink(job.result_path)
+            except OSError:
+                pass
+            job.result_path = None
+
+
+# Global job manager instance
+job_manager = JobManager(
+    max_workers=int(os.environ.get("MCP_JOB_WORKERS", "4")),
+    ttl=int(os.environ.get("MCP_JOB_TTL", "3600")),
+    spill_threshold=int(os.environ.get("MCP_JOB_SPILL_THRESHOLD", str(1024 * 1024))),
+    spill_dir=os.environ.get("MCP_JOB_SPILL_DIR")
+)
@@ -0,0 +1,169 @@
+"""
+Event loop health monitoring for the Hypernode MCP server.
+Measures scheduling lag and captures the stack of callbacks that block the loop.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from utils.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    """Return a percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(percentile / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class LoopMonitor:
+    """
+    Event loop health monitor.
+
+    A heartbeat task sleeps for `interval` seconds and records how much later
+    than requested it woke up (the scheduling lag). A watchdog thread checks
+    that the heartbeat keeps beating; when it is more than `slow_threshold`
+    seconds overdue, a callback is blocking the loop and the watchdog captures
+    the stack of the loop thread to show which code is responsible.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        slow_threshold: float = 0.1,
+        max_samples: int = 600,
+        max_slow_callbacks: int = 50
+    ):
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self.lag_samples: Deque[float] = deque(maxlen=max_samples)
+        self.slow_callbacks: Deque[Dict[str, Any]] = deque(maxlen=max_slow_callbacks)
+        self.blockers: Dict[str, Dict[str, Any]] = {}
+        self.stall_count = 0
+        self.max_lag = 0.0
+        self._lock = threading.Lock()
+        self._last_beat = time.monotonic()
+        self._current_stall: Optional[Dict[str, Any]] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        """Whether the monitor is running."""
+        return self._heartbeat_task is not None and not self._heartbeat_task.done()
+
+    def start(self) -> None:
+        """Start monitoring the running event loop."""
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._heartbeat_task = asyncio.ensure_future(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event loop monitor started (interval {self.interval}s, slow threshold {self.slow_threshold}s)")
+
+    def stop(self) -> None:
+        """Stop monitoring."""
+        self._stopped.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            with self._lock:
+                self._last_beat = time.monotonic()
+                self.lag_samples.append(lag)
+                self.max_lag = max(self.max_lag, lag)
+                if self._current_stall is not None:
+                    # The blocking callback has finished; now we know how long it took
+                    self._current_stall["duration"] = lag
+                    self._record_blocker(self._current_stall)
+                    self._current_stall = None
+
+    def _watch(self) -> None:
+        check_interval = self.slow_threshold / 2
+        while not self._stopped.wait(check_interval):
+            with self._lock:
+                overdue = time.monotonic() - self._last_beat - self.interval
+                if overdue < self.slow_threshold or self._current_stall is not None:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is None:
+                    continue
+                stack = traceback.format_stack(frame, limit=20)
+                stall = {
+                    "detected_at": time.time(),
+                    "duration": overdue,
+                    "location": self._blocking_location(frame),
+                    "stack": stack
+                }
+                self._current_stall = stall
+                self.stall_count += 1
+                self.slow_callbacks.append(stall)
+            logger.warning(f"Event loop blocked for more than {overdue:.3f}s in {stall['location']}")
+
+    @staticmethod
+    def _blocking_location(frame) -> str:
+        """Return the innermost frame of our own code in the stack, falling back to the top frame."""
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        current = frame
+        while current is not None:
+            filename = current.f_code.co_filename
+            if filename.startswith(project_root):
+                return f"{os.path.relpath(filename, project_root)}:{current.f_lineno} in {current.f_code.co_name}"
+            current = current.f_back
+        return f"{frame.f_code.co_filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+
+    def _record_blocker(self, stall: Dict[str, Any]) -> None:
+        blocker = self.blockers.setdefault(stall["location"], {"count": 0, "total_duration": 0.0, "max_duration": 0.0})
+        blocker["count"] += 1
+        blocker["total_duration"] += stall["duration"]
+        blocker["max_duration"] = max(blocker["max_duration"], stall["duration"])
+
+    def stats(self) -> Dict[str, Any]:
+        """Return lag percentiles, the worst blockers and the most recent slow callbacks."""
+        with self._lock:
+            lags = sorted(self.lag_samples)
+            blockers = sorted(self.blockers.items(), key=lambda item: item[1]["total_duration"], reverse=True)
+            return {
+                "running": self.running,
+                "interval": self.interval,
+                "slow_threshold": self.slow_threshold,
+                "lag": {
+                    "samples": len(lags),
+                    "p50": _percentile(lags, 50),
+                    "p95": _percentile(lags, 95),
+                    "p99": _percentile(lags, 99),
+                    "max": self.max_lag
+                },
+                "stall_count": self.stall_count,
+                "blockers": [{"location": location, **blocker} for location, blocker in blockers[:10]],
+                "slow_callbacks": list(self.slow_callbacks)[-10:]
+            }
+
+
+# Global loop monitor instance
+loop_monitor = LoopMonitor(
+    interval=float(os.environ.get("MCP_LOOP_MONITOR_INTERVAL", "0.1")),
+    slow_threshold=float(os.environ.get("MCP_SLOW_CALLBACK_THRESHOLD", "0.1"))
+)
+metrics_registry.register("event_loop", loop_monitor.stats)
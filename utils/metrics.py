@@ -0,0 +1,41 @@
+"""
+Metrics utilities for the Hypernode MCP server.
+Components register a provider here and the server metrics tool collects them all.
+"""
+
+import logging
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsRegistry:
+    """Registry of named metrics providers."""
+
+    def __init__(self):
+        self.providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def register(self, name: str, provider: Callable[[], Dict[str, Any]]) -> None:
+        """
+        Register a metrics provider.
+
+        Args:
+            name: Section name the metrics are reported under
+            provider: Callable returning the current metrics as a dict
+        """
+        self.providers[name] = provider
+
+    def collect(self) -> Dict[str, Any]:
+        """Collect the metrics of all providers; a failing provider reports its error."""
+        metrics = {}
+        for name, provider in self.providers.items():
+            try:
+                metrics[name] = provider()
+            except Exception as e:
+                logger.error(f"Failed to collect metrics for {name}: {e}")
+                metrics[name] = {"error": str(e)}
+        return metrics
+
+
+# Global metrics registry instance
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,398 @@
+"""
+Nginx access log utilities for the Hypernode MCP Server.
+Reads the access logs in-process: seeks to a point in time by binary search
+over the time-ordered lines and aggregates the traffic in a time window,
+without scanning the whole log.
+"""
+
+import json
+import os
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from utils.file_ranges import Buffer, open_buffer
+from utils.incident_archives import is_compressed, open_decompressed
+
+# Lines are written when a request completes, by several workers with their
+# own cached clocks, so they are time-ordered to within this many seconds
+TIME_SKEW = 5.0
+
+# Unparsable lines skipped while looking for a timestamp before giving up
+MAX_SKIPPED_LINES = 100
+
+# Hypernode logs JSON; the combined log format is supported as well
+_COMBINED = re.compile(
+    r'^(\S+) \S+ (\S+) \[([^\]]+)\] "((?:[^"\\]|\\.)*)" (\d{3}) (\S+)(?: "((?:[^"\\]|\\.)*)" "((?:[^"\\]|\\.)*)")?'
+)
+_JSON_TIME = re.compile(rb'"time(?:_iso8601|_local)?"\s*:\s*"([^"]+)"')
+_COMBINED_TIME = re.compile(rb'\[(\d{2}/\w{3}/\d{4}:[^\]]+)\]')
+_ROTATED = re.compile(r"^(access\.log)(?:\.(\d+))?(\.gz)?$")
+
+
+def log_dir() -> str:
+    """The directory holding the nginx access logs."""
+    return os.path.expanduser(os.environ.get("HYPERNODE_NGINX_LOG_DIR", "/var/log/nginx"))
+
+
+def access_logs(directory: Optional[str] = None) -> List[str]:
+    """
+    List the access log and its rotations, newest first.
+
+    Returns:
+        Paths of access.log, access.log.1, access.log.2.gz, ...
+    """
+    directory = directory or log_dir()
+    logs = []
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    for name in names:
+        match = _ROTATED.match(name)
+        if match:
+            logs.append((int(match.group(2) or 0), os.path.join(directory, name)))
+    return [path for _, path in sorted(logs)]
+
+
+def parse_time(value: str) -> Optional[float]:
+    """Parse an ISO 8601 or common log format timestamp to epoch seconds."""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(value, "%d/%b/%Y:%H:%M:%S %z").timestamp()
+    except ValueError:
+        return None
+
+
+def line_time(line: bytes) -> Optional[float]:
+    """Return the timestamp of a log line without parsing the whole line."""
+    match = _JSON_TIME.search(line) or _COMBINED_TIME.search(line)
+    return parse_time(match.group(1).decode('ascii', errors='ignore')) if match else None
+
+
+def parse_line(line: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Parse an access log line.
+
+    Returns:
+        Dict with the logged fields (remote_addr, request, status, host, ...)
+        as strings, or None if the line is in no known format
+    """
+    text = line.decode('utf-8', errors='replace').strip()
+    if text.startswith("{"):
+        try:
+            entry = json.loads(text)
+        except ValueError:
+            return None
+        if not isinstance(entry, dict):
+            return None
+        return {key: "" if value is None else str(value) for key, value in entry.items()}
+    match = _COMBINED.match(text)
+    if match is None:
+        return None
+    remote_addr, remote_user, time, request, status, body_bytes_sent, referer, user_agent = match.groups()
+    return {
+        "remote_addr": remote_addr,
+        "remote_user": remote_user,
+        "time": time,
+        "request": request,
+        "status": status,
+        "body_bytes_sent": body_bytes_sent,
+        "referer": referer or "",
+        "user_agent": user_agent or ""
+    }
+
+
+def entry_host(entry: Dict[str, Any]) -> str:
+    """Return the host a log entry was served for, preferring the matched server_name."""
+    host = (entry.get("server_name") or entry.get("host") or "").lower()
+    # Host headers may carry a port
+    return host if host.startswith("[") else host.split(":", 1)[0]
+
+
+def entry_time(entry: Dict[str, Any]) -> Optional[float]:
+    """Return the timestamp of a parsed log entry."""
+    value = entry.get("time") or entry.get("time_iso8601") or entry.get("time_local")
+    return parse_time(value) if value else None
+
+
+def request_path(entry: Dict[str, Any]) -> str:
+    """Return the path of the request of a log entry, without the query string."""
+    parts = entry.get("request", "").split(" ")
+    target = parts[1] if len(parts) > 1 else parts[0]
+    return target.split("?", 1)[0]
+
+
+def _line_start(buffer: Buffer, size: int, position: int) -> int:
+    """Return the start of the first line starting at or after position."""
+    if position <= 0:
+        return 0
+    newline = buffer.find(b"\n", position - 1, size)
+    return size if newline < 0 else newline + 1
+
+
+def _time_at(buffer: Buffer, size: int, position: int) -> Optional[float]:
+    """Return the timestamp of the first line at position that has one."""
+    for _ in range(MAX_SKIPPED_LINES):
+        if position >= size:
+            return None
+        end = buffer.find(b"\n", position, size)
+        end = size if end < 0 else end
+        timestamp = line_time(buffer[position:end])
+        if timestamp is not None:
+            return timestamp
+        position = end + 1
+    return None
+
+
+def seek_time(buffer: Buffer, size: int, target: float) -> int:
+    """
+    Find the first line logged at or after a point in time.
+
+    Binary search over byte offsets, reading a single line per step, so
+    seeking in a log of any size reads a few dozen lines.
+
+    Returns:
+        Offset of the line, or size if all lines are older
+    """
+    low, high = 0, size
+    while low < high:
+        middle = (low + high) // 2
+        start = _line_start(buffer, size, middle)
+        timestamp = _time_at(buffer, size, start) if start < size else None
+        if timestamp is None or timestamp >= target:
+            high = middle
+        else:
+            low = middle + 1
+    return _line_start(buffer, size, low)
+
+
+def first_time(path: str) -> Optional[float]:
+    """Return the timestamp of the first line of a log, decompressing only its start."""
+    with open_decompressed(path) as f:
+        for _, line in zip(range(MAX_SKIPPED_LINES), f):
+            timestamp = line_time(line)
+            if timestamp is not None:
+                return timestamp
+    return None
+
+
+def read_window(path: str, start: float, end: float) -> Iterator[Tuple[float, Dict[str, Any]]]:
+    """
+    Yield the entries of a log logged within [start, end).
+
+    Uncompressed logs are memory mapped and seeked to start by binary
+    search; compressed rotations can only be read forwards and are
+    decompressed up to the end of the window.
+
+    Yields:
+        Tuples of (timestamp, entry)
+    """
+    for timestamp, line in window_lines(path, start, end):
+        entry = parse_line(line)
+        if entry is not None:
+            yield timestamp, entry
+
+
+def window_lines(path: str, start: float, end: float) -> Iterator[Tuple[float, bytes]]:
+    """
+    Yield the raw lines of a log logged within [start, end), like read_window.
+
+    Lets callers skip parsing lines a cheap byte match rules out.
+
+    Yields:
+        Tuples of (timestamp, line)
+    """
+    if is_compressed(path):
+        with open_decompressed(path) as f:
+            yield from _lines_in_window(f, start, end)
+        return
+    with open_buffer(path) as (buffer, size):
+        offset = seek_time(buffer, size, start - TIME_SKEW)
+        yield from _lines_in_window(_buffer_lines(buffer, size, offset), start, end)
+
+
+def _buffer_lines(buffer: Buffer, size: int, offset: int) -> Iterator[bytes]:
+    while offset < size:
+        end = buffer.find(b"\n", offset, size)
+        end = size if end < 0 else end
+        yield buffer[offset:end]
+        offset = end + 1
+
+
+def _lines_in_window(lines: Iterator[bytes], start: float, end: float) -> Iterator[Tuple[float, bytes]]:
+    for line in lines:
+        timestamp = line_time(line)
+        if timestamp is None:
+            continue
+        if timestamp >= end + TIME_SKEW:
+            return
+        if start <= timestamp < end:
+            yield timestamp, line
+
+
+def logs_in_window(start: float, end: float, directory: Optional[str] = None) -> List[str]:
+    """
+    Select the logs that can hold lines logged within [start, end), oldest first.
+
+    A rotation holds the lines from its first line up to the first line of
+    the next newer log, so only the first line of each log is read.
+    """
+    selected = []
+    newer_first: Optional[float] = None
+    for path in access_logs(directory):
+        try:
+            first = first_time(path)
+        except (OSError, EOFError):
+            continue
+        if first is None:
+            continue
+        if first < end + TIME_SKEW and (newer_first is None or newer_first > start - TIME_SKEW):
+            selected.append(path)
+        if first <= start - TIME_SKEW:
+            # Older logs end before the window starts
+            break
+        newer_first = first
+    return list(reversed(selected))
+
+
+class TrafficSummary:
+    """Aggregates of the requests in a log window."""
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes_sent = 0
+        self.first: Optional[float] = None
+        self.last: Optional[float] = None
+        self.ips: Counter = Counter()
+        self.urls: Counter = Counter()
+        self.statuses: Counter = Counter()
+        self.hosts: Counter = Counter()
+        self.user_agents: Counter = Counter()
+        self.per_minute: Counter = Counter()
+
+    def add(self, timestamp: float, entry: Dict[str, Any]) -> None:
+        """Count a request."""
+        self.requests += 1
+        body_bytes_sent = entry.get("body_bytes_sent", "")
+        if body_bytes_sent.isdigit():
+            self.bytes_sent += int(body_bytes_sent)
+        self.first = timestamp if self.first is None else min(self.first, timestamp)
+        self.last = timestamp if self.last is None else max(self.last, timestamp)
+        self.ips[entry.get("remote_addr", "")] += 1
+        self.urls[request_path(entry)] += 1
+        self.statuses[entry.get("status", "")] += 1
+        self.hosts[entry.get("host") or entry.get("server_name", "")] += 1
+        self.user_agents[entry.get("user_agent", "")] += 1
+        self.per_minute[int(timestamp // 60) * 60] += 1
+
+    def to_dict(self, top: int = 10) -> Dict[str, Any]:
+        """Return the aggregates, with the top entries of each."""
+        return {
+            "requests": self.requests,
+            "bytes_sent": self.bytes_sent,
+            "first": self._isoformat(self.first),
+            "last": self._isoformat(self.last),
+            "top_ips": self.ips.most_common(top),
+            "top_urls": self.urls.most_common(top),
+            "status_codes": dict(sorted(self.statuses.items())),
+            "top_hosts": self.hosts.most_common(top),
+            "top_user_agents": self.user_agents.most_common(top),
+            "requests_per_minute": [
+                [self._isoformat(minute), count] for minute, count in sorted(self.per_minute.items())
+            ]
+        }
+
+    @staticmethod
+    def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+        if timestamp is None:
+            return None
+        return datetime.fromtimestamp(timestamp).astimezone().isoformat(timespec='seconds')
+
+
+class HostTraffic:
+    """Aggregates of the requests for a single host in a log window."""
+
+    def __init__(self):
+        self.requests = 0
+        self.server_errors = 0
+        self.bytes_sent = 0
+        # request_time is logged with millisecond resolution, so counting the
+        # distinct values keeps percentiles exact in bounded memory
+        self.request_times: Counter = Counter()
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        """Count a request."""
+        self.requests += 1
+        if entry.get("status", "").startswith("5"):
+            self.server_errors += 1
+        body_bytes_sent = entry.get("body_bytes_sent", "")
+        if body_bytes_sent.isdigit():
+            self.bytes_sent += int(body_bytes_sent)
+        try:
+            self.request_times[round(float(entry.get("request_time", "")), 3)] += 1
+        except ValueError:
+            pass
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Return the request_time below which the given fraction of the timed requests completed."""
+        total = sum(self.request_times.values())
+        if not total:
+            return None
+        rank = max(fraction * total, 1)
+        seen = 0
+        for request_time, count in sorted(self.request_times.items()):
+            seen += count
+            if seen >= rank:
+                return request_time
+        return None
+
+    def to_dict(self, minutes: float) -> Dict[str, Any]:
+        """Return the aggregates, with rates over a window of the given minutes."""
+        return {
+            "requests": self.requests,
+            "requests_per_minute": round(self.requests / minutes, 2) if minutes else None,
+            "server_errors": self.server_errors,
+            "server_error_rate": round(self.server_errors / self.requests, 4) if self.requests else 0.0,
+            "p95_request_time": self.percentile(0.95),
+            "bytes_sent": self.bytes_sent,
+            "bytes_per_minute": round(self.bytes_sent / minutes) if minutes else None
+        }
+
+
+def traffic_by_host(start: float, end: float, directory: Optional[str] = None) -> Tuple[Dict[str, HostTraffic], List[str]]:
+    """
+    Aggregate the traffic logged within [start, end) per host, in a single pass.
+
+    Returns:
+        Tuple of (traffic per host, paths of the logs read)
+    """
+    hosts: Dict[str, HostTraffic] = {}
+    logs = logs_in_window(start, end, directory)
+    for path in logs:
+        for _, entry in read_window(path, start, end):
+            host = entry_host(entry)
+            traffic = hosts.get(host)
+            if traffic is None:
+                traffic = hosts[host] = HostTraffic()
+            traffic.add(entry)
+    return hosts, logs
+
+
+def summarize_window(start: float, end: float, directory: Optional[str] = None) -> Tuple[TrafficSummary, List[str]]:
+    """
+    Aggregate the traffic logged within [start, end).
+
+    Returns:
+        Tuple of (summary, paths of the logs read)
+    """
+    summary = TrafficSummary()
+    logs = logs_in_window(start, end, directory)
+    for path in logs:
+        for timestamp, entry in read_window(path, start, end):
+            summary.add(timestamp, entry)
+    return summary, logs
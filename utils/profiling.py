@@ -0,0 +1,243 @@
+"""
+Profiling utilities for the Hypernode MCP server.
+Records where the time of every tool call goes and provides an on-demand
+sampling profiler producing collapsed stacks for flamegraphs.
+"""
+
+import contextvars
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from utils.metrics import metrics_registry
+
+try:
+    from fastmcp.server.middleware import Middleware
+except ImportError:
+    # fastmcp is only needed to serve the tools, not to call them directly
+    Middleware = object
+
+logger = logging.getLogger(__name__)
+
+# Time between receiving the call and the tool starting (waiting for dispatch or a job slot)
+SPAN_QUEUED = "queued"
+# Time spent running commands
+SPAN_SUBPROCESS = "subprocess"
+# Time spent turning command output into structured data
+SPAN_PARSE = "parse"
+# Time spent turning the tool result into the response
+SPAN_SERIALIZE = "serialize"
+# Time the tool method itself ran
+SPAN_EXECUTE = "execute"
+# Time from receiving the call until the response was ready
+SPAN_TOTAL = "total"
+
+_current_timing: contextvars.ContextVar[Optional["CallTiming"]] = contextvars.ContextVar(
+    "call_timing", default=None
+)
+
+
+class CallTiming:
+    """Timing spans of a single tool call."""
+
+    def __init__(self, tool: str, received_at: Optional[float] = None):
+        self.tool = tool
+        self.received_at = received_at if received_at is not None else time.perf_counter()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.spans: Dict[str, float] = defaultdict(float)
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add time to a span; spans entered several times accumulate."""
+        self.spans[name] += seconds
+
+    def start(self) -> None:
+        """Mark the start of the tool method."""
+        self.started_at = time.perf_counter()
+        self.spans[SPAN_QUEUED] = self.started_at - self.received_at
+
+    def finish(self) -> None:
+        """Mark the end of the tool method."""
+        self.finished_at = time.perf_counter()
+        if self.started_at is not None:
+            self.spans[SPAN_EXECUTE] = self.finished_at - self.started_at
+
+    def complete(self) -> None:
+        """Mark the response as ready; the time after the tool method finished is serialization."""
+        now = time.perf_counter()
+        self.spans[SPAN_TOTAL] = now - self.received_at
+        if self.finished_at is not None:
+            self.spans[SPAN_SERIALIZE] = now - self.finished_at
+
+
+def current_call_timing() -> Optional[CallTiming]:
+    """Return the timing of the tool call currently being handled, if any."""
+    return _current_timing.get()
+
+
+@contextmanager
+def use_call_timing(timing: CallTiming) -> Iterator[CallTiming]:
+    """Make a call timing the current one for the duration of the block."""
+    token = _current_timing.set(timing)
+    try:
+        yield timing
+    finally:
+        _current_timing.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a block as part of a span of the current tool call; a no-op outside of a call."""
+    timing = _current_timing.get()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - started)
+
+
+def add_span(name: str, seconds: float) -> None:
+    """Add already measured time to a span of the current tool call."""
+    timing = _current_timing.get()
+    if timing is not None:
+        timing.add(name, seconds)
+
+
+class ToolTimings:
+    """Aggregated span durations of the most recent calls of every tool."""
+
+    def __init__(self, max_samples: int = 1000):
+        self.max_samples = max_samples
+        self.calls: Counter = Counter()
+        self.samples: Dict[str, Dict[str, Deque[float]]] = defaultdict(dict)
+        self._lock = threading.Lock()
+
+    def record(self, timing: CallTiming) -> None:
+        """Record the spans of a finished call."""
+        with self._lock:
+            self.calls[timing.tool] += 1
+            tool_samples = self.samples[timing.tool]
+            for name, seconds in timing.spans.items():
+                tool_samples.setdefault(name, deque(maxlen=self.max_samples)).append(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return count, mean, p50, p95 and max per span per tool."""
+        with self._lock:
+            stats = {}
+            for tool, tool_samples in self.samples.items():
+                spans = {}
+                for name, samples in tool_samples.items():
+                    values = sorted(samples)
+                    spans[name] = {
+                        "count": len(values),
+                        "mean": sum(values) / len(values),
+                        "p50": values[int(0.5 * (len(values) - 1))],
+                        "p95": values[int(0.95 * (len(values) - 1))],
+                        "max": values[-1]
+                    }
+                stats[tool] = {"calls": self.calls[tool], "spans": spans}
+            return stats
+
+
+class ToolTimingMiddleware(Middleware):
+    """
+    FastMCP middleware timing every tool call.
+
+    The timing is created when the call is received, BaseTool's wrapper marks
+    the start and end of the tool method, and the remaining time until
+    FastMCP has converted the result is recorded as serialization.
+    """
+
+    async def on_call_tool(self, context, call_next):
+        timing = CallTiming(context.message.name)
+        try:
+            with use_call_timing(timing):
+                return await call_next(context)
+        finally:
+            timing.complete()
+            tool_timings.record(timing)
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler sampling the stacks of all threads from a background thread.
+
+    The overhead is a stack walk per thread per sample, so it can be switched
+    on in production. The output is in the collapsed stack format used by
+    flamegraph.pl and speedscope: one line per unique stack, frames from root
+    to leaf separated by semicolons, followed by the number of samples.
+    """
+
+    def __init__(self, rate: int = 100):
+        self.rate = rate
+        self.stacks: Counter = Counter()
+        self.sample_count = 0
+        self._project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def run(self, seconds: float) -> None:
+        """Sample for the given number of seconds; blocks, so run it in a thread."""
+        own_thread = threading.get_ident()
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        interval = 1.0 / self.rate
+        deadline = time.monotonic() + seconds
+
+        while time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                name = thread_names.get(thread_id)
+                if name is None:
+                    thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+                    name = thread_names.get(thread_id, str(thread_id))
+                self.stacks[self._collapse(name, frame)] += 1
+            self.sample_count += 1
+            time.sleep(interval)
+
+    def _collapse(self, thread_name: str, frame) -> str:
+        frames: List[str] = []
+        while frame is not None:
+            code = frame.f_code
+            filename = code.co_filename
+            if filename.startswith(self._project_root):
+                filename = os.path.relpath(filename, self._project_root)
+            else:
+                filename = os.path.basename(filename)
+            frames.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+            frame = frame.f_back
+        frames.append(thread_name)
+        return ";".join(reversed(frames))
+
+    def write(self, directory: Optional[str] = None) -> str:
+        """Write the collapsed stacks to a file and return its path."""
+        directory = directory or tempfile.gettempdir()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"hypernode-mcp-profile-{time.strftime('%Y%m%d-%H%M%S')}.folded")
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+    def top_functions(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Return the functions most often on top of a stack (self time)."""
+        leaves: Counter = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        total = sum(leaves.values()) or 1
+        return [
+            {"function": function, "samples": count, "share": count / total}
+            for function, count in leaves.most_common(limit)
+        ]
+
+
+# Global tool timings instance
+tool_timings = ToolTimings()
+metrics_registry.register("tools", tool_timings.stats)
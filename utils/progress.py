@@ -0,0 +1,234 @@
+"""
+Progress reporting utilities for the Hypernode MCP server.
+Lets long-running tools report progress without knowing which transport is in use.
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import stat
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Async callable receiving (progress, total, message), e.g. fastmcp's Context.report_progress
+ProgressSink = Callable[[float, Optional[float], Optional[str]], Awaitable[None]]
+
+_current_reporter: contextvars.ContextVar[Optional["ProgressReporter"]] = contextvars.ContextVar(
+    "progress_reporter", default=None
+)
+
+
+class ProgressReporter:
+    """
+    Throttled progress reporter bound to a single tool call.
+
+    Tools call update() as often as they like; at most one notification per
+    min_interval is forwarded to the sink, and never more than one at a time,
+    so a slow client can not slow down the work being reported on.
+    """
+
+    def __init__(self, sink: Optional[ProgressSink] = None, min_interval: float = 0.5):
+        self.sink = sink
+        self.min_interval = min_interval
+        self.progress = 0.0
+        self.total: Optional[float] = None
+        self.message: Optional[str] = None
+        self.details: Dict[str, Any] = {}
+        self.updated_at: Optional[float] = None
+        self.partial_result: Optional[Any] = None
+        self._next_report = 0.0
+        self._pending: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether anybody is listening to this reporter."""
+        return self.sink is not None
+
+    def due(self) -> bool:
+        """Cheap check tools can use to skip computing expensive progress details."""
+        return self.sink is not None and time.monotonic() >= self._next_report
+
+    def update(
+        self,
+        progress: float,
+        total: Optional[float] = None,
+        message: Optional[str] = None,
+        **details: Any
+    ) -> None:
+        """
+        Record the current progress and forward it to the sink if the throttle allows.
+
+        Args:
+            progress: Current progress value; never allowed to go backwards
+            total: Total value if known
+            message: Human readable message; defaults to the details as JSON
+            **details: Structured progress details (counters, partial results)
+        """
+        self.progress = max(self.progress, progress)
+        self.total = total
+        self.details.update(details)
+        self.message = message if message is not None else self._format_details()
+        self.updated_at = time.time()
+
+        if not self.due():
+            return
+        if self._pending is not None and not self._pending.done():
+            # Previous notification is still in flight; drop this one
+            return
+
+        self._next_report = time.monotonic() + self.min_interval
+        self._pending = asyncio.ensure_future(self._send(self.progress, self.total, self.message))
+
+    async def report(
+        self,
+        progress: float,
+        total: Optional[float] = None,
+        message: Optional[str] = None,
+        **details: Any
+    ) -> None:
+        """
+        Record the current progress and send it, bypassing the throttle.
+
+        For updates that must not be dropped, such as streamed output.
+        Notifications are sent in order and the call waits until this one
+        was sent, so a slow client slows down the caller: backpressure
+        instead of unbounded buffering.
+        """
+        self.progress = max(self.progress, progress)
+        self.total = total
+        self.details.update(details)
+        self.message = message if message is not None else self._format_details()
+        self.updated_at = time.time()
+
+        if self.sink is None:
+            return
+        if self._pending is not None and not self._pending.done():
+            await asyncio.gather(self._pending, return_exceptions=True)
+        self._next_report = time.monotonic() + self.min_interval
+        await self._send(self.progress, self.total, self.message)
+
+    def set_partial_result(self, result: Any) -> None:
+        """
+        Publish the best result available so far.
+
+        Tools call this when they are cancelled, so whoever cancelled them
+        (e.g. a background job) can still hand out what was found.
+        """
+        self.partial_result = result
+
+    async def flush(self) -> None:
+        """Send the latest state regardless of the throttle."""
+        if self.sink is None or self.updated_at is None:
+            return
+        if self._pending is not None and not self._pending.done():
+            await asyncio.gather(self._pending, return_exceptions=True)
+        await self._send(self.progress, self.total, self.message)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the latest progress state as a dict."""
+        return {
+            "progress": self.progress,
+            "total": self.total,
+            "message": self.message,
+            "details": dict(self.details),
+            "updated_at": self.updated_at
+        }
+
+    def _format_details(self) -> Optional[str]:
+        if not self.details:
+            return None
+        return json.dumps(self.details, separators=(',', ':'), default=str)
+
+    async def _send(self, progress: float, total: Optional[float], message: Optional[str]) -> None:
+        try:
+            await self.sink(progress, total, message)
+        except Exception as e:
+            # Progress is best effort; never fail a tool because a notification could not be sent
+            logger.debug(f"Failed to send progress notification: {e}")
+
+
+def get_progress_reporter() -> ProgressReporter:
+    """Return the reporter for the current tool call, or a disabled one outside of a call."""
+    reporter = _current_reporter.get()
+    return reporter if reporter is not None else ProgressReporter()
+
+
+@contextmanager
+def use_progress_reporter(reporter: ProgressReporter) -> Iterator[ProgressReporter]:
+    """Make a reporter the current one for the duration of the block."""
+    token = _current_reporter.set(reporter)
+    try:
+        yield reporter
+    finally:
+        _current_reporter.reset(token)
+
+
+def _child_pids(pid: int) -> List[int]:
+    """Return the direct children of a process."""
+    children_file = f"/proc/{pid}/task/{pid}/children"
+    if os.path.exists(children_file):
+        with open(children_file) as f:
+            return [int(child) for child in f.read().split()]
+
+    # Kernels without CONFIG_PROC_CHILDREN: fall back to scanning every process
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(entry))
+    return children
+
+
+def sample_read_progress(pid: int) -> Tuple[int, int]:
+    """
+    Sample how far a process tree has read through the regular files it has open.
+
+    Uses the file offsets in /proc/<pid>/fdinfo, so it works for any command
+    (pnl, sort, grep, ...) without cooperation from the command itself.
+
+    Args:
+        pid: Root process of the tree to inspect
+
+    Returns:
+        Tuple of (bytes_scanned, bytes_total); (0, 0) where /proc is unavailable
+    """
+    scanned = 0
+    total = 0
+    seen = set()
+    pending = [pid]
+
+    while pending:
+        current = pending.pop()
+        try:
+            pending.extend(_child_pids(current))
+            fds = os.listdir(f"/proc/{current}/fd")
+        except (OSError, ValueError):
+            continue
+
+        for fd in fds:
+            try:
+                st = os.stat(f"/proc/{current}/fd/{fd}")
+                if not stat.S_ISREG(st.st_mode) or (st.st_dev, st.st_ino) in seen:
+                    continue
+                with open(f"/proc/{current}/fdinfo/{fd}") as f:
+                    info = dict(line.split(':', 1) for line in f.read().splitlines() if ':' in line)
+                if int(info["flags"].strip(), 8) & os.O_ACCMODE != os.O_RDONLY:
+                    continue
+            except (OSError, KeyError, ValueError):
+                continue
+            seen.add((st.st_dev, st.st_ino))
+            scanned += min(int(info["pos"].strip()), st.st_size)
+            total += st.st_size
+
+    return scanned, total
@@ -0,0 +1,325 @@
+"""
+Shell session utilities for the Hypernode MCP Server.
+Keeps long-lived shells whose working directory and environment carry over
+between commands, so a follow-up command is a write to a pipe instead of
+starting a new shell.
+"""
+
+import asyncio
+import logging
+import os
+import shlex
+import shutil
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.command_executor import CommandExecutor, CommandResult
+from utils.metrics import metrics_registry
+from utils.profiling import SPAN_SUBPROCESS, span
+
+logger = logging.getLogger(__name__)
+
+MAX_SESSIONS = int(os.environ.get("MCP_SHELL_MAX_SESSIONS", "4"))
+IDLE_TIMEOUT = float(os.environ.get("MCP_SHELL_SESSION_IDLE_TIMEOUT", "600"))
+
+# Output kept per stream of a command; the rest is read and discarded
+MAX_OUTPUT_BYTES = 1024 * 1024
+
+READ_SIZE = 64 * 1024
+
+
+class SessionClosed(Exception):
+    """The shell of a session exited or was killed."""
+
+
+class ShellSession:
+    """
+    A long-lived shell running the commands of one session, one at a time.
+
+    Each command is evaluated by the shell itself, so cd, export and
+    variables carry over to the next command, with stdin from /dev/null so
+    it can not read the commands that follow. A sentinel unique to the
+    command is printed on stdout and stderr after it, delimiting its output
+    and carrying its exit status and the working directory.
+
+    A command that runs into its timeout can not be interrupted on its own;
+    the whole session is killed instead.
+    """
+
+    def __init__(self, session_id: str, process: asyncio.subprocess.Process, idle_timeout: float):
+        self.id = session_id
+        self.process = process
+        self.idle_timeout = idle_timeout
+        self.created_at = time.time()
+        self.last_used = time.monotonic()
+        self.commands = 0
+        self.cwd: Optional[str] = None
+        self.closed = False
+        self._lock = asyncio.Lock()
+        self._idle_handle: Optional[asyncio.TimerHandle] = None
+        self._buffers = {"stdout": b"", "stderr": b""}
+
+    @classmethod
+    async def start(cls, session_id: str, cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None,
+                    idle_timeout: float = IDLE_TIMEOUT) -> "ShellSession":
+        """
+        Start the shell of a session.
+
+        Raises:
+            OSError: If the shell can not be started, e.g. because cwd does not exist
+        """
+        shell = shutil.which("bash") or "/bin/sh"
+        process = await asyncio.create_subprocess_exec(
+            shell,
+            *(["--noprofile", "--norc"] if shell.endswith("bash") else []),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,
+            env={**os.environ, **(env or {})},
+            start_new_session=True
+        )
+        # Registered like any command, so it is killed when the server exits
+        CommandExecutor.track_process_group(process)
+        session = cls(session_id, process, idle_timeout)
+        session.cwd = os.path.abspath(cwd) if cwd else os.getcwd()
+        return session
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    async def run(self, command: str, timeout: int = 30) -> Tuple[CommandResult, bool]:
+        """
+        Run a command in the session.
+
+        Returns:
+            Tuple of (result, whether the output was truncated)
+
+        Raises:
+            SessionClosed: If the session is closed, or its shell exited or
+                was killed because the command timed out
+        """
+        if CommandExecutor.is_dangerous_command(command):
+            return CommandResult(
+                success=False,
+                stdout="",
+                stderr=f"Command '{command}' is blocked for security reasons",
+                return_code=1,
+                command=command
+            ), False
+
+        async with self._lock:
+            if self.closed:
+                raise SessionClosed(f"Session {self.id} is closed")
+            self._cancel_idle()
+            sentinel = f"__mcp_{uuid.uuid4().hex}__"
+            script = (
+                f"{{ eval {shlex.quote(command)}\n}} < /dev/null\n"
+                f"printf '\\n{sentinel} %d %s\\n' \"$?\" \"$PWD\"\n"
+                f"printf '\\n{sentinel}\\n' >&2\n"
+            )
+            readers = [
+                asyncio.ensure_future(self._read_until("stdout", self.process.stdout, sentinel)),
+                asyncio.ensure_future(self._read_until("stderr", self.process.stderr, sentinel))
+            ]
+            try:
+                with span(SPAN_SUBPROCESS):
+                    try:
+                        self.process.stdin.write(script.encode())
+                        await self.process.stdin.drain()
+                        (stdout, stdout_truncated, status), (stderr, stderr_truncated, _) = await asyncio.wait_for(
+                            asyncio.gather(*readers), timeout=timeout
+                        )
+                    except BaseException:
+                        # Stop reading the other stream before the pipes are drained on close
+                        for reader in readers:
+                            reader.cancel()
+                        await asyncio.gather(*readers, return_exceptions=True)
+                        raise
+            except asyncio.TimeoutError:
+                await self.close()
+                raise SessionClosed(f"Command timed out after {timeout} seconds; session {self.id} was closed")
+            except (ConnectionError, SessionClosed):
+                await self.close()
+                raise SessionClosed(f"The shell of session {self.id} exited")
+            except BaseException:
+                # Cancelled: the command may still be running and its output would end up in the next one
+                await self.close()
+                raise
+
+            return_code, _, cwd = status.partition(" ")
+            self.cwd = cwd or self.cwd
+            self.commands += 1
+            self.last_used = time.monotonic()
+            self._schedule_idle()
+        result = CommandResult(
+            success=return_code == "0",
+            stdout=stdout,
+            stderr=stderr,
+            return_code=int(return_code) if return_code.lstrip("-").isdigit() else -1,
+            command=command
+        )
+        return result, stdout_truncated or stderr_truncated
+
+    async def _read_until(self, name: str, pipe: asyncio.StreamReader, sentinel: str) -> Tuple[str, bool, str]:
+        """
+        Read a stream up to the sentinel of a command.
+
+        Returns:
+            Tuple of (output, whether it was truncated, the rest of the sentinel line)
+        """
+        marker = f"\n{sentinel}".encode()
+        data = self._buffers[name]
+        kept = b""
+        truncated = False
+        while True:
+            index = data.find(marker)
+            if index >= 0:
+                # Output ends at the marker; the rest of its line may not have arrived yet
+                kept += data[:index]
+                data = data[index:]
+                line_end = data.find(b"\n", len(marker))
+                if line_end >= 0:
+                    status = data[len(marker):line_end].decode('utf-8', errors='ignore').strip()
+                    self._buffers[name] = data[line_end + 1:]
+                    break
+            else:
+                # Keep enough of the tail to find a marker split over two reads
+                split = max(len(data) - len(marker), 0)
+                kept += data[:split]
+                data = data[split:]
+            if len(kept) > MAX_OUTPUT_BYTES:
+                kept = kept[:MAX_OUTPUT_BYTES]
+                truncated = True
+            chunk = await pipe.read(READ_SIZE)
+            if not chunk:
+                raise SessionClosed(f"The shell of session {self.id} exited")
+            data += chunk
+        if len(kept) > MAX_OUTPUT_BYTES:
+            kept = kept[:MAX_OUTPUT_BYTES]
+            truncated = True
+        return kept.decode('utf-8', errors='ignore'), truncated, status
+
+    def _schedule_idle(self) -> None:
+        if self.idle_timeout > 0:
+            self._idle_handle = asyncio.get_running_loop().call_later(
+                self.idle_timeout, lambda: asyncio.ensure_future(self.close())
+            )
+
+    def _cancel_idle(self) -> None:
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+
+    async def close(self) -> None:
+        """Kill the shell and everything it started."""
+        if self.closed:
+            return
+        self.closed = True
+        self._cancel_idle()
+        CommandExecutor.kill_process_group(self.process)
+        await CommandExecutor.reap(self.process)
+        CommandExecutor.forget_process_group(self.process)
+        logger.info(f"Closed shell session {self.id}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the session as a dict."""
+        return {
+            "session": self.id,
+            "cwd": self.cwd,
+            "commands": self.commands,
+            "busy": self.busy,
+            "idle_seconds": round(time.monotonic() - self.last_used, 1),
+            "created_at": self.created_at
+        }
+
+
+class ShellSessions:
+    """
+    The open shell sessions, at most max_sessions at a time.
+
+    Sessions close themselves after idle_timeout seconds without a command.
+    """
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS, idle_timeout: float = IDLE_TIMEOUT):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.opened = 0
+        self._sessions: Dict[str, ShellSession] = {}
+
+    async def open(self, cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None) -> ShellSession:
+        """
+        Open a session.
+
+        Raises:
+            ValueError: If the maximum number of sessions is open, or cwd is not a directory
+            OSError: If the shell can not be started
+        """
+        self._forget_closed()
+        if len(self._sessions) >= self.max_sessions:
+            raise ValueError(
+                f"At most {self.max_sessions} shell sessions can be open; close one of {sorted(self._sessions)}"
+            )
+        if cwd is not None and not os.path.isdir(cwd):
+            raise ValueError(f"Not a directory: {cwd}")
+        session = await ShellSession.start(uuid.uuid4().hex[:12], cwd, env, self.idle_timeout)
+        session._schedule_idle()
+        self._sessions[session.id] = session
+        self.opened += 1
+        return session
+
+    def get(self, session_id: str) -> ShellSession:
+        """
+        Return an open session.
+
+        Raises:
+            KeyError: If there is no such open session
+        """
+        self._forget_closed()
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise KeyError(f"No open shell session {session_id}")
+        return session
+
+    async def close(self, session_id: str) -> None:
+        """
+        Close a session.
+
+        Raises:
+            KeyError: If there is no such open session
+        """
+        session = self.get(session_id)
+        del self._sessions[session_id]
+        await session.close()
+
+    async def close_all(self) -> None:
+        """Close every session."""
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for session in sessions:
+            await session.close()
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Return the open sessions."""
+        self._forget_closed()
+        return [session.to_dict() for session in self._sessions.values()]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return session statistics."""
+        self._forget_closed()
+        return {
+            "open": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "opened": self.opened
+        }
+
+    def _forget_closed(self) -> None:
+        for session_id in [session_id for session_id, session in self._sessions.items() if session.closed]:
+            del self._sessions[session_id]
+
+
+# Global shell sessions instance
+shell_sessions = ShellSessions()
+metrics_registry.register("shell_sessions", shell_sessions.stats)
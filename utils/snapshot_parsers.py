@@ -0,0 +1,306 @@
+"""
+Snapshot parsers for the Hypernode MCP Server.
+Turn the text snapshots found in incident directories (top, ps, free,
+load averages, MySQL processlists) into compact structured records.
+"""
+
+import re
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+TOP_PROCESSES = 10
+LONGEST_QUERIES = 10
+MAX_INFO_LENGTH = 200
+
+_LOAD_AVERAGE = re.compile(r"load averages?:\s*([\d.]+),?\s+([\d.]+),?\s+([\d.]+)")
+_PROC_LOADAVG = re.compile(r"^([\d.]+) ([\d.]+) ([\d.]+) (\d+)/(\d+) \d+$")
+_PHP_FPM_POOL = re.compile(r"php-fpm: pool (\S+)")
+
+
+def _number(value: str) -> Optional[float]:
+    try:
+        return float(value.replace(",", "."))
+    except ValueError:
+        return None
+
+
+def _load(match: "re.Match") -> Dict[str, float]:
+    return {"1m": float(match.group(1)), "5m": float(match.group(2)), "15m": float(match.group(3))}
+
+
+def _table(lines: List[str], header: str) -> List[Dict[str, str]]:
+    """Parse whitespace separated columns; the last column takes the rest of the line."""
+    columns = header.split()
+    rows = []
+    for line in lines:
+        values = line.split(None, len(columns) - 1)
+        if len(values) == len(columns):
+            rows.append(dict(zip(columns, values)))
+    return rows
+
+
+def _php_fpm_workers(commands: List[str]) -> Dict[str, Any]:
+    pools: Counter = Counter()
+    for command in commands:
+        match = _PHP_FPM_POOL.search(command)
+        if match:
+            pools[match.group(1)] += 1
+    return {"total": sum(pools.values()), "pools": dict(pools)}
+
+
+class SnapshotParser(ABC):
+    """
+    Base class for snapshot parsers.
+
+    Parsers recognise their format from the start of a file, so it does not
+    matter what the file is called. Bump version when the output of parse()
+    changes, so cached summaries are recomputed.
+    """
+
+    name: str = ""
+    version: int = 1
+
+    @abstractmethod
+    def matches(self, head: str) -> bool:
+        """Whether the start of a file looks like this parser's format."""
+
+    @abstractmethod
+    def parse(self, text: str) -> Dict[str, Any]:
+        """Turn the full text of a snapshot file into a compact record."""
+
+
+class TopParser(SnapshotParser):
+    """Batch mode top output (top -b), possibly holding several snapshots."""
+
+    name = "top"
+
+    def matches(self, head: str) -> bool:
+        return head.lstrip().startswith("top - ")
+
+    def parse(self, text: str) -> Dict[str, Any]:
+        snapshots = []
+        for block in re.split(r"(?m)^(?=top - )", text):
+            if block.startswith("top - "):
+                snapshots.append(self._parse_snapshot(block.splitlines()))
+        return {"snapshot_count": len(snapshots), "snapshots": snapshots}
+
+    @staticmethod
+    def _parse_snapshot(lines: List[str]) -> Dict[str, Any]:
+        snapshot: Dict[str, Any] = {"time": lines[0].split()[2] if len(lines[0].split()) > 2 else None}
+        load = _LOAD_AVERAGE.search(lines[0])
+        if load:
+            snapshot["load"] = _load(load)
+
+        header_index = None
+        for i, line in enumerate(lines[1:], 1):
+            stripped = line.strip()
+            if stripped.startswith("Tasks:"):
+                snapshot["tasks"] = {
+                    label: int(count) for count, label in re.findall(r"(\d+) (\w+)", stripped)
+                }
+            elif re.match(r"^\w?i?B Mem\s*:", stripped):
+                unit = stripped.split()[0]
+                values = {label.strip("/"): _number(value) for value, label in re.findall(r"(\d[\d.,]*)\+?\s+([a-z/]+)", stripped)}
+                snapshot["memory"] = {"unit": unit, **values}
+            elif stripped.startswith("PID"):
+                header_index = i
+                break
+
+        if header_index is not None:
+            rows = _table([line.strip() for line in lines[header_index + 1:] if line.strip()], lines[header_index].strip())
+            for row in rows:
+                row["_cpu"] = _number(row.get("%CPU", "0")) or 0.0
+            rows.sort(key=lambda row: row["_cpu"], reverse=True)
+            snapshot["process_count"] = len(rows)
+            snapshot["top_cpu"] = [
+                {
+                    "pid": int(row["PID"]) if row["PID"].isdigit() else row["PID"],
+                    "user": row.get("USER"),
+                    "cpu": row["_cpu"],
+                    "mem": _number(row.get("%MEM", "0")),
+                    "command": row.get("COMMAND")
+                }
+                for row in rows[:TOP_PROCESSES]
+            ]
+            snapshot["php_fpm_workers"] = sum(1 for row in rows if "php-fpm" in (row.get("COMMAND") or ""))
+        return snapshot
+
+
+class PsParser(SnapshotParser):
+    """ps aux / ps auxww output."""
+
+    name = "ps"
+
+    def matches(self, head: str) -> bool:
+        first = head.lstrip().split("\n", 1)[0].split()
+        return first[:2] == ["USER", "PID"] and "%CPU" in first and "COMMAND" in first
+
+    def parse(self, text: str) -> Dict[str, Any]:
+        lines = [line for line in text.strip().splitlines() if line.strip()]
+        rows = _table(lines[1:], lines[0])
+        processes = []
+        for row in rows:
+            processes.append({
+                "pid": int(row["PID"]) if row["PID"].isdigit() else row["PID"],
+                "user": row.get("USER"),
+                "cpu": _number(row.get("%CPU", "0")) or 0.0,
+                "mem": _number(row.get("%MEM", "0")) or 0.0,
+                "rss_kb": int(row["RSS"]) if row.get("RSS", "").isdigit() else None,
+                "stat": row.get("STAT"),
+                "command": row.get("COMMAND", "")
+            })
+
+        return {
+            "process_count": len(processes),
+            "by_user": dict(Counter(process["user"] for process in processes).most_common(TOP_PROCESSES)),
+            "top_cpu": sorted(processes, key=lambda process: process["cpu"], reverse=True)[:TOP_PROCESSES],
+            "top_memory": sorted(processes, key=lambda process: process["mem"], reverse=True)[:TOP_PROCESSES],
+            "php_fpm_workers": _php_fpm_workers([process["command"] for process in processes]),
+            "running": sum(1 for process in processes if (process["stat"] or "").startswith("R")),
+            "uninterruptible": sum(1 for process in processes if (process["stat"] or "").startswith("D"))
+        }
+
+
+class FreeParser(SnapshotParser):
+    """free / free -m output."""
+
+    name = "free"
+
+    def matches(self, head: str) -> bool:
+        lines = head.lstrip().splitlines()
+        return len(lines) > 1 and "total" in lines[0].split() and lines[1].startswith("Mem:")
+
+    def parse(self, text: str) -> Dict[str, Any]:
+        lines = text.strip().splitlines()
+        columns = lines[0].split()
+        memory = {}
+        for line in lines[1:]:
+            label, _, values = line.partition(":")
+            if values:
+                memory[label.strip().lower()] = {
+                    column: int(value) if value.isdigit() else value
+                    for column, value in zip(columns, values.split())
+                }
+        return memory
+
+
+class LoadParser(SnapshotParser):
+    """/proc/loadavg contents or uptime output."""
+
+    name = "load"
+
+    def matches(self, head: str) -> bool:
+        first = head.strip().split("\n", 1)[0]
+        return bool(_PROC_LOADAVG.match(first)) or (" up " in first and bool(_LOAD_AVERAGE.search(first)))
+
+    def parse(self, text: str) -> Dict[str, Any]:
+        samples = []
+        for line in text.strip().splitlines():
+            match = _PROC_LOADAVG.match(line.strip())
+            if match:
+                samples.append({**_load(match), "running": int(match.group(4)), "processes": int(match.group(5))})
+                continue
+            match = _LOAD_AVERAGE.search(line)
+            if match:
+                samples.append(_load(match))
+        return {
+            "samples": samples,
+            "max_1m": max((sample["1m"] for sample in samples), default=None)
+        }
+
+
+class MysqlProcesslistParser(SnapshotParser):
+    """SHOW FULL PROCESSLIST output, as a table or in vertical (\\G) format."""
+
+    name = "mysql_processlist"
+
+    def matches(self, head: str) -> bool:
+        if re.search(r"^\*+ 1\. row \*+$", head, re.MULTILINE) and re.search(r"^\s*Command: ", head, re.MULTILINE):
+            return True
+        return bool(re.search(r"^\|\s*Id\s*\|\s*User\s*\|.*\|\s*Command\s*\|", head, re.MULTILINE))
+
+    def parse(self, text: str) -> Dict[str, Any]:
+        rows = self._vertical(text) if re.search(r"^\*+ 1\. row \*+$", text, re.MULTILINE) else self._table(text)
+        queries = []
+        for row in rows:
+            time_value = row.get("Time", "")
+            queries.append({
+                "id": row.get("Id"),
+                "user": row.get("User"),
+                "host": row.get("Host"),
+                "db": row.get("db"),
+                "command": row.get("Command"),
+                "time": int(time_value) if time_value.lstrip("-").isdigit() else None,
+                "state": row.get("State"),
+                "info": (row.get("Info") or "")[:MAX_INFO_LENGTH] or None
+            })
+
+        active = [query for query in queries if query["command"] not in ("Sleep", "Daemon", "Binlog Dump")]
+        return {
+            "connection_count": len(queries),
+            "active_count": len(active),
+            "sleeping_count": sum(1 for query in queries if query["command"] == "Sleep"),
+            "by_command": dict(Counter(query["command"] for query in queries)),
+            "by_state": dict(Counter(query["state"] for query in active if query["state"]).most_common(TOP_PROCESSES)),
+            "by_user": dict(Counter(query["user"] for query in queries).most_common(TOP_PROCESSES)),
+            "longest_running": sorted(active, key=lambda query: query["time"] or 0, reverse=True)[:LONGEST_QUERIES]
+        }
+
+    @staticmethod
+    def _table(text: str) -> List[Dict[str, str]]:
+        rows = []
+        columns: Optional[List[str]] = None
+        for line in text.splitlines():
+            if not line.startswith("|"):
+                continue
+            values = [value.strip() for value in line.strip().strip("|").split("|")]
+            if columns is None:
+                columns = values
+            elif len(values) == len(columns):
+                rows.append({column: ("" if value == "NULL" else value) for column, value in zip(columns, values)})
+        return rows
+
+    @staticmethod
+    def _vertical(text: str) -> List[Dict[str, str]]:
+        rows: List[Dict[str, str]] = []
+        for line in text.splitlines():
+            if re.match(r"^\*+ \d+\. row \*+$", line.strip()):
+                rows.append({})
+            elif rows and ":" in line:
+                key, _, value = line.partition(":")
+                value = value.strip()
+                rows[-1][key.strip()] = "" if value == "NULL" else value
+        return rows
+
+
+class ParserRegistry:
+    """
+    Registry of snapshot parsers.
+
+    Register a SnapshotParser instance to support another snapshot format;
+    the first parser recognising a file wins.
+    """
+
+    def __init__(self):
+        self.parsers: List[SnapshotParser] = []
+
+    def register_parser(self, parser: SnapshotParser) -> None:
+        """Register a parser instance."""
+        self.parsers.append(parser)
+
+    def find_parser(self, head: str) -> Optional[SnapshotParser]:
+        """Return the parser recognising the start of a file, if any."""
+        for parser in self.parsers:
+            try:
+                if parser.matches(head):
+                    return parser
+            except Exception:
+                continue
+        return None
+
+
+# Global parser registry instance
+parser_registry = ParserRegistry()
+for _parser in (TopParser(), PsParser(), FreeParser(), LoadParser(), MysqlProcesslistParser()):
+    parser_registry.register_parser(_parser)
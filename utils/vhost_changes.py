@@ -0,0 +1,210 @@
+"""
+VHost change utilities for the Hypernode MCP Server.
+Validates vhost setting changes and applies them through
+hypernode-manage-vhosts, combining the changes of a vhost into a single
+invocation so the nginx config is regenerated once per vhost, not once per
+setting.
+"""
+
+import asyncio
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from utils.command_executor import CommandExecutor
+
+MANAGE_VHOSTS = "hypernode-manage-vhosts"
+
+# hypernode-manage-vhosts takes several servernames per invocation; vhosts
+# getting identical changes share an invocation, up to this many
+MAX_VHOSTS_PER_COMMAND = 50
+
+COMMAND_TIMEOUT = 120
+
+_SERVERNAME = re.compile(r"^[A-Za-z0-9*_][A-Za-z0-9._-]*$")
+_ACTION = re.compile(r"^[a-z][a-z0-9-]*$")
+_VALUE = re.compile(r"^[A-Za-z0-9._/:@+-]+$")
+
+
+@dataclass(frozen=True)
+class VHostChange:
+    """A change of a single setting of a vhost."""
+    vhost: str
+    action: str
+    value: str
+
+    @classmethod
+    def from_dict(cls, item: Dict[str, Any]) -> "VHostChange":
+        """
+        Create a validated change from a dict with vhost, action and value.
+
+        Actions may be given as list_vhosts names them (force_https) or as the
+        CLI flag (force-https); boolean values enable or disable the setting.
+
+        Raises:
+            ValueError: If the change is invalid
+        """
+        if not isinstance(item, dict):
+            raise ValueError(f"Expected an object with vhost, action and value, got {item!r}")
+        vhost = str(item.get("vhost") or "")
+        action = str(item.get("action") or "").replace("_", "-")
+        value = item.get("value")
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        value = "" if value is None else str(value)
+
+        if not CommandExecutor.validate_vhost_name(vhost) or not _SERVERNAME.match(vhost) or ".." in vhost:
+            raise ValueError(f"Invalid vhost name: {vhost!r}")
+        if not _ACTION.match(action) or action.startswith("disable-"):
+            raise ValueError(f"Invalid action: {action!r}, use the setting name with value false to disable it")
+        if not _VALUE.match(value):
+            raise ValueError(f"Invalid value for {action}: {value!r}")
+        return cls(vhost=vhost, action=action, value=value)
+
+    def arguments(self) -> List[str]:
+        """Return the hypernode-manage-vhosts arguments making this change."""
+        if self.value.lower() == "false":
+            return [f"--disable-{self.action}"]
+        if self.value.lower() == "true":
+            return [f"--{self.action}"]
+        return [f"--{self.action}", self.value]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the change as a dict."""
+        return {"vhost": self.vhost, "action": self.action, "value": self.value}
+
+
+@dataclass
+class VHostCommand:
+    """A hypernode-manage-vhosts invocation making the changes of one or more vhosts."""
+    vhosts: Tuple[str, ...]
+    arguments: Tuple[str, ...]
+    changes: List[VHostChange]
+
+    @property
+    def command(self) -> str:
+        # Run without a shell, split on whitespace: quotes would reach the CLI
+        # literally. Validation limits every part to characters that need none.
+        return " ".join((MANAGE_VHOSTS, *self.vhosts, *self.arguments))
+
+
+def validate_changes(items: List[Dict[str, Any]]) -> Tuple[List[VHostChange], List[Dict[str, Any]]]:
+    """
+    Validate a list of changes.
+
+    Identical changes are merged; changing the same setting of a vhost to
+    different values is an error.
+
+    Returns:
+        Tuple of (valid changes in their original order, errors with the index of the invalid item)
+    """
+    changes: List[VHostChange] = []
+    errors: List[Dict[str, Any]] = []
+    seen: Dict[Tuple[str, str], VHostChange] = {}
+    for index, item in enumerate(items):
+        try:
+            change = VHostChange.from_dict(item)
+        except ValueError as e:
+            errors.append({"index": index, "error": str(e)})
+            continue
+        previous = seen.get((change.vhost, change.action))
+        if previous is None:
+            seen[(change.vhost, change.action)] = change
+            changes.append(change)
+        elif previous.value != change.value:
+            errors.append({
+                "index": index,
+                "error": f"Conflicting values for {change.action} of {change.vhost}: {previous.value!r} and {change.value!r}"
+            })
+    return changes, errors
+
+
+def plan_commands(changes: List[VHostChange]) -> List[VHostCommand]:
+    """
+    Group changes into as few hypernode-manage-vhosts invocations as possible.
+
+    All changes of a vhost go into one invocation, and vhosts getting
+    identical changes share an invocation.
+    """
+    per_vhost: Dict[str, List[VHostChange]] = {}
+    for change in changes:
+        per_vhost.setdefault(change.vhost, []).append(change)
+
+    groups: Dict[Tuple[str, ...], List[str]] = {}
+    for vhost, vhost_changes in per_vhost.items():
+        arguments = tuple(argument for change in vhost_changes for argument in change.arguments())
+        groups.setdefault(arguments, []).append(vhost)
+
+    commands = []
+    for arguments, vhosts in groups.items():
+        for i in range(0, len(vhosts), MAX_VHOSTS_PER_COMMAND):
+            chunk = tuple(vhosts[i:i + MAX_VHOSTS_PER_COMMAND])
+            commands.append(VHostCommand(
+                vhosts=chunk,
+                arguments=arguments,
+                changes=[change for vhost in chunk for change in per_vhost[vhost]]
+            ))
+    return commands
+
+
+async def apply_commands(commands: List[VHostCommand], concurrency: int = 1, timeout: int = COMMAND_TIMEOUT) -> List[Dict[str, Any]]:
+    """
+    Run planned invocations, at most concurrency at a time.
+
+    Returns:
+        Result per change, in the order of the commands
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def run(command: VHostCommand) -> List[Dict[str, Any]]:
+        async with semaphore:
+            result = await CommandExecutor.execute_command(command.command, timeout=timeout)
+        output = result.stdout if result.success and result.stdout else result.stderr
+        return [
+            {**change.to_dict(), "success": result.success, "result": output, "command": command.command}
+            for change in command.changes
+        ]
+
+    results = await asyncio.gather(*(run(command) for command in commands))
+    return [item for command_results in results for item in command_results]
+
+
+
+def _setting_value(value: Any) -> str:
+    """Normalize a setting value as list_vhosts returns it for comparison."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return "" if value is None else str(value)
+
+
+def diff_vhosts(
+    current: Dict[str, Dict[str, Any]],
+    desired: Dict[str, Dict[str, Any]]
+) -> Tuple[List[VHostChange], List[Dict[str, Any]]]:
+    """
+    Compute the changes that bring the vhosts from their current to their desired settings.
+
+    Only the settings given in desired are compared, and vhosts that are
+    not in desired are left alone. A vhost that does not exist yet gets all
+    of its desired settings.
+
+    Returns:
+        Tuple of (changes, errors with the vhost and setting of invalid desired settings)
+    """
+    changes: List[VHostChange] = []
+    errors: List[Dict[str, Any]] = []
+    for vhost, settings in desired.items():
+        if not isinstance(settings, dict):
+            errors.append({"vhost": vhost, "error": f"Expected the settings of {vhost} as an object"})
+            continue
+        current_settings = current.get(vhost)
+        for setting, value in settings.items():
+            if setting == "servername":
+                continue
+            if current_settings is not None and _setting_value(current_settings.get(setting)) == _setting_value(value):
+                continue
+            try:
+                changes.append(VHostChange.from_dict({"vhost": vhost, "action": setting, "value": _setting_value(value)}))
+            except ValueError as e:
+                errors.append({"vhost": vhost, "setting": setting, "error": str(e)})
+    return changes, errors
@@ -0,0 +1,211 @@
+"""
+VHost state utilities for the Hypernode MCP Server.
+Reads the vhost settings through a pluggable backend: directly from the
+vhost configuration when it is available, watched for changes so lookups
+are in-memory reads, or from hypernode-manage-vhosts otherwise.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Tuple
+
+from utils.command_executor import CommandExecutor
+from utils.metrics import metrics_registry
+
+LIST_COMMAND = "hypernode-manage-vhosts --list --format json"
+
+
+class VHostBackend(ABC):
+    """
+    Source of the vhost settings.
+
+    read() returns the vhosts in the shape hypernode-manage-vhosts --list
+    --format json prints them. Backends that notice changes themselves set
+    watches_changes, so their results need no expiry.
+    """
+
+    name: str = ""
+    watches_changes: bool = False
+
+    @abstractmethod
+    async def read(self) -> Tuple[bool, Any]:
+        """
+        Read the vhosts and their settings.
+
+        Returns:
+            Tuple of (success, vhosts_or_error_message)
+        """
+
+
+class CliVHostBackend(VHostBackend):
+    """Reads the vhosts from hypernode-manage-vhosts."""
+
+    name = "cli"
+
+    async def read(self) -> Tuple[bool, Any]:
+        return await CommandExecutor.execute_json_command(LIST_COMMAND)
+
+
+class ConfigVHostBackend(VHostBackend):
+    """
+    Reads the vhosts directly from their configuration.
+
+    The configuration is either a JSON file holding all vhosts, in the
+    shape of the CLI's JSON listing, or a directory holding a
+    <servername>.json file of settings per vhost. The parsed vhosts are
+    kept in memory and reread only when a stat shows the configuration
+    changed, so a lookup costs one stat per file instead of a CLI run.
+    """
+
+    name = "config"
+    watches_changes = True
+
+    def __init__(self, path: str):
+        self.path = path
+        self.loads = 0
+        self._key: Optional[Tuple[Any, ...]] = None
+        self._vhosts: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        """Whether the configuration exists."""
+        return os.path.exists(self.path)
+
+    async def read(self) -> Tuple[bool, Any]:
+        try:
+            return True, await asyncio.to_thread(self.read_sync)
+        except (OSError, ValueError) as e:
+            return False, f"Failed to read vhost configuration {self.path}: {e}"
+
+    def read_sync(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the vhosts, rereading the configuration only if it changed.
+
+        Raises:
+            OSError: If the configuration can not be read
+            ValueError: If the configuration is not valid JSON of the expected shape
+        """
+        with self._lock:
+            key = self._stat()
+            if key != self._key:
+                self._vhosts = self._load()
+                self._key = key
+                self.loads += 1
+            return self._vhosts
+
+    def _stat(self) -> Tuple[Any, ...]:
+        st = os.stat(self.path)
+        if not os.path.isdir(self.path):
+            return (st.st_ino, st.st_size, st.st_mtime_ns)
+        # Files edited in place do not change the directory, so stat every file
+        files = []
+        with os.scandir(self.path) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    file_st = entry.stat()
+                    files.append((entry.name, file_st.st_size, file_st.st_mtime_ns))
+        return (st.st_ino, st.st_mtime_ns, tuple(sorted(files)))
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.isdir(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                vhosts = json.load(f)
+            if not isinstance(vhosts, dict) or not all(isinstance(settings, dict) for settings in vhosts.values()):
+                raise ValueError("expected an object of vhost settings")
+            return vhosts
+
+        vhosts = {}
+        for name in sorted(os.listdir(self.path)):
+            if not name.endswith(".json") or name.startswith("."):
+                continue
+            with open(os.path.join(self.path, name), 'r', encoding='utf-8') as f:
+                settings = json.load(f)
+            if not isinstance(settings, dict):
+                raise ValueError(f"expected an object of settings in {name}")
+            vhosts[name[:-len(".json")]] = settings
+        return vhosts
+
+
+def select_backend(config_path: Optional[str] = None) -> VHostBackend:
+    """Use the vhost configuration when it is available, the CLI otherwise."""
+    config_path = config_path or os.environ.get("HYPERNODE_VHOSTS_CONFIG")
+    if config_path:
+        backend = ConfigVHostBackend(os.path.expanduser(config_path))
+        if backend.available():
+            return backend
+    return CliVHostBackend()
+
+
+class VHostState:
+    """
+    Cached view of the vhosts configured on the Hypernode.
+
+    Backends that watch the configuration are asked on every load, which
+    is an in-memory read while nothing changed. Other backends are read at
+    most once per ttl seconds unless a fresh read is requested; the vhost
+    tools invalidate the cache after changing vhosts, so only changes made
+    outside of the server can go unnoticed, for at most ttl seconds.
+    """
+
+    def __init__(self, backend: Optional[VHostBackend] = None, ttl: float = 30.0):
+        self._backend = backend
+        self.ttl = ttl
+        self.reads = 0
+        self.hits = 0
+        self._vhosts: Optional[Dict[str, Dict[str, Any]]] = None
+        self._read_at = 0.0
+
+    @property
+    def backend(self) -> VHostBackend:
+        """The backend in use, selected on first use."""
+        if self._backend is None:
+            self._backend = select_backend()
+        return self._backend
+
+    async def load(self, refresh: bool = False) -> Tuple[bool, Any]:
+        """
+        Return the vhosts and their settings.
+
+        Args:
+            refresh: Read the vhosts even if the cached state is still fresh
+
+        Returns:
+            Tuple of (success, vhosts_or_error_message)
+        """
+        backend = self.backend
+        if (
+            not refresh and not backend.watches_changes and self._vhosts is not None
+            and time.monotonic() - self._read_at < self.ttl
+        ):
+            self.hits += 1
+            return True, self._vhosts
+
+        self.reads += 1
+        success, result = await backend.read()
+        if not success:
+            return False, result
+        self._vhosts = result
+        self._read_at = time.monotonic()
+        return True, result
+
+    def invalidate(self) -> None:
+        """Forget the cached vhosts, e.g. after changing them."""
+        self._vhosts = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics."""
+        return {
+            "backend": self.backend.name,
+            "cached": self._vhosts is not None,
+            "reads": self.reads,
+            "hits": self.hits
+        }
+
+
+# Global vhost state instance
+vhost_state = VHostState(ttl=float(os.environ.get("MCP_VHOST_STATE_TTL", "30")))
+metrics_registry.register("vhost_state", vhost_state.stats)